@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class AdminStatsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'adminStats'
+    verbose_name = 'Στατιστικά Διαχείρισης'
+
+    def ready(self):
+        import adminStats.signals
@@ -0,0 +1,207 @@
+"""
+Στατιστικά του admin dashboard με σταθερό κόστος ανάγνωσης.
+
+Αντί για COUNT / GROUP BY σε ολόκληρους τους πίνακες σε κάθε φόρτωση, τα
+signals του adminStats.signals κρατούν:
+- συνολικούς μετρητές (StatisticCounter) για χρήστες, ενεργούς χρήστες, έργα
+  και κτίρια,
+- έναν μετρητή εγγραφών ανά ημέρα (registrations:YYYY-MM-DD), ώστε οι
+  πρόσφατες εγγραφές να είναι άθροισμα 30 γραμμών,
+- το πλήθος έργων/κτιρίων ανά χρήστη (UserStatistics) με indexes για τα top 10.
+
+Οι μετρητές ενημερώνονται με F() μέσα στο ίδιο transaction με την αλλαγή. Η
+εντολή reconcile_admin_stats τους ξαναϋπολογίζει περιοδικά (π.χ. από cron) για
+αλλαγές που δεν περνούν από signals (bulk_create, queryset.update κ.λπ.).
+Το έτοιμο αποτέλεσμα κρατιέται στο cache για ADMIN_STATS_CACHE_TTL δευτερόλεπτα.
+"""
+import logging
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from .models import StatisticCounter, UserStatistics
+
+logger = logging.getLogger(__name__)
+
+USERS_TOTAL = 'users_total'
+USERS_ACTIVE = 'users_active'
+PROJECTS_TOTAL = 'projects_total'
+BUILDINGS_TOTAL = 'buildings_total'
+TOTAL_COUNTERS = [USERS_TOTAL, USERS_ACTIVE, PROJECTS_TOTAL, BUILDINGS_TOTAL]
+
+REGISTRATIONS_PREFIX = 'registrations:'
+RECENT_DAYS = 30
+TOP_USERS = 10
+RECONCILE_CHUNK_SIZE = 5000
+CACHE_KEY = 'admin_stats:dashboard'
+
+
+def registration_counter(day):
+    return f"{REGISTRATIONS_PREFIX}{day.isoformat()}"
+
+
+def recent_days(today=None):
+    """Οι ημέρες του παραθύρου των πρόσφατων εγγραφών (συμπεριλαμβάνεται η σημερινή)."""
+    today = today or timezone.localdate()
+    return [today - timedelta(days=offset) for offset in range(RECENT_DAYS)]
+
+
+def registration_day(user):
+    return timezone.localdate(user.date_joined) if user.date_joined else timezone.localdate()
+
+
+def increment(name, delta=1, create=False):
+    """
+    Αυξάνει (ή μειώνει) έναν μετρητή. Ένας συνολικός μετρητής που λείπει δεν
+    δημιουργείται εδώ: θα υπολογιστεί από το reconcile στην επόμενη ανάγνωση.
+    """
+    if StatisticCounter.objects.filter(name=name).update(value=F('value') + delta) or not create:
+        return
+    try:
+        with transaction.atomic():
+            StatisticCounter.objects.create(name=name, value=max(delta, 0))
+    except IntegrityError:
+        # Δημιουργήθηκε ταυτόχρονα από άλλο request
+        StatisticCounter.objects.filter(name=name).update(value=F('value') + delta)
+
+
+def adjust_user_statistics(user_id, projects=0, buildings=0):
+    if not user_id:
+        return
+    # Greatest: ένας μετρητής που έμεινε πίσω δεν γίνεται αρνητικός (τον διορθώνει το reconcile)
+    UserStatistics.objects.filter(user_id=user_id).update(
+        projects_count=Greatest(F('projects_count') + projects, 0),
+        buildings_count=Greatest(F('buildings_count') + buildings, 0),
+    )
+
+
+def _upsert_counters(values):
+    now = timezone.now()
+    StatisticCounter.objects.bulk_create(
+        [StatisticCounter(name=name, value=value, updated_at=now) for name, value in values.items()],
+        update_conflicts=True,
+        unique_fields=['name'],
+        update_fields=['value', 'updated_at'],
+    )
+
+
+def reconcile(chunk_size=RECONCILE_CHUNK_SIZE):
+    """
+    Ξαναϋπολογίζει όλους τους μετρητές από τους πίνακες. Επιστρέφει τους
+    συνολικούς μετρητές και το πλήθος χρηστών που ενημερώθηκαν.
+    """
+    from user.models import User
+    from project.models import Project
+    from building.models import Building
+
+    days = recent_days()
+    with transaction.atomic():
+        totals = {
+            USERS_TOTAL: User.objects.count(),
+            USERS_ACTIVE: User.objects.filter(last_login__isnull=False).count(),
+            PROJECTS_TOTAL: Project.objects.count(),
+            BUILDINGS_TOTAL: Building.objects.count(),
+        }
+        registrations = {registration_counter(day): 0 for day in days}
+        first_day_start = timezone.make_aware(datetime.combine(days[-1], time.min))
+        for day, count in (
+            User.objects.filter(date_joined__gte=first_day_start)
+            .annotate(day=TruncDate('date_joined'))
+            .values('day').annotate(count=Count('pk')).values_list('day', 'count')
+        ):
+            if registration_counter(day) in registrations:
+                registrations[registration_counter(day)] = count
+        _upsert_counters({**totals, **registrations})
+        StatisticCounter.objects.filter(
+            name__startswith=REGISTRATIONS_PREFIX,
+            name__lt=registration_counter(days[-1]),
+        ).delete()
+
+    users_updated = 0
+    last_pk = None
+    while True:
+        users = User.objects.order_by('pk')
+        if last_pk is not None:
+            users = users.filter(pk__gt=last_pk)
+        user_ids = list(users.values_list('pk', flat=True)[:chunk_size])
+        if not user_ids:
+            break
+        last_pk = user_ids[-1]
+
+        projects = dict(
+            Project.objects.filter(user_id__in=user_ids).order_by()
+            .values('user').annotate(count=Count('pk')).values_list('user', 'count')
+        )
+        buildings = dict(
+            Building.objects.filter(user_id__in=user_ids).order_by()
+            .values('user').annotate(count=Count('pk')).values_list('user', 'count')
+        )
+        UserStatistics.objects.bulk_create(
+            [
+                UserStatistics(
+                    user_id=user_id,
+                    projects_count=projects.get(user_id, 0),
+                    buildings_count=buildings.get(user_id, 0),
+                )
+                for user_id in user_ids
+            ],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['projects_count', 'buildings_count'],
+        )
+        users_updated += len(user_ids)
+
+    cache.delete(CACHE_KEY)
+    return {'totals': totals, 'users_updated': users_updated}
+
+
+def _top_users(count_field):
+    return list(
+        UserStatistics.objects.filter(**{f'{count_field}__gt': 0})
+        .order_by(f'-{count_field}')
+        .values('user__email', count=F(count_field))[:TOP_USERS]
+    )
+
+
+def build_dashboard_stats():
+    """Τα στατιστικά του dashboard από τους μετρητές (λίγα ερωτήματα με index)."""
+    days = recent_days()
+    names = TOTAL_COUNTERS + [registration_counter(day) for day in days]
+    counters = dict(StatisticCounter.objects.filter(name__in=names).values_list('name', 'value'))
+    if any(name not in counters for name in TOTAL_COUNTERS):
+        logger.info("Admin statistics counters missing, reconciling")
+        reconcile()
+        counters = dict(StatisticCounter.objects.filter(name__in=names).values_list('name', 'value'))
+
+    return {
+        'users': {
+            'total': counters.get(USERS_TOTAL, 0),
+            'active': counters.get(USERS_ACTIVE, 0),
+            'recent_registrations': sum(counters.get(registration_counter(day), 0) for day in days),
+        },
+        'projects': {
+            'total': counters.get(PROJECTS_TOTAL, 0),
+            'by_user': _top_users('projects_count'),
+        },
+        'buildings': {
+            'total': counters.get(BUILDINGS_TOTAL, 0),
+            'by_user': _top_users('buildings_count'),
+        },
+        'generated_at': timezone.now().isoformat(),
+    }
+
+
+def get_dashboard_stats(fresh=False):
+    """Στατιστικά από το cache, ή υπολογισμένα από τους μετρητές με fresh=True / όταν έληξαν."""
+    if not fresh:
+        stats = cache.get(CACHE_KEY)
+        if stats is not None:
+            return stats
+    stats = build_dashboard_stats()
+    cache.set(CACHE_KEY, stats, settings.ADMIN_STATS_CACHE_TTL)
+    return stats
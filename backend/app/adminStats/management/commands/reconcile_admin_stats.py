@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from adminStats.counters import RECONCILE_CHUNK_SIZE, reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the admin dashboard counters (totals, daily registrations, per-user project and '
+        'building counts) from the tables. Run periodically, e.g. nightly from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=RECONCILE_CHUNK_SIZE,
+            help=f'Number of users whose counts are recomputed per batch (default: {RECONCILE_CHUNK_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive integer')
+
+        result = reconcile(chunk_size=options['chunk_size'])
+        for name, value in result['totals'].items():
+            self.stdout.write(f"  {name}: {value}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Admin statistics reconciled ({result['users_updated']} users)"
+        ))
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('user', '0002_user_is_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticCounter',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Μετρητής Στατιστικών',
+                'verbose_name_plural': 'Μετρητές Στατιστικών',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserStatistics',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('projects_count', models.PositiveIntegerField(default=0)),
+                ('buildings_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Στατιστικά Χρήστη',
+                'verbose_name_plural': 'Στατιστικά Χρηστών',
+                'indexes': [models.Index(fields=['-projects_count'], name='userstats_projects_idx'), models.Index(fields=['-buildings_count'], name='userstats_buildings_idx')],
+            },
+        ),
+    ]
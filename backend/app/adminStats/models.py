@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import models
+
+
+class StatisticCounter(models.Model):
+    """
+    Μετρητής του dashboard (π.χ. users_total, projects_total) που ενημερώνεται
+    σταδιακά από τα signals του adminStats.signals και διορθώνεται περιοδικά
+    από την εντολή reconcile_admin_stats.
+    """
+    name = models.CharField(max_length=64, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Μετρητής Στατιστικών"
+        verbose_name_plural = "Μετρητές Στατιστικών"
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class UserStatistics(models.Model):
+    """Πλήθος έργων και κτιρίων ανά χρήστη, για τις λίστες 'top χρήστες' του dashboard."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='statistics'
+    )
+    projects_count = models.PositiveIntegerField(default=0)
+    buildings_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Στατιστικά Χρήστη"
+        verbose_name_plural = "Στατιστικά Χρηστών"
+        indexes = [
+            models.Index(fields=['-projects_count'], name='userstats_projects_idx'),
+            models.Index(fields=['-buildings_count'], name='userstats_buildings_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.projects_count} έργα, {self.buildings_count} κτίρια"
@@ -0,0 +1,96 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from user.models import User
+from project.models import Project
+from building.models import Building
+from .counters import (
+    BUILDINGS_TOTAL, PROJECTS_TOTAL, USERS_ACTIVE, USERS_TOTAL,
+    adjust_user_statistics, increment, recent_days, registration_counter, registration_day,
+)
+from .models import UserStatistics
+
+
+@receiver(pre_save, sender=User)
+def remember_first_login(sender, instance, update_fields=None, **kwargs):
+    """
+    Σημειώνει αν η αποθήκευση ορίζει για πρώτη φορά το last_login, ώστε να
+    αυξηθεί ο μετρητής ενεργών χρηστών. Ερώτημα γίνεται μόνο όταν αλλάζει το last_login.
+    """
+    instance._first_login = False
+    if instance._state.adding or instance.last_login is None:
+        return
+    if update_fields is not None and 'last_login' not in update_fields:
+        return
+    instance._first_login = User.objects.filter(pk=instance.pk, last_login__isnull=True).exists()
+
+
+@receiver(post_save, sender=User)
+def count_saved_user(sender, instance, created, **kwargs):
+    if created:
+        increment(USERS_TOTAL)
+        if instance.last_login is not None:
+            increment(USERS_ACTIVE)
+        increment(registration_counter(registration_day(instance)), create=True)
+        UserStatistics.objects.get_or_create(user=instance)
+    elif getattr(instance, '_first_login', False):
+        increment(USERS_ACTIVE)
+
+
+@receiver(post_delete, sender=User)
+def count_deleted_user(sender, instance, **kwargs):
+    increment(USERS_TOTAL, -1)
+    if instance.last_login is not None:
+        increment(USERS_ACTIVE, -1)
+    day = registration_day(instance)
+    if day in recent_days():
+        increment(registration_counter(day), -1)
+
+
+def _previous_owner(instance, created, update_fields):
+    """
+    Ο προηγούμενος χρήστης αν η αποθήκευση μετέφερε την εγγραφή σε άλλον
+    χρήστη, αλλιώς None. Όπως το count_saved_building του project.signals: για
+    εγγραφή που δεν φορτώθηκε από τη βάση (from_db) θεωρείται ότι ο χρήστης
+    δεν άλλαξε.
+    """
+    previous = None
+    if not created and (update_fields is None or 'user' in update_fields):
+        loaded = getattr(instance, '_loaded_user_id', instance.user_id)
+        if str(loaded) != str(instance.user_id):
+            previous = loaded
+    instance._loaded_user_id = instance.user_id
+    return previous
+
+
+@receiver(post_save, sender=Project)
+def count_saved_project(sender, instance, created, update_fields=None, **kwargs):
+    previous = _previous_owner(instance, created, update_fields)
+    if created:
+        increment(PROJECTS_TOTAL)
+        adjust_user_statistics(instance.user_id, projects=1)
+    elif previous is not None:
+        adjust_user_statistics(previous, projects=-1)
+        adjust_user_statistics(instance.user_id, projects=1)
+
+
+@receiver(post_delete, sender=Project)
+def count_deleted_project(sender, instance, **kwargs):
+    increment(PROJECTS_TOTAL, -1)
+    adjust_user_statistics(instance.user_id, projects=-1)
+
+
+@receiver(post_save, sender=Building)
+def count_saved_building(sender, instance, created, update_fields=None, **kwargs):
+    previous = _previous_owner(instance, created, update_fields)
+    if created:
+        increment(BUILDINGS_TOTAL)
+        adjust_user_statistics(instance.user_id, buildings=1)
+    elif previous is not None:
+        adjust_user_statistics(previous, buildings=-1)
+        adjust_user_statistics(instance.user_id, buildings=1)
+
+
+@receiver(post_delete, sender=Building)
+def count_deleted_building(sender, instance, **kwargs):
+    increment(BUILDINGS_TOTAL, -1)
+    adjust_user_statistics(instance.user_id, buildings=-1)
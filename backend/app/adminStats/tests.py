@@ -0,0 +1,219 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.utils import timezone
+
+from admin_views import USER_SORT_FIELDS, admin_users_queryset
+from building.models import Building
+from prefectures.models import Prefecture
+from project.models import Project
+from user.models import User
+
+from .counters import (
+    BUILDINGS_TOTAL, CACHE_KEY, PROJECTS_TOTAL, USERS_ACTIVE, USERS_TOTAL, build_dashboard_stats, reconcile,
+    registration_counter,
+)
+from .models import StatisticCounter, UserStatistics
+
+
+class CounterTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user(email='alice@bemat.local', password=None)
+        cls.bob = User.objects.create_user(email='bob@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+        cls.project = cls.create_project(cls.alice, 'Alice')
+        cls.building = cls.create_building(cls.project, cls.alice, 'Alice 1')
+        reconcile()
+
+    @classmethod
+    def create_project(cls, user, name):
+        return Project.objects.create(user=user, name=name, cost_per_kwh_electricity=Decimal('0.2'))
+
+    @classmethod
+    def create_building(cls, project, user, name):
+        return Building.objects.create(
+            project=project, user=user, name=name, usage='Γραφεία', description='Test',
+            address='Test', prefecture=cls.prefecture, total_area=500, examined_area=400,
+        )
+
+    def counters(self):
+        return dict(StatisticCounter.objects.values_list('name', 'value'))
+
+    def user_statistics(self):
+        return {
+            user_id: (projects, buildings)
+            for user_id, projects, buildings in
+            UserStatistics.objects.values_list('user_id', 'projects_count', 'buildings_count')
+        }
+
+    def assertMatchesReconcile(self):
+        """Οι μετρητές που κράτησαν τα signals είναι ίδιοι με τον πλήρη επαναϋπολογισμό."""
+        state = (self.counters(), self.user_statistics())
+        reconcile()
+        self.assertEqual(state, (self.counters(), self.user_statistics()))
+
+
+class CounterSignalTests(CounterTestCase):
+    """Τα adminStats.signals ενημερώνουν τους μετρητές όπως τους υπολογίζει το reconcile."""
+
+    def test_user_registration_login_and_delete(self):
+        today = registration_counter(timezone.localdate())
+        before = self.counters()
+
+        carol = User.objects.create_user(email='carol@bemat.local', password=None)
+        counters = self.counters()
+        self.assertEqual(counters[USERS_TOTAL], before[USERS_TOTAL] + 1)
+        self.assertEqual(counters[today], before[today] + 1)
+        self.assertEqual(self.user_statistics()[carol.pk], (0, 0))
+
+        for _ in range(2):
+            carol.last_login = timezone.now()
+            carol.save(update_fields=['last_login'])
+        self.assertEqual(self.counters()[USERS_ACTIVE], before[USERS_ACTIVE] + 1)
+        self.assertMatchesReconcile()
+
+        carol.delete()
+        self.assertEqual(self.counters(), before)
+        self.assertMatchesReconcile()
+
+    def test_project_and_building_create_and_delete(self):
+        project = self.create_project(self.bob, 'Bob')
+        building = self.create_building(project, self.bob, 'Bob 1')
+        self.assertEqual(self.user_statistics()[self.bob.pk], (1, 1))
+        self.assertMatchesReconcile()
+
+        building.delete()
+        project.delete()
+        self.assertEqual(self.user_statistics()[self.bob.pk], (0, 0))
+        self.assertMatchesReconcile()
+
+    def test_owner_change_moves_statistics(self):
+        project = Project.objects.get(pk=self.project.pk)
+        project.user = self.bob
+        project.save()
+        building = Building.objects.get(pk=self.building.pk)
+        building.user = self.bob
+        building.save(update_fields=['user'])
+
+        statistics = self.user_statistics()
+        self.assertEqual(statistics[self.alice.pk], (0, 0))
+        self.assertEqual(statistics[self.bob.pk], (1, 1))
+        self.assertMatchesReconcile()
+
+        # Δεύτερη αποθήκευση του ίδιου instance: ο χρήστης δεν άλλαξε ξανά
+        project.save()
+        building.save()
+        self.assertEqual(self.user_statistics()[self.bob.pk], (1, 1))
+        self.assertMatchesReconcile()
+
+    def test_save_without_user_field_does_not_move(self):
+        building = Building.objects.get(pk=self.building.pk)
+        building.user = self.bob
+        building.save(update_fields=['name'])
+        self.assertEqual(self.user_statistics()[self.alice.pk], (1, 1))
+        self.assertMatchesReconcile()
+
+
+class ReconcileTests(CounterTestCase):
+
+    def test_reconcile_fixes_drifted_counters(self):
+        expected = (self.counters(), self.user_statistics())
+        StatisticCounter.objects.filter(name=PROJECTS_TOTAL).update(value=42)
+        StatisticCounter.objects.filter(name=BUILDINGS_TOTAL).delete()
+        UserStatistics.objects.filter(user=self.alice).update(projects_count=7, buildings_count=0)
+        UserStatistics.objects.filter(user=self.bob).delete()
+        stale_day = registration_counter(timezone.localdate() - timedelta(days=60))
+        StatisticCounter.objects.create(name=stale_day, value=3)
+
+        result = reconcile(chunk_size=1)
+        self.assertEqual(result['users_updated'], 2)
+        self.assertEqual(result['totals'][PROJECTS_TOTAL], 1)
+        self.assertEqual((self.counters(), self.user_statistics()), expected)
+        self.assertNotIn(stale_day, self.counters())
+
+    def test_dashboard_reconciles_missing_counters(self):
+        StatisticCounter.objects.all().delete()
+        cache.delete(CACHE_KEY)
+        stats = build_dashboard_stats()
+        self.assertEqual(stats['users']['total'], 2)
+        self.assertEqual(stats['users']['recent_registrations'], 2)
+        self.assertEqual(stats['projects']['by_user'], [{'user__email': 'alice@bemat.local', 'count': 1}])
+        self.assertEqual(stats['buildings']['total'], 1)
+
+
+class AdminUsersQuerysetTests(CounterTestCase):
+    """Το admin_users_queryset μετρά έργα/κτίρια όπως τα απλά count() ανά χρήστη."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_user(email='admin@bemat.local', password=None, is_staff=True)
+        cls.carol = User.objects.create_user(email='carol@bemat.local', password=None, first_name='Carol')
+        for name in ('Bob 1', 'Bob 2', 'Bob 3'):
+            project = cls.create_project(cls.bob, name)
+        for name in ('Bob A', 'Bob B'):
+            cls.create_building(project, cls.bob, name)
+        # Κτίριο άλλου χρήστη σε έργο του bob: μετρά στον κάτοχο του κτιρίου
+        cls.create_building(project, cls.carol, 'Carol 1')
+
+    def naive_counts(self, users):
+        return {
+            user.email: (Project.objects.filter(user=user).count(), Building.objects.filter(user=user).count())
+            for user in users
+        }
+
+    def counts(self, queryset):
+        return {user.email: (user.projects_count, user.buildings_count) for user in queryset}
+
+    def test_counts_match_naive_counts(self):
+        queryset, sort_by = admin_users_queryset({})
+        self.assertEqual(sort_by, '-date_joined')
+        self.assertEqual(self.counts(queryset), self.naive_counts(User.objects.all()))
+        self.assertEqual(self.counts(queryset)['bob@bemat.local'], (3, 2))
+        self.assertEqual(self.counts(queryset)['admin@bemat.local'], (0, 0))
+
+    def test_filters_keep_counts(self):
+        filters = [
+            ({'search': 'carol'}, User.objects.filter(email__icontains='carol')),
+            ({'is_staff': 'true'}, User.objects.filter(is_staff=True)),
+            ({'is_staff': 'false'}, User.objects.filter(is_staff=False)),
+            ({'date_from': timezone.localdate().isoformat()}, User.objects.all()),
+            ({'date_to': (timezone.localdate() - timedelta(days=1)).isoformat()}, User.objects.none()),
+        ]
+        for params, expected in filters:
+            with self.subTest(params=params):
+                queryset, _ = admin_users_queryset(params)
+                self.assertEqual(self.counts(queryset), self.naive_counts(expected))
+
+    def test_sort_by_counts(self):
+        naive = self.naive_counts(User.objects.all())
+        for sort_by, position in (('-projects_count', 0), ('buildings_count', 1)):
+            with self.subTest(sort_by=sort_by):
+                queryset, used = admin_users_queryset({'sort_by': sort_by})
+                self.assertEqual(used, sort_by)
+                values = [naive[user.email][position] for user in queryset]
+                self.assertEqual(values, sorted(values, reverse=sort_by.startswith('-')))
+
+        queryset, used = admin_users_queryset({'sort_by': 'password'})
+        self.assertNotIn('password', USER_SORT_FIELDS)
+        self.assertEqual(used, '-date_joined')
+
+    def test_users_list_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(user=self.bob)
+        self.assertEqual(client.get('/api/admin-api/users/').status_code, 403)
+
+        client.force_authenticate(user=self.admin)
+        response = client.get('/api/admin-api/users/', {'sort_by': '-projects_count', 'per_page': 2})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['pagination']['total_items'], 4)
+        self.assertEqual(
+            [(user['email'], user['projects_count'], user['buildings_count']) for user in data['users']],
+            [('bob@bemat.local', 3, 2), ('alice@bemat.local', 1, 1)],
+        )
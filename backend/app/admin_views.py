@@ -4,19 +4,24 @@ Admin-only views for system administration and monitoring
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Count, Q
-from django.utils import timezone
-from datetime import timedelta
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
 from django.core.paginator import Paginator
-from django.db import transaction
+from django.conf import settings
 import json
 
 from user.models import User
 from project.models import Project
 from building.models import Building
-from common.utils import standard_error_response, standard_success_response, is_admin_user
+from adminStats.counters import get_dashboard_stats
+from backgroundJobs.queue import JobError, enqueue
+from backgroundJobs.views import job_accepted
+from project.recalculation import DEFAULT_CHUNK_SIZE, parse_since, recalculate_scenarios
+from common.deletion import delete_projects, delete_users
+from common.performance import METRICS, collect_stats, reset_stats
+from common.utils import standard_error_response, standard_success_response, is_admin_user, validate_uuid
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,80 +31,152 @@ logger = logging.getLogger(__name__)
 @permission_classes([IsAuthenticated])
 def admin_dashboard_stats(request):
     """
-    Get comprehensive system statistics for admin dashboard
+    Get comprehensive system statistics for admin dashboard.
+    Served from the incrementally maintained counters of adminStats, cached for
+    ADMIN_STATS_CACHE_TTL seconds; ?fresh=1 bypasses the cache.
     """
     if not is_admin_user(request.user):
         return standard_error_response("Access denied: Admin privileges required", status.HTTP_403_FORBIDDEN)
     
     try:
-        total_users = User.objects.count()
-        active_users = User.objects.filter(last_login__isnull=False).count()
-        
-        total_projects = Project.objects.count()
-        projects_by_user = Project.objects.values('user__email').annotate(
-            count=Count('uuid')
-        ).order_by('-count')[:10]
-        
-        total_buildings = Building.objects.count()
-        buildings_by_user = Building.objects.values('user__email').annotate(
-            count=Count('uuid')
-        ).order_by('-count')[:10]
-        
-        month_ago = timezone.now() - timedelta(days=30)
-        recent_registrations = User.objects.filter(date_joined__gte=month_ago).count()
-        
-        return standard_success_response({
-            'users': {
-                'total': total_users,
-                'active': active_users,
-                'recent_registrations': recent_registrations
-            },
-            'projects': {
-                'total': total_projects,
-                'by_user': list(projects_by_user)
-            },
-            'buildings': {
-                'total': total_buildings,
-                'by_user': list(buildings_by_user)
-            }
-        })
+        fresh = request.GET.get('fresh') in ('1', 'true')
+        return standard_success_response(get_dashboard_stats(fresh=fresh))
         
     except Exception as e:
         return standard_error_response(f"Error getting admin stats: {str(e)}", status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+USER_SORT_FIELDS = [
+    'email', '-email', 'date_joined', '-date_joined',
+    'first_name', '-first_name', 'last_name', '-last_name',
+    'is_staff', '-is_staff', 'last_login', '-last_login',
+    'projects_count', '-projects_count', 'buildings_count', '-buildings_count',
+]
+USER_LIST_FIELDS = [
+    'uuid', 'email', 'first_name', 'last_name', 'date_joined', 'last_login',
+    'is_superuser', 'is_staff', 'projects_count', 'buildings_count',
+]
+MAX_PER_PAGE = 500
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _user_count_subquery(model):
+    """Πλήθος εγγραφών του model ανά χρήστη ως correlated subquery (χωρίς JOIN/GROUP BY στους χρήστες)."""
+    counts = model.objects.filter(user=OuterRef('pk')).order_by().values('user').annotate(
+        count=Count('pk')
+    ).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def admin_users_queryset(params, default_sort='-date_joined'):
+    """
+    Κοινό queryset των λιστών χρηστών του admin: φίλτρα (search, is_staff,
+    date_from, date_to), πλήθος έργων/κτιρίων ανά χρήστη και ταξινόμηση, όλα σε
+    ένα ερώτημα. Επιστρέφει (queryset, sort_by).
+    """
+    search = params.get('search', '')
+    is_staff_filter = params.get('is_staff')
+    date_from = params.get('date_from')
+    date_to = params.get('date_to')
+    sort_by = params.get('sort_by', default_sort)
+    
+    queryset = User.objects.all()
+    
+    if search:
+        queryset = queryset.filter(
+            Q(email__icontains=search) |
+            Q(first_name__icontains=search) |
+            Q(last_name__icontains=search)
+        )
+    
+    if is_staff_filter is not None:
+        queryset = queryset.filter(is_staff=is_staff_filter.lower() == 'true')
+    
+    if date_from:
+        queryset = queryset.filter(date_joined__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date_joined__date__lte=date_to)
+    
+    queryset = queryset.annotate(
+        projects_count=_user_count_subquery(Project),
+        buildings_count=_user_count_subquery(Building),
+    )
+    
+    if sort_by not in USER_SORT_FIELDS:
+        sort_by = default_sort
+    # Το uuid ως δεύτερο κριτήριο κρατά σταθερή τη σειρά μεταξύ σελίδων
+    return queryset.order_by(sort_by, 'uuid'), sort_by
+
+
+def _pagination_params(params):
+    page = int(params.get('page', 1))
+    per_page = min(max(int(params.get('per_page', 25)), 1), MAX_PER_PAGE)
+    return page, per_page
+
+
+def _pagination_data(paginator, page_obj, per_page):
+    return {
+        'current_page': page_obj.number,
+        'total_pages': paginator.num_pages,
+        'total_items': paginator.count,
+        'per_page': per_page,
+        'has_previous': page_obj.has_previous(),
+        'has_next': page_obj.has_next(),
+    }
+
+
+def _user_list_row(user):
+    return {
+        'uuid': str(user['uuid']),
+        'email': user['email'],
+        'first_name': user['first_name'],
+        'last_name': user['last_name'],
+        'date_joined': user['date_joined'].strftime('%Y-%m-%d %H:%M:%S'),
+        'last_login': user['last_login'].strftime('%Y-%m-%d %H:%M:%S') if user['last_login'] else None,
+        'is_superuser': user['is_superuser'],
+        'is_staff': user['is_staff'],
+        'projects_count': user['projects_count'],
+        'buildings_count': user['buildings_count'],
+    }
+
+
+def _stream_users_export(queryset):
+    """Όλοι οι χρήστες ως JSON, σε τμήματα, χωρίς να φορτωθούν όλοι στη μνήμη."""
+    yield '{"status": "success", "data": {"users": ['
+    for index, user in enumerate(queryset.values(*USER_LIST_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)):
+        yield (',' if index else '') + json.dumps(_user_list_row(user))
+    yield ']}}'
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def admin_users_list(request):
     """
-    Get list of all users with their statistics
+    Get list of users with their project and building counts.
+    Paginated (page, per_page, sort_by and the filters of admin_users_table);
+    ?export=1 streams every matching user as one JSON document.
     """
     if not is_admin_user(request.user):
         return standard_error_response("Access denied: Admin privileges required", status.HTTP_403_FORBIDDEN)
     
     try:
-        users = User.objects.all()
-        users_data = []
+        queryset, sort_by = admin_users_queryset(request.GET)
         
-        for user in users:
-            user_projects = Project.objects.filter(user=user).count()
-            user_buildings = Building.objects.filter(user=user).count()
-            
-            users_data.append({
-                'uuid': user.uuid,
-                'email': user.email,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'date_joined': user.date_joined.strftime('%Y-%m-%d %H:%M:%S'),
-                'last_login': user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else None,
-                'is_superuser': user.is_superuser,
-                'is_staff': user.is_staff,
-                'projects_count': user_projects,
-                'buildings_count': user_buildings
-            })
+        if request.GET.get('export') in ('1', 'true'):
+            return StreamingHttpResponse(_stream_users_export(queryset), content_type='application/json')
+        
+        page, per_page = _pagination_params(request.GET)
+        paginator = Paginator(queryset.values(*USER_LIST_FIELDS), per_page)
+        page_obj = paginator.get_page(page)
         
-        return standard_success_response({'users': users_data})
+        return standard_success_response({
+            'users': [_user_list_row(user) for user in page_obj],
+            'pagination': _pagination_data(paginator, page_obj, per_page),
+            'sort_by': sort_by,
+        })
         
+    except ValueError as e:
+        return standard_error_response(f"Invalid parameter: {str(e)}", status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return standard_error_response(f"Error getting users list: {str(e)}", status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -169,42 +246,9 @@ def admin_users_table(request):
     
     try:
         search = request.GET.get('search', '')
-        page = int(request.GET.get('page', 1))
-        per_page = int(request.GET.get('per_page', 25))
-        sort_by = request.GET.get('sort_by', '-date_joined')
         is_staff_filter = request.GET.get('is_staff')
-        date_from = request.GET.get('date_from')
-        date_to = request.GET.get('date_to')
-        
-        queryset = User.objects.all()
-        
-        if search:
-            queryset = queryset.filter(
-                Q(email__icontains=search) |
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search)
-            )
-        
-        if is_staff_filter is not None:
-            queryset = queryset.filter(is_staff=is_staff_filter.lower() == 'true')
-        
-        if date_from:
-            queryset = queryset.filter(date_joined__date__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(date_joined__date__lte=date_to)
-        
-        queryset = queryset.annotate(
-            projects_count=Count('projects')
-        )
-        
-        valid_sort_fields = [
-            'email', '-email', 'date_joined', '-date_joined', 
-            'first_name', '-first_name', 'last_name', '-last_name', 
-            'is_staff', '-is_staff', 'projects_count', '-projects_count'
-        ]
-        
-        if sort_by in valid_sort_fields:
-            queryset = queryset.order_by(sort_by)
+        page, per_page = _pagination_params(request.GET)
+        queryset, sort_by = admin_users_queryset(request.GET)
         
         paginator = Paginator(queryset, per_page)
         page_obj = paginator.get_page(page)
@@ -223,18 +267,12 @@ def admin_users_table(request):
                 'date_joined': user.date_joined.isoformat() if user.date_joined else None,
                 'last_login': user.last_login.isoformat() if user.last_login else None,
                 'projects_count': user.projects_count,
+                'buildings_count': user.buildings_count,
             })
         
         return standard_success_response({
             'users': users_data,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_items': paginator.count,
-                'per_page': per_page,
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-            },
+            'pagination': _pagination_data(paginator, page_obj, per_page),
             'filters': {
                 'search': search,
                 'sort_by': sort_by,
@@ -336,6 +374,16 @@ def admin_projects_table(request):
         return standard_error_response(f"Error getting projects table: {str(e)}", status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _enqueue_response(kind, params, user):
+    """Queue a background job instead of running the work inside the request (202 + job status)."""
+    try:
+        job = enqueue(kind, params, user)
+    except JobError as e:
+        return standard_error_response(str(e), e.status_code)
+    logger.info(f"Admin {user.email} queued job {job.uuid} ({kind})")
+    return job_accepted(job)
+
+
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def admin_bulk_delete_users(request):
@@ -379,17 +427,27 @@ def admin_bulk_delete_users(request):
             superuser_emails = list(superusers_to_delete.values_list('email', flat=True))
             logger.warning(f"Admin {request.user.email} is deleting {superusers_to_delete_count} superuser(s): {superuser_emails}")
         
-        with transaction.atomic():
-            deleted_count = users_to_delete.count()
-            user_emails = list(users_to_delete.values_list('email', flat=True))
-            
-            logger.info(f"Admin {request.user.email} deleting {deleted_count} user(s): {user_emails}")
-            users_to_delete.delete()
-            logger.info(f"Successfully deleted {deleted_count} user(s)")
+        # With "async": true the delete runs in the background worker (poll /api/jobs/<uuid>/)
+        if data.get('async'):
+            return _enqueue_response('bulk_delete_users', {'user_ids': user_ids}, request.user)
+        
+        user_emails = list(users_to_delete.values_list('email', flat=True))
+        logger.info(f"Admin {request.user.email} deleting {len(user_emails)} user(s): {user_emails}")
+        
+        # Chunked, dependency-ordered deletion without per-row signals (common.deletion)
+        result = delete_users(list(users_to_delete.values_list('pk', flat=True)))
+        deleted_count = result['roots_deleted']
+        logger.info(
+            f"Successfully deleted {deleted_count} user(s): {result['total_rows']} rows "
+            f"in {result['elapsed_seconds']}s ({result['rows_per_second']} rows/sec)"
+        )
         
         return standard_success_response({
             'deleted_count': deleted_count,
             'deleted_users': user_emails[:10],
+            'deleted_rows': result['total_rows'],
+            'elapsed_seconds': result['elapsed_seconds'],
+            'rows_per_second': result['rows_per_second'],
             'message': f'Successfully deleted {deleted_count} users'
         })
         
@@ -420,15 +478,23 @@ def admin_bulk_delete_projects(request):
         if not projects_to_delete.exists():
             return standard_error_response('No projects found with provided IDs', status.HTTP_404_NOT_FOUND)
         
-        with transaction.atomic():
-            deleted_count = projects_to_delete.count()
-            project_names = list(projects_to_delete.values_list('name', flat=True))
-            
-            projects_to_delete.delete()
+        if data.get('async'):
+            return _enqueue_response('bulk_delete_projects', {'project_ids': project_ids}, request.user)
+        
+        project_names = list(projects_to_delete.values_list('name', flat=True)[:10])
+        result = delete_projects(list(projects_to_delete.values_list('pk', flat=True)))
+        deleted_count = result['roots_deleted']
+        logger.info(
+            f"Admin {request.user.email} deleted {deleted_count} project(s): {result['total_rows']} rows "
+            f"in {result['elapsed_seconds']}s ({result['rows_per_second']} rows/sec)"
+        )
         
         return standard_success_response({
             'deleted_count': deleted_count,
-            'deleted_projects': project_names[:10],
+            'deleted_projects': project_names,
+            'deleted_rows': result['total_rows'],
+            'elapsed_seconds': result['elapsed_seconds'],
+            'rows_per_second': result['rows_per_second'],
             'message': f'Successfully deleted {deleted_count} projects'
         })
         
@@ -437,3 +503,105 @@ def admin_bulk_delete_projects(request):
     
     except Exception as e:
         return standard_error_response(f'An error occurred: {str(e)}', status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def admin_recalculate_scenarios(request):
+    """
+    Recalculate the stored savings and financial metrics of all scenarios
+    (optionally of one project or of scenarios updated since a date)
+    """
+    if not is_admin_user(request.user):
+        return standard_error_response("Access denied: Admin privileges required", status.HTTP_403_FORBIDDEN)
+    
+    try:
+        data = request.data or {}
+        
+        if data.get('async'):
+            return _enqueue_response('recalculate_scenarios', data, request.user)
+        
+        project = None
+        project_id = data.get('project_id')
+        if project_id:
+            if not validate_uuid(project_id):
+                return standard_error_response('Invalid project ID format', status.HTTP_400_BAD_REQUEST)
+            try:
+                project = Project.objects.get(uuid=project_id)
+            except Project.DoesNotExist:
+                return standard_error_response('Project not found', status.HTTP_404_NOT_FOUND)
+        
+        since = None
+        if data.get('since'):
+            try:
+                since = parse_since(str(data['since']))
+            except ValueError:
+                return standard_error_response('Invalid since date', status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            chunk_size = int(data.get('chunk_size', DEFAULT_CHUNK_SIZE))
+        except (TypeError, ValueError):
+            return standard_error_response('Invalid chunk_size', status.HTTP_400_BAD_REQUEST)
+        if chunk_size < 1:
+            return standard_error_response('Invalid chunk_size', status.HTTP_400_BAD_REQUEST)
+        
+        result = recalculate_scenarios(
+            project=project,
+            since=since,
+            chunk_size=chunk_size,
+            sync_prices=bool(data.get('sync_prices', False)),
+        )
+        logger.info(
+            f"Scenarios recalculated by {request.user.email}: {result['total_rows']} rows "
+            f"in {result['elapsed_seconds']}s"
+        )
+        
+        return standard_success_response(result, message=f"Recalculated {result['total_rows']} scenarios")
+        
+    except Exception as e:
+        logger.error(f"Error recalculating scenarios: {str(e)}")
+        return standard_error_response(f'An error occurred: {str(e)}', status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+PERF_SORT_FIELDS = {'count'} | set(METRICS)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def admin_performance_stats(request):
+    """
+    Per-route request statistics recorded by common.performance (query count,
+    DB / serializer time, response size) as p50/p90/p99/max over the latest
+    samples of every worker. ?sort=<metric> (default duration_ms, by p90),
+    ?limit=N. DELETE resets the samples.
+    """
+    if not is_admin_user(request.user):
+        return standard_error_response("Access denied: Admin privileges required", status.HTTP_403_FORBIDDEN)
+    
+    if request.method == 'DELETE':
+        reset_stats()
+        logger.info(f"Performance statistics reset by {request.user.email}")
+        return standard_success_response({'reset': True})
+    
+    sort_by = request.GET.get('sort', 'duration_ms')
+    if sort_by not in PERF_SORT_FIELDS:
+        return standard_error_response(f"Invalid sort field: {sort_by}", status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = int(request.GET['limit']) if request.GET.get('limit') else None
+    except ValueError:
+        limit = 0
+    if limit is not None and limit < 1:
+        return standard_error_response('Invalid limit', status.HTTP_400_BAD_REQUEST)
+    
+    routes, workers = collect_stats()
+    if sort_by == 'count':
+        routes.sort(key=lambda route: route['count'], reverse=True)
+    else:
+        routes.sort(key=lambda route: route[sort_by]['p90'] or 0, reverse=True)
+    
+    return standard_success_response({
+        'enabled': settings.PERFORMANCE_MONITORING,
+        'workers': workers,
+        'sample_size': settings.PERFORMANCE_SAMPLE_SIZE,
+        'routes': routes[:limit] if limit else routes,
+    })
@@ -3,6 +3,7 @@ from django.db import models
 from django.conf import settings
 from building.models import Building
 from project.models import Project
+from common.finance import IRR_UPPER_BOUND, discounted_payback, internal_rate_of_return, net_present_value
 
 
 class OldAirConditioning(models.Model):
@@ -165,9 +166,13 @@ class AirConditioningAnalysis(models.Model):
         verbose_name_plural = 'Αναλύσεις Κλιματιστικών'
         unique_together = [['building', 'project', 'user']]
 
+    def recalculate(self):
+        """Υπολογισμός κόστους και οικονομικών δεικτών (χωρίς αποθήκευση)"""
+        self.calculate_results()
+
     def save(self, *args, **kwargs):
         """Αυτόματος υπολογισμός αποτελεσμάτων"""
-        self.calculate_results()
+        self.recalculate()
         super().save(*args, **kwargs)
 
     def calculate_results(self):
@@ -210,64 +215,29 @@ class AirConditioningAnalysis(models.Model):
         # Υπολογισμός NPV (υπολογίζεται και για αρνητικές τιμές)
         if self.annual_economic_benefit != 0:
             discount_rate_decimal = self.discount_rate / 100
-            pv_savings = 0
-            
-            # Υπολογισμός Discounted Payback Period
-            cumulative_discounted_cash_flow = 0
-            self.discounted_payback_period = self.lifespan_years + 1  # Default: δεν αποπληρώνεται
             
             if discount_rate_decimal > 0:
                 # NPV = Σ[Annual_Benefit / (1 + r)^t] - Initial_Investment
-                for year in range(1, self.lifespan_years + 1):
-                    discounted_cash_flow = self.annual_economic_benefit / ((1 + discount_rate_decimal) ** year)
-                    cumulative_discounted_cash_flow += discounted_cash_flow
-                    pv_savings += discounted_cash_flow
-                    
-                    # Έλεγχος αν έχει αποπληρωθεί η επένδυση
-                    if cumulative_discounted_cash_flow >= self.total_investment_cost and self.discounted_payback_period > self.lifespan_years:
-                        previous_cumulative = cumulative_discounted_cash_flow - discounted_cash_flow
-                        fraction_of_year = (self.total_investment_cost - previous_cumulative) / discounted_cash_flow
-                        self.discounted_payback_period = (year - 1) + fraction_of_year
+                self.net_present_value = net_present_value(
+                    self.total_investment_cost, self.annual_economic_benefit, discount_rate_decimal, self.lifespan_years
+                )
+                self.discounted_payback_period = discounted_payback(
+                    self.total_investment_cost, self.annual_economic_benefit, discount_rate_decimal, self.lifespan_years
+                )
             else:
                 # Αν δεν υπάρχει προεξοφλητικός συντελεστής
-                pv_savings = self.annual_economic_benefit * self.lifespan_years
-            
-            self.net_present_value = pv_savings - self.total_investment_cost
+                self.net_present_value = self.annual_economic_benefit * self.lifespan_years - self.total_investment_cost
+                self.discounted_payback_period = self.lifespan_years + 1  # δεν αποπληρώνεται
         else:
             self.net_present_value = -self.total_investment_cost
             self.discounted_payback_period = 0
         
-        # Calculate IRR using Newton-Raphson method
+        # IRR με όριο 1000%
         if self.total_investment_cost > 0 and self.annual_economic_benefit > 0 and self.lifespan_years > 0:
-            guess = 0.1  # Initial guess 10%
-            max_iterations = 1000
-            tolerance = 0.00001
-            
-            for i in range(max_iterations):
-                npv_at_guess = -self.total_investment_cost
-                derivative_npv = 0
-                
-                for year in range(1, self.lifespan_years + 1):
-                    discount_factor = (1 + guess) ** year
-                    npv_at_guess += self.annual_economic_benefit / discount_factor
-                    derivative_npv -= (year * self.annual_economic_benefit) / ((1 + guess) ** (year + 1))
-                
-                if abs(npv_at_guess) < tolerance:
-                    self.internal_rate_of_return = guess * 100
-                    break
-                
-                if abs(derivative_npv) > 0.000001:
-                    guess = guess - npv_at_guess / derivative_npv
-                else:
-                    self.internal_rate_of_return = 0
-                    break
-                
-                if guess < -0.99:
-                    guess = -0.99
-                if guess > 10:
-                    guess = 10
-            else:
-                self.internal_rate_of_return = guess * 100 if guess > -0.99 else 0
+            irr = internal_rate_of_return(
+                self.total_investment_cost, self.annual_economic_benefit, self.lifespan_years, upper=IRR_UPPER_BOUND
+            )
+            self.internal_rate_of_return = irr * 100
         else:
             self.internal_rate_of_return = 0
 
@@ -51,3 +51,25 @@ class AirConditioningAnalysisCreateSerializer(serializers.ModelSerializer):
                   'energy_savings_kwh', 'total_investment_cost', 'annual_energy_savings',
                   'annual_economic_benefit', 'payback_period', 'discounted_payback_period', 'net_present_value', 
                   'internal_rate_of_return', 'created_at', 'updated_at')
+
+
+class OldAirConditioningBulkSerializer(serializers.ModelSerializer):
+    """Μία γραμμή μαζικής δημιουργίας· building / project ως UUID, επιλύονται μαζικά."""
+    building = serializers.UUIDField()
+    project = serializers.UUIDField()
+
+    class Meta:
+        model = OldAirConditioning
+        exclude = ('id', 'user', 'heating_consumption_kwh', 'cooling_consumption_kwh',
+                   'total_consumption_kwh', 'created_at', 'updated_at')
+
+
+class NewAirConditioningBulkSerializer(serializers.ModelSerializer):
+    """Μία γραμμή μαζικής δημιουργίας· building / project ως UUID, επιλύονται μαζικά."""
+    building = serializers.UUIDField()
+    project = serializers.UUIDField()
+
+    class Meta:
+        model = NewAirConditioning
+        exclude = ('id', 'user', 'heating_consumption_kwh', 'cooling_consumption_kwh',
+                   'total_consumption_kwh', 'total_cost', 'created_at', 'updated_at')
@@ -7,12 +7,14 @@ urlpatterns = [
     
     # Old Air Conditioning URLs
     path('old/create/', views.create_old_air_conditioning, name='create_old_air_conditioning'),
+    path('old/bulk-create/', views.bulk_create_old_air_conditionings, name='bulk_create_old_air_conditionings'),
     path('old/building/<uuid:building_uuid>/', views.get_old_air_conditionings_by_building, name='get_old_air_conditionings_by_building'),
     path('old/update/<uuid:ac_uuid>/', views.update_old_air_conditioning, name='update_old_air_conditioning'),
     path('old/delete/<uuid:ac_uuid>/', views.delete_old_air_conditioning, name='delete_old_air_conditioning'),
     
     # New Air Conditioning URLs
     path('new/create/', views.create_new_air_conditioning, name='create_new_air_conditioning'),
+    path('new/bulk-create/', views.bulk_create_new_air_conditionings, name='bulk_create_new_air_conditionings'),
     path('new/building/<uuid:building_uuid>/', views.get_new_air_conditionings_by_building, name='get_new_air_conditionings_by_building'),
     path('new/update/<uuid:ac_uuid>/', views.update_new_air_conditioning, name='update_new_air_conditioning'),
     path('new/delete/<uuid:ac_uuid>/', views.delete_new_air_conditioning, name='delete_new_air_conditioning'),
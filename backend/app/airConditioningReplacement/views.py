@@ -9,15 +9,49 @@ import logging
 from .models import OldAirConditioning, NewAirConditioning, AirConditioningAnalysis
 from .serializer import (
     OldAirConditioningSerializer, NewAirConditioningSerializer, AirConditioningAnalysisSerializer,
-    OldAirConditioningCreateSerializer, NewAirConditioningCreateSerializer, AirConditioningAnalysisCreateSerializer
+    OldAirConditioningCreateSerializer, NewAirConditioningCreateSerializer, AirConditioningAnalysisCreateSerializer,
+    OldAirConditioningBulkSerializer, NewAirConditioningBulkSerializer
 )
 from building.models import Building
 from project.models import Project
+from common.bulk import BulkError, bulk_create_rows, read_items
 from common.utils import is_admin_user, has_access_permission
 
 logger = logging.getLogger(__name__)
 
 
+def _bulk_create_air_conditionings(request, bulk_serializer_class, serializer_class, prepare, message):
+    """Κοινό σώμα των bulk create για παλαιά / νέα κλιματιστικά."""
+    items, error = read_items(request)
+    if error:
+        return Response({
+            'success': False,
+            'message': error
+        }, status=status.HTTP_400_BAD_REQUEST)
+    serializer = bulk_serializer_class(data=items, many=True)
+    if not serializer.is_valid():
+        return Response({
+            'success': False,
+            'message': 'Σφάλμα στα δεδομένα',
+            'errors': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        instances = bulk_create_rows(
+            request.user, bulk_serializer_class.Meta.model, serializer.validated_data, prepare=prepare
+        )
+    except BulkError as e:
+        return Response({
+            'success': False,
+            'message': 'Σφάλμα στα δεδομένα',
+            'errors': e.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return Response({
+        'success': True,
+        'message': message.format(count=len(instances)),
+        'data': serializer_class(instances, many=True).data
+    }, status=status.HTTP_201_CREATED)
+
+
 # Old Air Conditioning Views
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -45,6 +79,17 @@ def create_old_air_conditioning(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_create_old_air_conditionings(request):
+    """Μαζική δημιουργία παλαιών κλιματιστικών: {"items": [...]}, σφάλματα ανά γραμμή"""
+    return _bulk_create_air_conditionings(
+        request, OldAirConditioningBulkSerializer, OldAirConditioningSerializer,
+        OldAirConditioning.calculate_consumption,
+        'Προστέθηκαν {count} παλαιά κλιματιστικά'
+    )
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_old_air_conditionings_by_building(request, building_uuid):
@@ -168,6 +213,22 @@ def create_new_air_conditioning(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _prepare_new_air_conditioning(new_ac):
+    new_ac.calculate_consumption()
+    new_ac.calculate_cost()
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_create_new_air_conditionings(request):
+    """Μαζική δημιουργία νέων κλιματιστικών: {"items": [...]}, σφάλματα ανά γραμμή"""
+    return _bulk_create_air_conditionings(
+        request, NewAirConditioningBulkSerializer, NewAirConditioningSerializer,
+        _prepare_new_air_conditioning,
+        'Προστέθηκαν {count} νέα κλιματιστικά'
+    )
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_new_air_conditionings_by_building(request, building_uuid):
@@ -3,6 +3,7 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from building.models import Building
 from project.models import Project
+from common.finance import IRR_UPPER_BOUND, discounted_payback, internal_rate_of_return, net_present_value
 
 
 class AutomaticLightingControl(models.Model):
@@ -227,80 +228,23 @@ class AutomaticLightingControl(models.Model):
             
             # Discounted Payback Period calculation
             if annual_benefit > 0 and discount_rate_decimal > 0:
-                cumulative_discounted_cash_flow = 0
-                self.discounted_payback_period = years + 1  # Default: δεν αποπληρώνεται
-                
-                for year in range(1, years + 1):
-                    discounted_cash_flow = annual_benefit / ((1 + discount_rate_decimal) ** year)
-                    cumulative_discounted_cash_flow += discounted_cash_flow
-                    
-                    if cumulative_discounted_cash_flow >= float(self.total_investment_cost) and self.discounted_payback_period > years:
-                        # Linear interpolation for precise payback period
-                        previous = cumulative_discounted_cash_flow - discounted_cash_flow
-                        fraction = (float(self.total_investment_cost) - previous) / discounted_cash_flow
-                        self.discounted_payback_period = (year - 1) + fraction
+                self.discounted_payback_period = discounted_payback(
+                    float(self.total_investment_cost), annual_benefit, discount_rate_decimal, years
+                )
             else:
                 self.discounted_payback_period = 0
             
-            if discount_rate_decimal > 0:
-                # NPV = Σ[Annual_Benefit / (1 + r)^t] - Initial_Investment
-                npv_sum = 0
-                for year in range(1, years + 1):
-                    npv_sum += annual_benefit / ((1 + discount_rate_decimal) ** year)
-                self.net_present_value = npv_sum - float(self.total_investment_cost)
-            else:
-                # Αν δεν υπάρχει επιτόκιο αναγωγής
-                self.net_present_value = (annual_benefit * years) - float(self.total_investment_cost)
+            # NPV = Σ[Annual_Benefit / (1 + r)^t] - Initial_Investment
+            # (χωρίς επιτόκιο αναγωγής: Annual_Benefit * years - Initial_Investment)
+            self.net_present_value = net_present_value(
+                float(self.total_investment_cost), annual_benefit, max(discount_rate_decimal, 0), years
+            )
             
-            # IRR υπολογισμός με Newton-Raphson
-            # IRR είναι το επιτόκιο όπου NPV = 0
-            # NPV = -Initial_Investment + Σ[(Annual_Savings - Maintenance_Cost) / (1 + IRR)^t] = 0
-            if float(self.total_investment_cost) > 0 and annual_benefit > 0:
-                initial_investment = float(self.total_investment_cost)
-                
-                # Αρχική εκτίμηση IRR (απλή προσέγγιση)
-                simple_roi = annual_benefit / initial_investment
-                irr = simple_roi if simple_roi < 1 else 0.1
-                
-                tolerance = 0.00001
-                max_iterations = 1000
-                
-                for iteration in range(max_iterations):
-                    # Υπολογισμός NPV και της παραγώγου του ως προς IRR
-                    npv = -initial_investment
-                    npv_derivative = 0
-                    
-                    for year in range(1, years + 1):
-                        discount_factor = (1 + irr) ** year
-                        # Cash flow για κάθε έτος (καθαρό όφελος)
-                        cash_flow = annual_benefit
-                        npv += cash_flow / discount_factor
-                        # Παράγωγος του NPV ως προς IRR
-                        npv_derivative -= year * cash_flow / (discount_factor * (1 + irr))
-                    
-                    # Έλεγχος σύγκλισης
-                    if abs(npv) < tolerance:
-                        break
-                    
-                    # Newton-Raphson update: IRR_new = IRR_old - f(IRR)/f'(IRR)
-                    if abs(npv_derivative) > 1e-10:
-                        irr_new = irr - npv / npv_derivative
-                        
-                        # Περιορισμός του IRR σε λογικά όρια (-99% έως 1000%)
-                        irr_new = max(-0.99, min(irr_new, 10.0))
-                        
-                        # Έλεγχος για ταλάντωση
-                        if abs(irr_new - irr) < tolerance:
-                            irr = irr_new
-                            break
-                        
-                        irr = irr_new
-                    else:
-                        break
-                
-                self.internal_rate_of_return = irr * 100
-            else:
-                self.internal_rate_of_return = 0
+            # IRR είναι το επιτόκιο όπου NPV = 0, περιορισμένο σε -99% έως 1000%
+            irr = internal_rate_of_return(
+                float(self.total_investment_cost), annual_benefit, years, upper=IRR_UPPER_BOUND
+            )
+            self.internal_rate_of_return = irr * 100 if irr is not None else 0
                 
         except (ValueError, TypeError, ZeroDivisionError):
             # Σε περίπτωση σφάλματος, μηδενίζουμε τα υπολογιζόμενα πεδία
@@ -312,6 +256,10 @@ class AutomaticLightingControl(models.Model):
             self.net_present_value = 0
             self.internal_rate_of_return = 0
 
-    def save(self, *args, **kwargs):
+    def recalculate(self):
+        """Υπολογισμός κόστους και οικονομικών δεικτών (χωρίς αποθήκευση)"""
         self._calculate_economics()
+
+    def save(self, *args, **kwargs):
+        self.recalculate()
         super().save(*args, **kwargs)
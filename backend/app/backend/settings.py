@@ -13,6 +13,8 @@ import os
 from pathlib import Path
 import secrets
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -73,9 +75,15 @@ INSTALLED_APPS = [
     "boilerReplacement",
     "buildingImages",
     "numericValues",
+    "referenceData",
+    "backgroundJobs",
+    "adminStats",
+    "benchmarks",
 ]
 
 MIDDLEWARE = [
+    'common.performance.PerformanceMiddleware',
+    'common.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -107,6 +115,21 @@ TEMPLATES = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "mediafiles"
 
+# Προσωρινά αρχεία των τμηματικών (chunked) uploads εικόνων - εκτός MEDIA_ROOT
+BUILDING_IMAGE_UPLOAD_DIR = os.environ.get("BUILDING_IMAGE_UPLOAD_DIR", BASE_DIR / "upload_chunks")
+
+# Αποθήκευση των εικόνων κτιρίων: "database" (BLOB στη βάση), "filesystem" ή "s3".
+# Οι υπάρχουσες εικόνες μεταφέρονται με: python manage.py move_building_images
+BUILDING_IMAGE_STORAGE = os.environ.get("BUILDING_IMAGE_STORAGE", "database")
+BUILDING_IMAGE_STORAGE_ROOT = os.environ.get("BUILDING_IMAGE_STORAGE_ROOT", BASE_DIR / "image_storage")
+# S3-compatible backend (απαιτεί boto3). Το endpoint επιτρέπει MinIO / τοπικό stand-in.
+BUILDING_IMAGE_S3_BUCKET = os.environ.get("BUILDING_IMAGE_S3_BUCKET", "")
+BUILDING_IMAGE_S3_PREFIX = os.environ.get("BUILDING_IMAGE_S3_PREFIX", "building-images/")
+BUILDING_IMAGE_S3_ENDPOINT_URL = os.environ.get("BUILDING_IMAGE_S3_ENDPOINT_URL", "")
+BUILDING_IMAGE_S3_REGION = os.environ.get("BUILDING_IMAGE_S3_REGION", "")
+BUILDING_IMAGE_S3_ACCESS_KEY = os.environ.get("BUILDING_IMAGE_S3_ACCESS_KEY", "")
+BUILDING_IMAGE_S3_SECRET_KEY = os.environ.get("BUILDING_IMAGE_S3_SECRET_KEY", "")
+
 # CSRF Trusted Origins - Dynamic configuration from environment variable
 # Set CSRF_TRUSTED_ORIGINS in .env with comma-separated origins (including protocol)
 # Example: CSRF_TRUSTED_ORIGINS=http://localhost:3000,https://energymanagement.epu.ntua.gr
@@ -133,9 +156,80 @@ DATABASES = {
         "PASSWORD": os.environ.get("SQL_PASSWORD", "password"),
         "HOST": os.environ.get("SQL_HOST", "localhost"),
         "PORT": os.environ.get("SQL_PORT", "5432"),
+        # Δευτερόλεπτα που μια σύνδεση ξαναχρησιμοποιείται από τα επόμενα requests
+        # του ίδιου worker/thread (0 = νέα σύνδεση σε κάθε request, None = χωρίς όριο)
+        "CONN_MAX_AGE": None if os.environ.get("SQL_CONN_MAX_AGE") == "None" else int(
+            os.environ.get("SQL_CONN_MAX_AGE", "60")
+        ),
+        # Έλεγχος ότι η μόνιμη σύνδεση ζει ακόμα πριν ξαναχρησιμοποιηθεί σε νέο request
+        "CONN_HEALTH_CHECKS": os.environ.get("SQL_CONN_HEALTH_CHECKS", "True") == "True",
+        "OPTIONS": {},
+    }
+}
+
+if "postgresql" in DATABASES["default"]["ENGINE"]:
+    DATABASES["default"]["OPTIONS"]["connect_timeout"] = int(os.environ.get("SQL_CONNECT_TIMEOUT", "10"))
+
+# SQL_POOL_MODE=pgbouncer: οι συνδέσεις περνούν από pgbouncer (SQL_HOST/SQL_PORT
+# δείχνουν στον pgbouncer). Σε transaction pooling διαδοχικές συναλλαγές μπορεί να
+# πάνε σε διαφορετική σύνδεση της βάσης, οπότε απενεργοποιούνται οι server-side
+# cursors (.iterator()) που ζουν πέρα από μία συναλλαγή.
+SQL_POOL_MODE = os.environ.get("SQL_POOL_MODE", "")
+if SQL_POOL_MODE == "pgbouncer":
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+elif SQL_POOL_MODE:
+    raise ImproperlyConfigured(f"Unknown SQL_POOL_MODE '{SQL_POOL_MODE}' (expected 'pgbouncer')")
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Οι εκδόσεις των numericValues / referenceData ζουν εδώ, οπότε το backend πρέπει
+# να είναι κοινό για όλους τους gunicorn workers και τον run_jobs: προεπιλογή ο
+# πίνακας της βάσης (python manage.py createcachetable, στο entrypoint), ή Redis /
+# memcached με CACHE_BACKEND / CACHE_LOCATION. Το LocMemCache είναι ανά process.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "bemat_cache"),
     }
 }
 
+# Διάρκεια (δευτερόλεπτα) των cached στατιστικών του admin dashboard (?fresh=1 για παράκαμψη)
+ADMIN_STATS_CACHE_TTL = int(os.environ.get("ADMIN_STATS_CACHE_TTL", "60"))
+
+# max-age (δευτερόλεπτα) του /api/reference/?v=<έκδοση>· το URL αλλάζει με κάθε νέα έκδοση
+REFERENCE_DATA_MAX_AGE = int(os.environ.get("REFERENCE_DATA_MAX_AGE", str(365 * 24 * 60 * 60)))
+
+# Ουρά εργασιών παρασκηνίου (backgroundJobs), εκτελείται με: python manage.py run_jobs
+# Προσπάθειες ανά εργασία· η n-οστή επανάληψη περιμένει JOB_RETRY_DELAY * 2^(n-1) δευτερόλεπτα
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY = int(os.environ.get("JOB_RETRY_DELAY", "30"))
+# Αναμονή (δευτερόλεπτα) του worker όταν η ουρά είναι άδεια
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "2"))
+# Εργασία σε εκτέλεση χωρίς heartbeat για τόσα δευτερόλεπτα θεωρείται χαμένη
+JOB_STALE_AFTER = int(os.environ.get("JOB_STALE_AFTER", "600"))
+# Κάθε πόσα δευτερόλεπτα ο worker ανανεώνει το heartbeat της εργασίας που εκτελεί (< JOB_STALE_AFTER)
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get("JOB_HEARTBEAT_INTERVAL", "30"))
+# Οι ολοκληρωμένες εργασίες και τα αρχεία τους διαγράφονται μετά από τόσες ημέρες
+JOB_RETENTION_DAYS = int(os.environ.get("JOB_RETENTION_DAYS", "7"))
+
+# Καταγραφή ερωτημάτων / χρόνων ανά request (common.performance), header
+# Server-Timing και αναφορά στο /api/admin-api/perf/. Απενεργοποιημένη από προεπιλογή.
+PERFORMANCE_MONITORING = os.environ.get("PERFORMANCE_MONITORING", "False") == "True"
+# Δείγματα που κρατιούνται ανά route σε κάθε worker
+PERFORMANCE_SAMPLE_SIZE = int(os.environ.get("PERFORMANCE_SAMPLE_SIZE", "500"))
+# Κάθε πόσα δευτερόλεπτα κάθε worker γράφει τα δείγματά του στο cache
+PERFORMANCE_FLUSH_INTERVAL = int(os.environ.get("PERFORMANCE_FLUSH_INTERVAL", "10"))
+
+# Μετρικές Prometheus (common.metrics) στο /metrics. Με πολλούς gunicorn workers
+# ορίζεται και το PROMETHEUS_MULTIPROC_DIR (βλ. gunicorn.conf.py).
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "False") == "True"
+# Διευθύνσεις που επιτρέπεται να διαβάσουν το /metrics (χωρισμένες με κόμμα)
+METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",") if ip.strip()
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -3,6 +3,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 import admin_views
+from common.metrics import metrics_view
 
 urlpatterns = [
     path("api/admin/", admin.site.urls),
@@ -21,6 +22,8 @@ urlpatterns = [
     path('api/materials/', include('materials.urls')),
     path('api/prefectures/', include('prefectures.urls')),
     path('api/numeric_values/', include('numericValues.urls')),
+    path('api/reference/', include('referenceData.urls')),
+    path('api/jobs/', include('backgroundJobs.urls')),
     path('api/thermal_insulations/', include('thermalInsulation.urls')),
     path('api/roof_thermal_insulations/', include('roofThermalInsulation.urls')),
     path('api/photovoltaic_systems/', include('photovoltaicSystem.urls')),
@@ -44,6 +47,11 @@ urlpatterns = [
     path('api/admin-api/projects-table/', admin_views.admin_projects_table, name='admin_projects_table'),
     path('api/admin-api/users/bulk-delete/', admin_views.admin_bulk_delete_users, name='admin_bulk_delete_users'),
     path('api/admin-api/projects/bulk-delete/', admin_views.admin_bulk_delete_projects, name='admin_bulk_delete_projects'),
+    path('api/admin-api/recalculate-scenarios/', admin_views.admin_recalculate_scenarios, name='admin_recalculate_scenarios'),
+    path('api/admin-api/perf/', admin_views.admin_performance_stats, name='admin_performance_stats'),
+
+    # Prometheus scrape endpoint
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Serve media files during development
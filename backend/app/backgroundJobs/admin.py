@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'status', 'progress', 'attempts', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'kind', 'created_at']
+    search_fields = ['uuid', 'kind', 'created_by__email']
+    exclude = ['result_data']
+    readonly_fields = [
+        'uuid', 'kind', 'params', 'progress', 'message', 'result', 'result_name', 'result_type',
+        'result_size', 'error', 'attempts', 'worker', 'heartbeat_at', 'created_by', 'created_at',
+        'started_at', 'finished_at', 'updated_at',
+    ]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('result_data')
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class BackgroundJobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'backgroundJobs'
+    verbose_name = 'Εργασίες Παρασκηνίου'
+
+    def ready(self):
+        """
+        Καταχωρεί τα είδη εργασιών (backgroundJobs.tasks)
+        """
+        import backgroundJobs.tasks
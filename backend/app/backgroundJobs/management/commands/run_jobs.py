@@ -0,0 +1,77 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from backgroundJobs.queue import claim_next, purge_finished, requeue_stale, run_job, worker_name
+
+# Κάθε πόσα δευτερόλεπτα ελέγχονται οι εργασίες χωρίς heartbeat και οι παλιές εργασίες
+MAINTENANCE_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the background job worker: claim queued jobs (exports, scenario recalculation, bulk '
+        'deletes) from the database and execute them outside the request cycle. Several workers '
+        'may run at once. Stops after the current job on SIGINT / SIGTERM.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty instead of polling')
+        parser.add_argument('--max-jobs', type=int, default=0, help='Exit after this many jobs (default: no limit)')
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help=f'Seconds to wait when the queue is empty (default: {settings.JOB_POLL_INTERVAL})'
+        )
+        parser.add_argument('--worker-id', help='Name recorded on claimed jobs (default: host:pid)')
+
+    def handle(self, *args, **options):
+        if options['max_jobs'] < 0 or options['poll_interval'] <= 0:
+            raise CommandError('--max-jobs must be >= 0 and --poll-interval positive')
+
+        worker = options['worker_id'] or worker_name()
+        self._stopping = False
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self._stop)
+
+        self.stdout.write(f"Worker {worker} started")
+        processed = 0
+        last_maintenance = None
+        while not self._stopping:
+            close_old_connections()
+            if last_maintenance is None or time.monotonic() - last_maintenance >= MAINTENANCE_INTERVAL:
+                requeue_stale()
+                purged = purge_finished()
+                if purged:
+                    self.stdout.write(f"Purged {purged} finished jobs")
+                last_maintenance = time.monotonic()
+
+            job = claim_next(worker)
+            if job is None:
+                if options['once']:
+                    break
+                self._sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f"Job {job.uuid} ({job.kind}), attempt {job.attempts}/{job.max_attempts}")
+            started = time.monotonic()
+            outcome = run_job(job, worker)
+            self.stdout.write(f"  {outcome} in {time.monotonic() - started:.1f}s")
+            processed += 1
+            if options['max_jobs'] and processed >= options['max_jobs']:
+                break
+
+        close_old_connections()
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker} stopped after {processed} jobs"))
+
+    def _stop(self, signum, frame):
+        self._stopping = True
+
+    def _sleep(self, seconds):
+        deadline = time.monotonic() + seconds
+        while not self._stopping and time.monotonic() < deadline:
+            time.sleep(max(0, min(0.5, deadline - time.monotonic())))
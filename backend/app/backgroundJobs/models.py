@@ -0,0 +1,80 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    Εργασία που εκτελείται εκτός του request από τον worker (run_jobs):
+    επαναϋπολογισμοί, εξαγωγές, μαζικές διαγραφές. Το είδος (`kind`) επιλέγει
+    τον handler του backgroundJobs.tasks και το `params` τα ορίσματά του. Το
+    αποτέλεσμα είναι JSON (`result`) και προαιρετικά ένα αρχείο (`result_data`).
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Σε αναμονή'),
+        (STATUS_RUNNING, 'Σε εκτέλεση'),
+        (STATUS_SUCCEEDED, 'Ολοκληρώθηκε'),
+        (STATUS_FAILED, 'Απέτυχε'),
+        (STATUS_CANCELLED, 'Ακυρώθηκε'),
+    ]
+    FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED, STATUS_CANCELLED)
+
+    uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=64)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+
+    # Πρόοδος 0-100 και σύντομη περιγραφή του τρέχοντος βήματος
+    progress = models.PositiveSmallIntegerField(default=0)
+    message = models.CharField(max_length=255, blank=True, default='')
+
+    result = models.JSONField(null=True, blank=True)
+    # Αρχείο αποτελέσματος (π.χ. εξαγωγή) στη βάση, όπως οι εικόνες κτιρίων,
+    # ώστε web και worker να μη χρειάζονται κοινό δίσκο
+    result_data = models.BinaryField(blank=True, default=b'')
+    result_name = models.CharField(max_length=255, blank=True, default='')
+    result_type = models.CharField(max_length=100, blank=True, default='')
+    result_size = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    # Δεν εκτελείται πριν από αυτή τη στιγμή (καθυστέρηση μετά από αποτυχία)
+    run_after = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True, default='')
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Εργασία"
+        verbose_name_plural = "Εργασίες"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_queue_idx'),
+            models.Index(fields=['created_by', '-created_at'], name='job_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} ({self.status}, {self.progress}%)"
+
+    @property
+    def is_finished(self):
+        return self.status in self.FINISHED_STATUSES
@@ -0,0 +1,331 @@
+"""
+Ουρά εργασιών στη βάση, χωρίς Redis ή άλλον broker.
+
+Το API δημιουργεί μια εγγραφή Job (enqueue) και απαντά αμέσως με 202. Ο worker
+(python manage.py run_jobs) τη διεκδικεί με ένα conditional UPDATE
+(pending → running), που πετυχαίνει μόνο για έναν worker ακόμα κι αν τρέχουν
+πολλοί, εκτελεί τον handler του είδους της και γράφει αποτέλεσμα ή σφάλμα. Μια
+αποτυχία ξαναδοκιμάζεται με εκθετική καθυστέρηση έως max_attempts. Όσο τρέχει
+μια εργασία, ένα thread του worker ανανεώνει το heartbeat της· εργασίες που
+έμειναν σε running χωρίς heartbeat (ο worker σταμάτησε) επιστρέφουν στην ουρά.
+Η ακύρωση είναι συνεργατική: ο handler σταματά στην επόμενη αναφορά προόδου.
+"""
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Ελάχιστο διάστημα (δευτερόλεπτα) ανάμεσα σε δύο εγγραφές προόδου στη βάση
+PROGRESS_INTERVAL = 1.0
+# Αρχεία αποτελέσματος έως αυτό το μέγεθος μένουν στη μνήμη, τα μεγαλύτερα σε προσωρινό αρχείο
+RESULT_SPOOL_SIZE = 1024 * 1024
+
+_tasks = {}
+
+
+class JobError(Exception):
+    """Άκυρες παράμετροι ή δικαιώματα κατά το enqueue (απάντηση 400 / 403)."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class PermanentJobError(Exception):
+    """Αποτυχία που δεν διορθώνεται με νέα προσπάθεια (π.χ. το έργο διαγράφηκε)."""
+
+
+class JobCancelled(Exception):
+    """Η εργασία ακυρώθηκε ή πέρασε σε άλλον worker ενώ εκτελούνταν."""
+
+
+class Task:
+    def __init__(self, kind, run, validate, public):
+        self.kind = kind
+        self.run = run
+        self.validate = validate
+        self.public = public
+
+
+def register(kind, validate=None, public=True):
+    """
+    Decorator που καταχωρεί τον handler `run(params, context)` ενός είδους
+    εργασίας. Το `validate(params, user)` επιστρέφει τις καθαρές παραμέτρους ή
+    προκαλεί JobError. Τα μη `public` είδη δημιουργούνται μόνο από τον κώδικα
+    (π.χ. μετά τους ελέγχους ενός admin view) και όχι από το POST /api/jobs/.
+    """
+    def decorator(run):
+        _tasks[kind] = Task(kind, run, validate, public)
+        return run
+    return decorator
+
+
+def get_task(kind):
+    return _tasks.get(kind)
+
+
+def public_kinds():
+    return sorted(kind for kind, task in _tasks.items() if task.public)
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(kind, params=None, user=None):
+    """Ελέγχει τις παραμέτρους και δημιουργεί την εργασία. JobError αν είναι άκυρες."""
+    task = get_task(kind)
+    if task is None:
+        raise JobError(f"Unknown job kind: {kind}")
+    params = params or {}
+    if not isinstance(params, dict):
+        raise JobError("params must be an object")
+    if task.validate:
+        params = task.validate(params, user)
+    job = Job.objects.create(
+        kind=kind,
+        params=params,
+        created_by=user if user is not None and user.is_authenticated else None,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+    )
+    logger.info(f"Job {job.uuid} ({kind}) enqueued")
+    return job
+
+
+class Heartbeat(threading.Thread):
+    """
+    Ανανεώνει το heartbeat_at της εργασίας κάθε `interval` δευτερόλεπτα, σε
+    δικό του thread και δική του σύνδεση στη βάση, ώστε ένα μεγάλο βήμα χωρίς
+    αναφορά προόδου (π.χ. ένα αργό ερώτημα) να μη θεωρηθεί σταματημένος
+    worker από το requeue_stale. Αν η εργασία ακυρωθεί ή περάσει σε άλλον
+    worker σταματά και σημειώνει `lost`, οπότε το επόμενο progress() διακόπτει
+    τον handler.
+    """
+
+    def __init__(self, job, worker, interval):
+        super().__init__(name=f"job-heartbeat-{job.pk}", daemon=True)
+        self.job = job
+        self.worker = worker
+        self.interval = interval
+        self.lost = False
+        self._stopped = threading.Event()
+
+    def beat(self):
+        """Μία ανανέωση· False αν η εργασία δεν εκτελείται πια από αυτόν τον worker."""
+        updated = Job.objects.filter(
+            pk=self.job.pk, status=Job.STATUS_RUNNING, worker=self.worker,
+        ).update(heartbeat_at=timezone.now())
+        if not updated:
+            self.lost = True
+        return bool(updated)
+
+    def run(self):
+        try:
+            while not self._stopped.wait(self.interval):
+                try:
+                    if not self.beat():
+                        break
+                except Exception as e:
+                    # Π.χ. η βάση δεν απαντά προσωρινά· ξαναδοκιμάζει στο επόμενο διάστημα
+                    logger.warning(f"Heartbeat of job {self.job.pk} failed: {e}")
+        finally:
+            connection.close()
+
+    def stop(self):
+        self._stopped.set()
+        if self.is_alive():
+            self.join()
+
+
+class JobContext:
+    """Δίνεται στον handler για αναφορά προόδου και αποθήκευση αρχείου αποτελέσματος."""
+
+    def __init__(self, job, worker, heartbeat=None):
+        self.job = job
+        self.worker = worker
+        self.heartbeat = heartbeat
+        self.file = None
+        self._last_write = 0.0
+
+    def _running(self):
+        return Job.objects.filter(pk=self.job.pk, status=Job.STATUS_RUNNING, worker=self.worker)
+
+    def progress(self, percent, message=''):
+        """
+        Πρόοδος 0-100. Γράφεται το πολύ μία φορά ανά PROGRESS_INTERVAL και
+        ανανεώνει και το heartbeat. JobCancelled αν η εργασία ακυρώθηκε.
+        """
+        if self.heartbeat is not None and self.heartbeat.lost:
+            raise JobCancelled()
+        percent = max(0, min(100, int(percent)))
+        now = time.monotonic()
+        if now - self._last_write < PROGRESS_INTERVAL:
+            return
+        self._last_write = now
+        stamp = timezone.now()
+        updated = self._running().update(
+            progress=percent, message=message[:255], heartbeat_at=stamp, updated_at=stamp,
+        )
+        if not updated:
+            raise JobCancelled()
+        self.job.progress = percent
+
+    def save_file(self, chunks, name, content_type):
+        """
+        Γράφει τα κομμάτια (str ή bytes) σε προσωρινό αρχείο (στη μνήμη έως
+        RESULT_SPOOL_SIZE) που αποθηκεύεται ως αρχείο αποτελέσματος όταν η
+        εργασία ολοκληρωθεί.
+        """
+        self.close()
+        spool = tempfile.SpooledTemporaryFile(max_size=RESULT_SPOOL_SIZE)
+        try:
+            for chunk in chunks:
+                spool.write(chunk.encode() if isinstance(chunk, str) else chunk)
+        except BaseException:
+            spool.close()
+            raise
+        self.file = (spool, name, content_type)
+
+    def read_file(self):
+        """Τα bytes του αρχείου αποτελέσματος (None αν δεν υπάρχει)."""
+        if self.file is None:
+            return None
+        spool = self.file[0]
+        spool.seek(0)
+        return spool.read()
+
+    def close(self):
+        if self.file is not None:
+            self.file[0].close()
+            self.file = None
+
+
+def claim_next(worker):
+    """Διεκδικεί την παλαιότερη εργασία σε αναμονή (ή None)."""
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(status=Job.STATUS_PENDING, run_after__lte=now)
+        .order_by('run_after', 'created_at')
+        .values_list('pk', flat=True)[:10]
+    )
+    for pk in candidates:
+        # Το UPDATE πετυχαίνει μόνο αν η εργασία είναι ακόμα pending
+        claimed = Job.objects.filter(pk=pk, status=Job.STATUS_PENDING).update(
+            status=Job.STATUS_RUNNING,
+            worker=worker,
+            attempts=F('attempts') + 1,
+            started_at=now,
+            heartbeat_at=now,
+            updated_at=now,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=settings.JOB_RETRY_DELAY * 2 ** max(attempts - 1, 0))
+
+
+def run_job(job, worker):
+    """Εκτελεί μια εργασία που διεκδίκησε ο `worker` και αποθηκεύει την έκβασή της."""
+    heartbeat = Heartbeat(job, worker, settings.JOB_HEARTBEAT_INTERVAL)
+    context = JobContext(job, worker, heartbeat)
+    heartbeat.start()
+    try:
+        return _execute(job, context)
+    finally:
+        heartbeat.stop()
+        context.close()
+
+
+def _execute(job, context):
+    task = get_task(job.kind)
+    started = time.monotonic()
+    try:
+        if task is None:
+            raise PermanentJobError(f"Unknown job kind: {job.kind}")
+        result = task.run(job.params, context)
+    except JobCancelled:
+        logger.info(f"Job {job.uuid} ({job.kind}) stopped: cancelled or reassigned")
+        return Job.STATUS_CANCELLED
+    except Exception as e:
+        now = timezone.now()
+        error = f"{type(e).__name__}: {e}"
+        if not isinstance(e, PermanentJobError) and job.attempts < job.max_attempts:
+            delay = _retry_delay(job.attempts)
+            logger.warning(
+                f"Job {job.uuid} ({job.kind}) failed (attempt {job.attempts}/{job.max_attempts}), "
+                f"retrying in {delay.total_seconds():.0f}s: {error}"
+            )
+            context._running().update(
+                status=Job.STATUS_PENDING, worker='', error=error, run_after=now + delay, updated_at=now,
+            )
+            return Job.STATUS_PENDING
+        logger.error(f"Job {job.uuid} ({job.kind}) failed: {error}")
+        context._running().update(status=Job.STATUS_FAILED, error=error, finished_at=now, updated_at=now)
+        return Job.STATUS_FAILED
+
+    now = timezone.now()
+    fields = {}
+    if context.file is not None:
+        _, name, content_type = context.file
+        data = context.read_file()
+        fields = {'result_data': data, 'result_name': name, 'result_type': content_type, 'result_size': len(data)}
+    updated = context._running().update(
+        status=Job.STATUS_SUCCEEDED, progress=100, message='', error='', result=result,
+        finished_at=now, updated_at=now, **fields,
+    )
+    if not updated:
+        return Job.STATUS_CANCELLED
+    logger.info(f"Job {job.uuid} ({job.kind}) succeeded in {time.monotonic() - started:.1f}s")
+    return Job.STATUS_SUCCEEDED
+
+
+def requeue_stale(stale_after=None):
+    """
+    Εργασίες σε running χωρίς heartbeat για `stale_after` δευτερόλεπτα: ξανά
+    σε αναμονή αν έχουν προσπάθειες, αλλιώς αποτυχημένες. Επιστρέφει το πλήθος.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.STATUS_RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=stale_after or settings.JOB_STALE_AFTER),
+    )
+    requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+        status=Job.STATUS_PENDING, worker='', error='Worker stopped responding', run_after=now, updated_at=now,
+    )
+    failed = stale.update(
+        status=Job.STATUS_FAILED, error='Worker stopped responding', finished_at=now, updated_at=now,
+    )
+    if requeued or failed:
+        logger.warning(f"Stale jobs: {requeued} requeued, {failed} failed")
+    return requeued + failed
+
+
+def cancel(job):
+    """Ακυρώνει εργασία σε αναμονή ή σε εκτέλεση. False αν έχει ήδη τελειώσει."""
+    now = timezone.now()
+    return bool(
+        Job.objects.filter(pk=job.pk, status__in=[Job.STATUS_PENDING, Job.STATUS_RUNNING])
+        .update(status=Job.STATUS_CANCELLED, finished_at=now, updated_at=now)
+    )
+
+
+def purge_finished(days=None):
+    """Διαγράφει τις εργασίες (και τα αρχεία τους) που τελείωσαν πριν από `days` ημέρες."""
+    cutoff = timezone.now() - timedelta(days=settings.JOB_RETENTION_DAYS if days is None else days)
+    deleted, _ = Job.objects.filter(status__in=Job.FINISHED_STATUSES, finished_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,26 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """
+    Κατάσταση μιας εργασίας για το polling. Δεν περιέχει το αρχείο
+    αποτελέσματος, μόνο το URL του (result_url) όταν υπάρχει.
+    """
+    result_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'uuid', 'kind', 'params', 'status', 'progress', 'message', 'result', 'error',
+            'attempts', 'max_attempts', 'result_name', 'result_size', 'result_url',
+            'created_at', 'started_at', 'finished_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+    def get_result_url(self, obj):
+        if obj.status != Job.STATUS_SUCCEEDED or not obj.result_name:
+            return None
+        return reverse('job-result', kwargs={'job_uuid': obj.uuid})
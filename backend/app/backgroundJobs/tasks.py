@@ -0,0 +1,178 @@
+"""
+Τα είδη εργασιών του worker. Κάθε handler δέχεται τις παραμέτρους που
+επέστρεψε το validate() του και ένα JobContext για πρόοδο / αρχείο, και
+επιστρέφει JSON αποτέλεσμα. Μετά από αποτυχία ο handler ξανατρέχει από την
+αρχή: ο επαναϋπολογισμός και η εξαγωγή δίνουν το ίδιο αποτέλεσμα, οι
+διαγραφές (common.deletion) βρίσκουν μόνο όσα δεν έχουν ήδη διαγραφεί.
+"""
+from common.utils import has_access_permission, is_admin_user, validate_uuid
+from .queue import JobError, PermanentJobError, register
+
+
+def _require_admin(user):
+    if user is None or not is_admin_user(user):
+        raise JobError("Access denied: Admin privileges required", 403)
+
+
+def _get_project(project_id):
+    from project.models import Project
+
+    if not validate_uuid(project_id):
+        raise JobError("Invalid project ID format")
+    try:
+        return Project.objects.get(uuid=project_id)
+    except Project.DoesNotExist:
+        raise JobError("Project not found", 404)
+
+
+def _ids(params, key):
+    ids = params.get(key)
+    if not ids or not isinstance(ids, list) or not all(validate_uuid(value) for value in ids):
+        raise JobError(f"{key} must be a non-empty list of UUIDs")
+    return [str(value) for value in ids]
+
+
+def validate_recalculation(params, user):
+    from project.recalculation import DEFAULT_CHUNK_SIZE, parse_since
+
+    _require_admin(user)
+    cleaned = {'project_id': None, 'since': None, 'sync_prices': bool(params.get('sync_prices', False))}
+    if params.get('project_id'):
+        cleaned['project_id'] = str(_get_project(params['project_id']).uuid)
+    if params.get('since'):
+        try:
+            cleaned['since'] = parse_since(str(params['since'])).isoformat()
+        except ValueError:
+            raise JobError("Invalid since date")
+    try:
+        cleaned['chunk_size'] = int(params.get('chunk_size', DEFAULT_CHUNK_SIZE))
+    except (TypeError, ValueError):
+        raise JobError("Invalid chunk_size")
+    if cleaned['chunk_size'] < 1:
+        raise JobError("Invalid chunk_size")
+    return cleaned
+
+
+@register('recalculate_scenarios', validate=validate_recalculation)
+def recalculate_scenarios_task(params, context):
+    """Ο επαναϋπολογισμός του project.recalculation (π.χ. μετά από αλλαγή τιμών ενέργειας)."""
+    from project.models import Project
+    from project.recalculation import SCENARIO_RECALCULATION, parse_since, recalculate_scenarios
+
+    project = None
+    if params.get('project_id'):
+        project = Project.objects.filter(uuid=params['project_id']).first()
+        if project is None:
+            raise PermanentJobError("Project not found")
+
+    # Κάθε μοντέλο σεναρίου μετρά για ίσο μέρος της συνολικής προόδου
+    positions = {label: index for index, (label, _, _) in enumerate(SCENARIO_RECALCULATION)}
+
+    def report(label, processed, total):
+        done = positions[label] + (processed / total if total else 1)
+        context.progress(100 * done / len(SCENARIO_RECALCULATION), f"{label}: {processed}/{total}")
+
+    return recalculate_scenarios(
+        project=project,
+        since=parse_since(params['since']) if params.get('since') else None,
+        chunk_size=params['chunk_size'],
+        sync_prices=params['sync_prices'],
+        progress=report,
+    )
+
+
+def validate_export(params, user):
+    from project.export import FORMATS, format_available
+
+    export_format = params.get('as', 'csv')
+    if export_format not in FORMATS:
+        raise JobError(f"as must be one of: {', '.join(FORMATS)}")
+    if not format_available(export_format):
+        raise JobError("XLSX export requires openpyxl")
+
+    cleaned = {'as': export_format, 'project_id': None, 'user_id': None}
+    if params.get('project_id'):
+        project = _get_project(params['project_id'])
+        if user is None or not has_access_permission(user, project):
+            raise JobError("Access denied: You do not own this project", 403)
+        cleaned['project_id'] = str(project.uuid)
+        # Όπως στο export_project_scenarios: ο χρήστης εξάγει μόνο τα δικά του κτίρια
+        if not is_admin_user(user):
+            cleaned['user_id'] = str(user.pk)
+    else:
+        _require_admin(user)
+    return cleaned
+
+
+@register('export_scenarios', validate=validate_export)
+def export_scenarios_task(params, context):
+    """Η εξαγωγή του project.export ως αρχείο αποτελέσματος της εργασίας."""
+    from building.models import Building
+    from project.export import CONTENT_TYPES, stream_export
+
+    export_format = params['as']
+    buildings = Building.objects.all()
+    filename = "all-projects-scenarios"
+    if params.get('project_id'):
+        buildings = buildings.filter(project_id=params['project_id'])
+        filename = f"project-{params['project_id']}-scenarios"
+    if params.get('user_id'):
+        buildings = buildings.filter(user_id=params['user_id'])
+
+    total = buildings.count()
+
+    def report(done):
+        context.progress(100 * done / total, f"{done}/{total} buildings")
+
+    context.save_file(
+        stream_export(buildings, export_format, progress=report),
+        f"{filename}.{export_format}",
+        CONTENT_TYPES[export_format],
+    )
+    return {'buildings': total, 'format': export_format}
+
+
+def _delete_progress(context):
+    def report(label, processed, total):
+        context.progress(100 * processed / total if total else 100, f"{label}: {processed}/{total}")
+    return report
+
+
+@register('bulk_delete_projects', validate=lambda params, user: {'project_ids': _ids(params, 'project_ids')},
+          public=False)
+def bulk_delete_projects_task(params, context):
+    """Μαζική διαγραφή έργων (δημιουργείται από το admin_bulk_delete_projects)."""
+    from common.deletion import delete_projects
+    from project.models import Project
+
+    names = list(Project.objects.filter(pk__in=params['project_ids']).values_list('name', flat=True)[:10])
+    result = delete_projects(params['project_ids'], progress=_delete_progress(context))
+    return {
+        'deleted_count': result['roots_deleted'],
+        'deleted_projects': names,
+        'deleted_rows': result['total_rows'],
+        'elapsed_seconds': result['elapsed_seconds'],
+        'rows_per_second': result['rows_per_second'],
+        'tables': result['tables'],
+        'message': f"Successfully deleted {result['roots_deleted']} projects",
+    }
+
+
+@register('bulk_delete_users', validate=lambda params, user: {'user_ids': _ids(params, 'user_ids')},
+          public=False)
+def bulk_delete_users_task(params, context):
+    """Μαζική διαγραφή χρηστών (δημιουργείται από το admin_bulk_delete_users μετά τους ελέγχους του)."""
+    from common.deletion import delete_users
+    from user.models import User
+
+    emails = list(User.objects.filter(pk__in=params['user_ids']).values_list('email', flat=True)[:10])
+    result = delete_users(params['user_ids'], progress=_delete_progress(context))
+    return {
+        'deleted_count': result['roots_deleted'],
+        'deleted_users': emails,
+        'deleted_rows': result['total_rows'],
+        'elapsed_seconds': result['elapsed_seconds'],
+        'rows_per_second': result['rows_per_second'],
+        'tables': result['tables'],
+        'message': f"Successfully deleted {result['roots_deleted']} users",
+    }
@@ -0,0 +1,335 @@
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from user.models import User
+
+from . import queue
+from .models import Job
+from .queue import (
+    Heartbeat, JobCancelled, JobContext, PermanentJobError, cancel, claim_next, enqueue, register,
+    requeue_stale, run_job,
+)
+
+
+class JobTestCase(TestCase):
+    """Βοηθητικά είδη εργασιών, καταχωρημένα μόνο για τη διάρκεια κάθε test."""
+
+    def setUp(self):
+        patcher = mock.patch.dict(queue._tasks)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.handler = mock.Mock(return_value={'ok': True})
+        register('test_job')(lambda params, context: self.handler(params, context))
+        register('test_internal', public=False)(lambda params, context: None)
+
+    def create_job(self, **fields):
+        fields.setdefault('kind', 'test_job')
+        return Job.objects.create(**fields)
+
+    def claim(self, worker='worker-a'):
+        job = claim_next(worker)
+        self.assertIsNotNone(job)
+        return job
+
+
+class ClaimTests(JobTestCase):
+
+    def test_claims_oldest_ready_job(self):
+        now = timezone.now()
+        later = self.create_job(run_after=now + timedelta(minutes=5))
+        second = self.create_job(run_after=now - timedelta(minutes=1))
+        first = self.create_job(run_after=now - timedelta(minutes=2))
+
+        job = self.claim()
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual((job.status, job.worker, job.attempts), (Job.STATUS_RUNNING, 'worker-a', 1))
+        self.assertIsNotNone(job.heartbeat_at)
+        self.assertEqual(self.claim('worker-b').pk, second.pk)
+        self.assertIsNone(claim_next('worker-c'))
+        later.refresh_from_db()
+        self.assertEqual(later.status, Job.STATUS_PENDING)
+
+    def test_concurrent_claim_takes_next_candidate(self):
+        first = self.create_job(run_after=timezone.now() - timedelta(minutes=2))
+        second = self.create_job(run_after=timezone.now() - timedelta(minutes=1))
+        original_update = QuerySet.update
+        raced = []
+
+        def racing_update(queryset, **kwargs):
+            # Ο worker-b διεκδικεί την ίδια εργασία ανάμεσα στο SELECT και στο UPDATE του worker-a
+            if not raced:
+                raced.append(None)
+                raced[0] = claim_next('worker-b')
+            return original_update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=racing_update):
+            job = claim_next('worker-a')
+
+        self.assertEqual(raced[0].pk, first.pk)
+        self.assertEqual(job.pk, second.pk)
+        first.refresh_from_db()
+        self.assertEqual((first.worker, first.attempts), ('worker-b', 1))
+
+
+@override_settings(JOB_RETRY_DELAY=30)
+class RetryTests(JobTestCase):
+
+    def test_failures_back_off_exponentially_until_max_attempts(self):
+        self.handler.side_effect = ValueError('boom')
+        job = self.create_job(max_attempts=3)
+
+        for attempt, delay in ((1, 30), (2, 60)):
+            claimed = self.claim()
+            self.assertEqual(claimed.attempts, attempt)
+            before = timezone.now()
+            self.assertEqual(run_job(claimed, 'worker-a'), Job.STATUS_PENDING)
+
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.worker, job.error), (Job.STATUS_PENDING, '', 'ValueError: boom'))
+            self.assertGreaterEqual(job.run_after, before + timedelta(seconds=delay))
+            self.assertLess(job.run_after, before + timedelta(seconds=delay + 5))
+            # Δεν ξανατρέχει πριν από το run_after
+            self.assertIsNone(claim_next('worker-a'))
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+
+        self.assertEqual(run_job(self.claim(), 'worker-a'), Job.STATUS_FAILED)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_FAILED, 3))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_permanent_error_is_not_retried(self):
+        self.handler.side_effect = PermanentJobError('Project not found')
+        job = self.create_job(max_attempts=3)
+        self.assertEqual(run_job(self.claim(), 'worker-a'), Job.STATUS_FAILED)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_FAILED, 1))
+        self.assertEqual(job.error, 'PermanentJobError: Project not found')
+
+
+@override_settings(JOB_STALE_AFTER=600)
+class StaleJobTests(JobTestCase):
+
+    def test_jobs_without_heartbeat_are_requeued_or_failed(self):
+        now = timezone.now()
+        old = now - timedelta(seconds=601)
+        retry = self.create_job(status=Job.STATUS_RUNNING, worker='gone', attempts=1, heartbeat_at=old)
+        exhausted = self.create_job(
+            status=Job.STATUS_RUNNING, worker='gone', attempts=3, max_attempts=3, heartbeat_at=old,
+        )
+        alive = self.create_job(
+            status=Job.STATUS_RUNNING, worker='alive', attempts=1, heartbeat_at=now - timedelta(seconds=60),
+        )
+
+        self.assertEqual(requeue_stale(), 2)
+        for job in (retry, exhausted, alive):
+            job.refresh_from_db()
+        self.assertEqual((retry.status, retry.worker, retry.error), (Job.STATUS_PENDING, '', 'Worker stopped responding'))
+        self.assertEqual(exhausted.status, Job.STATUS_FAILED)
+        self.assertEqual((alive.status, alive.worker), (Job.STATUS_RUNNING, 'alive'))
+        self.assertEqual(self.claim('worker-b').pk, retry.pk)
+
+    def test_heartbeat_keeps_job_alive(self):
+        self.create_job()
+        job = self.claim()
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(seconds=601))
+
+        heartbeat = Heartbeat(job, 'worker-a', interval=30)
+        self.assertTrue(heartbeat.beat())
+        self.assertEqual(requeue_stale(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+
+    def test_heartbeat_of_reassigned_job_is_lost(self):
+        self.create_job()
+        job = self.claim()
+        Job.objects.filter(pk=job.pk).update(worker='worker-b')
+
+        heartbeat = Heartbeat(job, 'worker-a', interval=30)
+        self.assertFalse(heartbeat.beat())
+        self.assertTrue(heartbeat.lost)
+        with self.assertRaises(JobCancelled):
+            JobContext(job, 'worker-a', heartbeat).progress(50)
+
+
+class CancelTests(JobTestCase):
+
+    def test_cancel_pending_job(self):
+        job = self.create_job()
+        self.assertTrue(cancel(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_CANCELLED)
+        self.assertIsNone(claim_next('worker-a'))
+        self.assertFalse(cancel(job))
+
+    def test_cancel_running_job_stops_handler(self):
+        job = self.create_job()
+        claimed = self.claim()
+
+        def handler(params, context):
+            cancel(job)
+            context._last_write = 0.0
+            context.progress(50)
+            self.fail('progress() should raise JobCancelled')
+
+        self.handler.side_effect = handler
+        self.assertEqual(run_job(claimed, 'worker-a'), Job.STATUS_CANCELLED)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), (Job.STATUS_CANCELLED, None))
+
+    def test_cancel_after_last_progress_discards_result(self):
+        job = self.create_job()
+        claimed = self.claim()
+
+        def handler(params, context):
+            cancel(job)
+            return {'ok': True}
+
+        self.handler.side_effect = handler
+        self.assertEqual(run_job(claimed, 'worker-a'), Job.STATUS_CANCELLED)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), (Job.STATUS_CANCELLED, None))
+
+
+class ResultFileTests(JobTestCase):
+
+    def test_file_is_spooled_and_stored(self):
+        chunks = ['κτίριο;NPV\n'] + [b'x' * 1000] * 50
+        expected = b''.join(chunk.encode() if isinstance(chunk, str) else chunk for chunk in chunks)
+
+        def handler(params, context):
+            context.save_file(iter(chunks), 'export.csv', 'text/csv')
+            return {'rows': 50}
+
+        self.handler.side_effect = handler
+        job = self.create_job()
+        with mock.patch.object(queue, 'RESULT_SPOOL_SIZE', 1024):
+            self.assertEqual(run_job(self.claim(), 'worker-a'), Job.STATUS_SUCCEEDED)
+
+        job.refresh_from_db()
+        self.assertEqual(bytes(job.result_data), expected)
+        self.assertEqual((job.result_name, job.result_type, job.result_size), ('export.csv', 'text/csv', len(expected)))
+
+    def test_failed_file_is_closed(self):
+        def chunks():
+            yield b'partial'
+            raise ValueError('export failed')
+
+        spools = []
+        spooled_file = tempfile.SpooledTemporaryFile
+
+        def spool(**kwargs):
+            spools.append(spooled_file(**kwargs))
+            return spools[-1]
+
+        context = JobContext(self.create_job(), 'worker-a')
+        with mock.patch.object(queue.tempfile, 'SpooledTemporaryFile', side_effect=spool):
+            with self.assertRaises(ValueError):
+                context.save_file(chunks(), 'export.csv', 'text/csv')
+        self.assertTrue(spools[0].closed)
+        self.assertIsNone(context.file)
+
+class JobApiTests(JobTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email='jobs@bemat.local', password=None)
+        self.other = User.objects.create_user(email='other-jobs@bemat.local', password=None)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def run_worker(self):
+        while (job := claim_next('worker-a')) is not None:
+            run_job(job, 'worker-a')
+
+    def test_enqueue_poll_and_download_result(self):
+        def handler(params, context):
+            context.save_file([b'a;b\n', '1;2\n'], 'result.csv', 'text/csv')
+            return {'rows': params['rows']}
+
+        self.handler.side_effect = handler
+        response = self.client.post('/api/jobs/', {'kind': 'test_job', 'params': {'rows': 1}}, format='json')
+        self.assertEqual(response.status_code, 202)
+        job_url = response['Location']
+        self.assertEqual(job_url, f"/api/jobs/{response.data['data']['uuid']}/")
+        self.assertEqual(response.data['data']['status'], Job.STATUS_PENDING)
+
+        self.assertEqual(self.client.get(f'{job_url}result/').status_code, 409)
+        self.run_worker()
+
+        data = self.client.get(job_url).data['data']
+        self.assertEqual((data['status'], data['progress'], data['result']), (Job.STATUS_SUCCEEDED, 100, {'rows': 1}))
+        self.assertEqual(data['result_url'], f'{job_url}result/')
+        response = self.client.get(data['result_url'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'a;b\n1;2\n')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="result.csv"')
+
+        listed = self.client.get('/api/jobs/', {'status': Job.STATUS_SUCCEEDED}).data['data']
+        self.assertEqual([job['uuid'] for job in listed], [data['uuid']])
+        self.assertEqual(self.client.get('/api/jobs/', {'status': Job.STATUS_PENDING}).data['data'], [])
+
+    def test_result_without_file_is_404(self):
+        job = enqueue('test_job', user=self.user)
+        self.run_worker()
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/result/').status_code, 404)
+
+    def test_unknown_and_internal_kinds_are_rejected(self):
+        for kind in ('unknown', 'test_internal', None):
+            with self.subTest(kind=kind):
+                response = self.client.post('/api/jobs/', {'kind': kind}, format='json')
+                self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/jobs/', {'kind': 'test_job', 'params': [1]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+    def test_other_users_cannot_see_or_cancel(self):
+        job = enqueue('test_job', user=self.user)
+        self.client.force_authenticate(user=self.other)
+        for method in ('get', 'delete'):
+            with self.subTest(method=method):
+                self.assertEqual(getattr(self.client, method)(f'/api/jobs/{job.pk}/').status_code, 403)
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/result/').status_code, 403)
+        self.assertEqual(self.client.get('/api/jobs/').data['data'], [])
+
+    def test_delete_cancels_until_finished(self):
+        job = enqueue('test_job', user=self.user)
+        response = self.client.delete(f'/api/jobs/{job.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['status'], Job.STATUS_CANCELLED)
+        self.assertEqual(self.client.delete(f'/api/jobs/{job.pk}/').status_code, 409)
+
+
+@override_settings(JOB_HEARTBEAT_INTERVAL=0.05, JOB_STALE_AFTER=600)
+class HeartbeatThreadTests(TransactionTestCase):
+    """Το thread του run_job ανανεώνει το heartbeat χωρίς καμία αναφορά προόδου από τον handler."""
+
+    def setUp(self):
+        patcher = mock.patch.dict(queue._tasks)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_long_step_keeps_heartbeat_fresh(self):
+        beats = []
+
+        @register('test_slow')
+        def slow(params, context):
+            started = Job.objects.get(pk=job.pk).heartbeat_at
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                heartbeat_at = Job.objects.get(pk=job.pk).heartbeat_at
+                if heartbeat_at > started:
+                    beats.append(heartbeat_at)
+                    break
+            return None
+
+        job = Job.objects.create(kind='test_slow')
+        self.assertEqual(run_job(claim_next('worker-a'), 'worker-a'), Job.STATUS_SUCCEEDED)
+        self.assertTrue(beats)
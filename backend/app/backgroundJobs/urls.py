@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.jobs, name='jobs'),
+    path('<uuid:job_uuid>/', views.job_detail, name='job-detail'),
+    path('<uuid:job_uuid>/result/', views.job_result, name='job-result'),
+]
@@ -0,0 +1,96 @@
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+
+from common.utils import is_admin_user, standard_error_response, standard_success_response
+from .models import Job
+from .queue import JobError, cancel, enqueue, get_task, public_kinds
+from .serializers import JobSerializer
+
+JOB_LIST_LIMIT = 50
+
+
+def job_accepted(job):
+    """Απάντηση 202 για εργασία που μόλις μπήκε στην ουρά, με Location το URL του polling."""
+    response = standard_success_response(
+        JobSerializer(job).data, message="Job queued", status_code=status.HTTP_202_ACCEPTED
+    )
+    response['Location'] = f"/api/jobs/{job.uuid}/"
+    return response
+
+
+def _get_job(request, job_uuid):
+    """(εργασία, None) ή (None, απάντηση σφάλματος)· ο χρήστης βλέπει μόνο τις δικές του."""
+    try:
+        job = Job.objects.defer('result_data').get(uuid=job_uuid)
+    except Job.DoesNotExist:
+        return None, standard_error_response("Job not found", status.HTTP_404_NOT_FOUND)
+    if job.created_by_id != request.user.pk and not is_admin_user(request.user):
+        return None, standard_error_response("Access denied: You do not own this job", status.HTTP_403_FORBIDDEN)
+    return job, None
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def jobs(request):
+    """
+    GET: οι πιο πρόσφατες εργασίες του χρήστη (όλες για τους διαχειριστές),
+    με ?status= και ?kind=. POST {"kind": ..., "params": {...}}: νέα εργασία,
+    απάντηση 202 με την κατάστασή της, που ο client ρωτά στο /api/jobs/<uuid>/.
+    """
+    if request.method == 'POST':
+        kind = request.data.get('kind')
+        task = get_task(kind)
+        if task is None or not task.public:
+            return standard_error_response(
+                f"kind must be one of: {', '.join(public_kinds())}", status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            job = enqueue(kind, request.data.get('params'), request.user)
+        except JobError as e:
+            return standard_error_response(str(e), e.status_code)
+        return job_accepted(job)
+
+    queryset = Job.objects.defer('result_data')
+    if not is_admin_user(request.user):
+        queryset = queryset.filter(created_by=request.user)
+    if request.query_params.get('status'):
+        queryset = queryset.filter(status=request.query_params['status'])
+    if request.query_params.get('kind'):
+        queryset = queryset.filter(kind=request.query_params['kind'])
+    return standard_success_response(JobSerializer(queryset[:JOB_LIST_LIMIT], many=True).data)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def job_detail(request, job_uuid):
+    """GET: κατάσταση και πρόοδος της εργασίας (polling). DELETE: ακύρωση."""
+    job, error = _get_job(request, job_uuid)
+    if error:
+        return error
+
+    if request.method == 'DELETE':
+        if not cancel(job):
+            return standard_error_response("Job has already finished", status.HTTP_409_CONFLICT)
+        job.refresh_from_db(fields=['status', 'finished_at', 'updated_at'])
+
+    return standard_success_response(JobSerializer(job).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_result(request, job_uuid):
+    """Το αρχείο αποτελέσματος μιας ολοκληρωμένης εργασίας (π.χ. εξαγωγή)."""
+    job, error = _get_job(request, job_uuid)
+    if error:
+        return error
+    if job.status != Job.STATUS_SUCCEEDED:
+        return standard_error_response("Job has not finished successfully", status.HTTP_409_CONFLICT)
+    if not job.result_name:
+        return standard_error_response("Job has no result file", status.HTTP_404_NOT_FOUND)
+
+    data = Job.objects.filter(pk=job.pk).values_list('result_data', flat=True).get()
+    response = HttpResponse(bytes(data), content_type=job.result_type or 'application/octet-stream')
+    response['Content-Disposition'] = f'attachment; filename="{job.result_name}"'
+    return response
@@ -0,0 +1,119 @@
+"""
+Οι περιπτώσεις του benchmark. Κάθε περίπτωση δέχεται το dataset του seed και
+επιστρέφει callable χωρίς ορίσματα που εκτελεί μία φορά τη μετρούμενη
+λειτουργία (ένα request από όλο το middleware stack, ένα save(), ένα
+bulk_create ή τον υπολογισμό οικονομικών δεικτών).
+"""
+from django.conf import settings
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from building.models import Building
+from common.finance import evaluate, evaluate_batch
+from project.counters import count_created_buildings
+
+
+class BenchmarkError(Exception):
+    """Η λειτουργία απέτυχε, οπότε η μέτρηση δεν έχει νόημα."""
+
+
+def _client(user):
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+    client = APIClient(SERVER_NAME=hosts[0] if hosts else 'localhost')
+    client.force_authenticate(user=user)
+    return client
+
+
+def _get(path):
+    def case(dataset):
+        client = _client(dataset['user'])
+        path_for_dataset = path(dataset)
+
+        def run():
+            response = client.get(path_for_dataset)
+            if response.status_code != 200:
+                raise BenchmarkError(f"GET {path_for_dataset} returned {response.status_code}")
+        return run
+    return case
+
+
+def _save(index):
+    def case(dataset):
+        scenario = dataset['scenarios'][index]
+        return scenario.save
+    return case
+
+
+def _bulk_create_buildings(count):
+    """
+    `count` αντίγραφα του πρώτου κτιρίου με bulk_create και το buildings_count
+    του έργου τους, σε συναλλαγή που ακυρώνεται ώστε το dataset να μην αλλάζει.
+    Πέρα από τα INSERT γίνεται ένα UPDATE ανά έργο, όσα κι αν είναι τα κτίρια.
+    """
+    def case(dataset):
+        template = dataset['buildings'][0]
+        attnames = [field.attname for field in Building._meta.concrete_fields if not field.primary_key]
+
+        def run():
+            buildings = [Building(**{name: getattr(template, name) for name in attnames}) for _ in range(count)]
+            with transaction.atomic():
+                count_created_buildings(Building.objects.bulk_create(buildings))
+                transaction.set_rollback(True)
+        return run
+    return case
+
+
+def _finance_rows(count):
+    """Συνθετικές ταμειακές ροές (επένδυση, ετήσιο όφελος, επιτόκιο, έτη), ίδιες σε κάθε εκτέλεση."""
+    return [
+        (1000.0 + 37 * index, 50.0 + index % 400, (index % 12) / 100, 5 + index % 26)
+        for index in range(count)
+    ]
+
+
+def _finance_per_row(count):
+    """Οι δείκτες `count` σεναρίων με τις scalar συναρτήσεις, μία γραμμή τη φορά (όπως στο save())."""
+    def case(dataset):
+        rows = _finance_rows(count)
+
+        def run():
+            for row in rows:
+                evaluate(*row)
+        return run
+    return case
+
+
+def _finance_batch(count):
+    """Οι ίδιοι δείκτες με μία κλήση του evaluate_batch (NumPy)."""
+    def case(dataset):
+        columns = list(zip(*_finance_rows(count)))
+
+        def run():
+            evaluate_batch(*columns)
+        return run
+    return case
+
+
+def get_cases(dataset):
+    """[(όνομα, case)] για όλες τις περιπτώσεις, με ένα save() ανά τύπο σεναρίου."""
+    cases = [
+        ('api.get_projects', _get(lambda dataset: '/api/projects/get/')),
+        ('api.get_buildings', _get(lambda dataset: '/api/buildings/get/')),
+        ('api.get_building_progress', _get(
+            lambda dataset: f"/api/projects/building-progress/{dataset['buildings'][0].uuid}/"
+        )),
+        ('api.get_building_bundle', _get(lambda dataset: f"/api/buildings/{dataset['buildings'][0].uuid}/bundle/")),
+        ('api.building_images.list', _get(lambda dataset: '/api/building-images/')),
+        ('api.building_images.by_building', _get(
+            lambda dataset: f"/api/building-images/building/{dataset['buildings'][0].uuid}/"
+        )),
+    ]
+    cases += [
+        ('save.building.Building', lambda dataset: dataset['buildings'][0].save),
+        ('bulk_create.building.Building.1000', _bulk_create_buildings(1000)),
+        ('finance.evaluate.10000', _finance_per_row(10000)),
+        ('finance.evaluate_batch.10000', _finance_batch(10000)),
+    ]
+    for index, scenario in enumerate(dataset['scenarios']):
+        cases.append((f"save.{scenario._meta.label}", _save(index)))
+    return cases
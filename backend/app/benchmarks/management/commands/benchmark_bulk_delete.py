@@ -0,0 +1,157 @@
+import contextlib
+import io
+import json
+import logging
+import math
+import time
+import tracemalloc
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from adminStats.counters import reconcile
+from benchmarks.seed import clone_buildings, seed_dataset
+from building.models import Building
+from common.deletion import delete_projects, delete_users
+from common.performance import RequestMetrics
+from project.completion import refresh_building_progress
+from project.models import Project
+from user.models import User
+
+MODES = ('engine', 'django')
+ROOTS = ('users', 'projects')
+
+
+def _total_rows():
+    return sum(
+        model._base_manager.count() for model in apps.get_models()
+        if model._meta.managed and not model._meta.proxy
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database with a synthetic tree of about N rows (a user with projects, '
+        'buildings, all scenarios, material layers, images and progress rows) and delete it with '
+        'common.deletion ("engine") and with queryset.delete() ("django"). Reports rows/sec, '
+        'queries and, with --trace-memory, peak Python memory per mode.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Approximate rows in the tree (default: 100000)')
+        parser.add_argument('--per-project', type=int, default=1000, help='Buildings per project (default: 1000)')
+        parser.add_argument('--root', choices=ROOTS, default='users', help='Delete the user or only the projects')
+        parser.add_argument('--mode', dest='modes', action='append', default=[], choices=MODES,
+                            help='Deletion to measure (repeatable, default: both)')
+        parser.add_argument('--trace-memory', action='store_true',
+                            help='Rebuild the tree and measure peak Python memory (slow)')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['per_project'] < 1:
+            raise CommandError('--rows and --per-project must be positive integers')
+        modes = options['modes'] or list(MODES)
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        logging.disable(logging.WARNING)
+        results = []
+        try:
+            with override_settings(DEBUG=False), contextlib.redirect_stdout(io.StringIO()):
+                self.dataset = seed_dataset(projects=1, buildings=1, layers=2, images=1)
+                self.runs = 0
+                # Γραμμές ανά κτίριο: διαφορά δύο δοκιμαστικών δέντρων, χωρίς τις σταθερές
+                # γραμμές (χρήστης, στατιστικά, έργο). Το πρώτο δέντρο δημιουργεί και τους
+                # ημερήσιους μετρητές του reconcile(), γι' αυτό δεν μετράει.
+                samples = []
+                for size in (1, 1, 11):
+                    sample = self._build_tree(size)
+                    samples.append(sample['rows'])
+                    self._delete(sample, 'engine', 'users')
+                rows_per_building = max(1, (samples[2] - samples[1]) / 10)
+                fixed_rows = max(0, samples[1] - rows_per_building)
+                buildings = max(1, math.ceil((options['rows'] - fixed_rows) / rows_per_building))
+
+                for mode in modes:
+                    results.append(self._measure(mode, buildings, options))
+        finally:
+            logging.disable(logging.NOTSET)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(
+            f"{'mode':<7} {'root':<9} {'buildings':>9} {'rows':>8} {'seconds':>8} {'rows/s':>8} "
+            f"{'queries':>8} {'peak MB':>8}"
+        )
+        for result in results:
+            peak = f"{result['peak_memory_bytes'] / 1e6:>8.1f}" if result['peak_memory_bytes'] is not None else f"{'-':>8}"
+            self.stdout.write(
+                f"{result['mode']:<7} {result['root']:<9} {result['buildings']:>9} {result['rows']:>8} "
+                f"{result['seconds']:>8.2f} {result['rows_per_second']:>8.0f} {result['queries']:>8} {peak}"
+            )
+
+        if options['output']:
+            report = {'generated_at': timezone.now().isoformat(), 'database': connection.vendor, 'results': results}
+            with open(options['output'], 'w') as target:
+                json.dump(report, target, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+    def _build_tree(self, buildings, per_project=1000):
+        """Νέος χρήστης με `buildings` κτίρια και όλες τις εξαρτημένες εγγραφές τους."""
+        self.runs += 1
+        before = _total_rows()
+        user = User.objects.create_user(email=f'bulk-delete-{self.runs}@bemat.local', password=None)
+        clone_buildings(dict(self.dataset, user=user), buildings, per_project=per_project, dependents=True)
+        owned = list(Building.objects.filter(project__user=user).values_list('pk', flat=True))
+        for start in range(0, len(owned), 500):
+            refresh_building_progress(Building.objects.filter(pk__in=owned[start:start + 500]))
+        # Το bulk_create δεν ενημερώνει τους μετρητές του dashboard
+        reconcile()
+        return {'user': user, 'rows': _total_rows() - before}
+
+    def _delete(self, tree, mode, root):
+        user = tree['user']
+        if root == 'users':
+            if mode == 'engine':
+                delete_users([user.pk])
+            else:
+                User.objects.filter(pk=user.pk).delete()
+        else:
+            project_ids = list(Project.objects.filter(user=user).values_list('pk', flat=True))
+            if mode == 'engine':
+                delete_projects(project_ids)
+            else:
+                Project.objects.filter(pk__in=project_ids).delete()
+
+    def _measure(self, mode, buildings, options):
+        tree = self._build_tree(buildings, options['per_project'])
+        before = _total_rows()
+        metrics = RequestMetrics()
+        with connection.execute_wrapper(metrics):
+            started = time.perf_counter()
+            self._delete(tree, mode, options['root'])
+            seconds = time.perf_counter() - started
+        rows = before - _total_rows()
+
+        peak = None
+        if options['trace_memory']:
+            tree = self._build_tree(buildings, options['per_project'])
+            tracemalloc.start()
+            try:
+                self._delete(tree, mode, options['root'])
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        return {
+            'mode': mode,
+            'root': options['root'],
+            'buildings': buildings,
+            'tree_rows': tree['rows'],
+            'rows': rows,
+            'seconds': round(seconds, 3),
+            'rows_per_second': round(rows / seconds) if seconds > 0 else None,
+            'queries': metrics.queries,
+            'peak_memory_bytes': peak,
+        }
@@ -0,0 +1,125 @@
+import contextlib
+import io
+import json
+import logging
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from benchmarks.seed import clone_buildings, seed_dataset
+from building.models import Building
+from common.performance import RequestMetrics
+from project.export import FORMATS, format_available
+
+
+def _consume(response, started):
+    """(bytes, γραμμές, ms από το `started` μέχρι το πρώτο κομμάτι) της ροής της απάντησης."""
+    first_chunk_ms = None
+    size = 0
+    lines = 0
+    for chunk in response.streaming_content:
+        if first_chunk_ms is None:
+            first_chunk_ms = (time.perf_counter() - started) * 1000
+        size += len(chunk)
+        lines += chunk.count(b'\n')
+    return size, lines, first_chunk_ms
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database with portfolios of N buildings (every building with all 11 '
+        'scenarios, cloned with bulk_create) and stream /api/projects/export/ in every format. '
+        'Reports time to first byte, total time, size, queries and peak Python memory per size, '
+        'to check that the export cost grows linearly and its memory stays flat.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--buildings', type=int, action='append', default=[],
+                            help='Portfolio size to measure (repeatable, default: 1000 and 10000)')
+        parser.add_argument('--per-project', type=int, default=1000, help='Buildings per project (default: 1000)')
+        parser.add_argument('--as', dest='formats', action='append', default=[], choices=FORMATS,
+                            help='Export format (repeatable, default: all available)')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        sizes = sorted(set(options['buildings'] or [1000, 10000]))
+        if sizes[0] < 1 or options['per_project'] < 1:
+            raise CommandError('--buildings and --per-project must be positive integers')
+        formats = options['formats'] or [name for name in FORMATS if format_available(name)]
+        unavailable = [name for name in formats if not format_available(name)]
+        if unavailable:
+            raise CommandError(f"Unavailable formats (missing dependency): {', '.join(unavailable)}")
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        logging.disable(logging.INFO)
+        results = []
+        try:
+            with override_settings(DEBUG=False), contextlib.redirect_stdout(io.StringIO()):
+                dataset = seed_dataset(projects=1, buildings=1, layers=2, images=0)
+                user = dataset['user']
+                user.is_staff = True
+                user.save()
+                client = APIClient(SERVER_NAME='localhost')
+                client.force_authenticate(user)
+
+                for size in sizes:
+                    clone_buildings(dataset, size - Building.objects.count(), per_project=options['per_project'])
+                    for export_format in formats:
+                        results.append(self._measure(client, size, export_format))
+        finally:
+            logging.disable(logging.NOTSET)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(
+            f"{'buildings':>9} {'format':<7} {'first ms':>9} {'total ms':>9} {'rows/s':>9} {'MB':>7} "
+            f"{'queries':>8} {'peak MB':>8}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['buildings']:>9} {result['format']:<7} {result['first_chunk_ms']:>9.1f} "
+                f"{result['total_ms']:>9.1f} {result['rows_per_second']:>9.0f} {result['bytes'] / 1e6:>7.2f} "
+                f"{result['queries']:>8} {result['peak_memory_bytes'] / 1e6:>8.2f}"
+            )
+
+        if options['output']:
+            report = {'generated_at': timezone.now().isoformat(), 'database': connection.vendor, 'results': results}
+            with open(options['output'], 'w') as target:
+                json.dump(report, target, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+    def _measure(self, client, size, export_format):
+        url = f'/api/projects/export/?as={export_format}'
+
+        # Χρόνος και ερωτήματα χωρίς tracemalloc, που επιβαρύνει πολύ την εκτέλεση
+        metrics = RequestMetrics()
+        with connection.execute_wrapper(metrics):
+            started = time.perf_counter()
+            response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f"{url}: HTTP {response.status_code}")
+            size_bytes, lines, first_chunk_ms = _consume(response, started)
+            total_ms = (time.perf_counter() - started) * 1000
+
+        tracemalloc.start()
+        try:
+            _consume(client.get(url), time.perf_counter())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'buildings': size,
+            'format': export_format,
+            'first_chunk_ms': round(first_chunk_ms, 1),
+            'total_ms': round(total_ms, 1),
+            'rows_per_second': round(size / (total_ms / 1000)),
+            'bytes': size_bytes,
+            'lines': lines,
+            'queries': metrics.queries,
+            'peak_memory_bytes': peak,
+        }
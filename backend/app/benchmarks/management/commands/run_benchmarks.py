@@ -0,0 +1,146 @@
+import contextlib
+import io
+import json
+import logging
+import platform
+import subprocess
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from benchmarks.cases import BenchmarkError, get_cases
+from benchmarks.report import compare, measure
+from benchmarks.seed import seed_dataset
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database (in-memory for SQLite) with synthetic projects, buildings, '
+        'material layers, all scenario types and images, then measure wall-clock time and query '
+        'counts of the project/progress/image endpoints, of every scenario save() and of the '
+        'per-row vs batch financial metrics. '
+        'Writes a JSON report that can be compared between commits with --compare.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=2, help='Projects to seed (default: 2)')
+        parser.add_argument('--buildings', type=int, default=5, help='Buildings per project (default: 5)')
+        parser.add_argument('--layers', type=int, default=10,
+                            help='Material layers per wall and roof insulation (default: 10)')
+        parser.add_argument('--images', type=int, default=5, help='Images per building (default: 5)')
+        parser.add_argument('--repeat', type=int, default=5, help='Measured runs per case (default: 5)')
+        parser.add_argument('--warmup', type=int, default=1, help='Unmeasured runs per case (default: 1)')
+        parser.add_argument('--case', action='append', default=[],
+                            help='Only run cases whose name contains this text (repeatable)')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--compare', help='Baseline JSON report to compare against')
+        parser.add_argument('--threshold', type=float, default=25.0,
+                            help='Median time increase (%%) counted as a regression (default: 25)')
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help='Exit with an error if --compare finds a regression')
+
+    def handle(self, *args, **options):
+        for name in ('projects', 'buildings', 'repeat'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} must be a positive integer')
+        for name in ('layers', 'images', 'warmup'):
+            if options[name] < 0:
+                raise CommandError(f'--{name} must not be negative')
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as source:
+                    baseline = json.load(source)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read baseline report: {e}")
+
+        report = self._run(options)
+
+        self.stdout.write(f"{'case':<60} {'queries':>8} {'median ms':>10} {'min ms':>8}")
+        for name, result in report['results'].items():
+            self.stdout.write(
+                f"{name:<60} {result['queries']:>8} {result['time_ms']['median']:>10.2f} {result['time_ms']['min']:>8.2f}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as target:
+                json.dump(report, target, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+        if baseline is not None:
+            self._compare(baseline, report, options)
+
+    def _run(self, options):
+        # Ξεχωριστή βάση δοκιμών: τα δεδομένα δεν αγγίζουν τη βάση εργασίας και
+        # κάθε εκτέλεση ξεκινά από την ίδια κατάσταση.
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        # Τα print()/logging των views και των μοντέλων θα χαλούσαν τη μέτρηση και την έξοδο
+        logging.disable(logging.INFO)
+        try:
+            with override_settings(DEBUG=False, BUILDING_IMAGE_STORAGE='database'), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                dataset = seed_dataset(
+                    projects=options['projects'], buildings=options['buildings'],
+                    layers=options['layers'], images=options['images'],
+                )
+                results = {}
+                for name, case in get_cases(dataset):
+                    if options['case'] and not any(text in name for text in options['case']):
+                        continue
+                    try:
+                        results[name] = measure(case(dataset), options['repeat'], options['warmup'])
+                    except BenchmarkError as e:
+                        raise CommandError(f"{name}: {e}")
+        finally:
+            logging.disable(logging.NOTSET)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        return {
+            'generated_at': timezone.now().isoformat(),
+            'commit': _git_commit(),
+            'environment': {
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+            },
+            'dataset': {name: options[name] for name in ('projects', 'buildings', 'layers', 'images')},
+            'results': results,
+        }
+
+    def _compare(self, baseline, report, options):
+        if baseline.get('dataset') != report['dataset']:
+            self.stdout.write(self.style.WARNING(
+                f"Baseline dataset {baseline.get('dataset')} differs from {report['dataset']}"
+            ))
+        rows = compare(baseline, report, options['threshold'])
+        self.stdout.write(f"\nCompared with {baseline.get('commit') or options['compare']}:")
+        for row in rows:
+            line = (
+                f"{row['case']:<60} queries {row['queries_before']:>4} -> {row['queries_after']:<4} "
+                f"median {row['median_before']:>8.2f} -> {row['median_after']:<8.2f} ({row['change_pct']:+.1f}%)"
+            )
+            self.stdout.write(self.style.ERROR(line) if row['regression'] else line)
+
+        regressions = [row['case'] for row in rows if row['regression']]
+        if regressions:
+            message = f"{len(regressions)} regression(s): {', '.join(regressions)}"
+            if options['fail_on_regression']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS('No regressions'))
@@ -0,0 +1,91 @@
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from common.performance import PERCENTILES, percentile
+
+
+def _fetch(url, headers, timeout):
+    request = urllib.request.Request(url, headers=headers)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = None
+    return (time.perf_counter() - started) * 1000, status
+
+
+class Command(BaseCommand):
+    help = (
+        'Send concurrent GET requests to a running server (e.g. gunicorn) and report latency '
+        'percentiles. Run it once per configuration, e.g. SQL_CONN_MAX_AGE=0 and =60, to compare '
+        'the cost of opening a database connection on every request.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='Absolute URL to request, e.g. http://127.0.0.1:8000/api/projects/get/')
+        parser.add_argument('--token', help='DRF auth token sent as "Authorization: Token <token>"')
+        parser.add_argument('--requests', type=int, default=500, help='Total requests (default: 500)')
+        parser.add_argument('--concurrency', type=int, default=4, help='Parallel clients (default: 4)')
+        parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests first (default: 20)')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds')
+        parser.add_argument('--label', default='', help='Free text stored in the report (e.g. the settings used)')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        for name in ('requests', 'concurrency'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} must be a positive integer')
+        if options['warmup'] < 0:
+            raise CommandError('--warmup must not be negative')
+
+        url = options['url']
+        headers = {'Authorization': f"Token {options['token']}"} if options['token'] else {}
+
+        def run(count):
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                return list(executor.map(lambda _: _fetch(url, headers, options['timeout']), range(count)))
+
+        run(options['warmup'])
+        started = time.perf_counter()
+        results = run(options['requests'])
+        elapsed = time.perf_counter() - started
+
+        timings = sorted(duration for duration, status in results if status is not None and status < 400)
+        if not timings:
+            statuses = sorted({str(status) for _, status in results})
+            raise CommandError(f"No successful responses from {url} (statuses: {', '.join(statuses)})")
+
+        report = {
+            'generated_at': timezone.now().isoformat(),
+            'url': url,
+            'label': options['label'],
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'errors': options['requests'] - len(timings),
+            'requests_per_second': round(options['requests'] / elapsed, 1),
+            'time_ms': {
+                **{f'p{percent}': round(percentile(timings, percent), 3) for percent in PERCENTILES},
+                'mean': round(statistics.mean(timings), 3),
+                'max': round(timings[-1], 3),
+            },
+        }
+
+        self.stdout.write(
+            f"{options['label'] or url}: {report['requests_per_second']} req/s, errors {report['errors']}, "
+            + ', '.join(f"{name} {value:.2f} ms" for name, value in report['time_ms'].items())
+        )
+        if options['output']:
+            with open(options['output'], 'w') as target:
+                json.dump(report, target, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
@@ -0,0 +1,60 @@
+"""
+Μέτρηση χρόνου και πλήθους ερωτημάτων ανά περίπτωση και σύγκριση δύο
+αναφορών JSON (π.χ. του main με ένα branch) για εντοπισμό regressions.
+"""
+import statistics
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def measure(operation, repeat=5, warmup=1):
+    """
+    Εκτελεί το `operation` `warmup` φορές χωρίς μέτρηση (caches, lazy imports)
+    και `repeat` φορές με μέτρηση. Ο χρόνος είναι σε ms· τα ερωτήματα είναι το
+    μέγιστο των επαναλήψεων.
+    """
+    for _ in range(warmup):
+        operation()
+    timings, queries = [], []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            operation()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(context))
+    return {
+        'time_ms': {
+            'min': round(min(timings), 3),
+            'median': round(statistics.median(timings), 3),
+            'max': round(max(timings), 3),
+        },
+        'queries': max(queries),
+        'repeat': repeat,
+    }
+
+
+def compare(baseline, current, threshold=25.0):
+    """
+    Γραμμές σύγκρισης για τις κοινές περιπτώσεις. Regression είναι κάθε
+    αύξηση ερωτημάτων ή αύξηση του διάμεσου χρόνου πάνω από `threshold` %.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        before = previous['time_ms']['median']
+        after = result['time_ms']['median']
+        change = (after - before) / before * 100 if before else 0.0
+        rows.append({
+            'case': name,
+            'queries_before': previous['queries'],
+            'queries_after': result['queries'],
+            'median_before': before,
+            'median_after': after,
+            'change_pct': round(change, 1),
+            'regression': result['queries'] > previous['queries'] or change > threshold,
+        })
+    return rows
@@ -0,0 +1,235 @@
+"""
+Συνθετικά δεδομένα για τα benchmarks: έργα με N κτίρια, όπου κάθε κτίριο έχει
+και τα 11 σενάρια, θερμομονώσεις τοίχου/οροφής με M στρώσεις υλικών και
+εικόνες. Οι τιμές είναι σταθερές, ώστε δύο εκτελέσεις να είναι συγκρίσιμες.
+"""
+import io
+from decimal import Decimal
+
+from PIL import Image
+
+from airConditioningReplacement.models import AirConditioningAnalysis
+from automaticLightingControl.models import AutomaticLightingControl
+from boilerReplacement.models import BoilerReplacement
+from building.models import Building
+from buildingImages.models import BuildingImage
+from bulbReplacement.models import BulbReplacement
+from exteriorBlinds.models import ExteriorBlinds
+from hotWaterUpgrade.models import HotWaterUpgrade
+from materials.models import Material
+from naturalGasNetwork.models import NaturalGasNetwork
+from photovoltaicSystem.models import PhotovoltaicSystem
+from prefectures.models import Prefecture
+from project.counters import count_created_buildings
+from project.models import Project
+from roofThermalInsulation.models import RoofThermalInsulation, RoofThermalInsulationMaterialLayer
+from thermalInsulation.models import ExternalWallThermalInsulation, ThermalInsulationMaterialLayer
+from user.models import User
+from windowReplacement.models import WindowReplacement
+
+BENCHMARK_EMAIL = 'benchmark@bemat.local'
+
+
+def _png(width=640, height=480):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (120, 160, 200)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _materials(count):
+    return [
+        Material.objects.create(
+            name=f'Benchmark material {index}',
+            category='insulation',
+            thermal_conductivity=0.03 + index * 0.02,
+        )
+        for index in range(count)
+    ]
+
+
+def _layers(materials):
+    """(material, material_type, thickness, surface_area, cost) ανά στρώση."""
+    return [
+        (material, 'old' if position % 3 == 0 else 'new', 0.02 + position * 0.01, 80.0, 100.0)
+        for position, material in enumerate(materials)
+    ]
+
+
+def _scenarios(user, project, building, materials):
+    """Ένα αντικείμενο από κάθε τύπο σεναρίου για το κτίριο."""
+    common = {'building': building, 'project': project}
+    scenarios = [
+        WindowReplacement.objects.create(
+            user=user, old_thermal_conductivity=5.8, new_thermal_conductivity=1.8, window_area=25,
+            cost_per_sqm=250, energy_cost_kwh=0.2, lifespan_years=20, discount_rate=5, **common
+        ),
+        BulbReplacement.objects.create(
+            user=user, old_power_per_bulb=60, old_bulb_count=50, old_operating_hours=2000,
+            new_power_per_bulb=9, new_bulb_count=50, new_operating_hours=2000, cost_per_new_bulb=5,
+            energy_cost_kwh=0.2, lifespan_years=10, **common
+        ),
+        BoilerReplacement.objects.create(
+            boiler_cost=Decimal('3000'), installation_cost=Decimal('500'),
+            annual_heating_consumption_liters=Decimal('2000'), **common
+        ),
+        AirConditioningAnalysis.objects.create(user=user, energy_cost_kwh=0.2, **common),
+        ExteriorBlinds.objects.create(window_area=25, cost_per_m2=80, energy_cost_kwh=0.2, **common),
+        PhotovoltaicSystem.objects.create(
+            user=user, pv_panels_quantity=10, pv_panels_unit_price=200, inverter_quantity=1,
+            inverter_unit_price=1500, **common
+        ),
+        HotWaterUpgrade.objects.create(
+            building=str(building.uuid), project=str(project.uuid), solar_collectors_quantity=2,
+            solar_collectors_unit_price=800, electric_heater_power=4, operating_hours_per_year=1000,
+            solar_utilization_percentage=60, energy_cost_kwh=0.2
+        ),
+        AutomaticLightingControl.objects.create(
+            lighting_area=300, cost_per_m2=Decimal('15'), installation_cost=Decimal('500'),
+            maintenance_cost=Decimal('50'), energy_cost_kwh=Decimal('0.2'), **common
+        ),
+        NaturalGasNetwork.objects.create(
+            burner_replacement_quantity=1, burner_replacement_unit_price=1200,
+            gas_pipes_quantity=20, gas_pipes_unit_price=30, **common
+        ),
+    ]
+
+    insulation = {
+        'heating_hours_per_year': 1200, 'cooling_hours_per_year': 600, 'total_cost': 6000,
+        'time_period_years': 20, 'discount_rate': 5, **common,
+    }
+    wall = ExternalWallThermalInsulation.objects.create(user=user, **insulation)
+    ThermalInsulationMaterialLayer.objects.bulk_create([
+        ThermalInsulationMaterialLayer(
+            thermal_insulation=wall, material=material, material_type=material_type,
+            thickness=thickness, surface_area=area, cost=cost,
+        )
+        for material, material_type, thickness, area, cost in _layers(materials)
+    ])
+    roof = RoofThermalInsulation.objects.create(created_by=user, **insulation)
+    roof_layers = []
+    for order, (material, material_type, thickness, area, cost) in enumerate(_layers(materials)):
+        layer = RoofThermalInsulationMaterialLayer(
+            roof_thermal_insulation=roof, material=material, material_type=material_type,
+            thickness=thickness, surface_area=area, cost=cost, order=order,
+        )
+        layer.fill_material_fields()
+        roof_layers.append(layer)
+    RoofThermalInsulationMaterialLayer.objects.bulk_create(roof_layers)
+    # Επαναϋπολογισμός με τις στρώσεις
+    wall.save()
+    roof.save()
+    return scenarios + [wall, roof]
+
+
+def seed_dataset(projects=2, buildings=5, layers=10, images=5):
+    """
+    Δημιουργεί τα δεδομένα και επιστρέφει dict με τον χρήστη, τα έργα, τα
+    κτίρια και ένα σενάριο ανά τύπο (από το πρώτο κτίριο) για τα save().
+    """
+    user = User.objects.create_user(email=BENCHMARK_EMAIL, password=None, first_name='Benchmark')
+    prefecture, _ = Prefecture.objects.get_or_create(name='Αττική', defaults={'zone': 'B'})
+    materials = _materials(layers)
+    image_data = _png()
+
+    created_projects, created_buildings = [], []
+    scenarios = None
+    for project_index in range(projects):
+        project = Project.objects.create(
+            user=user, name=f'Benchmark project {project_index}', cost_per_kwh_electricity=Decimal('0.2'),
+        )
+        created_projects.append(project)
+        for building_index in range(buildings):
+            building = Building.objects.create(
+                project=project, user=user, name=f'Benchmark building {project_index}.{building_index}',
+                usage='Γραφεία', description='Benchmark', address='Benchmark', prefecture=prefecture,
+                total_area=500, examined_area=400,
+            )
+            created_buildings.append(building)
+            building_scenarios = _scenarios(user, project, building, materials)
+            if scenarios is None:
+                scenarios = building_scenarios
+            for image_index in range(images):
+                BuildingImage.objects.create(
+                    title=f'Benchmark image {image_index}', category='exterior', building=building,
+                    project=project, user=user, image_data=image_data, image_name='benchmark.png',
+                    image_type='image/png', image_size=len(image_data),
+                )
+
+    return {
+        'user': user,
+        'projects': created_projects,
+        'buildings': created_buildings,
+        'scenarios': scenarios or [],
+    }
+
+
+def _clone(obj, **overrides):
+    """Αντίγραφο (χωρίς αποθήκευση) με νέο primary key και τα `overrides` (attnames)."""
+    model = type(obj)
+    values = {field.attname: getattr(obj, field.attname) for field in model._meta.concrete_fields if not field.primary_key}
+    values.update(overrides)
+    return model(**values)
+
+
+def clone_buildings(dataset, count, per_project=1000, batch_size=500, dependents=False):
+    """
+    Προσθέτει `count` κτίρια (σε νέα έργα των `per_project` κτιρίων) με
+    αντίγραφα των σεναρίων του πρώτου κτιρίου του `dataset`. Γράφονται με
+    bulk_create, χωρίς τους υπολογισμούς του save(), ώστε να στήνονται γρήγορα
+    χαρτοφυλάκια δεκάδων χιλιάδων κτιρίων (π.χ. για το benchmark_export). Με
+    `dependents=True` αντιγράφονται και οι στρώσεις υλικών των θερμομονώσεων
+    και οι εικόνες του κτιρίου (π.χ. για το benchmark_bulk_delete).
+    """
+    template = dataset['buildings'][0]
+    scenarios = dataset['scenarios']
+    layers = {}
+    images = []
+    if dependents:
+        # (μοντέλο στρώσης, πεδίο προς το σενάριο, στρώσεις του προτύπου) ανά τύπο θερμομόνωσης
+        for scenario in scenarios:
+            if isinstance(scenario, ExternalWallThermalInsulation):
+                layers[type(scenario)] = (
+                    ThermalInsulationMaterialLayer, 'thermal_insulation_id',
+                    list(ThermalInsulationMaterialLayer.objects.filter(thermal_insulation=scenario)),
+                )
+            elif isinstance(scenario, RoofThermalInsulation):
+                layers[type(scenario)] = (
+                    RoofThermalInsulationMaterialLayer, 'roof_thermal_insulation_id',
+                    list(RoofThermalInsulationMaterialLayer.objects.filter(roof_thermal_insulation=scenario)),
+                )
+        images = list(BuildingImage.objects.filter(building=template))
+
+    created = 0
+    while created < count:
+        project = Project.objects.create(
+            user=dataset['user'], name=f'Benchmark portfolio {Project.objects.count()}',
+            cost_per_kwh_electricity=Decimal('0.2'),
+        )
+        in_project = min(per_project, count - created)
+        for start in range(0, in_project, batch_size):
+            buildings = Building.objects.bulk_create([
+                _clone(template, project_id=project.pk, name=f'{project.name}.{start + index}')
+                for index in range(min(batch_size, in_project - start))
+            ])
+            count_created_buildings(buildings)
+            rows = {}
+            for building in buildings:
+                for scenario in scenarios:
+                    if isinstance(scenario, HotWaterUpgrade):
+                        clone = _clone(scenario, building=str(building.pk), project=str(project.pk))
+                    else:
+                        clone = _clone(scenario, building_id=building.pk, project_id=project.pk)
+                    rows.setdefault(type(scenario), []).append(clone)
+                    if type(scenario) in layers:
+                        layer_model, attname, template_layers = layers[type(scenario)]
+                        rows.setdefault(layer_model, []).extend(
+                            _clone(layer, **{attname: clone.pk}) for layer in template_layers
+                        )
+                rows.setdefault(BuildingImage, []).extend(
+                    _clone(image, building_id=building.pk, project_id=project.pk) for image in images
+                )
+            # Τα σενάρια πριν από τις στρώσεις τους (τα dict κρατούν τη σειρά εισαγωγής)
+            for model, objs in rows.items():
+                model.objects.bulk_create(objs, batch_size=batch_size)
+        created += in_project
+    return created
@@ -4,4 +4,17 @@ from .models import BoilerDetail
 class BoilerDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = BoilerDetail
-        fields = '__all__' 
\ No newline at end of file
+        fields = '__all__'
+
+
+class BoilerDetailBulkSerializer(serializers.ModelSerializer):
+    """
+    One row of a bulk create. Related objects are given by UUID and resolved
+    for all rows with a single query per relation.
+    """
+    building = serializers.UUIDField()
+    project = serializers.UUIDField(required=False, allow_null=True)
+
+    class Meta:
+        model = BoilerDetail
+        exclude = ('uuid', 'user', 'created_at', 'updated_at')
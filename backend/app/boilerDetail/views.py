@@ -8,9 +8,10 @@ from rest_framework import status
 import logging
 
 from .models import BoilerDetail
-from .serializer import BoilerDetailSerializer
+from .serializer import BoilerDetailSerializer, BoilerDetailBulkSerializer
 from building.models import Building
 from project.models import Project
+from common.bulk import bulk_create_response
 from common.utils import (
     get_user_from_token, 
     standard_error_response, 
@@ -76,6 +77,17 @@ def create_boiler_detail(request):
     except Exception as e:
         return standard_error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_create_boiler_details(request):
+    """
+    Create many boiler details in one request: {"items": [{"building", "project", ...}, ...]}.
+    The building and project of all rows are looked up together and nothing is
+    created if any row is invalid (errors are returned per row).
+    """
+    return bulk_create_response(request, BoilerDetailBulkSerializer, BoilerDetailSerializer, "boiler details")
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_building_boiler_details(request, building_uuid):
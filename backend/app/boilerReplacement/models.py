@@ -3,6 +3,7 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from building.models import Building
 from project.models import Project
+from common.finance import net_present_value, discounted_payback, internal_rate_of_return
 
 
 class BoilerReplacement(models.Model):
@@ -220,68 +221,24 @@ class BoilerReplacement(models.Model):
             
             # Discounted Payback Period calculation
             if annual_benefit > 0 and discount_rate_decimal > 0:
-                cumulative_discounted_cash_flow = 0
-                self.discounted_payback_period = years + 1  # Default: δεν αποπληρώνεται
-                
-                for year in range(1, years + 1):
-                    discounted_cash_flow = annual_benefit / ((1 + discount_rate_decimal) ** year)
-                    cumulative_discounted_cash_flow += discounted_cash_flow
-                    
-                    if cumulative_discounted_cash_flow >= float(self.total_investment_cost) and self.discounted_payback_period > years:
-                        # Linear interpolation for precise payback period
-                        previous = cumulative_discounted_cash_flow - discounted_cash_flow
-                        fraction = (float(self.total_investment_cost) - previous) / discounted_cash_flow
-                        self.discounted_payback_period = (year - 1) + fraction
+                self.discounted_payback_period = discounted_payback(
+                    float(self.total_investment_cost), annual_benefit, discount_rate_decimal, years
+                )
             else:
                 self.discounted_payback_period = 0
             
-            if annual_benefit != 0:
-                if discount_rate_decimal > 0:
-                    # NPV = Σ[Annual_Benefit / (1 + r)^t] - Initial_Investment
-                    npv_sum = 0
-                    for year in range(1, years + 1):
-                        npv_sum += annual_benefit / ((1 + discount_rate_decimal) ** year)
-                    self.net_present_value = npv_sum - float(self.total_investment_cost)
-                else:
-                    # Αν δεν υπάρχει προεξοφλητικός συντελεστής
-                    self.net_present_value = (annual_benefit * years) - float(self.total_investment_cost)
-            else:
-                self.net_present_value = -float(self.total_investment_cost)
+            # NPV = Σ[Annual_Benefit / (1 + r)^t] - Initial_Investment
+            # (χωρίς προεξοφλητικό συντελεστή: Annual_Benefit × έτη - Initial_Investment)
+            self.net_present_value = net_present_value(
+                float(self.total_investment_cost),
+                annual_benefit,
+                discount_rate_decimal if discount_rate_decimal > 0 else 0,
+                years
+            )
             
-            # IRR υπολογισμός με Newton-Raphson
+            # IRR: το επιτόκιο όπου NPV = 0
             if float(self.total_investment_cost) > 0 and annual_benefit > 0:
-                # Υπολογισμός IRR: βρίσκουμε το επιτόκιο όπου NPV = 0
-                initial_investment = float(self.total_investment_cost)
-                
-                # Αρχική εκτίμηση IRR
-                irr = 0.1  # 10%
-                tolerance = 0.00001
-                max_iterations = 1000
-                
-                for _ in range(max_iterations):
-                    # Υπολογισμός NPV με το τρέχον IRR
-                    npv = -initial_investment
-                    npv_derivative = 0
-                    
-                    for year in range(1, years + 1):
-                        factor = (1 + irr) ** year
-                        npv += annual_benefit / factor
-                        npv_derivative -= year * annual_benefit / (factor * (1 + irr))
-                    
-                    # Έλεγχος σύγκλισης
-                    if abs(npv) < tolerance:
-                        break
-                    
-                    # Newton-Raphson update
-                    if npv_derivative != 0:
-                        irr = irr - npv / npv_derivative
-                    else:
-                        break
-                    
-                    # Αποφυγή αρνητικών IRR
-                    if irr < -0.99:
-                        irr = -0.99
-                
+                irr = internal_rate_of_return(float(self.total_investment_cost), annual_benefit, years)
                 self.internal_rate_of_return = irr * 100
             else:
                 self.internal_rate_of_return = 0
@@ -297,6 +254,10 @@ class BoilerReplacement(models.Model):
             self.net_present_value = 0
             self.internal_rate_of_return = 0
 
-    def save(self, *args, **kwargs):
+    def recalculate(self):
+        """Υπολογισμός κόστους και οικονομικών δεικτών (χωρίς αποθήκευση)"""
         self._calculate_economics()
+
+    def save(self, *args, **kwargs):
+        self.recalculate()
         super().save(*args, **kwargs)
@@ -0,0 +1,213 @@
+"""
+Όλα τα δεδομένα ενός κτιρίου (συστήματα, καταναλώσεις, σενάρια) σε μία
+απάντηση, για το άνοιγμα του κτιρίου στο frontend αντί για ένα request ανά
+καρτέλα.
+
+Το κτίριο και η πρόσβαση ελέγχονται μία φορά· κάθε ενότητα είναι ένα ερώτημα
+(συν τα prefetch των στρώσεων υλικών), οπότε το πλήθος των ερωτημάτων δεν
+εξαρτάται από το πλήθος των εγγραφών. Το ETag βγαίνει από ένα μόνο ερώτημα
+(πλήθος και μέγιστο updated_at ανά ενότητα), πριν από οποιοδήποτε
+serialization, ώστε ένα αμετάβλητο κτίριο να απαντά 304 σχεδόν χωρίς κόστος.
+"""
+from django.apps import apps
+from django.db.models import Count, Max, Q, Value
+from django.utils.module_loading import import_string
+
+from common.conditional import make_etag
+from common.utils import is_admin_user
+
+
+class Section:
+    """
+    Μία ενότητα του bundle: οι εγγραφές ενός μοντέλου για το κτίριο. Οι μη
+    διαχειριστές βλέπουν μόνο όσες έχουν `owner` τον εαυτό τους (όπως τα
+    αντίστοιχα endpoints ανά καρτέλα)· με `owner=None` αρκεί η πρόσβαση στο κτίριο.
+    """
+
+    def __init__(self, label, serializer, owner='user', include_unowned=False, prefetch=(), order_by=None):
+        self.label = label
+        self.serializer = serializer
+        self.owner = owner
+        self.include_unowned = include_unowned
+        self.prefetch = prefetch
+        self.order_by = order_by
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+    def queryset(self, building, user):
+        model = self.model
+        if model._meta.get_field('building').is_relation:
+            queryset = model.objects.filter(building=building)
+        else:
+            # Το HotWaterUpgrade κρατά το κτίριο ως string UUID
+            queryset = model.objects.filter(building=str(building.pk))
+        if self.owner and not is_admin_user(user):
+            scope = Q(**{self.owner: user})
+            if self.include_unowned:
+                scope |= Q(**{f'{self.owner}__isnull': True})
+            queryset = queryset.filter(scope)
+        return queryset
+
+    def rows(self, building, user):
+        model = self.model
+        related = [
+            field.name for field in model._meta.concrete_fields
+            if field.is_relation and field.name in ('building', 'project', 'user', 'created_by', 'thermal_zone', 'energy_consumption')
+        ]
+        queryset = self.queryset(building, user).select_related(*related)
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*self.prefetch)
+        if self.order_by:
+            queryset = queryset.order_by(*self.order_by)
+        return queryset
+
+
+SECTIONS = {
+    # Συστήματα και καταναλώσεις
+    'boiler_details': Section('boilerDetail.BoilerDetail', 'boilerDetail.serializer.BoilerDetailSerializer'),
+    'cooling_systems': Section('coolingSystem.CoolingSystem', 'coolingSystem.serializer.CoolingSystemSerializer'),
+    'heating_systems': Section('heatingSystem.HeatingSystem', 'heatingSystem.serializer.HeatingSystemSerializer'),
+    'domestic_hot_water_systems': Section(
+        'domesticHotWaterSystem.DomesticHotWaterSystem',
+        'domesticHotWaterSystem.serializer.DomesticHotWaterSystemSerializer',
+    ),
+    'solar_collectors': Section('solarCollectors.SolarCollector', 'solarCollectors.serializer.SolarCollectorSerializer'),
+    'thermal_zones': Section('thermalZone.ThermalZone', 'thermalZone.serializer.ThermalZoneSerializer'),
+    'electrical_consumptions': Section(
+        'electricalConsumption.ElectricalConsumption',
+        'electricalConsumption.serializer.ElectricalConsumptionSerializer',
+    ),
+    'energy_consumptions': Section(
+        'energyConsumption.EnergyConsumption', 'energyConsumption.serializers.EnergyConsumptionSerializer',
+    ),
+    # Σενάρια
+    'window_replacements': Section(
+        'windowReplacement.WindowReplacement', 'windowReplacement.serializer.WindowReplacementSerializer',
+    ),
+    'bulb_replacements': Section('bulbReplacement.BulbReplacement', 'bulbReplacement.serializer.BulbReplacementSerializer'),
+    'boiler_replacements': Section(
+        'boilerReplacement.BoilerReplacement', 'boilerReplacement.serializer.BoilerReplacementSerializer', owner=None,
+    ),
+    'air_conditioning_analyses': Section(
+        'airConditioningReplacement.AirConditioningAnalysis',
+        'airConditioningReplacement.serializer.AirConditioningAnalysisSerializer',
+        include_unowned=True, order_by=('-created_at',),
+    ),
+    'old_air_conditionings': Section(
+        'airConditioningReplacement.OldAirConditioning',
+        'airConditioningReplacement.serializer.OldAirConditioningSerializer',
+        include_unowned=True, order_by=('-created_at',),
+    ),
+    'new_air_conditionings': Section(
+        'airConditioningReplacement.NewAirConditioning',
+        'airConditioningReplacement.serializer.NewAirConditioningSerializer',
+        include_unowned=True, order_by=('-created_at',),
+    ),
+    'roof_thermal_insulations': Section(
+        'roofThermalInsulation.RoofThermalInsulation',
+        'roofThermalInsulation.serializer.RoofThermalInsulationSerializer',
+        owner='created_by', prefetch=('material_layers__material',),
+    ),
+    'thermal_insulations': Section(
+        'thermalInsulation.ExternalWallThermalInsulation',
+        'thermalInsulation.serializer.ExternalWallThermalInsulationSerializer',
+        prefetch=('material_layers__material',),
+    ),
+    'exterior_blinds': Section('exteriorBlinds.ExteriorBlinds', 'exteriorBlinds.serializer.ExteriorBlindsSerializer', owner=None),
+    'photovoltaic_systems': Section(
+        'photovoltaicSystem.PhotovoltaicSystem', 'photovoltaicSystem.serializer.PhotovoltaicSystemSerializer',
+    ),
+    'hot_water_upgrades': Section(
+        'hotWaterUpgrade.HotWaterUpgrade', 'hotWaterUpgrade.serializer.HotWaterUpgradeSerializer',
+        owner=None, order_by=('-created_at',),
+    ),
+    'automatic_lighting_controls': Section(
+        'automaticLightingControl.AutomaticLightingControl',
+        'automaticLightingControl.serializer.AutomaticLightingControlSerializer',
+        owner=None,
+    ),
+    'natural_gas_networks': Section(
+        'naturalGasNetwork.NaturalGasNetwork', 'naturalGasNetwork.serializer.NaturalGasNetworkSerializer',
+        owner=None, order_by=('-created_at',),
+    ),
+}
+
+# Εγγραφές που ενσωματώνονται σε ενότητες χωρίς να αλλάζουν τον γονέα τους (π.χ.
+# διαγραφή στρώσης από το material-layers/<uuid>/): (μοντέλο, διαδρομή προς το
+# κτίριο). Για καθεμία μετρούν οι γραμμές και τα υλικά που ενσωματώνουν.
+NESTED = {
+    'thermal_insulations.material_layers': (
+        'thermalInsulation.ThermalInsulationMaterialLayer', 'thermal_insulation__building',
+    ),
+    'roof_thermal_insulations.material_layers': (
+        'roofThermalInsulation.RoofThermalInsulationMaterialLayer', 'roof_thermal_insulation__building',
+    ),
+}
+
+# Το ίδιο το κτίριο είναι επίσης ενότητα που μπορεί να επιλεγεί με ?include=
+BUILDING_SECTION = 'building'
+SECTION_NAMES = (BUILDING_SECTION, *SECTIONS)
+
+
+def parse_include(value):
+    """Οι ενότητες του ?include=a,b (όλες αν λείπει). ValueError για άγνωστα ονόματα."""
+    if not value:
+        return list(SECTION_NAMES)
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SECTION_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+    return [name for name in SECTION_NAMES if name in names]
+
+
+def bundle_etag(building, user, include):
+    """
+    Weak ETag από ένα ερώτημα UNION ALL με (πλήθος, μέγιστο updated_at) ανά
+    ενότητα, ανά ενσωματωμένη σχέση (NESTED) και για τα υλικά της. Καλύπτει
+    όλες τις ενότητες ανεξάρτητα από το ?include=, γιατί κάποιες ενσωματώνουν
+    δεδομένα άλλων (π.χ. θερμική ζώνη στις καταναλώσεις).
+    """
+    queries = [
+        section.queryset(building, user).order_by().values('building')
+        .annotate(section=Value(name), count=Count('pk'), changed=Max('updated_at'))
+        .values_list('section', 'count', 'changed')
+        for name, section in SECTIONS.items()
+    ]
+    for name, (label, path) in NESTED.items():
+        rows = apps.get_model(label).objects.filter(**{path: building}).order_by().values(path)
+        queries.append(
+            rows.annotate(section=Value(name), count=Count('pk'), changed=Max('updated_at'))
+            .values_list('section', 'count', 'changed')
+        )
+        queries.append(
+            rows.annotate(
+                section=Value(f'{name}.material'), count=Count('material', distinct=True),
+                changed=Max('material__updated_at'),
+            ).values_list('section', 'count', 'changed')
+        )
+    first, *rest = queries
+    versions = first.union(*rest, all=True)
+    parts = [
+        str(user.pk), str(is_admin_user(user)), ','.join(include),
+        str(building.updated_at), str(building.project.updated_at), str(building.prefecture.updated_at),
+        building.user.email,
+    ]
+    parts.extend(f"{name}:{count}:{changed}" for name, count, changed in sorted(versions))
+    return make_etag(*parts)
+
+
+def build_bundle(building, user, include, context=None):
+    """Το σώμα της απάντησης: {ενότητα: δεδομένα} για τις ενότητες του `include`."""
+    from .serializer import BuildingSerializer
+
+    data = {}
+    for name in include:
+        if name == BUILDING_SECTION:
+            data[name] = BuildingSerializer(building, context=context).data
+            continue
+        section = SECTIONS[name]
+        serializer_class = import_string(section.serializer)
+        data[name] = serializer_class(section.rows(building, user), many=True, context=context).data
+    return data
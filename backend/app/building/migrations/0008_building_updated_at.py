@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('building', '0007_alter_building_prefecture'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='building',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Τελευταία Ενημέρωση'),
+        ),
+    ]
@@ -150,6 +150,27 @@ class Building(models.Model):
         verbose_name='Ημερομηνία Δημιουργίας'
     )
     
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Τελευταία Ενημέρωση'
+    )
+    
+    class Meta:
+        # Σελιδοποίηση keyset του get_buildings (common.listing)
+        indexes = [
+            models.Index(fields=['date_created', 'uuid'], name='building_created_uuid_idx'),
+            models.Index(fields=['user', 'date_created', 'uuid'], name='building_user_created_uuid_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Το έργο και ο χρήστης κατά τη φόρτωση: τα project.signals και
+        # adminStats.signals εντοπίζουν τη μεταφορά χωρίς ερώτημα
+        instance._loaded_project_id = instance.__dict__.get('project_id')
+        instance._loaded_user_id = instance.__dict__.get('user_id')
+        return instance
+
     def save(self, *args, **kwargs):
         if self.prefecture:
             self.energy_zone = self.prefecture.zone
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from .models import Building
 from prefectures.serializers import PrefectureListSerializer
+from common.listing import SparseFieldsMixin
 
-class BuildingSerializer(serializers.ModelSerializer):
+class BuildingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     prefecture_data = PrefectureListSerializer(source='prefecture', read_only=True)
     
     class Meta:
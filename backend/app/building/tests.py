@@ -0,0 +1,193 @@
+import datetime
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from materials.models import Material
+from numericValues import cache as numeric_cache
+from prefectures.models import Prefecture
+from project.models import Project
+from roofThermalInsulation.models import RoofThermalInsulationMaterialLayer
+from thermalInsulation.models import ThermalInsulationMaterialLayer
+from user.models import User
+
+from .bundle import NESTED, SECTIONS
+from .models import Building
+
+# Υποχρεωτικά πεδία ανά ενότητα, πέρα από κτίριο / έργο / χρήστη
+SECTION_FIELDS = {
+    'electrical_consumptions': {'consumption_type': 'lighting'},
+    'energy_consumptions': {
+        'energy_source': 'electricity', 'start_date': datetime.date(2024, 1, 1),
+        'end_date': datetime.date(2024, 12, 31), 'quantity': Decimal('1000'),
+    },
+    'window_replacements': {'old_thermal_conductivity': 5.8, 'new_thermal_conductivity': 1.8, 'window_area': 10},
+    'bulb_replacements': {
+        'old_power_per_bulb': 60, 'old_bulb_count': 10, 'old_operating_hours': 3000, 'new_power_per_bulb': 9,
+        'new_bulb_count': 10, 'new_operating_hours': 3000, 'cost_per_new_bulb': 8, 'installation_cost': 100,
+        'energy_cost_kwh': 0.2, 'lifespan_years': 10,
+    },
+    'boiler_replacements': {'boiler_cost': Decimal('2500')},
+    'old_air_conditionings': {
+        'btu_type': 12000, 'cop_percentage': 3, 'eer_percentage': 2.8, 'heating_hours_per_year': 800,
+        'cooling_hours_per_year': 600, 'quantity': 2,
+    },
+    'new_air_conditionings': {
+        'btu_type': 12000, 'cop_percentage': 4.6, 'eer_percentage': 4.1, 'heating_hours_per_year': 800,
+        'cooling_hours_per_year': 600, 'quantity': 2,
+    },
+    'exterior_blinds': {'window_area': 20, 'cost_per_m2': 60},
+    'automatic_lighting_controls': {
+        'lighting_area': 300, 'cost_per_m2': Decimal('15'), 'installation_cost': Decimal('500'),
+        'maintenance_cost': Decimal('50'),
+    },
+}
+
+
+class BuildingBundleTests(TestCase):
+    """Το /api/buildings/<uuid>/bundle/: ενότητες, πλήθος ερωτημάτων και ETag."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='bundle@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+        cls.project = Project.objects.create(user=cls.user, name='Bundle', cost_per_kwh_electricity=Decimal('0.2'))
+        cls.material = Material.objects.create(name='EPS', category='insulation', thermal_conductivity=0.035)
+        cls.building = cls.create_building('Ένα')
+        cls.fill(cls.building, 1)
+
+    @classmethod
+    def create_building(cls, name):
+        return Building.objects.create(
+            project=cls.project, user=cls.user, name=name, usage='Γραφεία', description='Test',
+            address='Test', prefecture=cls.prefecture, total_area=500, examined_area=400,
+        )
+
+    @classmethod
+    def fill(cls, building, count):
+        """
+        Μία εγγραφή σε κάθε ενότητα (`count` όπου επιτρέπονται πολλές ανά κτίριο)
+        και `count` στρώσεις υλικών ανά μόνωση.
+        """
+        rows = {}
+        for name, section in SECTIONS.items():
+            model = section.model
+            field_names = {field.name for field in model._meta.concrete_fields}
+            fields = dict(SECTION_FIELDS.get(name, {}))
+            if model._meta.get_field('building').is_relation:
+                fields.update(building=building, project=building.project)
+            else:
+                fields.update(building=str(building.pk), project=str(building.project_id))
+            for owner in ('user', 'created_by'):
+                if owner in field_names:
+                    fields[owner] = cls.user
+            if 'thermal_zone' in field_names:
+                fields['thermal_zone'] = rows['thermal_zones'][0]
+            unique = model._meta.unique_together or model._meta.get_field('building').unique
+            repeat = 1 if unique else count
+            rows[name] = [model.objects.create(**fields) for _ in range(repeat)]
+
+        for _ in range(count):
+            ThermalInsulationMaterialLayer.objects.create(
+                thermal_insulation=rows['thermal_insulations'][0], material=cls.material,
+                thickness=0.05, surface_area=100,
+            )
+            RoofThermalInsulationMaterialLayer.objects.create(
+                roof_thermal_insulation=rows['roof_thermal_insulations'][0], material=cls.material,
+                material_type='new', thickness=0.05, surface_area=100,
+            )
+        return rows
+
+    def setUp(self):
+        numeric_cache.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def url(self, building=None):
+        return f'/api/buildings/{(building or self.building).pk}/bundle/'
+
+    def get_etag(self):
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_every_section_is_returned(self):
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['building']['uuid'], str(self.building.pk))
+        for name in SECTIONS:
+            with self.subTest(section=name):
+                self.assertTrue(data[name])
+        self.assertEqual(len(data['thermal_insulations'][0]['material_layers']), 1)
+
+    def test_query_count_does_not_depend_on_row_count(self):
+        large = self.create_building('Πολλά')
+        self.fill(large, 5)
+        numeric_cache.get_numeric_values()
+
+        queries = []
+        for building in (self.building, large):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(self.url(building))
+            self.assertEqual(response.status_code, 200)
+            queries.append(len(context))
+        self.assertEqual(queries[0], queries[1])
+        self.assertEqual(len(response.json()['data']['boiler_details']), 5)
+
+    def test_include_selects_sections_and_rejects_unknown_names(self):
+        response = self.client.get(self.url(), {'include': 'heating_systems,thermal_zones'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['data']), {'heating_systems', 'thermal_zones'})
+
+        response = self.client.get(self.url(), {'include': 'heating_systems,unknown'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.get_etag()
+        response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_edit_in_any_section_changes_etag(self):
+        for name, section in SECTIONS.items():
+            with self.subTest(section=name, change='save'):
+                before = self.get_etag()
+                section.queryset(self.building, self.user).first().save()
+                self.assertNotEqual(self.get_etag(), before)
+
+        # Από το τέλος, ώστε π.χ. οι καταναλώσεις να διαγραφούν πριν από τη θερμική ζώνη τους
+        for name, section in reversed(SECTIONS.items()):
+            with self.subTest(section=name, change='delete'):
+                before = self.get_etag()
+                section.queryset(self.building, self.user).first().delete()
+                self.assertNotEqual(self.get_etag(), before)
+
+    def test_nested_layer_delete_changes_etag(self):
+        for model in (ThermalInsulationMaterialLayer, RoofThermalInsulationMaterialLayer):
+            with self.subTest(model=model.__name__):
+                before = self.get_etag()
+                model.objects.first().delete()
+                self.assertNotEqual(self.get_etag(), before)
+
+    def test_related_objects_change_etag(self):
+        later = datetime.timedelta(seconds=1)
+        changes = {
+            'material': lambda: Material.objects.filter(pk=self.material.pk).update(
+                thermal_conductivity=0.04, updated_at=self.material.updated_at + later,
+            ),
+            'prefecture': lambda: Prefecture.objects.filter(pk=self.prefecture.pk).update(
+                name='Αττικής', updated_at=self.prefecture.updated_at + later,
+            ),
+            'user email': lambda: User.objects.filter(pk=self.user.pk).update(email='renamed@bemat.local'),
+            'project': lambda: Project.objects.get(pk=self.project.pk).save(),
+            'building': lambda: Building.objects.get(pk=self.building.pk).save(),
+        }
+        for name, change in changes.items():
+            with self.subTest(change=name):
+                before = self.get_etag()
+                change()
+                self.assertNotEqual(self.get_etag(), before)
@@ -8,6 +8,7 @@ urlpatterns = [
     path('get/<uuid:uuid>/', views.get_building_detail, name='get_building_detail'),
     path('delete/<uuid:uuid>/', views.delete_building, name='delete_building'),
     path('update/<uuid:uuid>/', views.update_building, name='update_building'),
+    path('<uuid:uuid>/bundle/', views.get_building_bundle, name='get_building_bundle'),
     path('<uuid:building_uuid>/contacts/create/', ContactCreateForBuildingView.as_view(), name='building-contact-create'),
     path('<uuid:building_uuid>/contacts/', ContactListCreateView.as_view(), name='building-contact-list'),
     path('<uuid:building_uuid>/contacts/<uuid:contact_uuid>/delete/', ContactDeleteView.as_view(), name='building-contact-delete'),
@@ -1,6 +1,5 @@
 import logging
-from django.dispatch import receiver
-from django.db.models.signals import post_save, post_delete
+from django.db.models import Count, Max
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -9,9 +8,12 @@ from rest_framework import status
 
 from .models import Building
 from .serializer import BuildingSerializer
+from .bundle import build_bundle, bundle_etag, parse_include
 from project.models import Project
 from contact.models import Contact
 from contact.serializers import ContactSerializer
+from common.conditional import conditional_etag, etag_matches, make_etag, not_modified, set_etag
+from common.listing import ListingError, keyset_page, parse_fields
 from common.utils import (
     get_user_from_token, 
     standard_error_response, 
@@ -89,9 +91,31 @@ def create_building(request):
     except Exception as e:
         return standard_error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+def _buildings_etag(request):
+    """Πλήθος και τελευταία αλλαγή των κτιρίων της λίστας και των νομών τους."""
+    project_uuid = request.GET.get("project")
+    if project_uuid and not validate_uuid(project_uuid):
+        return None
+    buildings = Building.objects.all()
+    if project_uuid:
+        buildings = buildings.filter(project__uuid=project_uuid)
+    if not is_admin_user(request.user):
+        buildings = buildings.filter(user=request.user)
+    version = buildings.aggregate(
+        count=Count('pk'), changed=Max('updated_at'), prefecture_changed=Max('prefecture__updated_at'),
+    )
+    return make_etag(request.user.pk, version['count'], version['changed'], version['prefecture_changed'])
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(_buildings_etag)
 def get_buildings(request):
+    """
+    Τα κτίρια του χρήστη (όλα για διαχειριστές), σε σελίδες ταξινομημένες κατά
+    (date_created, uuid): ?page_size= (έως 500), ?cursor= από το
+    pagination.next_cursor της προηγούμενης σελίδας, ?fields=uuid,name.
+    """
     try:
         project_uuid = request.GET.get("project")
         
@@ -109,14 +133,41 @@ def get_buildings(request):
             else:
                 buildings = Building.objects.filter(user=request.user)
         
-        serializer = BuildingSerializer(buildings, many=True)
-        return standard_success_response(serializer.data)
-        
+        fields = parse_fields(request, BuildingSerializer)
+        buildings, pagination = keyset_page(buildings.select_related('prefecture'), request)
+        serializer = BuildingSerializer(buildings, many=True, fields=fields)
+        response = standard_success_response(serializer.data)
+        response.data['pagination'] = pagination
+        return response
+
+    except ListingError as e:
+        return standard_error_response(str(e), status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return standard_error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _building_detail_etag(request, uuid):
+    """
+    Το κτίριο, το έργο, ο νομός και οι επαφές του σε ένα ερώτημα. None αν δεν
+    υπάρχει ή δεν επιτρέπεται, ώστε το view να δώσει το αντίστοιχο σφάλμα.
+    """
+    if not validate_uuid(uuid):
+        return None
+    building = (
+        Building.objects.select_related('user', 'project__user', 'prefecture')
+        .annotate(contacts_count=Count('contacts'), contacts_changed=Max('contacts__updated_at'))
+        .filter(uuid=uuid).first()
+    )
+    if building is None or not has_access_permission(request.user, building):
+        return None
+    return make_etag(
+        building.updated_at, building.project.updated_at, building.prefecture.updated_at,
+        building.user.email, building.contacts_count, building.contacts_changed,
+    )
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(_building_detail_etag)
 def get_building_detail(request, uuid):
     """
     Endpoint για την ανάκτηση λεπτομερειών ενός συγκεκριμένου κτιρίου.
@@ -178,6 +229,35 @@ def get_building_detail(request, uuid):
     except Exception as e:
         return standard_error_response(f"An unexpected error occurred: {str(e)}", status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_building_bundle(request, uuid):
+    """
+    Όλα τα συστήματα, οι καταναλώσεις και τα σενάρια ενός κτιρίου σε μία
+    απάντηση (βλ. building.bundle). ?include=heating_systems,thermal_zones για
+    επιλογή ενοτήτων· με If-None-Match απαντά 304 αν δεν άλλαξε τίποτα.
+    """
+    try:
+        include = parse_include(request.query_params.get('include'))
+    except ValueError as e:
+        return standard_error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+    try:
+        building = Building.objects.select_related('user', 'project__user', 'prefecture').get(uuid=uuid)
+    except Building.DoesNotExist:
+        return standard_error_response("Building not found", status.HTTP_404_NOT_FOUND)
+
+    if not has_access_permission(request.user, building):
+        return standard_error_response("Access denied: You do not own this building", status.HTTP_403_FORBIDDEN)
+
+    etag = bundle_etag(building, request.user, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return set_etag(
+        standard_success_response(build_bundle(building, request.user, include, {'request': request})), etag,
+    )
+
+
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def delete_building(request, uuid):
@@ -198,36 +278,6 @@ def delete_building(request, uuid):
     except Exception as e:
         return standard_error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@receiver(post_save, sender=Building)
-def building_post_save_update_project_buildings_count(sender, instance, **kwargs):
-    project = instance.project
-    if project:
-        project.buildings_count = project.buildings.count()
-        project.save(update_fields=['buildings_count'])
-
-@receiver(post_delete, sender=Building)
-def building_post_delete_update_project_buildings_count(sender, instance, **kwargs):
-    project = instance.project
-    if project and hasattr(project, 'pk') and project.pk is not None:
-        try:
-            project_instance = Project.objects.get(pk=project.pk)
-            new_count = project_instance.buildings.count()
-            if project_instance.buildings_count != new_count:
-                project_instance.buildings_count = new_count
-                project_instance.save(update_fields=['buildings_count'])
-                logger.info(f"Successfully updated buildings_count for project {project.pk} to {new_count} after building delete.")
-            else:
-                logger.info(f"buildings_count for project {project.pk} is already {new_count}. No update needed after building delete.")
-        except Project.DoesNotExist:
-            logger.info(f"Project {project.pk if project else 'unknown'} not found during building delete signal (likely deleted). No count update needed.")
-            pass
-        except Exception as e:
-            logger.error(
-                f"Could not update buildings_count for project {project.pk if project else 'unknown'} during building delete signal. Error: {str(e)}",
-                exc_info=True 
-            )
-            pass
-
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def update_building(request, uuid):
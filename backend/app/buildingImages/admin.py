@@ -4,8 +4,8 @@ from .models import BuildingImage
 
 @admin.register(BuildingImage)
 class BuildingImageAdmin(admin.ModelAdmin):
-    list_display = ['title', 'category', 'building', 'project', 'uploaded_at']
-    list_filter = ['category', 'uploaded_at', 'building', 'project']
+    list_display = ['title', 'category', 'building', 'project', 'storage_backend', 'uploaded_at']
+    list_filter = ['category', 'storage_backend', 'uploaded_at', 'building', 'project']
     search_fields = ['title', 'description', 'tags', 'building__name']
     readonly_fields = ['uploaded_at', 'updated_at']
     
@@ -5,3 +5,6 @@ class BuildingimagesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'buildingImages'
     verbose_name = 'Building Images'
+
+    def ready(self):
+        import buildingImages.signals
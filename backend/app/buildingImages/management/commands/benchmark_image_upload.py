@@ -0,0 +1,224 @@
+import base64
+import hashlib
+import json
+import os
+import resource
+import shutil
+import tempfile
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections, transaction
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from rest_framework.test import force_authenticate
+
+from building.models import Building
+from buildingImages.models import release_stored_image
+from buildingImages.storage import content_key
+from buildingImages.uploads import MAX_IMAGE_SIZE, UPLOAD_CHUNK_SIZE
+from buildingImages.views import BuildingImageViewSet
+
+MODES = ['base64', 'multipart', 'chunked']
+BOUNDARY = 'BenchmarkBoundary'
+BLOCK_SIZE = 3 * 64 * 1024  # multiple of 3 so base64 blocks concatenate without padding
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the peak memory of one image upload per upload path (legacy base64 JSON, '
+        'multipart, chunked). Request bodies are prepared as files and read like a socket, '
+        'each path runs in a forked process inside a rolled-back transaction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--building', required=True, help='UUID of the building to upload to (its owner is used)')
+        parser.add_argument('--size-mb', type=float, default=10, help='Image size in MB (default: 10)')
+        parser.add_argument('--chunk-size', type=int, default=UPLOAD_CHUNK_SIZE,
+                            help=f'Chunk size in bytes for the chunked path (default: {UPLOAD_CHUNK_SIZE})')
+        parser.add_argument('--mode', action='append', choices=MODES, help='Upload path(s) to measure (default: all)')
+
+    def handle(self, *args, **options):
+        if not hasattr(os, 'fork'):
+            raise CommandError('This benchmark needs os.fork (Linux / macOS)')
+        try:
+            building = Building.objects.select_related('user').get(uuid=options['building'])
+        except (Building.DoesNotExist, ValueError):
+            raise CommandError(f"Building {options['building']} not found")
+        if building.user is None:
+            raise CommandError('The building has no owner to upload as')
+
+        size = int(options['size_mb'] * 1024 * 1024)
+        if not 0 < size <= MAX_IMAGE_SIZE:
+            raise CommandError('--size-mb must be between 0 and 10')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive integer')
+
+        fields = {
+            'title': 'benchmark',
+            'category': 'other',
+            'building': str(building.uuid),
+            'project': str(building.project_id),
+        }
+        directory = tempfile.mkdtemp(prefix='image-upload-benchmark-')
+        try:
+            payload_path = os.path.join(directory, 'payload.jpg')
+            _write_payload(payload_path, size)
+            _write_base64_body(os.path.join(directory, 'base64.body'), fields, payload_path)
+            _write_multipart_body(os.path.join(directory, 'multipart.body'), fields, payload_path)
+
+            self.stdout.write(f"Uploading {size / 1024 / 1024:.1f} MB per path")
+            self.stdout.write(f"{'path':<10} {'status':>6} {'peak RSS +MB':>13} {'peak Python MB':>15}")
+            for mode in options['mode'] or MODES:
+                result = self._run_forked(mode, building.user, fields, payload_path, directory, options['chunk_size'])
+                self.stdout.write(
+                    f"{mode:<10} {result['status']:>6} {result['rss_mb']:>13.1f} {result['python_mb']:>15.1f}"
+                )
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _run_forked(self, mode, user, fields, payload_path, directory, chunk_size):
+        # Fresh database connections on both sides of the fork
+        connections.close_all()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            try:
+                result = _measure(mode, user, fields, payload_path, directory, chunk_size)
+            except Exception as e:
+                result = {'status': f'error: {e}', 'rss_mb': 0.0, 'python_mb': 0.0}
+            with os.fdopen(write_fd, 'w') as pipe:
+                json.dump(result, pipe)
+            os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            output = pipe.read()
+        os.waitpid(pid, 0)
+        return json.loads(output)
+
+
+def _write_payload(path, size):
+    """JPEG magic bytes followed by random data (no thumbnail can be decoded from it)."""
+    with open(path, 'wb') as target:
+        target.write(b'\xff\xd8\xff\xe0')
+        remaining = size - 4
+        while remaining > 0:
+            block = os.urandom(min(BLOCK_SIZE, remaining))
+            target.write(block)
+            remaining -= len(block)
+
+
+def _copy_blocks(source, target, encode=None):
+    while True:
+        block = source.read(BLOCK_SIZE)
+        if not block:
+            return
+        target.write(encode(block) if encode else block)
+
+
+def _write_base64_body(path, fields, payload_path):
+    prefix = json.dumps(fields)[:-1] + ', "image": "data:image/jpeg;base64,'
+    with open(path, 'wb') as target, open(payload_path, 'rb') as source:
+        target.write(prefix.encode())
+        _copy_blocks(source, target, base64.b64encode)
+        target.write(b'"}')
+
+
+def _write_multipart_body(path, fields, payload_path):
+    with open(path, 'wb') as target, open(payload_path, 'rb') as source:
+        for name, value in fields.items():
+            target.write(
+                f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+            )
+        target.write(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="image"; filename="benchmark.jpg"\r\n'
+            f'Content-Type: image/jpeg\r\n\r\n'.encode()
+        )
+        _copy_blocks(source, target)
+        target.write(f'\r\n--{BOUNDARY}--\r\n'.encode())
+
+
+def _factory():
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+    return RequestFactory(SERVER_NAME=hosts[0] if hosts else 'localhost')
+
+
+def _request(method, path, body, offset, length, content_type, user, headers=None):
+    """WSGIRequest whose body is read from an open file, as from a socket."""
+    environ = dict(_factory().generic(method, path, b'', **(headers or {})).environ)
+    body.seek(offset)
+    environ['wsgi.input'] = body
+    environ['CONTENT_TYPE'] = content_type
+    environ['CONTENT_LENGTH'] = str(length)
+    request = WSGIRequest(environ)
+    force_authenticate(request, user=user)
+    return request
+
+
+def _send(view_actions, request, **kwargs):
+    response = BuildingImageViewSet.as_view(view_actions)(request, **kwargs)
+    response.render()
+    return response
+
+
+def _upload(mode, user, fields, payload_path, directory, chunk_size):
+    if mode in ('base64', 'multipart'):
+        body_path = os.path.join(directory, f'{mode}.body')
+        if mode == 'base64':
+            content_type = 'application/json'
+        else:
+            content_type = f'multipart/form-data; boundary={BOUNDARY}'
+        with open(body_path, 'rb') as body:
+            request = _request('POST', '/building-images/upload/', body, 0,
+                               os.path.getsize(body_path), content_type, user)
+            return _send({'post': 'upload_image'}, request).status_code
+
+    total = os.path.getsize(payload_path)
+    factory = _factory()
+    request = factory.post('/building-images/uploads/', {**fields, 'size': total})
+    force_authenticate(request, user=user)
+    response = _send({'post': 'create_upload'}, request)
+    if response.status_code != 201:
+        return response.status_code
+    upload_id = response.data['upload_id']
+
+    with open(payload_path, 'rb') as body:
+        for start in range(0, total, chunk_size):
+            end = min(start + chunk_size, total) - 1
+            request = _request(
+                'PUT', f'/building-images/uploads/{upload_id}/', body, start, end - start + 1,
+                'application/octet-stream', user, {'HTTP_CONTENT_RANGE': f'bytes {start}-{end}/{total}'},
+            )
+            response = _send({'put': 'upload_chunk'}, request, upload_id=upload_id)
+            if response.status_code != 200:
+                return response.status_code
+
+    request = factory.post(f'/building-images/uploads/{upload_id}/complete/')
+    force_authenticate(request, user=user)
+    return _send({'post': 'complete_upload'}, request, upload_id=upload_id).status_code
+
+
+def _measure(mode, user, fields, payload_path, directory, chunk_size):
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    # With DEBUG the query log keeps a quoted copy of every BLOB parameter
+    with override_settings(DEBUG=False), transaction.atomic():
+        status = _upload(mode, user, fields, payload_path, directory, chunk_size)
+        transaction.set_rollback(True)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # The rows were rolled back; remove what an external backend stored for them
+    with open(payload_path, 'rb') as payload:
+        checksum = hashlib.file_digest(payload, 'sha256').hexdigest()
+    release_stored_image(settings.BUILDING_IMAGE_STORAGE, content_key(checksum))
+    return {
+        'status': status,
+        'rss_mb': (rss_after - rss_before) / 1024,
+        'python_mb': python_peak / 1024 / 1024,
+    }
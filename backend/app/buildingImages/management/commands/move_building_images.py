@@ -0,0 +1,128 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from buildingImages.models import BuildingImage, release_stored_image
+from buildingImages.storage import STORAGE_CLASSES, STORAGE_DATABASE, get_storage
+from buildingImages.thumbnails import image_checksum
+
+METADATA_FIELDS = ('uuid', 'image_checksum', 'image_type', 'storage_backend', 'storage_key')
+
+
+class Command(BaseCommand):
+    help = (
+        'Move building image data between storage backends (database BLOB, filesystem, s3) in batches, '
+        'verifying the SHA-256 checksum of every image'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--to',
+            choices=sorted(STORAGE_CLASSES),
+            help='Target backend (default: BUILDING_IMAGE_STORAGE)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of images selected per batch; image data is loaded one image at a time (default: 50)'
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Read every image back from the target backend and compare its checksum before switching the row'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many images and bytes would be moved'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be a positive integer')
+        try:
+            target = get_storage(options['to'] or settings.BUILDING_IMAGE_STORAGE)
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+
+        queryset = BuildingImage.objects.exclude(storage_backend=target.name)
+        total = queryset.count()
+        if options['dry_run']:
+            self.stdout.write(f"{total} images would be moved to '{target.name}'")
+            return
+
+        started = time.monotonic()
+        moved = failed = skipped = moved_bytes = 0
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(page.order_by('pk').values(*METADATA_FIELDS)[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1]['uuid']
+
+            for row in batch:
+                try:
+                    size = self._move(row, target, options['verify'])
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"  {row['uuid']}: {e}")
+                    continue
+                if size is None:
+                    skipped += 1
+                else:
+                    moved += 1
+                    moved_bytes += size
+            self.stdout.write(f"{moved + failed + skipped}/{total} images processed")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Moved {moved} images ({moved_bytes / 1024 / 1024:.1f} MB) to '{target.name}' in {elapsed:.1f}s"
+            f" - {failed} failed, {skipped} changed concurrently and skipped"
+        ))
+        if moved and target.name != STORAGE_DATABASE and connection.vendor == 'postgresql':
+            self.stdout.write(
+                f"Run VACUUM FULL \"{BuildingImage._meta.db_table}\" to return the freed space to the operating system"
+            )
+
+    def _move(self, row, target, verify):
+        """
+        Copies one image to the target backend and switches its row. Returns the
+        number of bytes moved, or None if the row changed in the meantime.
+        """
+        if row['storage_backend'] == STORAGE_DATABASE:
+            data = BuildingImage.objects.filter(uuid=row['uuid']).values_list('image_data', flat=True).first()
+            data = bytes(data) if data else b''
+        else:
+            data = get_storage(row['storage_backend']).read(row['storage_key'])
+
+        checksum = image_checksum(data)
+        if row['image_checksum'] and checksum != row['image_checksum']:
+            raise ValueError(f"checksum mismatch in '{row['storage_backend']}' storage")
+
+        if target.in_database:
+            changes = {'image_data': data, 'storage_key': ''}
+        else:
+            key = target.save(checksum, data, row['image_type'])
+            if verify and image_checksum(target.read(key)) != checksum:
+                raise ValueError(f"checksum mismatch after writing to '{target.name}' storage")
+            changes = {'image_data': b'', 'storage_key': key}
+
+        # Conditional update: a concurrent replacement of the image wins
+        updated = BuildingImage.objects.filter(
+            uuid=row['uuid'],
+            storage_backend=row['storage_backend'],
+            storage_key=row['storage_key'],
+            image_checksum=row['image_checksum'],
+        ).update(storage_backend=target.name, image_checksum=checksum, **changes)
+        if not updated:
+            if not target.in_database:
+                release_stored_image(target.name, changes['storage_key'])
+            return None
+
+        release_stored_image(row['storage_backend'], row['storage_key'])
+        return len(data)
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:13
+
+from django.db import migrations, models
+
+
+def populate_thumbnails(apps, schema_editor):
+    from buildingImages.thumbnails import image_checksum, make_thumbnail
+
+    BuildingImage = apps.get_model('buildingImages', 'BuildingImage')
+    for pk in BuildingImage.objects.values_list('uuid', flat=True):
+        obj = BuildingImage.objects.only('uuid', 'image_data').get(uuid=pk)
+        thumbnail_data, thumbnail_type = make_thumbnail(obj.image_data)
+        BuildingImage.objects.filter(uuid=pk).update(
+            image_checksum=image_checksum(obj.image_data),
+            thumbnail_data=thumbnail_data,
+            thumbnail_type=thumbnail_type,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buildingImages', '0007_remove_buildingimage_id_alter_buildingimage_uuid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='buildingimage',
+            name='image_checksum',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 of the image data, used as ETag', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='buildingimage',
+            name='thumbnail_data',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+        migrations.AddField(
+            model_name='buildingimage',
+            name='thumbnail_type',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.RunPython(populate_thumbnails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:16
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('building', '0007_alter_building_prefecture'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('project', '0007_buildingprogress'),
+        ('buildingImages', '0008_thumbnail_and_checksum'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageUploadSession',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('category', models.CharField(choices=[('exterior', 'Exterior Views'), ('interior', 'Interior Views'), ('systems', 'Building Systems'), ('construction', 'Construction Details'), ('documentation', 'Documentation'), ('other', 'Other')], default='other', max_length=20)),
+                ('tags', models.CharField(blank=True, max_length=500, null=True)),
+                ('image_type', models.CharField(blank=True, default='', help_text='Detected from the magic bytes of the first chunk', max_length=50)),
+                ('total_size', models.PositiveIntegerField(help_text='Declared image size in bytes')),
+                ('received_size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='image_upload_sessions', to='building.building')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='image_upload_sessions', to='project.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='image_upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Image Upload Session',
+                'verbose_name_plural': 'Image Upload Sessions',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
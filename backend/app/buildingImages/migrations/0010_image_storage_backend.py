@@ -0,0 +1,23 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buildingImages', '0009_image_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='buildingimage',
+            name='storage_backend',
+            field=models.CharField(choices=[('database', 'Database'), ('filesystem', 'File system'), ('s3', 'S3')], default='database', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='buildingimage',
+            name='storage_key',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Content-addressed key in the storage backend', max_length=255),
+        ),
+    ]
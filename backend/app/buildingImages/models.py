@@ -1,10 +1,28 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import FileExtensionValidator
 from django.conf import settings
 from building.models import Building
 from project.models import Project
 import base64
+from .thumbnails import image_checksum, make_thumbnail
+from .uploads import MAX_IMAGE_SIZE
+from .storage import STORAGE_CHOICES, STORAGE_DATABASE, get_storage
+
+
+def release_stored_image(backend, key):
+    """
+    Deletes a stored image once the transaction commits, unless another
+    image still references the same content-addressed key.
+    """
+    if backend == STORAGE_DATABASE or not key:
+        return
+    
+    def delete_if_unreferenced():
+        if not BuildingImage.objects.filter(storage_backend=backend, storage_key=key).exists():
+            get_storage(backend).delete(key)
+    
+    transaction.on_commit(delete_if_unreferenced)
 
 
 class BuildingImage(models.Model):
@@ -32,6 +50,15 @@ class BuildingImage(models.Model):
     image_name = models.CharField(max_length=255, help_text="Original filename", default='')
     image_type = models.CharField(max_length=50, help_text="Image MIME type (e.g., image/jpeg)", default='image/jpeg')
     image_size = models.PositiveIntegerField(help_text="Image file size in bytes", default=0)
+    image_checksum = models.CharField(max_length=64, blank=True, default='', help_text="SHA-256 of the image data, used as ETag")
+    
+    # Where the image data lives; with an external backend image_data stays empty
+    storage_backend = models.CharField(max_length=20, choices=STORAGE_CHOICES, default=STORAGE_DATABASE)
+    storage_key = models.CharField(max_length=255, blank=True, default='', db_index=True, help_text="Content-addressed key in the storage backend")
+    
+    # Pre-generated thumbnail served by the list views instead of the full image
+    thumbnail_data = models.BinaryField(blank=True, default=b'')
+    thumbnail_type = models.CharField(max_length=50, blank=True, default='')
     
     building = models.ForeignKey(Building, on_delete=models.CASCADE, related_name='images')
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='building_images')
@@ -52,14 +79,73 @@ class BuildingImage(models.Model):
         """Custom validation for file size"""
         from django.core.exceptions import ValidationError
         if self.image_data:
-            # Check file size (10MB = 10 * 1024 * 1024 bytes)
-            if len(self.image_data) > 10 * 1024 * 1024:
+            if len(self.image_data) > MAX_IMAGE_SIZE:
                 raise ValidationError("File size cannot exceed 10MB.")
 
+    # Open file with new image content, set instead of image_data for uploads;
+    # save() streams it to the storage backend and clears it.
+    image_file = None
+
+    def save(self, *args, **kwargs):
+        """
+        Regenerate checksum and thumbnail whenever the image data changes and
+        move new image data to the active storage backend
+        """
+        changed_fields = set()
+        released = None
+        source = self.image_file
+        self.image_file = None
+        if source is None and 'image_data' not in self.get_deferred_fields() and self.image_data:
+            source = self.image_data
+        if source is not None:
+            # Both read a file in blocks and rewind it
+            checksum = image_checksum(source)
+            if checksum != self.image_checksum:
+                self.image_checksum = checksum
+                self.thumbnail_data, self.thumbnail_type = make_thumbnail(source)
+                changed_fields |= {'image_checksum', 'thumbnail_data', 'thumbnail_type'}
+            
+            storage = get_storage()
+            if self.storage_backend != STORAGE_DATABASE and self.storage_key:
+                released = (self.storage_backend, self.storage_key)
+            if not storage.in_database:
+                self.storage_key = storage.save(self.image_checksum, source, self.image_type)
+                self.image_data = b''
+            else:
+                # The database backend keeps the bytes in the row itself
+                if hasattr(source, 'read'):
+                    self.image_data = source.read()
+                self.storage_key = ''
+            self.storage_backend = storage.name
+            changed_fields |= {'image_data', 'storage_backend', 'storage_key'}
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and changed_fields:
+            kwargs['update_fields'] = set(update_fields) | changed_fields
+        super().save(*args, **kwargs)
+        
+        if released and released != (self.storage_backend, self.storage_key):
+            release_stored_image(*released)
+
+    def open_image_data(self):
+        """Image content as bytes, or as a file object (with .size) for file system storage"""
+        if self.storage_backend == STORAGE_DATABASE:
+            return self.image_data
+        return get_storage(self.storage_backend).open(self.storage_key)
+
+    def load_image_data(self):
+        """Image content as bytes, wherever it is stored"""
+        data = self.open_image_data()
+        if hasattr(data, 'read'):
+            with data:
+                return data.read()
+        return bytes(data) if data else b''
+
     def get_image_data_url(self):
         """Return data URL for the image"""
-        if self.image_data:
-            encoded = base64.b64encode(self.image_data).decode('utf-8')
+        data = self.load_image_data()
+        if data:
+            encoded = base64.b64encode(data).decode('utf-8')
             return f"data:{self.image_type};base64,{encoded}"
         return None
 
@@ -67,3 +153,36 @@ class BuildingImage(models.Model):
     def image_url(self):
         """Property to maintain compatibility with frontend"""
         return self.get_image_data_url()
+
+
+class ImageUploadSession(models.Model):
+    """Resumable chunked upload; the received bytes live in a temporary file until completion"""
+    uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True, null=True)
+    category = models.CharField(max_length=20, choices=BuildingImage.CATEGORY_CHOICES, default='other')
+    tags = models.CharField(max_length=500, blank=True, null=True)
+    
+    image_type = models.CharField(max_length=50, blank=True, default='', help_text="Detected from the magic bytes of the first chunk")
+    total_size = models.PositiveIntegerField(help_text="Declared image size in bytes")
+    received_size = models.PositiveIntegerField(default=0)
+    
+    building = models.ForeignKey(Building, on_delete=models.CASCADE, related_name='image_upload_sessions')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='image_upload_sessions')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='image_upload_sessions')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Image Upload Session"
+        verbose_name_plural = "Image Upload Sessions"
+    
+    def __str__(self):
+        return f"{self.title} ({self.received_size}/{self.total_size})"
+    
+    @property
+    def is_complete(self):
+        return self.received_size == self.total_size
@@ -1,12 +1,17 @@
 from rest_framework import serializers
 from .models import BuildingImage
 import base64
+import binascii
 import uuid
-from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import UploadedFile
+from .streaming import signed_image_url
+from .uploads import MAX_IMAGE_SIZE, UploadError, detect_image_type, image_name, open_uploaded_file
 
 
 class BuildingImageSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    image_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
     
     class Meta:
         model = BuildingImage
@@ -17,6 +22,8 @@ class BuildingImageSerializer(serializers.ModelSerializer):
             'category',
             'tags',
             'image',
+            'image_url',
+            'thumbnail_url',
             'image_name',
             'image_type',
             'image_size',
@@ -31,9 +38,53 @@ class BuildingImageSerializer(serializers.ModelSerializer):
         """Return data URL for the image"""
         return obj.get_image_data_url()
 
+    def get_image_url(self, obj):
+        return signed_image_url(self.context.get('request'), obj, 'raw')
+
+    def get_thumbnail_url(self, obj):
+        return signed_image_url(self.context.get('request'), obj, 'thumbnail')
+
+
+class ImageDataField(serializers.Field):
+    """
+    Accepts either a multipart file (preferred, streamed to disk by Django
+    and from there to the storage backend) or the legacy base64 string / data
+    URL. The type is always detected from the magic bytes of the content.
+    """
+
+    def to_internal_value(self, value):
+        if isinstance(value, UploadedFile):
+            try:
+                image_file, image_type = open_uploaded_file(value)
+            except UploadError as e:
+                raise serializers.ValidationError(str(e))
+            return {'file': image_file, 'type': image_type, 'size': image_file.size}
+
+        if not isinstance(value, str):
+            raise serializers.ValidationError("Invalid image data: expected a file or a base64 string.")
+        data = value.split(',', 1)[1] if value.startswith('data:') and ',' in value else value
+
+        # Reject oversized payloads before decoding them
+        if len(data) * 3 // 4 > MAX_IMAGE_SIZE + 2:
+            raise serializers.ValidationError("File size cannot exceed 10MB.")
+        try:
+            image_data = base64.b64decode(data)
+        except (binascii.Error, ValueError) as e:
+            raise serializers.ValidationError(f"Invalid image data: {str(e)}")
+
+        if len(image_data) > MAX_IMAGE_SIZE:
+            raise serializers.ValidationError("File size cannot exceed 10MB.")
+        image_type = detect_image_type(image_data)
+        if image_type is None:
+            raise serializers.ValidationError("Only JPEG, PNG and GIF images are allowed.")
+        return {'data': image_data, 'type': image_type, 'size': len(image_data)}
+
+    def to_representation(self, value):
+        return None
+
 
 class BuildingImageCreateUpdateSerializer(serializers.ModelSerializer):
-    image = serializers.CharField(write_only=True, help_text="Base64 encoded image data")
+    image = ImageDataField(write_only=True, help_text="Image file (multipart) or base64 encoded image data")
     
     class Meta:
         model = BuildingImage
@@ -51,37 +102,15 @@ class BuildingImageCreateUpdateSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['uuid', 'uploaded_at', 'updated_at']
 
-    def validate_image(self, value):
-        """Validate base64 image data"""
-        try:
-            if value.startswith('data:'):
-                header, data = value.split(',', 1)
-                image_type = header.split(':')[1].split(';')[0]
-            else:
-                data = value
-                image_type = 'image/jpeg' 
-            
-            image_data = base64.b64decode(data)
-            
-            # Check file size (10MB = 10 * 1024 * 1024 bytes)
-            if len(image_data) > 10 * 1024 * 1024:
-                raise serializers.ValidationError("File size cannot exceed 10MB.")
-            
-            allowed_types = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif']
-            if image_type not in allowed_types:
-                raise serializers.ValidationError(
-                    f"Image type '{image_type}' is not allowed. "
-                    f"Allowed types: {', '.join(allowed_types)}"
-                )
-            
-            return {
-                'data': image_data,
-                'type': image_type,
-                'size': len(image_data)
-            }
-            
-        except Exception as e:
-            raise serializers.ValidationError(f"Invalid image data: {str(e)}")
+    def _set_image(self, instance, image_info, title):
+        # A multipart file is streamed by BuildingImage.save(), base64 data is already in memory
+        if 'file' in image_info:
+            instance.image_file = image_info['file']
+        else:
+            instance.image_data = image_info['data']
+        instance.image_type = image_info['type']
+        instance.image_size = image_info['size']
+        instance.image_name = image_name(title, image_info['type'], uuid.uuid4().hex[:8])
 
     def create(self, validated_data):
         image_info = validated_data.pop('image')
@@ -89,24 +118,15 @@ class BuildingImageCreateUpdateSerializer(serializers.ModelSerializer):
         # Get user from context (set by the view)
         user = self.context['request'].user
         
-        instance = BuildingImage.objects.create(
-            image_data=image_info['data'],
-            image_type=image_info['type'],
-            image_size=image_info['size'],
-            image_name=f"{validated_data.get('title', 'image')}_{uuid.uuid4().hex[:8]}.{image_info['type'].split('/')[1]}",
-            user=user,
-            **validated_data
-        )
+        instance = BuildingImage(user=user, **validated_data)
+        self._set_image(instance, image_info, validated_data.get('title'))
+        instance.save(force_insert=True)
         
         return instance
 
     def update(self, instance, validated_data):
         if 'image' in validated_data:
-            image_info = validated_data.pop('image')
-            instance.image_data = image_info['data']
-            instance.image_type = image_info['type']
-            instance.image_size = image_info['size']
-            instance.image_name = f"{validated_data.get('title', instance.title)}_{uuid.uuid4().hex[:8]}.{image_info['type'].split('/')[1]}"
+            self._set_image(instance, validated_data.pop('image'), validated_data.get('title', instance.title))
         
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -116,19 +136,35 @@ class BuildingImageCreateUpdateSerializer(serializers.ModelSerializer):
 
 
 class BuildingImageListSerializer(serializers.ModelSerializer):
-    """Simplified serializer for list views"""
-    image = serializers.SerializerMethodField()
+    """
+    Simplified serializer for list views. Carries only the URLs of the
+    thumbnail and the raw image, never the image data itself, so querysets
+    should defer 'image_data' and 'thumbnail_data'.
+    """
+    image_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
     
     class Meta:
         model = BuildingImage
         fields = [
             'uuid',
             'title',
+            'description',
             'category',
-            'image',
-            'uploaded_at'
+            'tags',
+            'image_url',
+            'thumbnail_url',
+            'image_name',
+            'image_type',
+            'image_size',
+            'building',
+            'project',
+            'uploaded_at',
+            'updated_at'
         ]
 
-    def get_image(self, obj):
-        """Return data URL for the image"""
-        return obj.get_image_data_url()
+    def get_image_url(self, obj):
+        return signed_image_url(self.context.get('request'), obj, 'raw')
+
+    def get_thumbnail_url(self, obj):
+        return signed_image_url(self.context.get('request'), obj, 'thumbnail')
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .models import BuildingImage, release_stored_image
+
+
+@receiver(post_delete, sender=BuildingImage)
+def release_image_storage(sender, instance, **kwargs):
+    """Deletes the stored file/object once no other image references it."""
+    release_stored_image(instance.storage_backend, instance.storage_key)
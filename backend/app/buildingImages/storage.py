@@ -0,0 +1,217 @@
+"""
+Αποθήκευση των δεδομένων των εικόνων κτιρίων.
+
+Το backend επιλέγεται με το BUILDING_IMAGE_STORAGE:
+- 'database': τα bytes μένουν στη στήλη BuildingImage.image_data (προεπιλογή)
+- 'filesystem': αρχεία με διεύθυνση βάσει περιεχομένου (sha256) κάτω από το
+  BUILDING_IMAGE_STORAGE_ROOT
+- 's3': S3-compatible object storage (AWS, MinIO κ.λπ.), απαιτεί boto3
+
+Τα κλειδιά προκύπτουν από το checksum, οπότε η ίδια εικόνα αποθηκεύεται μία
+φορά και μια επανάληψη εγγραφής (retry) δεν δημιουργεί διπλότυπα.
+"""
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+except ImportError:  # Το S3 backend είναι προαιρετικό.
+    boto3 = None
+    ClientError = Exception
+
+STORAGE_DATABASE = 'database'
+STORAGE_FILESYSTEM = 'filesystem'
+STORAGE_S3 = 's3'
+
+STORAGE_CHOICES = [
+    (STORAGE_DATABASE, 'Database'),
+    (STORAGE_FILESYSTEM, 'File system'),
+    (STORAGE_S3, 'S3'),
+]
+
+
+def content_key(checksum):
+    """Σχετική διαδρομή του αρχείου, π.χ. 'ab/cd/abcd…'."""
+    return f"{checksum[:2]}/{checksum[2:4]}/{checksum}"
+
+
+class ImageStorage:
+    """Κοινή διεπαφή των backends αποθήκευσης."""
+    name = None
+    in_database = False
+
+    def save(self, checksum, data, content_type):
+        """
+        Αποθηκεύει τα bytes ή το ανοιχτό αρχείο `data` (από την τρέχουσα θέση
+        του, χωρίς να φορτωθεί ολόκληρο στη μνήμη) και επιστρέφει το κλειδί τους.
+        """
+        raise NotImplementedError
+
+    def open(self, key):
+        """bytes ή file-like αντικείμενο (με .size) για streaming."""
+        return self.read(key)
+
+    def read(self, key):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def exists(self, key):
+        raise NotImplementedError
+
+
+class DatabaseImageStorage(ImageStorage):
+    """Τα δεδομένα μένουν στη στήλη image_data του μοντέλου."""
+    name = STORAGE_DATABASE
+    in_database = True
+
+    def save(self, checksum, data, content_type):
+        return ''
+
+    def read(self, key):
+        raise ImproperlyConfigured("Database images are read from BuildingImage.image_data")
+
+    def delete(self, key):
+        pass
+
+    def exists(self, key):
+        return True
+
+
+class FileSystemImageStorage(ImageStorage):
+    name = STORAGE_FILESYSTEM
+
+    def __init__(self, root=None):
+        self.root = str(root or settings.BUILDING_IMAGE_STORAGE_ROOT)
+
+    def path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def save(self, checksum, data, content_type):
+        key = content_key(checksum)
+        path = self.path(key)
+        if os.path.exists(path):
+            return key
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Εγγραφή σε προσωρινό αρχείο και ατομική μετονομασία: ένα αρχείο
+        # υπάρχει είτε ολόκληρο είτε καθόλου.
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as target:
+                if hasattr(data, 'read'):
+                    shutil.copyfileobj(data, target)
+                else:
+                    target.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return key
+
+    def open(self, key):
+        return File(open(self.path(key), 'rb'))
+
+    def read(self, key):
+        with open(self.path(key), 'rb') as source:
+            return source.read()
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+
+class S3ImageStorage(ImageStorage):
+    """
+    S3-compatible backend. Με το BUILDING_IMAGE_S3_ENDPOINT_URL δείχνει σε
+    τοπικό MinIO ή σε moto server για δοκιμές.
+    """
+    name = STORAGE_S3
+
+    def __init__(self, bucket=None, prefix=None, client=None):
+        if boto3 is None and client is None:
+            raise ImproperlyConfigured("The 's3' building image storage requires boto3")
+        self.bucket = bucket or settings.BUILDING_IMAGE_S3_BUCKET
+        if not self.bucket:
+            raise ImproperlyConfigured("BUILDING_IMAGE_S3_BUCKET is not set")
+        self.prefix = settings.BUILDING_IMAGE_S3_PREFIX if prefix is None else prefix
+        self.client = client or boto3.client(
+            's3',
+            endpoint_url=settings.BUILDING_IMAGE_S3_ENDPOINT_URL or None,
+            region_name=settings.BUILDING_IMAGE_S3_REGION or None,
+            aws_access_key_id=settings.BUILDING_IMAGE_S3_ACCESS_KEY or None,
+            aws_secret_access_key=settings.BUILDING_IMAGE_S3_SECRET_KEY or None,
+        )
+
+    def object_name(self, key):
+        return f"{self.prefix}{key}"
+
+    def save(self, checksum, data, content_type):
+        key = content_key(checksum)
+        if self.exists(key):
+            return key
+        if hasattr(data, 'read'):
+            # Multipart upload σε τμήματα για μεγάλα αρχεία
+            self.client.upload_fileobj(
+                data,
+                self.bucket,
+                self.object_name(key),
+                ExtraArgs={'ContentType': content_type, 'Metadata': {'sha256': checksum}},
+            )
+        else:
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=self.object_name(key),
+                Body=data,
+                ContentType=content_type,
+                Metadata={'sha256': checksum},
+            )
+        return key
+
+    def read(self, key):
+        response = self.client.get_object(Bucket=self.bucket, Key=self.object_name(key))
+        return response['Body'].read()
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_name(key))
+
+    def exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_name(key))
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+        return True
+
+
+STORAGE_CLASSES = {
+    STORAGE_DATABASE: DatabaseImageStorage,
+    STORAGE_FILESYSTEM: FileSystemImageStorage,
+    STORAGE_S3: S3ImageStorage,
+}
+
+_instances = {}
+
+
+def get_storage(name=None):
+    """Backend με το όνομα `name` (ή το ενεργό από τα settings), ένα ανά process."""
+    name = name or settings.BUILDING_IMAGE_STORAGE
+    if name not in STORAGE_CLASSES:
+        raise ImproperlyConfigured(f"Unknown building image storage '{name}'")
+    if name not in _instances:
+        _instances[name] = STORAGE_CLASSES[name]()
+    return _instances[name]
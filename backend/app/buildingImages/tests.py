@@ -0,0 +1,543 @@
+import hashlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+from building.models import Building
+from prefectures.models import Prefecture
+from project.models import Project
+from user.models import User
+
+from . import storage as image_storage
+from .models import BuildingImage, ImageUploadSession
+from .streaming import SIGNATURE_MAX_AGE, SIGNATURE_WINDOW, sign_image, signed_image_url
+from .thumbnails import image_checksum
+from .uploads import session_file_path
+
+IMAGES_URL = '/api/building-images/'
+UPLOADS_URL = '/api/building-images/uploads/'
+
+
+def make_png(width=160, height=120, seed=0):
+    """PNG με θόρυβο, ώστε να μη συμπιέζεται σε λίγα bytes."""
+    rng = random.Random(seed)
+    image = Image.frombytes('RGB', (width, height), bytes(rng.getrandbits(8) for _ in range(width * height * 3)))
+    output = io.BytesIO()
+    image.save(output, format='PNG')
+    return output.getvalue()
+
+
+class FakeClientError(image_storage.ClientError):
+    """Σφάλμα του client με τη μορφή του botocore (e.response['Error']['Code'])."""
+
+    def __init__(self, code):
+        Exception.__init__(self, code)
+        self.response = {'Error': {'Code': code}}
+
+
+class FakeS3Client:
+    """S3 client στη μνήμη με τις κλήσεις που κάνει το S3ImageStorage."""
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+        # Για αποτυχίες / αλλοίωση δεδομένων στα tests
+        self.fail_writes = False
+        self.corrupt_reads = False
+
+    def _store(self, bucket, key, data, content_type, metadata):
+        if self.fail_writes:
+            raise FakeClientError('InternalError')
+        self.objects[(bucket, key)] = {'data': data, 'content_type': content_type, 'metadata': metadata}
+
+    def put_object(self, Bucket, Key, Body, ContentType, Metadata):
+        self.calls.append('put_object')
+        self._store(Bucket, Key, bytes(Body), ContentType, Metadata)
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs):
+        self.calls.append('upload_fileobj')
+        self._store(Bucket, Key, Fileobj.read(), ExtraArgs['ContentType'], ExtraArgs['Metadata'])
+
+    def get_object(self, Bucket, Key):
+        self.calls.append('get_object')
+        if (Bucket, Key) not in self.objects:
+            raise FakeClientError('NoSuchKey')
+        data = self.objects[(Bucket, Key)]['data']
+        if self.corrupt_reads:
+            data = data[::-1]
+        return {'Body': io.BytesIO(data), 'ContentLength': len(data)}
+
+    def head_object(self, Bucket, Key):
+        self.calls.append('head_object')
+        if (Bucket, Key) not in self.objects:
+            raise FakeClientError('404')
+        return {'ContentLength': len(self.objects[(Bucket, Key)]['data'])}
+
+    def delete_object(self, Bucket, Key):
+        self.calls.append('delete_object')
+        self.objects.pop((Bucket, Key), None)
+
+
+class ImageTestCase(TestCase):
+    """Χρήστες, κτίρια και προσωρινοί φάκελοι για uploads / αποθήκευση αρχείων."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@bemat.local', password=None)
+        cls.other = User.objects.create_user(email='other@bemat.local', password=None)
+        prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+        cls.project = Project.objects.create(user=cls.user, name='Έργο', cost_per_kwh_electricity=Decimal('0.2'))
+        cls.other_project = Project.objects.create(
+            user=cls.other, name='Άλλο έργο', cost_per_kwh_electricity=Decimal('0.2'),
+        )
+        cls.building = cls.create_building(cls.project, prefecture)
+        cls.other_building = cls.create_building(cls.other_project, prefecture)
+        cls.png = make_png()
+
+    @staticmethod
+    def create_building(project, prefecture):
+        return Building.objects.create(
+            project=project, user=project.user, name=f'Κτίριο {project.name}', usage='Γραφεία',
+            description='Test', address='Test', prefecture=prefecture, total_area=500, examined_area=400,
+        )
+
+    def setUp(self):
+        directory = tempfile.mkdtemp(prefix='building-images-test-')
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.upload_dir = os.path.join(directory, 'uploads')
+        self.storage_root = os.path.join(directory, 'storage')
+        settings_override = override_settings(
+            BUILDING_IMAGE_UPLOAD_DIR=self.upload_dir, BUILDING_IMAGE_STORAGE_ROOT=self.storage_root,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Τα backends κρατιούνται ανά process με τις ρυθμίσεις της πρώτης χρήσης
+        image_storage._instances.clear()
+        self.addCleanup(image_storage._instances.clear)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def use_storage(self, name):
+        settings_override = override_settings(BUILDING_IMAGE_STORAGE=name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def use_fake_s3(self):
+        """S3 backend με FakeS3Client στη θέση του boto3 client."""
+        self.s3 = FakeS3Client()
+        image_storage._instances[image_storage.STORAGE_S3] = image_storage.S3ImageStorage(
+            bucket='images', prefix='test/', client=self.s3,
+        )
+        return self.s3
+
+    def create_image(self, data=None):
+        image = BuildingImage(
+            title='Πρόσοψη', image_type='image/png', building=self.building, project=self.project, user=self.user,
+        )
+        image.image_data = self.png if data is None else data
+        image.image_size = len(image.image_data)
+        image.save()
+        return image
+
+
+class ChunkedUploadTests(ImageTestCase):
+    """Συνεχιζόμενο upload σε τμήματα: δημιουργία, τμήματα, συνέχιση και ολοκλήρωση."""
+
+    def create_upload(self, size=None, building=None):
+        building = building or self.building
+        return self.client.post(UPLOADS_URL, {
+            'building': str(building.uuid), 'project': str(building.project_id),
+            'title': 'Πρόσοψη', 'category': 'exterior', 'size': len(self.png) if size is None else size,
+        }, format='json')
+
+    def put_chunk(self, upload_id, start, end, data=None):
+        return self.client.generic(
+            'PUT', f'{UPLOADS_URL}{upload_id}/', self.png[start:end + 1] if data is None else data,
+            content_type='application/octet-stream', HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(self.png)}',
+        )
+
+    def upload_all(self, upload_id, chunk_size):
+        for start in range(0, len(self.png), chunk_size):
+            end = min(start + chunk_size, len(self.png)) - 1
+            self.assertEqual(self.put_chunk(upload_id, start, end).status_code, 200)
+
+    def test_resume_and_complete_streams_to_file_storage(self):
+        self.use_storage(image_storage.STORAGE_FILESYSTEM)
+        upload_id = self.create_upload().data['upload_id']
+        chunk = len(self.png) // 3
+
+        response = self.put_chunk(upload_id, 0, chunk - 1)
+        self.assertEqual(response.data['received_size'], chunk)
+        self.assertEqual(response.data['image_type'], 'image/png')
+
+        # Τμήμα μετά από κενό: 409 με το σημείο συνέχισης
+        response = self.put_chunk(upload_id, 2 * chunk, len(self.png) - 1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['received_size'], chunk)
+
+        # Συνέχιση από το received_size που επιστρέφει το GET, με επανάληψη του πρώτου τμήματος
+        status = self.client.get(f'{UPLOADS_URL}{upload_id}/').data
+        self.assertEqual((status['received_size'], status['complete']), (chunk, False))
+        self.assertEqual(self.client.post(f'{UPLOADS_URL}{upload_id}/complete/').status_code, 409)
+        self.assertEqual(self.put_chunk(upload_id, 0, chunk - 1).data['received_size'], chunk)
+        self.assertEqual(self.put_chunk(upload_id, chunk, len(self.png) - 1).data['complete'], True)
+
+        session = ImageUploadSession.objects.get(uuid=upload_id)
+        response = self.client.post(f'{UPLOADS_URL}{upload_id}/complete/')
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(ImageUploadSession.objects.filter(uuid=upload_id).exists())
+        self.assertFalse(os.path.exists(session_file_path(session)))
+
+        image = BuildingImage.objects.get(uuid=response.data['uuid'])
+        checksum = hashlib.sha256(self.png).hexdigest()
+        self.assertEqual((image.storage_backend, image.image_checksum), (image_storage.STORAGE_FILESYSTEM, checksum))
+        self.assertEqual((bytes(image.image_data), image.image_size), (b'', len(self.png)))
+        self.assertEqual(image.thumbnail_type, 'image/jpeg')
+        with open(os.path.join(self.storage_root, *image_storage.content_key(checksum).split('/')), 'rb') as stored:
+            self.assertEqual(stored.read(), self.png)
+
+    def test_complete_with_database_storage_keeps_bytes_in_row(self):
+        upload_id = self.create_upload().data['upload_id']
+        self.upload_all(upload_id, 4096)
+
+        response = self.client.post(f'{UPLOADS_URL}{upload_id}/complete/')
+        self.assertEqual(response.status_code, 201)
+        image = BuildingImage.objects.get(uuid=response.data['uuid'])
+        self.assertEqual(image.storage_backend, image_storage.STORAGE_DATABASE)
+        self.assertEqual(bytes(image.image_data), self.png)
+        self.assertEqual(image.image_checksum, hashlib.sha256(self.png).hexdigest())
+        self.assertTrue(image.thumbnail_data)
+
+    def test_rejects_bad_ranges_and_non_images(self):
+        upload_id = self.create_upload().data['upload_id']
+        response = self.client.generic('PUT', f'{UPLOADS_URL}{upload_id}/', b'x', content_type='application/octet-stream')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.put_chunk(upload_id, 0, len(self.png)).status_code, 416)
+
+        response = self.put_chunk(upload_id, 0, 99, data=b'not an image'.ljust(100, b'.'))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ImageUploadSession.objects.filter(uuid=upload_id).exists())
+
+    def test_other_users_cannot_upload_or_resume(self):
+        self.assertEqual(self.create_upload(building=self.other_building).status_code, 403)
+        self.assertEqual(self.create_upload(size=11 * 1024 * 1024).status_code, 400)
+
+        upload_id = self.create_upload().data['upload_id']
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self.client.get(f'{UPLOADS_URL}{upload_id}/').status_code, 404)
+        self.assertEqual(self.put_chunk(upload_id, 0, 99).status_code, 404)
+        self.assertEqual(self.client.post(f'{UPLOADS_URL}{upload_id}/complete/').status_code, 404)
+
+
+class MultipartUploadTests(ImageTestCase):
+    """Το upload/ με αρχείο multipart και οι έλεγχοι κτιρίου / έργου."""
+
+    def upload(self, building, project=None, content=None):
+        return self.client.post(f'{IMAGES_URL}upload/', {
+            'title': 'Πρόσοψη',
+            'category': 'exterior',
+            'building': str(building.uuid),
+            'project': str(project or building.project_id),
+            'image': SimpleUploadedFile('photo.png', self.png if content is None else content, 'image/png'),
+        }, format='multipart')
+
+    def test_file_is_streamed_to_file_storage(self):
+        self.use_storage(image_storage.STORAGE_FILESYSTEM)
+        response = self.upload(self.building)
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('image', response.data)
+
+        image = BuildingImage.objects.get(uuid=response.data['uuid'])
+        self.assertEqual((bytes(image.image_data), image.image_size), (b'', len(self.png)))
+        self.assertEqual(image.image_checksum, hashlib.sha256(self.png).hexdigest())
+        self.assertEqual(image.load_image_data(), self.png)
+        self.assertTrue(image.thumbnail_data)
+
+    def test_database_storage(self):
+        response = self.upload(self.building)
+        self.assertEqual(response.status_code, 201)
+        image = BuildingImage.objects.get(uuid=response.data['uuid'])
+        self.assertEqual(bytes(image.image_data), self.png)
+        self.assertEqual(image.user, self.user)
+
+    def test_rejects_non_images(self):
+        response = self.upload(self.building, content=b'GIF? no, plain text')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(BuildingImage.objects.exists())
+
+    def test_other_users_building_is_denied(self):
+        self.assertEqual(self.upload(self.other_building).status_code, 403)
+        self.assertEqual(self.upload(self.building, project=self.other_project.uuid).status_code, 400)
+        # Το ίδιο και με POST στη συλλογή
+        response = self.client.post(IMAGES_URL, {
+            'title': 'Πρόσοψη', 'building': str(self.other_building.uuid), 'project': str(self.other_project.uuid),
+            'image': SimpleUploadedFile('photo.png', self.png, 'image/png'),
+        }, format='multipart')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(BuildingImage.objects.exists())
+
+
+class S3StorageTests(SimpleTestCase):
+    """Το S3ImageStorage με FakeS3Client."""
+
+    def setUp(self):
+        self.client = FakeS3Client()
+        self.storage = image_storage.S3ImageStorage(bucket='images', prefix='test/', client=self.client)
+        self.data = b'\x89PNG\r\n\x1a\n' + bytes(range(256)) * 10
+        self.checksum = hashlib.sha256(self.data).hexdigest()
+
+    def test_put_get_delete(self):
+        key = self.storage.save(self.checksum, self.data, 'image/png')
+        self.assertEqual(key, image_storage.content_key(self.checksum))
+        stored = self.client.objects[('images', f'test/{key}')]
+        self.assertEqual(stored, {'data': self.data, 'content_type': 'image/png', 'metadata': {'sha256': self.checksum}})
+        self.assertEqual(self.storage.read(key), self.data)
+        self.assertTrue(self.storage.exists(key))
+
+        # Ίδιο περιεχόμενο, ίδιο κλειδί: καμία δεύτερη εγγραφή
+        self.assertEqual(self.storage.save(self.checksum, self.data, 'image/png'), key)
+        self.assertEqual(self.client.calls.count('put_object'), 1)
+
+        self.storage.delete(key)
+        self.assertFalse(self.storage.exists(key))
+        with self.assertRaises(FakeClientError):
+            self.storage.read(key)
+
+    def test_file_is_uploaded_with_upload_fileobj(self):
+        key = self.storage.save(self.checksum, io.BytesIO(self.data), 'image/png')
+        self.assertEqual(self.client.calls, ['head_object', 'upload_fileobj'])
+        self.assertEqual(self.storage.read(key), self.data)
+
+    def test_errors_other_than_not_found_propagate(self):
+        self.client.head_object = mock.Mock(side_effect=FakeClientError('AccessDenied'))
+        with self.assertRaises(FakeClientError):
+            self.storage.exists('ab/cd/abcd')
+
+
+class FileSystemStorageTests(SimpleTestCase):
+    """Το FileSystemImageStorage σε προσωρινό φάκελο."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='building-images-test-')
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.storage = image_storage.FileSystemImageStorage(root=self.root)
+        self.data = b'GIF89a' + bytes(range(256)) * 300
+        self.checksum = hashlib.sha256(self.data).hexdigest()
+
+    def test_save_open_read_delete(self):
+        key = self.storage.save(self.checksum, self.data, 'image/gif')
+        self.assertEqual(key, image_storage.content_key(self.checksum))
+        self.assertEqual(os.listdir(os.path.dirname(self.storage.path(key))), [self.checksum])
+        self.assertEqual(self.storage.read(key), self.data)
+        with self.storage.open(key) as stored:
+            self.assertEqual(stored.size, len(self.data))
+            stored.seek(10)
+            self.assertEqual(stored.read(5), self.data[10:15])
+
+        self.storage.delete(key)
+        self.assertFalse(self.storage.exists(key))
+        # Η διαγραφή ενός κλειδιού που λείπει δεν είναι σφάλμα
+        self.storage.delete(key)
+
+    def test_file_is_copied_and_existing_content_is_kept(self):
+        key = self.storage.save(self.checksum, io.BytesIO(self.data), 'image/gif')
+        self.assertEqual(self.storage.read(key), self.data)
+        with mock.patch('buildingImages.storage.shutil.copyfileobj') as copy:
+            self.assertEqual(self.storage.save(self.checksum, io.BytesIO(self.data), 'image/gif'), key)
+        copy.assert_not_called()
+
+    def test_failed_write_leaves_no_file(self):
+        with mock.patch('buildingImages.storage.shutil.copyfileobj', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                self.storage.save(self.checksum, io.BytesIO(self.data), 'image/gif')
+        key = image_storage.content_key(self.checksum)
+        self.assertFalse(self.storage.exists(key))
+        self.assertEqual(os.listdir(os.path.dirname(self.storage.path(key))), [])
+
+
+class S3ImageTests(ImageTestCase):
+    """Εικόνες στο S3 (FakeS3Client): αποθήκευση, ανάγνωση με Range και διαγραφή."""
+
+    def setUp(self):
+        super().setUp()
+        self.use_storage(image_storage.STORAGE_S3)
+        self.use_fake_s3()
+
+    def test_save_stores_object_and_range_reads_it(self):
+        image = self.create_image()
+        self.assertEqual((image.storage_backend, bytes(image.image_data)), (image_storage.STORAGE_S3, b''))
+        self.assertEqual(self.s3.objects[('images', f'test/{image.storage_key}')]['data'], self.png)
+
+        url = f'{IMAGES_URL}{image.uuid}/raw/'
+        response = self.client.get(url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.png[10:20])
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.png)}')
+        self.assertEqual(self.client.get(url, HTTP_RANGE=f'bytes={len(self.png)}-').status_code, 416)
+
+    def test_delete_removes_unreferenced_object(self):
+        image = self.create_image()
+        duplicate = self.create_image()
+        self.assertEqual(len(self.s3.objects), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        self.assertEqual(len(self.s3.objects), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            duplicate.delete()
+        self.assertEqual(self.s3.objects, {})
+
+
+class MoveBuildingImagesTests(ImageTestCase):
+    """Η εντολή move_building_images μεταφέρει τα δεδομένα και ελέγχει το checksum."""
+
+    def setUp(self):
+        super().setUp()
+        self.use_fake_s3()
+        self.image = self.create_image()
+
+    def move(self, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('move_building_images', *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_moves_database_images_to_s3_and_back(self):
+        self.move('--to', 's3', '--verify')
+        self.image.refresh_from_db()
+        checksum = hashlib.sha256(self.png).hexdigest()
+        self.assertEqual(self.image.storage_backend, image_storage.STORAGE_S3)
+        self.assertEqual((bytes(self.image.image_data), self.image.image_checksum), (b'', checksum))
+        self.assertEqual(self.s3.objects[('images', f'test/{self.image.storage_key}')]['data'], self.png)
+
+        self.move('--to', 'filesystem')
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.storage_backend, image_storage.STORAGE_FILESYSTEM)
+        self.assertEqual(self.image.load_image_data(), self.png)
+        # Το αντικείμενο του S3 δεν χρησιμοποιείται πια από καμία εικόνα
+        self.assertEqual(self.s3.objects, {})
+
+    def assertRowUnchanged(self):
+        row = BuildingImage.objects.values('storage_backend', 'storage_key', 'image_data', 'image_checksum').get(
+            uuid=self.image.uuid,
+        )
+        self.assertEqual(
+            (row['storage_backend'], row['storage_key'], bytes(row['image_data']), row['image_checksum']),
+            (image_storage.STORAGE_DATABASE, '', self.png, image_checksum(self.png)),
+        )
+
+    def test_failed_copy_leaves_row_unchanged(self):
+        self.s3.fail_writes = True
+        _, stderr = self.move('--to', 's3')
+        self.assertIn(str(self.image.uuid), stderr)
+        self.assertRowUnchanged()
+
+    def test_checksum_mismatch_after_copy_leaves_row_unchanged(self):
+        self.s3.corrupt_reads = True
+        _, stderr = self.move('--to', 's3', '--verify')
+        self.assertIn('checksum mismatch', stderr)
+        self.assertRowUnchanged()
+
+    def test_corrupted_source_is_not_moved(self):
+        BuildingImage.objects.filter(uuid=self.image.uuid).update(image_checksum='0' * 64)
+        _, stderr = self.move('--to', 's3')
+        self.assertIn('checksum mismatch', stderr)
+        self.assertEqual(BuildingImage.objects.get(uuid=self.image.uuid).storage_backend, image_storage.STORAGE_DATABASE)
+        self.assertEqual(self.s3.objects, {})
+
+
+class StreamingEndpointTests(ImageTestCase):
+    """Τα raw/ και thumbnail/ (AllowAny) με υπογεγραμμένα URLs, Range και ETag."""
+
+    def setUp(self):
+        super().setUp()
+        self.image = self.create_image()
+        # Ανώνυμος client, όπως ένα <img> χωρίς Authorization header
+        self.anonymous = APIClient()
+
+    def test_signed_url_streams_image_and_thumbnail(self):
+        response = self.anonymous.get(signed_image_url(None, self.image, 'raw'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.png)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['Content-Length'], str(len(self.png)))
+        self.assertEqual(response['ETag'], f'"{self.image.image_checksum}"')
+
+        response = self.anonymous.get(signed_image_url(None, self.image, 'thumbnail'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(b''.join(response.streaming_content), bytes(self.image.thumbnail_data))
+
+    def test_range_requests(self):
+        url = signed_image_url(None, self.image, 'raw')
+        size = len(self.png)
+        for header, (start, end) in (
+            ('bytes=0-99', (0, 99)),
+            ('bytes=100-', (100, size - 1)),
+            ('bytes=-50', (size - 50, size - 1)),
+            (f'bytes=10-{size + 1000}', (10, size - 1)),
+        ):
+            with self.subTest(range=header):
+                response = self.anonymous.get(url, HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/{size}')
+                self.assertEqual(b''.join(response.streaming_content), self.png[start:end + 1])
+
+        for header in (f'bytes={size}-', f'bytes={size + 10}-{size + 20}'):
+            with self.subTest(range=header):
+                response = self.anonymous.get(url, HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], f'bytes */{size}')
+
+        # Range που δεν αναγνωρίζεται ή If-Range με παλιό ETag: ολόκληρη η εικόνα
+        self.assertEqual(self.anonymous.get(url, HTTP_RANGE='items=0-5').status_code, 200)
+        self.assertEqual(self.anonymous.get(url, HTTP_RANGE='bytes=0-5', HTTP_IF_RANGE='"old"').status_code, 200)
+
+    def test_if_none_match_returns_304(self):
+        for variant in ('raw', 'thumbnail'):
+            with self.subTest(variant=variant):
+                url = signed_image_url(None, self.image, variant)
+                etag = self.anonymous.get(url)['ETag']
+                response = self.anonymous.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(self.anonymous.get(url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_expired_or_tampered_signature_is_denied(self):
+        raw_url = reverse('building-images-raw', kwargs={'pk': str(self.image.pk)})
+        expired = time.time() - SIGNATURE_MAX_AGE - SIGNATURE_WINDOW
+        with mock.patch('buildingImages.streaming.time.time', return_value=expired):
+            expired_signature = sign_image(self.image, 'raw')
+        signature = sign_image(self.image, 'raw')
+        tampered = signature[:-1] + ('A' if signature[-1] != 'A' else 'B')
+
+        for sig in (expired_signature, tampered, sign_image(self.image, 'thumbnail'), ''):
+            with self.subTest(sig=sig):
+                self.assertEqual(self.anonymous.get(raw_url, {'sig': sig}).status_code, 403)
+        self.assertEqual(self.anonymous.get(raw_url, {'sig': signature}).status_code, 200)
+
+        # Η υπογραφή δένεται με το checksum: μετά από αντικατάσταση της εικόνας δεν ισχύει
+        self.image.image_data = make_png(seed=1)
+        self.image.save()
+        self.assertEqual(self.anonymous.get(raw_url, {'sig': signature}).status_code, 403)
+
+    def test_owner_without_signature_and_other_users(self):
+        raw_url = reverse('building-images-raw', kwargs={'pk': str(self.image.pk)})
+        self.assertEqual(self.client.get(raw_url).status_code, 200)
+        other = APIClient()
+        other.force_authenticate(user=self.other)
+        self.assertEqual(other.get(raw_url).status_code, 403)
+        self.assertEqual(other.get(signed_image_url(None, self.image, 'raw')).status_code, 200)
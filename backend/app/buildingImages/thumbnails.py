@@ -0,0 +1,64 @@
+"""
+Δημιουργία μικρογραφιών (thumbnails) και checksum για τις εικόνες κτιρίων.
+"""
+import hashlib
+import io
+import logging
+
+try:
+    from PIL import Image
+except ImportError:  # Χωρίς Pillow δεν δημιουργούνται μικρογραφίες.
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (320, 320)
+THUMBNAIL_TYPE = 'image/jpeg'
+THUMBNAIL_QUALITY = 80
+HASH_BLOCK_SIZE = 64 * 1024
+
+
+def image_checksum(data):
+    """
+    SHA-256 του περιεχομένου, χρησιμοποιείται ως ETag. Δέχεται bytes ή ανοιχτό
+    αρχείο, που διαβάζεται σε τμήματα από την αρχή και επιστρέφεται στη θέση 0.
+    """
+    if hasattr(data, 'read'):
+        digest = hashlib.sha256()
+        data.seek(0)
+        for block in iter(lambda: data.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+        data.seek(0)
+        return digest.hexdigest()
+    return hashlib.sha256(data).hexdigest() if data else ''
+
+
+def make_thumbnail(data):
+    """
+    Επιστρέφει (thumbnail_bytes, mime_type) ή (b'', '') όταν δεν είναι δυνατή
+    η δημιουργία (κενή εικόνα, μη έγκυρα δεδομένα ή απουσία Pillow). Δέχεται
+    bytes ή ανοιχτό αρχείο, από το οποίο το Pillow διαβάζει απευθείας.
+    """
+    if Image is None:
+        return b'', ''
+    if hasattr(data, 'read'):
+        data.seek(0)
+        source = data
+    elif data:
+        source = io.BytesIO(data)
+    else:
+        return b'', ''
+    try:
+        with Image.open(source) as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            output = io.BytesIO()
+            image.save(output, format='JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+            return output.getvalue(), THUMBNAIL_TYPE
+    except Exception as e:
+        logger.warning(f"Could not create thumbnail: {e}")
+        return b'', ''
+    finally:
+        if source is data:
+            data.seek(0)
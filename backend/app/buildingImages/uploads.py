@@ -0,0 +1,139 @@
+"""
+Upload of building images without holding the image in memory: multipart
+files (spooled to disk by Django above FILE_UPLOAD_MAX_MEMORY_SIZE) and
+resumable chunked uploads that are appended to a temporary file. Both are
+handed to BuildingImage as open files and streamed from there to the
+storage backend. The image type is decided from the magic bytes of the
+content, never from the client-supplied MIME type.
+"""
+import logging
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 5 * 1024 * 1024
+READ_BLOCK_SIZE = 64 * 1024
+SESSION_EXPIRY = timedelta(hours=24)
+
+# (magic bytes, MIME type)
+IMAGE_SIGNATURES = [
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+]
+SIGNATURE_LENGTH = max(len(signature) for signature, _ in IMAGE_SIGNATURES)
+IMAGE_EXTENSIONS = {'image/jpeg': 'jpg', 'image/png': 'png', 'image/gif': 'gif'}
+
+
+class UploadError(Exception):
+    """Invalid upload; the message is returned to the client."""
+
+
+def detect_image_type(header):
+    """MIME type from the first bytes of the content, or None if not an allowed image."""
+    header = bytes(header[:SIGNATURE_LENGTH])
+    for signature, image_type in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return image_type
+    return None
+
+
+def image_name(title, image_type, unique):
+    return f"{title or 'image'}_{unique}.{IMAGE_EXTENSIONS.get(image_type, 'jpg')}"
+
+
+def open_uploaded_file(uploaded_file):
+    """
+    Validates a multipart UploadedFile and returns (file, image_type), with
+    the file rewound to its start. Only the magic bytes are read here: the
+    content is streamed from the file (on disk for uploads above
+    FILE_UPLOAD_MAX_MEMORY_SIZE) when the image is saved.
+    """
+    if uploaded_file.size > MAX_IMAGE_SIZE:
+        raise UploadError("File size cannot exceed 10MB.")
+    uploaded_file.seek(0)
+    image_type = detect_image_type(uploaded_file.read(SIGNATURE_LENGTH))
+    if image_type is None:
+        raise UploadError("Only JPEG, PNG and GIF images are allowed.")
+    uploaded_file.seek(0)
+    return uploaded_file, image_type
+
+
+def upload_directory():
+    directory = settings.BUILDING_IMAGE_UPLOAD_DIR
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def session_file_path(session):
+    return os.path.join(upload_directory(), f"{session.uuid}.part")
+
+
+def write_chunk(session, stream, start, length):
+    """
+    Copies up to `length` bytes of the request body to the session file at
+    offset `start`, in READ_BLOCK_SIZE blocks. Returns the number of bytes
+    written; anything beyond them is truncated, so an interrupted chunk can
+    simply be sent again from the same offset.
+    """
+    path = session_file_path(session)
+    mode = 'r+b' if os.path.exists(path) else 'wb'
+    written = 0
+    with open(path, mode) as target:
+        target.seek(start)
+        while written < length:
+            block = stream.read(min(READ_BLOCK_SIZE, length - written))
+            if not block:
+                break
+            target.write(block)
+            written += len(block)
+        target.truncate()
+    return written
+
+
+def sniff_session_type(session):
+    """
+    Detects the image type once enough bytes have arrived. Returns the MIME
+    type, '' while more bytes are needed, or raises UploadError.
+    """
+    needed = min(SIGNATURE_LENGTH, session.total_size)
+    if session.received_size < needed:
+        return ''
+    with open(session_file_path(session), 'rb') as source:
+        image_type = detect_image_type(source.read(SIGNATURE_LENGTH))
+    if image_type is None:
+        raise UploadError("Only JPEG, PNG and GIF images are allowed.")
+    return image_type
+
+
+def open_session_file(session):
+    """The received bytes as a file opened for reading; the caller closes it."""
+    return open(session_file_path(session), 'rb')
+
+
+def discard_session(session):
+    """Deletes the session and its temporary file."""
+    try:
+        os.remove(session_file_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
+
+
+def purge_expired_sessions():
+    """Removes unfinished uploads older than SESSION_EXPIRY."""
+    from .models import ImageUploadSession
+
+    expired = ImageUploadSession.objects.filter(updated_at__lt=timezone.now() - SESSION_EXPIRY)
+    for session in expired:
+        try:
+            discard_session(session)
+        except OSError as e:
+            logger.warning(f"Could not remove upload session {session.uuid}: {e}")
@@ -1,16 +1,33 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from django.db.models import Q
 import logging
+import re
+import uuid
 
-from .models import BuildingImage
+from .models import BuildingImage, ImageUploadSession
 from .serializers import BuildingImageSerializer, BuildingImageListSerializer, BuildingImageCreateUpdateSerializer
 from building.models import Building
-from project.models import Project
-from common.utils import is_admin_user, has_access_permission
+from common.utils import is_admin_user, has_access_permission, validate_uuid
+from .streaming import PassthroughRenderer, binary_response, has_valid_signature
+from .uploads import (
+    MAX_CHUNK_SIZE, MAX_IMAGE_SIZE, SIGNATURE_LENGTH, UPLOAD_CHUNK_SIZE, UploadError, discard_session, image_name,
+    open_session_file, purge_expired_sessions, sniff_session_type, write_chunk,
+)
+
+# Τα BLOB δεν φορτώνονται ποτέ στις λίστες - οι λίστες επιστρέφουν μόνο URLs
+LIST_DEFERRED_FIELDS = ('image_data', 'thumbnail_data')
+STREAMING_FIELDS = (
+    'uuid', 'user', 'image_type', 'image_checksum', 'thumbnail_type', 'storage_backend', 'storage_key', 'updated_at',
+)
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +60,9 @@ class BuildingImageViewSet(viewsets.ModelViewSet):
                 Q(user=self.request.user) | Q(user__isnull=True)
             )
         
+        if self.action == 'list':
+            queryset = queryset.defer(*LIST_DEFERRED_FIELDS)
+        
         return queryset.order_by('-uploaded_at')
     
     def get_serializer_class(self):
@@ -120,7 +140,8 @@ class BuildingImageViewSet(viewsets.ModelViewSet):
             if category:
                 images = images.filter(category=category)
             
-            serializer = BuildingImageSerializer(images, many=True, context={'request': request})
+            images = images.defer(*LIST_DEFERRED_FIELDS)
+            serializer = BuildingImageListSerializer(images, many=True, context={'request': request})
             return Response(serializer.data)
             
         except Building.DoesNotExist:
@@ -129,37 +150,198 @@ class BuildingImageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
     
-    @action(detail=False, methods=['post'], url_path='upload')
+    @action(detail=False, methods=['post'], url_path='upload',
+            parser_classes=[MultiPartParser, FormParser, JSONParser])
     def upload_image(self, request):
-        """Upload a new image"""
+        """Upload a new image (multipart file field `image`, or legacy base64 JSON)"""
         serializer = BuildingImageCreateUpdateSerializer(data=request.data, context={'request': request})
-        if serializer.is_valid():
-            # Verify building and project exist and belong to user
-            building_uuid = request.data.get('building')
-            project_uuid = request.data.get('project')
-            
-            try:
-                building = Building.objects.get(uuid=building_uuid)
-                project = Project.objects.get(uuid=project_uuid)
-                
-                # You might want to add permission checks here
-                # to ensure the user can upload images to this building/project
-                
-                instance = serializer.save()
-                # Return the full serializer data
-                response_serializer = BuildingImageSerializer(instance, context={'request': request})
-                return Response(response_serializer.data, status=status.HTTP_201_CREATED)
-                
-            except (Building.DoesNotExist, Project.DoesNotExist):
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        error = self._check_upload_target(request, serializer.validated_data)
+        if error:
+            return error
+        
+        instance = serializer.save()
+        # The new image is added to the lists, so return the list representation (URLs, no data)
+        response_serializer = BuildingImageListSerializer(instance, context={'request': request})
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+    
+    def _check_upload_target(self, request, validated_data):
+        """Error response unless the building belongs to the project and the user may access it"""
+        building = validated_data['building']
+        if building.project_id != validated_data['project'].pk:
+            return Response({"error": "Invalid building or project"}, status=status.HTTP_400_BAD_REQUEST)
+        if not has_access_permission(request.user, building):
+            return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
+        return None
+    
+    def _upload_session(self, request, upload_id):
+        if not validate_uuid(upload_id):
+            return None
+        return ImageUploadSession.objects.filter(uuid=upload_id, user=request.user).first()
+    
+    def _upload_session_data(self, session):
+        return {
+            'upload_id': str(session.uuid),
+            'title': session.title,
+            'image_type': session.image_type,
+            'total_size': session.total_size,
+            'received_size': session.received_size,
+            'chunk_size': UPLOAD_CHUNK_SIZE,
+            'max_chunk_size': MAX_CHUNK_SIZE,
+            'complete': session.is_complete,
+        }
+    
+    @action(detail=False, methods=['post'], url_path='uploads')
+    def create_upload(self, request):
+        """
+        Start a resumable chunked upload. Body: building, project, title,
+        description, category, tags and size (bytes). The chunks are then sent
+        with PUT uploads/<upload_id>/ and a Content-Range header.
+        """
+        purge_expired_sessions()
+        
+        building_uuid = request.data.get('building')
+        project_uuid = request.data.get('project')
+        if not validate_uuid(building_uuid) or not validate_uuid(project_uuid):
+            return Response({"error": "Invalid building or project"}, status=status.HTTP_400_BAD_REQUEST)
+        building = Building.objects.filter(uuid=building_uuid, project__uuid=project_uuid).first()
+        if building is None:
+            return Response({"error": "Invalid building or project"}, status=status.HTTP_400_BAD_REQUEST)
+        if not has_access_permission(request.user, building):
+            return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            total_size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            return Response({"error": "size is required"}, status=status.HTTP_400_BAD_REQUEST)
+        if total_size <= 0 or total_size > MAX_IMAGE_SIZE:
+            return Response({"error": "File size cannot exceed 10MB."}, status=status.HTTP_400_BAD_REQUEST)
+        
+        title = (request.data.get('title') or '').strip()
+        if not title:
+            return Response({"error": "title is required"}, status=status.HTTP_400_BAD_REQUEST)
+        category = request.data.get('category') or 'other'
+        if category not in dict(BuildingImage.CATEGORY_CHOICES):
+            return Response({"error": "Invalid category"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        session = ImageUploadSession.objects.create(
+            title=title[:200],
+            description=request.data.get('description') or None,
+            category=category,
+            tags=request.data.get('tags') or None,
+            total_size=total_size,
+            building=building,
+            project_id=building.project_id,
+            user=request.user,
+        )
+        return Response(self._upload_session_data(session), status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['get', 'put', 'delete'], url_path='uploads/(?P<upload_id>[^/.]+)',
+            parser_classes=[])
+    def upload_chunk(self, request, upload_id=None):
+        """
+        GET: upload status (received_size is the offset to resume from).
+        PUT: append a chunk - raw body with `Content-Range: bytes start-end/total`.
+        DELETE: abort the upload.
+        """
+        session = self._upload_session(request, upload_id)
+        if session is None:
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+        if request.method == 'GET':
+            return Response(self._upload_session_data(session))
+        
+        if request.method == 'DELETE':
+            discard_session(session)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        
+        match = CONTENT_RANGE_RE.match(request.META.get('HTTP_CONTENT_RANGE', '').strip())
+        if not match:
+            return Response({"error": "Content-Range header is required (bytes start-end/total)"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        start, end, total = (int(value) for value in match.groups())
+        length = end - start + 1
+        if total != session.total_size or end < start or end >= total:
+            return Response({"error": "Content-Range does not match the upload"},
+                            status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        if length > MAX_CHUNK_SIZE:
+            return Response({"error": "Chunk too large", "max_chunk_size": MAX_CHUNK_SIZE},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if request.META.get('CONTENT_LENGTH') not in (None, '', str(length)):
+            return Response({"error": "Content-Length does not match Content-Range"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        with transaction.atomic():
+            session = ImageUploadSession.objects.select_for_update().get(pk=session.pk)
+            # Chunks are sequential; re-sending an already received range is allowed (retries)
+            if start > session.received_size:
                 return Response(
-                    {"error": "Invalid building or project"}, 
+                    {"error": "Chunk out of order", **self._upload_session_data(session)},
+                    status=status.HTTP_409_CONFLICT
+                )
+            written = write_chunk(session, request.stream, start, length) if request.stream else 0
+            session.received_size = start + written
+            if written < length:
+                session.save(update_fields=['received_size', 'updated_at'])
+                return Response(
+                    {"error": "Incomplete chunk, resend from received_size", **self._upload_session_data(session)},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            if start < SIGNATURE_LENGTH:
+                session.image_type = ''
+            if not session.image_type:
+                try:
+                    session.image_type = sniff_session_type(session)
+                except UploadError as e:
+                    discard_session(session)
+                    return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            session.save(update_fields=['received_size', 'image_type', 'updated_at'])
         
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self._upload_session_data(session))
+    
+    @action(detail=False, methods=['post'], url_path='uploads/(?P<upload_id>[^/.]+)/complete')
+    def complete_upload(self, request, upload_id=None):
+        """Create the image from a fully received chunked upload"""
+        session = self._upload_session(request, upload_id)
+        if session is None:
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        if not session.is_complete or not session.image_type:
+            return Response(
+                {"error": "Upload is not complete", **self._upload_session_data(session)},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        with transaction.atomic():
+            instance = BuildingImage(
+                title=session.title,
+                description=session.description,
+                category=session.category,
+                tags=session.tags,
+                image_type=session.image_type,
+                image_size=session.total_size,
+                image_name=image_name(session.title, session.image_type, uuid.uuid4().hex[:8]),
+                building_id=session.building_id,
+                project_id=session.project_id,
+                user=request.user,
+            )
+            # Streamed from the temporary file to the storage backend
+            with open_session_file(session) as source:
+                instance.image_file = source
+                instance.save(force_insert=True)
+            discard_session(session)
+        
+        response_serializer = BuildingImageListSerializer(instance, context={'request': request})
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
     
     def perform_create(self, serializer):
-        """Custom create logic if needed"""
+        """Same building checks as upload_image"""
+        error = self._check_upload_target(self.request, serializer.validated_data)
+        if error:
+            if error.status_code == status.HTTP_403_FORBIDDEN:
+                raise PermissionDenied(error.data['error'])
+            raise ValidationError(error.data)
         serializer.save()
     
     def perform_update(self, serializer):
@@ -193,5 +375,74 @@ class BuildingImageViewSet(viewsets.ModelViewSet):
         if building_uuid:
             queryset = queryset.filter(building__uuid=building_uuid)
         
-        serializer = BuildingImageSerializer(queryset, many=True)
+        queryset = queryset.defer(*LIST_DEFERRED_FIELDS)
+        serializer = BuildingImageListSerializer(queryset, many=True, context={'request': request})
         return Response(serializer.data)
+    
+    def _streaming_image(self, request, pk, variant):
+        """
+        Metadata of the image (without the BLOBs) if the request may read it:
+        either a valid signed URL or an authenticated owner/admin.
+        Returns (image, error_response).
+        """
+        if not validate_uuid(pk):
+            return None, Response({"error": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+        image = BuildingImage.objects.only(*STREAMING_FIELDS).filter(uuid=pk).first()
+        if image is None:
+            return None, Response({"error": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+        if has_valid_signature(image, variant, request.query_params.get('sig')):
+            return image, None
+        
+        user = request.user
+        if user.is_authenticated and (
+            is_admin_user(user) or image.user_id is None or image.user_id == user.pk
+        ):
+            return image, None
+        
+        return None, Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
+    
+    @action(detail=True, methods=['get'], url_path='raw', permission_classes=[AllowAny],
+            renderer_classes=[JSONRenderer, PassthroughRenderer])
+    def raw(self, request, pk=None):
+        """Stream the original image (ETag / Last-Modified / Range support)"""
+        image, error = self._streaming_image(request, pk, 'raw')
+        if error:
+            return error
+        
+        return binary_response(
+            request,
+            image.open_image_data,
+            image.image_type,
+            image.image_checksum,
+            image.updated_at,
+        )
+    
+    @action(detail=True, methods=['get'], url_path='thumbnail', permission_classes=[AllowAny],
+            renderer_classes=[JSONRenderer, PassthroughRenderer])
+    def thumbnail(self, request, pk=None):
+        """Stream the pre-generated thumbnail (falls back to the original image)"""
+        image, error = self._streaming_image(request, pk, 'thumbnail')
+        if error:
+            return error
+        
+        if not image.thumbnail_type:
+            return binary_response(
+                request,
+                image.open_image_data,
+                image.image_type,
+                image.image_checksum,
+                image.updated_at,
+                variant='thumbnail',
+            )
+        
+        return binary_response(
+            request,
+            lambda: BuildingImage.objects.filter(uuid=image.uuid).values_list('thumbnail_data', flat=True).first(),
+            image.thumbnail_type,
+            f"{image.image_checksum}-thumb" if image.image_checksum else '',
+            image.updated_at,
+            max_age=86400,
+            variant='thumbnail',
+        )
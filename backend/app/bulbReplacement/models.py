@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.conf import settings
 import uuid
+from common.finance import IRR_UPPER_BOUND, discounted_payback, internal_rate_of_return, net_present_value
 
 User = get_user_model()
 
@@ -163,6 +164,12 @@ class BulbReplacement(models.Model):
     def __str__(self):
         return f"Bulb Replacement - {self.building} ({self.uuid})"
 
+    def recalculate(self):
+        """Υπολογισμός κόστους και οικονομικών δεικτών (χωρίς αποθήκευση)"""
+        self.calculate_consumption()
+        self.calculate_energy_savings()
+        self.calculate_economic_benefits()
+
     def save(self, *args, **kwargs):
         """
         Override save to calculate energy and economic benefits automatically
@@ -170,9 +177,7 @@ class BulbReplacement(models.Model):
         if not self.user_id and hasattr(self, '_user'):
             self.user = self._user
             
-        self.calculate_consumption()
-        self.calculate_energy_savings()
-        self.calculate_economic_benefits()
+        self.recalculate()
             
         super().save(*args, **kwargs)
 
@@ -217,54 +222,19 @@ class BulbReplacement(models.Model):
         
         # Υπολογισμός NPV και Discounted Payback Period
         if annual_net_savings != 0:
-            pv_savings = 0
-            cumulative_discounted_cash_flow = 0
-            self.discounted_payback_period = int(years) + 1  # Default: δεν αποπληρώνεται
-            
-            for year in range(1, int(years) + 1):
-                discounted_cash_flow = annual_net_savings / (1 + discount_rate) ** year
-                cumulative_discounted_cash_flow += discounted_cash_flow
-                pv_savings += discounted_cash_flow
-                
-                # Έλεγχος αν έχει αποπληρωθεί η επένδυση
-                if cumulative_discounted_cash_flow >= self.total_investment_cost and self.discounted_payback_period > years:
-                    previous_cumulative = cumulative_discounted_cash_flow - discounted_cash_flow
-                    fraction_of_year = (self.total_investment_cost - previous_cumulative) / discounted_cash_flow
-                    self.discounted_payback_period = (year - 1) + fraction_of_year
-                
-            self.net_present_value = pv_savings - self.total_investment_cost
+            self.net_present_value = net_present_value(
+                self.total_investment_cost, annual_net_savings, discount_rate, int(years)
+            )
+            self.discounted_payback_period = discounted_payback(
+                self.total_investment_cost, annual_net_savings, discount_rate, int(years)
+            )
             
-            # Calculate IRR using Newton-Raphson method
+            # IRR με όριο 1000%
             if self.total_investment_cost > 0 and annual_net_savings > 0 and years > 0:
-                guess = 0.1  # Initial guess 10%
-                max_iterations = 1000
-                tolerance = 0.00001
-                
-                for i in range(max_iterations):
-                    npv_at_guess = -self.total_investment_cost
-                    derivative_npv = 0
-                    
-                    for year in range(1, int(years) + 1):
-                        discount_factor = (1 + guess) ** year
-                        npv_at_guess += annual_net_savings / discount_factor
-                        derivative_npv -= (year * annual_net_savings) / ((1 + guess) ** (year + 1))
-                    
-                    if abs(npv_at_guess) < tolerance:
-                        self.internal_rate_of_return = guess * 100
-                        break
-                    
-                    if abs(derivative_npv) > 0.000001:
-                        guess = guess - npv_at_guess / derivative_npv
-                    else:
-                        self.internal_rate_of_return = 0
-                        break
-                    
-                    if guess < -0.99:
-                        guess = -0.99
-                    if guess > 10:
-                        guess = 10
-                else:
-                    self.internal_rate_of_return = guess * 100 if guess > -0.99 else 0
+                irr = internal_rate_of_return(
+                    self.total_investment_cost, annual_net_savings, int(years), upper=IRR_UPPER_BOUND
+                )
+                self.internal_rate_of_return = irr * 100
             else:
                 self.internal_rate_of_return = 0
         else:
@@ -0,0 +1,170 @@
+"""
+Μαζική δημιουργία εγγραφών (συστήματα, φορτία, κλιματιστικά) με ένα request.
+
+Αντί για ένα request ανά γραμμή με 3-5 ερωτήματα το καθένα (κτίριο, έργο,
+θερμική ζώνη, ...), όλα τα ξένα κλειδιά της λίστας επιλύονται με ένα in_bulk
+ανά σχέση, η πρόσβαση ελέγχεται μία φορά ανά κτίριο / έργο και οι γραμμές
+γράφονται με bulk_create σε μία συναλλαγή. Αν έστω και μία γραμμή είναι
+λάθος δεν γράφεται τίποτα και επιστρέφονται τα σφάλματα ανά γραμμή.
+"""
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from building.models import Building
+from project.completion import SCENARIO_MODELS, SYSTEM_MODELS, refresh_building_progress
+
+from .utils import has_access_permission, standard_success_response
+
+BATCH_SIZE = 500
+MAX_ROWS = 1000
+OWNED_RELATIONS = ('building', 'project')
+
+# Το bulk_create δεν στέλνει post_save, οπότε η πρόοδος ανανεώνεται εδώ
+PROGRESS_MODELS = {label for _, label in SYSTEM_MODELS + SCENARIO_MODELS}
+
+
+class BulkError(Exception):
+    """Μη έγκυρες γραμμές· το `errors` έχει ένα dict ανά γραμμή (κενό για τις έγκυρες)."""
+
+    def __init__(self, errors):
+        super().__init__("Invalid rows")
+        self.errors = errors
+
+
+def _resolve(model, name, rows):
+    """Ένα ερώτημα για όλα τα αντικείμενα της σχέσης `name` που αναφέρονται στις γραμμές."""
+    related_model = model._meta.get_field(name).related_model
+    keys = {row[name] for row in rows if row.get(name) is not None}
+    if not keys:
+        return {}
+    queryset = related_model.objects.all()
+    if name == 'building':
+        # Για το has_access_permission (building.user, building.project.user)
+        queryset = queryset.select_related('user', 'project__user')
+    elif name == 'project':
+        queryset = queryset.select_related('user')
+    return queryset.in_bulk(keys)
+
+
+def _check_unique_together(model, instances, errors):
+    """
+    Ένα ερώτημα ανά unique_together (π.χ. ένα σύστημα θέρμανσης ανά κτίριο και
+    χρήστη) για τις υπάρχουσες εγγραφές, και έλεγχος διπλών μέσα στη λίστα.
+    """
+    for fields in model._meta.unique_together:
+        attnames = [model._meta.get_field(name).attname for name in fields]
+        keys = {index: tuple(getattr(instance, attname) for attname in attnames) for index, instance in instances}
+        if not keys:
+            continue
+        lookups = {f'{attname}__in': {key[position] for key in keys.values()} for position, attname in enumerate(attnames)}
+        taken = set(model.objects.filter(**lookups).values_list(*attnames))
+        for index, key in keys.items():
+            if key in taken:
+                errors[index].setdefault('non_field_errors', []).append(
+                    f"The fields {', '.join(fields)} must make a unique set."
+                )
+            taken.add(key)
+
+
+def bulk_create_rows(user, model, rows, in_building=(), prepare=None):
+    """
+    Δημιουργεί μία εγγραφή `model` ανά γραμμή. Οι γραμμές είναι validated_data
+    ενός bulk serializer με τα ξένα κλειδιά ως UUID: τα building / project
+    πρέπει να είναι προσβάσιμα από τον χρήστη και όσα αναφέρονται στο
+    `in_building` (π.χ. thermal_zone) να ανήκουν στο κτίριο της γραμμής. Το
+    `prepare(instance)` κάνει τους υπολογισμούς που αλλιώς κάνει το save().
+    Επιστρέφει τις εγγραφές με τη σειρά των γραμμών.
+    """
+    field_names = {field.name for field in model._meta.concrete_fields}
+    relations = [name for name in OWNED_RELATIONS + tuple(in_building) if name in field_names]
+    resolved = {name: _resolve(model, name, rows) for name in relations}
+    allowed = {}
+
+    errors = []
+    instances = []
+    for row in rows:
+        row_errors = {}
+        fields = dict(row)
+        for name in relations:
+            key = fields.get(name)
+            if key is None:
+                continue
+            obj = resolved[name].get(key)
+            if obj is None:
+                row_errors[name] = [f"{name.replace('_', ' ').capitalize()} {key} not found."]
+                continue
+            if name in OWNED_RELATIONS:
+                if (name, key) not in allowed:
+                    allowed[(name, key)] = has_access_permission(user, obj)
+                if not allowed[(name, key)]:
+                    row_errors[name] = [f"Access denied: you do not own this {name}."]
+                    continue
+            elif row.get('building') is not None and obj.building_id != row['building']:
+                row_errors[name] = [f"{name.replace('_', ' ').capitalize()} does not belong to this building."]
+                continue
+            fields[name] = obj
+        errors.append(row_errors)
+        if row_errors:
+            continue
+
+        instance = model(user=user, **fields)
+        if prepare is not None:
+            prepare(instance)
+        instances.append((len(errors) - 1, instance))
+
+    _check_unique_together(model, instances, errors)
+    if any(errors):
+        raise BulkError(errors)
+    instances = [instance for _, instance in instances]
+
+    with transaction.atomic():
+        model.objects.bulk_create(instances, batch_size=BATCH_SIZE)
+        if model._meta.label in PROGRESS_MODELS:
+            building_ids = {instance.building_id for instance in instances}
+            refresh_building_progress(Building.objects.filter(pk__in=building_ids))
+    return instances
+
+
+def read_items(request):
+    """Οι γραμμές του body {"items": [...]}· επιστρέφει (items, None) ή (None, μήνυμα σφάλματος)."""
+    items = request.data.get('items') if hasattr(request.data, 'get') else None
+    if not isinstance(items, list) or not items:
+        return None, 'Body must be {"items": [...]} with at least one row'
+    if len(items) > MAX_ROWS:
+        return None, f'At most {MAX_ROWS} rows per request'
+    return items, None
+
+
+def bulk_create_response(request, bulk_serializer_class, serializer_class, label, **kwargs):
+    """
+    View helper για POST {"items": [...]}: validation, bulk_create_rows και
+    απάντηση 201 με τις εγγραφές ή 400 με τα σφάλματα ανά γραμμή.
+    """
+    items, error = read_items(request)
+    if error:
+        return Response({'status': 'error', 'message': error}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = bulk_serializer_class(data=items, many=True)
+    if not serializer.is_valid():
+        return Response({
+            'status': 'error',
+            'message': 'Validation errors',
+            'errors': serializer.errors,
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    model = bulk_serializer_class.Meta.model
+    try:
+        instances = bulk_create_rows(request.user, model, serializer.validated_data, **kwargs)
+    except BulkError as e:
+        return Response({
+            'status': 'error',
+            'message': 'Validation errors',
+            'errors': e.errors,
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    return standard_success_response(
+        serializer_class(instances, many=True).data,
+        f"{len(instances)} {label} created successfully",
+        status.HTTP_201_CREATED,
+    )
@@ -0,0 +1,89 @@
+"""
+Conditional GET (ETag / If-None-Match) για τα read endpoints.
+
+Το ETag υπολογίζεται από aggregates (πλήθος εγγραφών, μέγιστο updated_at)
+με ένα ερώτημα, χωρίς serialization. Αν ταιριάζει με το If-None-Match του
+client η απάντηση είναι 304 χωρίς σώμα· αλλιώς το view τρέχει κανονικά και
+η απάντηση παίρνει το ETag. Το πλήθος καλύπτει τις διαγραφές, που δεν
+αλλάζουν το μέγιστο updated_at.
+"""
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def make_etag(*parts):
+    """Weak ETag από τις τιμές `parts` (str() της καθεμίας)."""
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return f"W/{quote_etag(digest)}"
+
+
+def queryset_version(queryset, field='updated_at'):
+    """(πλήθος, μέγιστο `field`) του queryset με ένα ερώτημα."""
+    version = queryset.order_by().aggregate(count=Count('pk'), changed=Max(field))
+    return version['count'], version['changed']
+
+
+def etag_matches(request, etag):
+    """True αν το If-None-Match του request περιέχει το `etag` (ή `*`)."""
+    if_none_match = [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]
+    return etag in if_none_match or '*' in if_none_match
+
+
+def set_etag(response, etag):
+    response['ETag'] = etag
+    # Ο browser ξαναρωτά κάθε φορά (με If-None-Match), δεν σερβίρει παλιά δεδομένα
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def not_modified(etag):
+    return set_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+
+def conditional_etag(etag_func):
+    """
+    Decorator για function views (κάτω από τα @api_view / @permission_classes).
+    Το `etag_func(request, *args, **kwargs)` επιστρέφει το ETag ή None, οπότε
+    το view τρέχει χωρίς ETag (π.χ. άκυρο UUID, 404, 403 που τα χειρίζεται το
+    ίδιο το view). Μόνο οι επιτυχημένες απαντήσεις (200) παίρνουν ETag.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            etag = etag_func(request, *args, **kwargs) if request.method in SAFE_METHODS else None
+            if etag is None:
+                return view(request, *args, **kwargs)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            response = view(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                set_etag(response, etag)
+            return response
+        return wrapped
+    return decorator
+
+
+class ConditionalETagMixin:
+    """
+    Για generic views: ETag στο GET από το get_etag(), που από προεπιλογή
+    είναι το πλήθος και το μέγιστο updated_at του get_queryset().
+    """
+
+    def get_etag(self, request):
+        return make_etag(*queryset_version(self.get_queryset()))
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            set_etag(response, etag)
+        return response
@@ -0,0 +1,356 @@
+"""
+Μαζική διαγραφή χρηστών και έργων μαζί με όλες τις εξαρτημένες εγγραφές.
+
+Το queryset.delete() φορτώνει κάθε εξαρτημένη εγγραφή ως αντικείμενο στη
+μνήμη: κτίρια, εικόνες μαζί με τα BLOB τους, σενάρια, στρώσεις υλικών. Όλα
+γίνονται σε μία συναλλαγή, και για κάθε γραμμή στέλνεται post_delete
+(buildings_count του έργου, πρόοδος κτιρίου, μετρητές του dashboard). Εδώ
+αντίθετα:
+
+- Το σχέδιο διαγραφής (ποιοι πίνακες δείχνουν σε ποιους, με CASCADE ή
+  SET_NULL) βγαίνει από τα _meta των μοντέλων, σε τοπολογική σειρά.
+- Οι ρίζες επεξεργάζονται σε τμήματα. Για κάθε τμήμα διαβάζονται μόνο τα
+  primary keys των εξαρτημένων γραμμών, ποτέ ολόκληρα αντικείμενα.
+- Οι γραμμές διαγράφονται από τα παιδιά προς τους γονείς με
+  DELETE ... WHERE pk IN (...) ανά BATCH_SIZE γραμμές, σε μια σύντομη
+  συναλλαγή ανά παρτίδα και χωρίς signals. Χάρη στη σειρά κάθε ενδιάμεση
+  κατάσταση είναι συνεπής: μια διακοπή απλώς αφήνει γραμμές που δεν
+  διαγράφηκαν ακόμα, και μια νέα εκτέλεση συνεχίζει από εκεί.
+- Ό,τι έκαναν τα post_delete signals εφαρμόζεται μία φορά ανά τμήμα,
+  αθροιστικά (_SideEffects).
+
+Τα HotWaterUpgrade δείχνουν στο κτίριο και στο έργο τους με CharField και όχι
+με ForeignKey. Διαγράφονται μαζί τους, ενώ το queryset.delete() τα άφηνε
+ορφανά.
+"""
+import logging
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.db import models, router, transaction
+from django.db.models.deletion import get_candidate_relations_to_delete
+from django.db.models.signals import post_delete, pre_delete
+
+from adminStats.counters import (
+    BUILDINGS_TOTAL, PROJECTS_TOTAL, USERS_ACTIVE, USERS_TOTAL,
+    adjust_user_statistics, increment, recent_days, registration_counter, registration_day,
+)
+from project.counters import adjust_buildings_count
+from project.completion import CHAR_KEYED_SCENARIOS, SCENARIO_MODELS, SYSTEM_MODELS, refresh_building_progress
+
+logger = logging.getLogger(__name__)
+
+# Ρίζες (χρήστες / έργα) ανά τμήμα: η μνήμη εξαρτάται από τα primary keys ενός τμήματος
+ROOT_CHUNK_SIZE = 10
+# Γραμμές ανά DELETE / UPDATE και ανά συναλλαγή
+BATCH_SIZE = 500
+
+# Σχέσεις με CharField: (μοντέλο, πεδίο, μοντέλο στο οποίο δείχνει)
+CHAR_KEYED_RELATIONS = [
+    (label, field, target)
+    for label in CHAR_KEYED_SCENARIOS
+    for field, target in (('building', 'building.Building'), ('project', 'project.Project'))
+]
+
+PROGRESS_MODELS = {label for _, label in SYSTEM_MODELS + SCENARIO_MODELS} - CHAR_KEYED_SCENARIOS
+CACHED_MODELS = {
+    'prefectures.Prefecture': 'referenceData.cache',
+    'materials.Material': 'referenceData.cache',
+    'numericValues.NumericValue': 'numericValues.cache',
+}
+# Μοντέλα των οποίων τα delete signals αντικαθιστά το _SideEffects
+HANDLED_SIGNAL_MODELS = (
+    {'user.User', 'project.Project', 'building.Building', 'buildingImages.BuildingImage'}
+    | PROGRESS_MODELS | set(CACHED_MODELS)
+)
+
+
+class DeletionError(Exception):
+    """Σχέση που δεν μπορεί να διαγραφεί μαζικά (π.χ. on_delete=PROTECT)."""
+
+
+class PlanNode:
+    """Ένας πίνακας του σχεδίου: τα παιδιά του με CASCADE και όσα δείχνουν σε αυτόν με SET_NULL."""
+
+    def __init__(self, model):
+        self.model = model
+        self.cascade = []
+        self.set_null = []
+
+
+def _batches(values, size):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def build_plan(model):
+    """
+    Οι πίνακες που επηρεάζει η διαγραφή γραμμών του `model`, με κάθε γονέα
+    πριν από τα παιδιά του. DeletionError για on_delete εκτός από CASCADE,
+    SET_NULL και DO_NOTHING.
+    """
+    nodes = {}
+    order = []
+    visiting = set()
+
+    def visit(current):
+        if current in nodes:
+            return
+        if current in visiting:
+            raise DeletionError(f"Cyclic cascade through {current._meta.label}")
+        visiting.add(current)
+        node = PlanNode(current)
+        seen = set()
+        for relation in get_candidate_relations_to_delete(current._meta):
+            child = relation.related_model._meta.concrete_model
+            field = relation.field
+            # Τα proxy μοντέλα (π.χ. TokenProxy) μοιράζονται πίνακα και στήλη με το κανονικό
+            if (child, field.column) in seen:
+                continue
+            seen.add((child, field.column))
+            on_delete = field.remote_field.on_delete
+            if on_delete is models.CASCADE:
+                node.cascade.append((child, field))
+                visit(child)
+            elif on_delete is models.SET_NULL:
+                node.set_null.append((child, field))
+            elif on_delete is not models.DO_NOTHING:
+                raise DeletionError(
+                    f"{child._meta.label}.{field.name}: on_delete={on_delete.__name__} is not supported"
+                )
+        visiting.discard(current)
+        nodes[current] = node
+        # Post-order: κάθε πίνακας μπαίνει μετά από όλους τους απογόνους του
+        order.append(node)
+
+    visit(model._meta.concrete_model)
+    order.reverse()
+
+    for node in order:
+        label = node.model._meta.label
+        if label not in HANDLED_SIGNAL_MODELS and (
+            pre_delete.has_listeners(node.model) or post_delete.has_listeners(node.model)
+        ):
+            logger.warning(f"Bulk delete skips the delete signals of {label}")
+    return order
+
+
+def _collect(plan, root_pks, batch_size):
+    """{μοντέλο: set(pk)} των γραμμών που διαγράφονται μαζί με τις ρίζες `root_pks`."""
+    root = plan[0].model
+    doomed = {node.model: set() for node in plan}
+    for batch in _batches(root_pks, batch_size):
+        doomed[root].update(root._base_manager.filter(pk__in=batch).values_list('pk', flat=True))
+
+    # Οι γονείς προηγούνται, οπότε τα pk ενός πίνακα είναι πλήρη όταν φτάνουμε σε αυτόν
+    for node in plan:
+        for child, field in node.cascade:
+            for batch in _batches(doomed[node.model], batch_size):
+                doomed[child].update(
+                    child._base_manager.filter(**{f'{field.name}__in': batch}).values_list('pk', flat=True)
+                )
+
+    for label, field, target in CHAR_KEYED_RELATIONS:
+        target_model = apps.get_model(target)
+        if target_model not in doomed:
+            continue
+        model = apps.get_model(label)
+        found = doomed.setdefault(model, set())
+        for batch in _batches(doomed[target_model], batch_size):
+            found.update(
+                model._base_manager.filter(**{f'{field}__in': [str(pk) for pk in batch]})
+                .values_list('pk', flat=True)
+            )
+    return doomed
+
+
+class _SideEffects:
+    """
+    Ό,τι έκαναν τα post_delete signals ανά γραμμή, συγκεντρωμένο ανά τμήμα.
+    Διαβάζει τα στοιχεία που χρειάζεται πριν από κάθε DELETE (before_delete)
+    και τα εφαρμόζει μία φορά στο τέλος (apply).
+    """
+
+    def __init__(self, doomed):
+        from building.models import Building
+        from project.models import Project
+        from user.models import User
+
+        self.doomed_users = doomed.get(User, set())
+        self.doomed_projects = doomed.get(Project, set())
+        self.doomed_buildings = doomed.get(Building, set())
+        self.counters = Counter()
+        self.user_projects = Counter()
+        self.user_buildings = Counter()
+        self.project_buildings = Counter()
+        self.progress_buildings = set()
+        self.images = set()
+        self.caches = set()
+
+    def before_delete(self, model, batch):
+        label = model._meta.label
+        rows = model._base_manager.filter(pk__in=batch)
+        if label == 'user.User':
+            days = recent_days()
+            for user in rows.only('last_login', 'date_joined'):
+                self.counters[USERS_TOTAL] += 1
+                if user.last_login is not None:
+                    self.counters[USERS_ACTIVE] += 1
+                day = registration_day(user)
+                if day in days:
+                    self.counters[registration_counter(day)] += 1
+        elif label == 'project.Project':
+            for user_id in rows.values_list('user_id', flat=True):
+                self.counters[PROJECTS_TOTAL] += 1
+                self.user_projects[user_id] += 1
+        elif label == 'building.Building':
+            for user_id, project_id in rows.values_list('user_id', 'project_id'):
+                self.counters[BUILDINGS_TOTAL] += 1
+                self.user_buildings[user_id] += 1
+                if project_id not in self.doomed_projects:
+                    self.project_buildings[project_id] += 1
+        elif label in PROGRESS_MODELS:
+            self.progress_buildings.update(
+                building_id for building_id in rows.values_list('building_id', flat=True)
+                if building_id not in self.doomed_buildings
+            )
+        elif label == 'buildingImages.BuildingImage':
+            from buildingImages.storage import STORAGE_DATABASE
+
+            self.images.update(
+                rows.exclude(storage_backend=STORAGE_DATABASE)
+                .values_list('storage_backend', 'storage_key').distinct()
+            )
+        if label in CACHED_MODELS:
+            self.caches.add(CACHED_MODELS[label])
+
+    def apply(self):
+        import importlib
+
+        from building.models import Building
+        from buildingImages.models import release_stored_image
+
+        for name, value in self.counters.items():
+            increment(name, -value)
+        for user_id in (set(self.user_projects) | set(self.user_buildings)) - self.doomed_users:
+            adjust_user_statistics(
+                user_id, projects=-self.user_projects[user_id], buildings=-self.user_buildings[user_id],
+            )
+        for project_id, count in self.project_buildings.items():
+            adjust_buildings_count(project_id, -count)
+        for batch in _batches(self.progress_buildings, BATCH_SIZE):
+            refresh_building_progress(Building.objects.filter(pk__in=batch))
+        for backend, key in self.images:
+            release_stored_image(backend, key)
+        for module in self.caches:
+            importlib.import_module(module).bump_version()
+
+
+def bulk_delete(model, pks, root_chunk_size=ROOT_CHUNK_SIZE, batch_size=BATCH_SIZE, progress=None):
+    """
+    Διαγράφει τις γραμμές `pks` του `model` με όλες τις εξαρτημένες τους.
+    Επιστρέφει στατιστικά ανά πίνακα με τον ρυθμό (rows/sec), όπως το
+    recalculate_scenarios. Το `progress(label, processed, total)` καλείται
+    μετά από κάθε τμήμα ριζών.
+    """
+    started = time.monotonic()
+    plan = build_plan(model)
+    using = router.db_for_write(model)
+    root_label = plan[0].model._meta.label
+    pks = list(dict.fromkeys(pks))
+    set_null = {node.model: node.set_null for node in plan}
+    stats = {}
+    roots = 0
+    processed = 0
+
+    for chunk in _batches(pks, root_chunk_size):
+        doomed = _collect(plan, chunk, batch_size)
+        roots += len(doomed[plan[0].model])
+        effects = _SideEffects(doomed)
+
+        # Παιδιά πριν από γονείς· τα HotWaterUpgrade (χωρίς ForeignKey) πρώτα
+        targets = [target for target in doomed if target not in set_null] + [node.model for node in reversed(plan)]
+        for target in targets:
+            table_started = time.monotonic()
+            rows = 0
+            for batch in _batches(doomed[target], batch_size):
+                with transaction.atomic(using=using):
+                    effects.before_delete(target, batch)
+                    for child, field in set_null.get(target, ()):
+                        child._base_manager.filter(**{f'{field.name}__in': batch}).update(**{field.name: None})
+                    # _raw_delete: ένα DELETE χωρίς Collector (φόρτωση αντικειμένων) και signals
+                    rows += target._base_manager.filter(pk__in=batch)._raw_delete(using)
+            if rows:
+                item = stats.setdefault(target._meta.label, {'model': target._meta.label, 'rows': 0, 'seconds': 0.0})
+                item['rows'] += rows
+                item['seconds'] += time.monotonic() - table_started
+
+        effects.apply()
+        processed += len(chunk)
+        if progress:
+            progress(root_label, processed, len(pks))
+
+    elapsed = time.monotonic() - started
+    tables = sorted(stats.values(), key=lambda item: item['rows'], reverse=True)
+    for item in tables:
+        item['seconds'] = round(item['seconds'], 3)
+    total_rows = sum(item['rows'] for item in tables)
+    logger.info(f"Bulk delete of {roots} {root_label}: {total_rows} rows in {elapsed:.2f}s")
+    return {
+        'roots_deleted': roots,
+        'tables': tables,
+        'total_rows': total_rows,
+        'elapsed_seconds': round(elapsed, 3),
+        'rows_per_second': round(total_rows / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def _merge(results):
+    tables = {}
+    for result in results:
+        for item in result['tables']:
+            merged = tables.setdefault(item['model'], {'model': item['model'], 'rows': 0, 'seconds': 0.0})
+            merged['rows'] += item['rows']
+            merged['seconds'] = round(merged['seconds'] + item['seconds'], 3)
+    total_rows = sum(result['total_rows'] for result in results)
+    elapsed = sum(result['elapsed_seconds'] for result in results)
+    return {
+        'tables': sorted(tables.values(), key=lambda item: item['rows'], reverse=True),
+        'total_rows': total_rows,
+        'elapsed_seconds': round(elapsed, 3),
+        'rows_per_second': round(total_rows / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def delete_projects(project_ids, progress=None, **kwargs):
+    """Διαγραφή έργων (με τα κτίρια και τα σενάριά τους). Βλ. bulk_delete."""
+    from project.models import Project
+
+    return bulk_delete(Project, project_ids, progress=progress, **kwargs)
+
+
+def delete_users(user_ids, progress=None, **kwargs):
+    """
+    Διαγραφή χρηστών. Πρώτα διαγράφονται τα έργα τους ανά τμήματα έργων, ώστε
+    ένας χρήστης με πολλά μεγάλα έργα να μη φορτώνει όλα τα pk τους μαζί.
+    """
+    from project.models import Project
+    from user.models import User
+
+    project_ids = []
+    for batch in _batches(user_ids, BATCH_SIZE):
+        project_ids.extend(Project.objects.filter(user__in=batch).values_list('pk', flat=True))
+    total = len(project_ids) + len(user_ids)
+
+    def report(offset):
+        # Μία συνολική πρόοδος για τις δύο φάσεις (έργα, χρήστες)
+        return lambda label, processed, _: progress(label, offset + processed, total) if progress else None
+
+    projects = bulk_delete(Project, project_ids, progress=report(0), **kwargs)
+    users = bulk_delete(User, user_ids, progress=report(len(project_ids)), **kwargs)
+    result = _merge([projects, users])
+    result['roots_deleted'] = users['roots_deleted']
+    result['projects_deleted'] = projects['roots_deleted']
+    return result
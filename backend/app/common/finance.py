@@ -0,0 +1,271 @@
+"""
+Shared financial-metrics engine for the scenario models.
+
+Every scenario evaluates the same cash-flow shape: an initial investment
+followed by a constant annual net benefit over a number of years. For that
+shape the discounted sums have closed forms (annuity factors), so NPV and
+discounted payback are computed without year-by-year loops, and the IRR is
+found with a Newton iteration safeguarded by a bisection bracket.
+
+Each scenario calls the scalar functions per row from its own save(): the
+cash flows differ per model, and with closed forms a row costs a few
+microseconds, far below the save() that stores it. `evaluate_batch` computes
+the same metrics for many rows at once with NumPy, for callers that already
+hold the cash flows of a whole batch in memory (e.g. the benchmarks).
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+
+IRR_LOWER_BOUND = -0.99
+IRR_UPPER_BOUND = 10.0
+IRR_BRACKET_EXPANSIONS = 20
+IRR_TOLERANCE = 1e-10
+IRR_MAX_ITERATIONS = 100
+
+FinancialMetrics = namedtuple(
+    'FinancialMetrics',
+    ['net_present_value', 'payback_period', 'discounted_payback_period', 'internal_rate_of_return']
+)
+
+
+def annuity_factor(rate, years):
+    """
+    Present value of 1 € received at the end of each year for `years` years.
+    AF = (1 - (1 + r)^-n) / r, and AF = n when r = 0.
+    """
+    if years <= 0:
+        return 0.0
+    if rate == 0:
+        return float(years)
+    return (1 - (1 + rate) ** -years) / rate
+
+
+def _annuity_factor_derivative(rate, years):
+    """dAF/dr, used by the Newton step of the IRR solver."""
+    if rate == 0:
+        return -years * (years + 1) / 2.0
+    factor = annuity_factor(rate, years)
+    return (years * (1 + rate) ** -(years + 1) - factor) / rate
+
+
+def present_value(annual_cash_flow, rate, years):
+    """Present value of a constant annual cash flow."""
+    return annual_cash_flow * annuity_factor(rate, years)
+
+
+def net_present_value(investment, annual_cash_flow, rate, years):
+    """NPV = Σ[CF / (1 + r)^t] - Investment, t = 1..years."""
+    return present_value(annual_cash_flow, rate, years) - investment
+
+
+def simple_payback(investment, annual_cash_flow):
+    """Investment / annual cash flow, or None when the cash flow is not positive."""
+    if annual_cash_flow <= 0:
+        return None
+    return investment / annual_cash_flow
+
+
+def discounted_payback(investment, annual_cash_flow, rate, years):
+    """
+    Year (with linear interpolation inside the year) at which the cumulative
+    discounted cash flow reaches the investment. Returns `years + 1` when the
+    investment is not recovered within the evaluation period.
+    """
+    years = int(years)
+    if annual_cash_flow <= 0 or years <= 0:
+        return years + 1
+
+    # Smallest integer year k with A·AF(r, k) >= I, from the closed form.
+    if investment <= 0:
+        year = 1
+    elif rate == 0:
+        year = math.ceil(investment / annual_cash_flow)
+    else:
+        remaining = 1 - investment * rate / annual_cash_flow
+        if remaining <= 0:
+            return years + 1
+        year = max(1, math.ceil(-math.log(remaining) / math.log(1 + rate)))
+
+    # Guard against floating-point error around the integer boundary.
+    while year > 1 and present_value(annual_cash_flow, rate, year - 1) >= investment:
+        year -= 1
+    while year <= years and present_value(annual_cash_flow, rate, year) < investment:
+        year += 1
+    if year > years:
+        return years + 1
+
+    previous = present_value(annual_cash_flow, rate, year - 1)
+    discounted_cash_flow = annual_cash_flow / (1 + rate) ** year
+    return (year - 1) + (investment - previous) / discounted_cash_flow
+
+
+def internal_rate_of_return(investment, annual_cash_flow, years,
+                            lower=IRR_LOWER_BOUND, upper=None):
+    """
+    Rate (as a fraction) at which the NPV is zero, or None when the cash flows
+    do not describe an investment (no positive investment or benefit).
+
+    The NPV of this cash-flow shape is strictly decreasing in the rate, so the
+    root is kept inside a [lower, upper] bracket and every Newton step that
+    leaves it is replaced by bisection. Rates below `lower` are clamped to it
+    (-99%). With `upper=None` the bracket is widened until it contains the
+    root; pass `upper=IRR_UPPER_BOUND` to cap the result at 1000%.
+    """
+    years = int(years)
+    if investment <= 0 or annual_cash_flow <= 0 or years <= 0:
+        return None
+
+    def npv_at(rate):
+        return annual_cash_flow * annuity_factor(rate, years) - investment
+
+    if upper is None:
+        upper = IRR_UPPER_BOUND
+        for _ in range(IRR_BRACKET_EXPANSIONS):
+            if npv_at(upper) < 0:
+                break
+            upper *= 2
+    if npv_at(upper) >= 0:
+        return upper
+    if npv_at(lower) <= 0:
+        return lower
+
+    rate = min(max(0.1, lower), upper)
+    previous_step = upper - lower
+    for _ in range(IRR_MAX_ITERATIONS):
+        value = npv_at(rate)
+        if abs(value) < IRR_TOLERANCE * max(1.0, investment):
+            return rate
+        if value > 0:
+            lower = rate
+        else:
+            upper = rate
+
+        # Newton only while it converges at least as fast as bisection would.
+        derivative = annual_cash_flow * _annuity_factor_derivative(rate, years)
+        candidate = rate - value / derivative if derivative != 0 else None
+        if candidate is None or not lower < candidate < upper or abs(candidate - rate) > previous_step / 2:
+            candidate = (lower + upper) / 2
+        previous_step = abs(candidate - rate)
+        if previous_step < IRR_TOLERANCE:
+            return candidate
+        rate = candidate
+    return rate
+
+
+def evaluate(investment, annual_cash_flow, rate, years, irr_upper=None):
+    """All metrics for one cash-flow row. IRR is returned as a fraction."""
+    return FinancialMetrics(
+        net_present_value=net_present_value(investment, annual_cash_flow, rate, years),
+        payback_period=simple_payback(investment, annual_cash_flow),
+        discounted_payback_period=(
+            discounted_payback(investment, annual_cash_flow, rate, years)
+            if annual_cash_flow > 0 else None
+        ),
+        internal_rate_of_return=internal_rate_of_return(investment, annual_cash_flow, years, upper=irr_upper),
+    )
+
+
+def evaluate_batch(investments, annual_cash_flows, rates, years, irr_upper=None):
+    """
+    Evaluate many cash-flow rows at once, with the same results as `evaluate`
+    per row. Arguments are equal-length sequences (rates as fractions).
+    Returns a dict of lists keyed like FinancialMetrics, with None where a
+    metric is undefined for a row.
+    """
+    return _evaluate_batch_numpy(
+        np.asarray(investments, dtype=float),
+        np.asarray(annual_cash_flows, dtype=float),
+        np.asarray(rates, dtype=float),
+        np.asarray(years, dtype=int),
+        irr_upper,
+    )
+
+
+def _annuity_factor_array(rates, years):
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        factor = (1 - (1 + rates) ** -years.astype(float)) / rates
+    factor = np.where(rates == 0, years.astype(float), factor)
+    return np.where(years <= 0, 0.0, factor)
+
+
+def _annuity_factor_derivative_array(rates, years):
+    n = years.astype(float)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        derivative = (n * (1 + rates) ** -(n + 1) - _annuity_factor_array(rates, years)) / rates
+    return np.where(rates == 0, -n * (n + 1) / 2.0, derivative)
+
+
+def _to_list(values, valid):
+    return [float(value) if ok else None for value, ok in zip(values, valid)]
+
+
+def _evaluate_batch_numpy(investments, cash_flows, rates, years, irr_upper):
+    positive = cash_flows > 0
+    npv = cash_flows * _annuity_factor_array(rates, years) - investments
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payback = investments / cash_flows
+
+    # Discounted payback: closed-form year, then boundary correction as in the scalar path.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        remaining = 1 - investments * rates / cash_flows
+        exact_year = np.where(
+            rates == 0,
+            investments / cash_flows,
+            -np.log(np.where(remaining > 0, remaining, 1.0)) / np.log1p(rates),
+        )
+    year = np.maximum(1, np.ceil(np.nan_to_num(exact_year, nan=1.0, posinf=1e9))).astype(int)
+    year = np.where(investments <= 0, 1, year)
+    never = positive & (rates != 0) & (investments > 0) & (remaining <= 0)
+    year = np.minimum(year, years + 1)
+    step_back = (year > 1) & (cash_flows * _annuity_factor_array(rates, year - 1) >= investments)
+    year = np.where(step_back, year - 1, year)
+    step_forward = (year <= years) & (cash_flows * _annuity_factor_array(rates, year) < investments)
+    year = np.where(step_forward, year + 1, year)
+    previous = cash_flows * _annuity_factor_array(rates, year - 1)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        dpp = (year - 1) + (investments - previous) / (cash_flows / (1 + rates) ** year)
+    dpp = np.where(never | (year > years), years + 1, dpp)
+
+    # IRR: vectorized safeguarded Newton over a per-row bracket.
+    irr_valid = (investments > 0) & positive & (years > 0)
+    lower = np.full(investments.shape, IRR_LOWER_BOUND)
+    upper = np.full(investments.shape, IRR_UPPER_BOUND if irr_upper is None else irr_upper)
+    npv_upper = cash_flows * _annuity_factor_array(upper, years) - investments
+    if irr_upper is None:
+        for _ in range(IRR_BRACKET_EXPANSIONS):
+            widen = npv_upper >= 0
+            if not np.any(widen & irr_valid):
+                break
+            upper = np.where(widen, upper * 2, upper)
+            npv_upper = cash_flows * _annuity_factor_array(upper, years) - investments
+    npv_lower = cash_flows * _annuity_factor_array(lower, years) - investments
+    rate = np.clip(np.full(investments.shape, 0.1), lower, upper)
+    previous_step = upper - lower
+    for _ in range(IRR_MAX_ITERATIONS):
+        value = cash_flows * _annuity_factor_array(rate, years) - investments
+        lower = np.where(value > 0, rate, lower)
+        upper = np.where(value > 0, upper, rate)
+        derivative = cash_flows * _annuity_factor_derivative_array(rate, years)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            candidate = rate - value / derivative
+        outside = (
+            ~np.isfinite(candidate) | (candidate <= lower) | (candidate >= upper)
+            | (np.abs(candidate - rate) > previous_step / 2)
+        )
+        candidate = np.where(outside, (lower + upper) / 2, candidate)
+        previous_step = np.abs(candidate - rate)
+        done = previous_step < IRR_TOLERANCE
+        rate = candidate
+        if np.all(done | ~irr_valid):
+            break
+    irr = np.where(npv_upper >= 0, upper, np.where(npv_lower <= 0, IRR_LOWER_BOUND, rate))
+
+    return {
+        'net_present_value': npv.tolist(),
+        'payback_period': _to_list(payback, positive),
+        'discounted_payback_period': _to_list(dpp, positive),
+        'internal_rate_of_return': _to_list(irr, irr_valid),
+    }
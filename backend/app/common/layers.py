@@ -0,0 +1,101 @@
+"""
+Μαζική αντικατάσταση των στρώσεων υλικών μιας θερμομόνωσης (τοίχου ή οροφής).
+
+Αντί για ένα request και ένα save() ανά στρώση (όπου κάθε save() ξαναϋπολογίζει
+και ξαναγράφει ολόκληρη τη θερμομόνωση), η λίστα των στρώσεων γράφεται με ένα
+delete, ένα bulk_update και ένα bulk_create και ο συντελεστής U και οι
+οικονομικοί δείκτες υπολογίζονται μία φορά στο τέλος.
+"""
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+
+from materials.models import Material
+
+BATCH_SIZE = 500
+
+
+class LayerError(Exception):
+    """Μη έγκυρη λίστα στρώσεων· το `errors` έχει ένα dict ανά στρώση (κενό για τις έγκυρες)."""
+
+    def __init__(self, errors):
+        super().__init__("Invalid material layers")
+        self.errors = errors
+
+
+def _update_fields(model, parent_field):
+    return [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key and field.name not in (parent_field, 'created_at')
+    ]
+
+
+def replace_layers(parent, related_name, layers, prepare=None):
+    """
+    Αντικαθιστά τις στρώσεις του `parent` με τις `layers` (validated_data του
+    batch serializer, με το υλικό ως UUID). Στρώσεις με uuid που ανήκει ήδη στο
+    parent ενημερώνονται, οι υπόλοιπες δημιουργούνται και όσες λείπουν από τη
+    λίστα διαγράφονται. Το `prepare(layer)` συμπληρώνει πεδία που αλλιώς
+    συμπληρώνει το save() της στρώσης. Καλείται μέσα σε transaction.atomic.
+    Επιστρέφει τις στρώσεις με τη σειρά της λίστας.
+    """
+    manager = getattr(parent, related_name)
+    model = manager.model
+    parent_field = manager.field.name
+
+    existing = manager.in_bulk()
+    materials = Material.objects.in_bulk({data['material'] for data in layers})
+
+    errors = []
+    result, to_create, to_update = [], [], []
+    seen = set()
+    for data in layers:
+        row_errors = {}
+        fields = dict(data)
+        layer_uuid = fields.pop('uuid', None)
+        material = materials.get(fields['material'])
+        if material is None:
+            row_errors['material'] = [f"Material {fields['material']} not found."]
+        if layer_uuid is not None:
+            if layer_uuid not in existing:
+                row_errors['uuid'] = ["Layer does not belong to this thermal insulation."]
+            elif layer_uuid in seen:
+                row_errors['uuid'] = ["Layer is listed more than once."]
+            seen.add(layer_uuid)
+        errors.append(row_errors)
+        if row_errors:
+            continue
+
+        fields['material'] = material
+        if layer_uuid is None:
+            layer = model(**{parent_field: parent}, **fields)
+            to_create.append(layer)
+        else:
+            layer = existing[layer_uuid]
+            for name, value in fields.items():
+                setattr(layer, name, value)
+            to_update.append(layer)
+        if prepare is not None:
+            prepare(layer)
+        result.append(layer)
+
+    if any(errors):
+        raise LayerError(errors)
+
+    removed = [pk for pk in existing if pk not in seen]
+    if removed:
+        model.objects.filter(pk__in=removed).delete()
+    if to_update:
+        # Το bulk_update δεν ενημερώνει τα auto_now πεδία
+        now = timezone.now()
+        for layer in to_update:
+            layer.updated_at = now
+        model.objects.bulk_update(to_update, _update_fields(model, parent_field), batch_size=BATCH_SIZE)
+    if to_create:
+        model.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+
+    # Ένας επαναϋπολογισμός και μία εγγραφή για ολόκληρη τη θερμομόνωση
+    parent.save()
+    # Οι νέες στρώσεις με τα υλικά τους για τον serializer της απάντησης, που
+    # αλλιώς θα διάβαζε τις στρώσεις πολλές φορές και το υλικό ανά στρώση
+    prefetch_related_objects([parent], f'{related_name}__material')
+    return result
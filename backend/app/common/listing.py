@@ -0,0 +1,103 @@
+"""
+Σελιδοποίηση keyset (cursor) και επιλογή πεδίων (?fields=) για τις λίστες
+κτιρίων και έργων.
+
+Αντί για OFFSET, κάθε σελίδα ξεκινά μετά το (date_created, uuid) της
+τελευταίας γραμμής της προηγούμενης, με ένα ερώτημα πάνω στο σύνθετο index,
+οπότε το κόστος μιας σελίδας εξαρτάται από το μέγεθός της και όχι από το
+πλήθος των γραμμών του πίνακα. Το uuid σπάει τις ισοπαλίες (π.χ. έργα με
+την ίδια ημερομηνία δημιουργίας).
+"""
+import base64
+import binascii
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.utils.urls import replace_query_param
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+KEYSET_FIELDS = ('date_created', 'uuid')
+
+
+class ListingError(ValueError):
+    """Άκυρο ?cursor=, ?page_size= ή ?fields= (απάντηση 400)."""
+
+
+class SparseFieldsMixin:
+    """Serializer που δέχεται `fields=[...]` και κρατά μόνο αυτά τα πεδία."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def parse_fields(request, serializer_class):
+    """Τα πεδία του ?fields=a,b (None αν λείπει). ListingError για άγνωστα ονόματα."""
+    value = request.query_params.get('fields')
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in serializer_class().fields]
+    if unknown:
+        raise ListingError(f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def _page_size(request):
+    value = request.query_params.get('page_size')
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        page_size = int(value)
+    except ValueError:
+        raise ListingError("page_size must be an integer")
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ListingError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+    return page_size
+
+
+def encode_cursor(values):
+    raw = '|'.join(value.isoformat() if hasattr(value, 'isoformat') else str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, model, keys=KEYSET_FIELDS):
+    """Οι τιμές των `keys` από ένα cursor του encode_cursor. ListingError αν είναι άκυρο."""
+    try:
+        parts = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        if len(parts) != len(keys):
+            raise ValueError
+        return [model._meta.get_field(key).to_python(part) for key, part in zip(keys, parts)]
+    except (ValueError, binascii.Error, ValidationError):
+        raise ListingError("Invalid cursor")
+
+
+def keyset_page(queryset, request, keys=KEYSET_FIELDS):
+    """
+    Μία σελίδα του queryset ταξινομημένου κατά `keys`, μετά το ?cursor=.
+    Επιστρέφει (γραμμές, pagination) όπου pagination είναι
+    {'page_size', 'next_cursor', 'next'} (None στην τελευταία σελίδα).
+    """
+    page_size = _page_size(request)
+    queryset = queryset.order_by(*keys)
+    cursor = request.query_params.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, keys)
+        after = Q()
+        for index, key in enumerate(keys):
+            after |= Q(**dict(zip(keys[:index], values[:index])), **{f'{key}__gt': values[index]})
+        queryset = queryset.filter(after)
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(getattr(rows[-1], key) for key in keys)
+    return rows, {
+        'page_size': page_size,
+        'next_cursor': next_cursor,
+        'next': replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor) if next_cursor else None,
+    }
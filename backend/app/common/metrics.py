@@ -0,0 +1,146 @@
+"""
+Μετρικές σε μορφή Prometheus (METRICS_ENABLED=True, απαιτεί prometheus_client).
+
+- bemat_http_requests_total / bemat_http_request_duration_seconds ανά route
+  (το pattern του URL, όχι το πραγματικό path)
+- bemat_db_queries_per_request / bemat_db_time_per_request_seconds ανά route
+- bemat_db_connections_opened_total: νέες συνδέσεις στη βάση (με
+  CONN_MAX_AGE=0 μία ανά request)
+- bemat_scenario_save_duration_seconds ανά μοντέλο σεναρίου: από το pre_save ως
+  το post_save (εγγραφή στη βάση και receivers), χωρίς τον επανυπολογισμό
+  που γίνεται στο save() πριν από αυτά
+- bemat_image_bytes_served_total ανά είδος (raw / thumbnail)
+
+Με πολλούς gunicorn workers το PROMETHEUS_MULTIPROC_DIR πρέπει να οριστεί στο
+περιβάλλον πριν ξεκινήσει ο gunicorn: κάθε worker γράφει τις τιμές του σε
+αρχεία εκεί και το /metrics τις αθροίζει (βλ. gunicorn.conf.py).
+"""
+import os
+import time
+from contextlib import ExitStack
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, pre_save
+from django.http import HttpResponse, HttpResponseForbidden
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+    )
+except ImportError:  # Οι μετρικές είναι προαιρετικές.
+    Counter = None
+
+from .performance import RequestMetrics, route_name
+
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+if Counter is not None:
+    REQUESTS = Counter(
+        'bemat_http_requests_total', 'HTTP requests', ['method', 'route', 'status'],
+    )
+    REQUEST_DURATION = Histogram(
+        'bemat_http_request_duration_seconds', 'HTTP request latency', ['method', 'route'],
+    )
+    QUERIES_PER_REQUEST = Histogram(
+        'bemat_db_queries_per_request', 'SQL queries per HTTP request', ['method', 'route'],
+        buckets=QUERY_BUCKETS,
+    )
+    DB_TIME_PER_REQUEST = Histogram(
+        'bemat_db_time_per_request_seconds', 'Time spent in SQL queries per HTTP request', ['method', 'route'],
+    )
+    CONNECTIONS_OPENED = Counter(
+        'bemat_db_connections_opened_total', 'Database connections opened', ['alias'],
+    )
+    SCENARIO_SAVE_DURATION = Histogram(
+        'bemat_scenario_save_duration_seconds', 'Duration of scenario database save (pre_save to post_save)', ['model'],
+    )
+    IMAGE_BYTES_SERVED = Counter(
+        'bemat_image_bytes_served_total', 'Building image bytes served', ['variant'],
+    )
+
+_instrumented = False
+
+
+def metrics_enabled():
+    return Counter is not None and settings.METRICS_ENABLED
+
+
+def observe_image_bytes(variant, size):
+    if metrics_enabled() and size:
+        IMAGE_BYTES_SERVED.labels(variant).inc(size)
+
+
+def _count_connection(sender, connection, **kwargs):
+    CONNECTIONS_OPENED.labels(connection.alias).inc()
+
+
+def _start_save_timer(sender, instance, **kwargs):
+    instance._metrics_save_started = time.perf_counter()
+
+
+def _observe_save(sender, instance, **kwargs):
+    started = instance.__dict__.pop('_metrics_save_started', None)
+    if started is not None:
+        SCENARIO_SAVE_DURATION.labels(sender._meta.label).observe(time.perf_counter() - started)
+
+
+def _instrument():
+    """Μία φορά ανά process: μέτρηση συνδέσεων και αποθηκεύσεων των σεναρίων."""
+    global _instrumented
+    if _instrumented:
+        return
+    from project.completion import SCENARIO_MODELS
+
+    connection_created.connect(_count_connection, dispatch_uid='common.metrics.connection_created')
+    for _, label in SCENARIO_MODELS:
+        model = apps.get_model(label)
+        pre_save.connect(_start_save_timer, sender=model, dispatch_uid=f'common.metrics.save_started_{label}')
+        # Συνδέεται μετά τους receivers των εφαρμογών, οπότε μετρά και αυτούς (π.χ. πρόοδο κτιρίου)
+        post_save.connect(_observe_save, sender=model, dispatch_uid=f'common.metrics.save_finished_{label}')
+    _instrumented = True
+
+
+class MetricsMiddleware:
+    """Αφαιρείται (MiddlewareNotUsed) αν οι μετρικές είναι απενεργοποιημένες."""
+
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _instrument()
+
+    def __call__(self, request):
+        request_metrics = RequestMetrics()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(request_metrics))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        route = route_name(request)
+        REQUESTS.labels(request.method, route, str(response.status_code)).inc()
+        REQUEST_DURATION.labels(request.method, route).observe(duration)
+        QUERIES_PER_REQUEST.labels(request.method, route).observe(request_metrics.queries)
+        DB_TIME_PER_REQUEST.labels(request.method, route).observe(request_metrics.db_time)
+        return response
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, μόνο για τις διευθύνσεις του METRICS_ALLOWED_IPS."""
+    if not metrics_enabled():
+        return HttpResponse("Metrics are disabled", status=404, content_type='text/plain')
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden("Forbidden", content_type='text/plain')
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        # Άθροισμα των αρχείων όλων των workers
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
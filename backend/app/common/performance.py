@@ -0,0 +1,278 @@
+"""
+Προαιρετική καταγραφή απόδοσης ανά request (PERFORMANCE_MONITORING=True).
+
+Για κάθε request καταγράφονται ο χρόνος απόκρισης, το πλήθος και ο χρόνος των
+SQL ερωτημάτων (μέσω connection.execute_wrapper, χωρίς DEBUG), ο χρόνος των
+serializers του DRF και το μέγεθος της απόκρισης. Τα ίδια μεγέθη στέλνονται
+στο header Server-Timing, ώστε να φαίνονται στα devtools του frontend.
+
+Κάθε process κρατά τα τελευταία PERFORMANCE_SAMPLE_SIZE δείγματα ανά route
+(το pattern του URL, όχι το πραγματικό path) και κάθε
+PERFORMANCE_FLUSH_INTERVAL δευτερόλεπτα γράφει ένα αντίγραφο στο cache. Το
+/api/admin-api/perf/ ενώνει τα αντίγραφα όλων των workers· με LocMemCache
+βλέπει μόνο τον τρέχοντα worker.
+"""
+import contextvars
+import math
+import os
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+CACHE_PREFIX = 'performance:'
+WORKERS_KEY = f'{CACHE_PREFIX}workers'
+GENERATION_KEY = f'{CACHE_PREFIX}generation'
+WORKER_TTL = 600
+PERCENTILES = (50, 90, 99)
+METRICS = ('duration_ms', 'queries', 'db_ms', 'serializer_ms', 'response_bytes')
+
+_request_metrics = contextvars.ContextVar('performance_request_metrics', default=None)
+_serializer_depth = contextvars.ContextVar('performance_serializer_depth', default=0)
+_instrumented = False
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile σε ταξινομημένη λίστα."""
+    if not values:
+        return None
+    rank = math.ceil(percent / 100 * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper: μετρά κάθε ερώτημα του request
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+def _timed_data(original):
+    """
+    Μετρά τον χρόνο του πιο εξωτερικού serializer.data (όχι των εμφωλευμένων),
+    χωρίς τα ερωτήματα που έγιναν μέσα του· αυτά μετρώνται στο db, ώστε
+    db + serializer + app να αθροίζουν στον συνολικό χρόνο.
+    """
+    def data(self):
+        metrics = _request_metrics.get()
+        if metrics is None or _serializer_depth.get():
+            return original(self)
+        token = _serializer_depth.set(1)
+        started = time.perf_counter()
+        db_time = metrics.db_time
+        try:
+            return original(self)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.serializer_time += elapsed - (metrics.db_time - db_time)
+            _serializer_depth.reset(token)
+    return property(data)
+
+
+def _instrument_serializers():
+    global _instrumented
+    if _instrumented:
+        return
+    from rest_framework import serializers
+
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        serializer_class.data = _timed_data(serializer_class.data.fget)
+    _instrumented = True
+
+
+class PerformanceStore:
+    """Δείγματα ανά (method, route) για το τρέχον process."""
+
+    def __init__(self, sample_size):
+        self.sample_size = sample_size
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.last_flush = 0.0
+        self.generation = None
+
+    def record(self, key, status_code, sample):
+        with self.lock:
+            route = self.routes.get(key)
+            if route is None:
+                route = self.routes[key] = {
+                    'count': 0, 'errors': 0, 'samples': deque(maxlen=self.sample_size),
+                }
+            route['count'] += 1
+            if status_code >= 500:
+                route['errors'] += 1
+            route['samples'].append(sample)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                key: {'count': route['count'], 'errors': route['errors'], 'samples': list(route['samples'])}
+                for key, route in self.routes.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+
+    def flush(self, interval, force=False):
+        """Γράφει το snapshot στο cache το πολύ μία φορά ανά `interval` δευτερόλεπτα."""
+        now = time.monotonic()
+        if not force and now - self.last_flush < interval:
+            return
+        self.last_flush = now
+        worker = worker_id()
+        try:
+            # Μετά από reset (αλλαγή generation) κάθε worker αδειάζει τα δικά του δείγματα
+            generation = cache.get(GENERATION_KEY, 0)
+            if self.generation is not None and generation != self.generation:
+                self.reset()
+            self.generation = generation
+            cache.set(f'{CACHE_PREFIX}{worker}', self.snapshot(), WORKER_TTL)
+            workers = set(cache.get(WORKERS_KEY) or ())
+            if worker not in workers:
+                workers.add(worker)
+                cache.set(WORKERS_KEY, sorted(workers), WORKER_TTL)
+        except Exception:
+            # Η καταγραφή απόδοσης δεν πρέπει ποτέ να ρίξει ένα request
+            pass
+
+
+store = PerformanceStore(getattr(settings, 'PERFORMANCE_SAMPLE_SIZE', 500))
+
+
+def route_name(request):
+    """Το pattern του URL που εξυπηρέτησε το request (π.χ. /api/projects/<uuid:uuid>/)."""
+    match = getattr(request, 'resolver_match', None)
+    route = getattr(match, 'route', None) if match else None
+    return f"/{route}" if route else '<unresolved>'
+
+
+def _route_key(request):
+    return f"{request.method} {route_name(request)}"
+
+
+def _response_size(response):
+    if getattr(response, 'streaming', False):
+        length = response.get('Content-Length')
+        return int(length) if length and length.isdigit() else None
+    return len(response.content)
+
+
+def _server_timing(metrics, duration):
+    return ', '.join([
+        f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+        f'serializer;dur={metrics.serializer_time * 1000:.1f}',
+        f'app;dur={(duration - metrics.db_time - metrics.serializer_time) * 1000:.1f}',
+        f'total;dur={duration * 1000:.1f}',
+    ])
+
+
+class PerformanceMiddleware:
+    """
+    Πρώτο στο MIDDLEWARE ώστε ο χρόνος να καλύπτει όλο το stack. Αν το
+    PERFORMANCE_MONITORING είναι False, το Django το αφαιρεί (MiddlewareNotUsed).
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERFORMANCE_MONITORING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _instrument_serializers()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+        duration = time.perf_counter() - started
+
+        store.record(_route_key(request), response.status_code, (
+            round(duration * 1000, 3),
+            metrics.queries,
+            round(metrics.db_time * 1000, 3),
+            round(metrics.serializer_time * 1000, 3),
+            _response_size(response),
+        ))
+        store.flush(settings.PERFORMANCE_FLUSH_INTERVAL)
+
+        response['Server-Timing'] = _server_timing(metrics, duration)
+        origin = request.headers.get('Origin')
+        if origin and origin in settings.CORS_ALLOWED_ORIGINS:
+            # Επιτρέπει στο frontend (άλλο origin) να διαβάσει το Server-Timing
+            response['Timing-Allow-Origin'] = origin
+        return response
+
+
+def _summarize(key, count, errors, samples):
+    summary = {'route': key, 'count': count, 'errors': errors, 'samples': len(samples)}
+    for position, metric in enumerate(METRICS):
+        values = sorted(sample[position] for sample in samples if sample[position] is not None)
+        summary[metric] = {f'p{percent}': percentile(values, percent) for percent in PERCENTILES}
+        summary[metric]['max'] = values[-1] if values else None
+    return summary
+
+
+def collect_stats():
+    """
+    Στατιστικά ανά route από όλους τους workers που έχουν γράψει στο cache
+    (και το live snapshot του τρέχοντος). Επιστρέφει (routes, workers).
+    """
+    snapshots = {worker_id(): store.snapshot()}
+    try:
+        for worker in cache.get(WORKERS_KEY) or ():
+            if worker not in snapshots:
+                snapshot = cache.get(f'{CACHE_PREFIX}{worker}')
+                if snapshot is not None:
+                    snapshots[worker] = snapshot
+    except Exception:
+        pass
+
+    merged = {}
+    for snapshot in snapshots.values():
+        for key, route in snapshot.items():
+            entry = merged.setdefault(key, {'count': 0, 'errors': 0, 'samples': []})
+            entry['count'] += route['count']
+            entry['errors'] += route['errors']
+            entry['samples'].extend(route['samples'])
+
+    routes = [
+        _summarize(key, entry['count'], entry['errors'], entry['samples'])
+        for key, entry in merged.items()
+    ]
+    return routes, sorted(snapshots)
+
+
+def reset_stats():
+    """Αδειάζει τα δείγματα· οι άλλοι workers τα αδειάζουν στο επόμενο flush τους."""
+    store.reset()
+    try:
+        workers = cache.get(WORKERS_KEY) or ()
+        cache.delete_many([f'{CACHE_PREFIX}{worker}' for worker in workers] + [WORKERS_KEY])
+        cache.set(GENERATION_KEY, cache.get(GENERATION_KEY, 0) + 1, None)
+        store.generation = cache.get(GENERATION_KEY)
+    except Exception:
+        pass
@@ -0,0 +1,877 @@
+import base64
+import random
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.db import connection, models, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from adminStats.counters import reconcile
+from adminStats.models import StatisticCounter, UserStatistics
+from airConditioningReplacement.models import AirConditioningAnalysis, NewAirConditioning, OldAirConditioning
+from automaticLightingControl.models import AutomaticLightingControl
+from boilerReplacement.models import BoilerReplacement
+from building.models import Building
+from bulbReplacement.models import BulbReplacement
+from electricalConsumption.models import ElectricalConsumption
+from exteriorBlinds.models import ExteriorBlinds
+from heatingSystem.models import HeatingSystem
+from hotWaterUpgrade.models import HotWaterUpgrade
+from materials.models import Material
+from naturalGasNetwork.models import NaturalGasNetwork
+from numericValues import cache as numeric_cache
+from photovoltaicSystem.models import PhotovoltaicSystem
+from prefectures.models import Prefecture
+from project.completion import SCENARIO_MODELS, SYSTEM_MODELS
+from project.models import BuildingProgress, Project
+from roofThermalInsulation.models import RoofThermalInsulation, RoofThermalInsulationMaterialLayer
+from thermalInsulation.models import ExternalWallThermalInsulation, ThermalInsulationMaterialLayer
+from thermalZone.models import ThermalZone
+from user.models import User
+from windowReplacement.models import WindowReplacement
+
+from .deletion import DeletionError, delete_projects, delete_users
+from . import metrics, performance
+from .performance import PerformanceStore, collect_stats, percentile, reset_stats
+from .finance import (
+    IRR_LOWER_BOUND,
+    IRR_UPPER_BOUND,
+    FinancialMetrics,
+    annuity_factor,
+    discounted_payback,
+    evaluate,
+    evaluate_batch,
+    internal_rate_of_return,
+    net_present_value,
+    simple_payback,
+)
+
+# Τιμές από τους αρχικούς βρόχους ανά μοντέλο (baseline 273edad, πριν το common.finance):
+# (payback_period, discounted_payback_period, net_present_value, internal_rate_of_return)
+SCENARIO_GOLDEN_VALUES = {
+    ('window_replacement', 'low_cost'): (7.5, 10.295892, 1735.63993, 11.132656),
+    ('window_replacement', 'high_cost'): (56.25, 21.0, -17764.36007, -8.669647),
+    ('bulb_replacement', 'low_cost'): (0.392157, 0.414474, 11137.037092, 253.332497),
+    ('bulb_replacement', 'high_cost'): (13.202614, 11.0, -8462.962908, -4.862511),
+    ('boiler_replacement', 'low_cost'): (6.45, 8.4, 1669.78, 13.04),
+    ('boiler_replacement', 'high_cost'): (30.88, 16.0, -10830.22, -7.91),
+    ('air_conditioning', 'low_cost'): (3.849108, 4.386914, 5005.088204, 25.074039),
+    ('air_conditioning', 'high_cost'): (84.288935, 16.0, -14161.227949, -16.475802),
+    ('roof_thermal_insulation', 'low_cost'): (1.73, 1.87, 28348.54, 57.38),
+    ('roof_thermal_insulation', 'high_cost'): (17.28, 26.0, -7651.46, 2.99),
+    ('wall_thermal_insulation', 'low_cost'): (2.87, 3.21, 23197.7, 34.51),
+    ('wall_thermal_insulation', 'high_cost'): (28.69, 26.0, -30802.3, -1.1),
+    ('exterior_blinds', 'low_cost'): (2.125506, 2.308039, 8155.1, 46.900665),
+    ('exterior_blinds', 'high_cost'): (18.522267, 16.0, -8044.9, -2.527674),
+    ('photovoltaic_system', 'low_cost'): (6.56, 8.49, 11794.45, 14.22),
+    ('photovoltaic_system', 'high_cost'): (37.64, 26.0, -36863.15, -3.14),
+    ('hot_water_upgrade', 'low_cost'): (2.916667, 3.366406, 5957.523011, 32.580233),
+    ('hot_water_upgrade', 'high_cost'): (17.916667, 16.0, -6642.476989, -2.563591),
+    ('automatic_lighting_control', 'low_cost'): (12.14, 11.0, -3094.79, -3.38),
+    ('automatic_lighting_control', 'high_cost'): (108.57, 11.0, -70594.79, -29.52),
+    ('natural_gas_network', 'low_cost'): (1.42, 1.519441, 15225.42, 70.22),
+    ('natural_gas_network', 'high_cost'): (18.19, 16.0, -13274.58, -100.0),
+}
+
+
+class FinanceGoldenValueTests(SimpleTestCase):
+    """
+    Τιμές αναφοράς για επένδυση 1.000 € και 300 €/έτος επί 5 έτη με 10%
+    (ίδιες με τις NPV/IRR του Excel), και 10.000 € με 2.500 €/έτος επί 5 έτη.
+    """
+
+    def test_annuity_factor(self):
+        self.assertAlmostEqual(annuity_factor(0.1, 5), 3.790787, places=6)
+        self.assertEqual(annuity_factor(0, 5), 5.0)
+        self.assertEqual(annuity_factor(0.1, 0), 0.0)
+
+    def test_net_present_value(self):
+        self.assertAlmostEqual(net_present_value(1000, 300, 0.1, 5), 137.2360, places=4)
+        self.assertAlmostEqual(net_present_value(10000, 2500, 0.05, 5), 823.6917, places=4)
+        self.assertAlmostEqual(net_present_value(1000, 300, 0, 5), 500.0)
+
+    def test_internal_rate_of_return(self):
+        self.assertAlmostEqual(internal_rate_of_return(1000, 300, 5), 0.152382, places=6)
+        self.assertAlmostEqual(internal_rate_of_return(10000, 2500, 5), 0.079308, places=6)
+        self.assertAlmostEqual(internal_rate_of_return(1000, 200, 5), 0.0, places=9)
+        self.assertAlmostEqual(net_present_value(1000, 300, internal_rate_of_return(1000, 300, 5), 5), 0.0, places=6)
+
+    def test_internal_rate_of_return_bounds(self):
+        self.assertIsNone(internal_rate_of_return(0, 300, 5))
+        self.assertIsNone(internal_rate_of_return(1000, 0, 5))
+        self.assertEqual(internal_rate_of_return(1000, 1, 1), IRR_LOWER_BOUND)
+        self.assertEqual(internal_rate_of_return(1000, 20000, 5, upper=IRR_UPPER_BOUND), IRR_UPPER_BOUND)
+        self.assertAlmostEqual(internal_rate_of_return(1000, 20000, 1), 19.0)
+
+    def test_simple_payback(self):
+        self.assertAlmostEqual(simple_payback(1000, 300), 3.3333, places=4)
+        self.assertEqual(simple_payback(10000, 2500), 4.0)
+        self.assertIsNone(simple_payback(1000, 0))
+
+    def test_discounted_payback(self):
+        # Σωρευτική παρούσα αξία 950,96 € στο 4ο έτος, 186,28 € μέσα στο 5ο
+        self.assertAlmostEqual(discounted_payback(1000, 300, 0.1, 5), 4.2633, places=4)
+        self.assertAlmostEqual(discounted_payback(1000, 250, 0, 10), 4.0)
+        self.assertAlmostEqual(discounted_payback(1000, 300, 0, 10), 3.3333, places=4)
+        # Δεν αποπληρώνεται μέσα στην περίοδο: έτη + 1
+        self.assertEqual(discounted_payback(1000, 100, 0.1, 5), 6)
+        self.assertEqual(discounted_payback(1000, 0, 0.1, 5), 6)
+
+
+class FinanceBatchTests(SimpleTestCase):
+    """Το evaluate_batch (NumPy) δίνει ανά γραμμή ό,τι και οι scalar συναρτήσεις."""
+
+    def assertMatchesScalar(self, rows, irr_upper=None):
+        batch = evaluate_batch(*zip(*rows), irr_upper=irr_upper)
+        for index, row in enumerate(rows):
+            expected = evaluate(*row, irr_upper=irr_upper)
+            for field in FinancialMetrics._fields:
+                with self.subTest(row=row, field=field, irr_upper=irr_upper):
+                    value = batch[field][index]
+                    if getattr(expected, field) is None:
+                        self.assertIsNone(value)
+                    else:
+                        self.assertAlmostEqual(value, getattr(expected, field), places=6)
+
+    def test_random_rows(self):
+        rng = random.Random(273)
+        rows = [
+            (
+                rng.choice([0.0, rng.uniform(1, 100000)]),
+                rng.choice([0.0, -50.0, rng.uniform(1, 20000)]),
+                rng.choice([0.0, rng.uniform(0, 0.2)]),
+                rng.randint(0, 40),
+            )
+            for _ in range(500)
+        ]
+        self.assertMatchesScalar(rows)
+        self.assertMatchesScalar(rows, irr_upper=IRR_UPPER_BOUND)
+
+    def test_edge_rows(self):
+        rows = [
+            (1000, 300, 0.1, 5),       # Τιμές αναφοράς του FinanceGoldenValueTests
+            (1000, 300, 0, 10),        # Μηδενικό επιτόκιο
+            (1000, 100, 0.1, 5),       # Δεν αποπληρώνεται: έτη + 1
+            (1000, 50, 0.1, 30),       # Ποτέ, ούτε σε άπειρα έτη
+            (1000, 1, 0.05, 1),        # IRR κάτω από -99%
+            (1000, 20000, 0.05, 1),    # IRR 1900%, πέρα από το αρχικό bracket
+            (0, 300, 0.1, 5),          # Χωρίς επένδυση
+            (1000, 0, 0.1, 5),         # Χωρίς όφελος
+            (1000, 300, 0.1, 0),       # Μηδενική περίοδος
+        ]
+        self.assertMatchesScalar(rows)
+        self.assertMatchesScalar(rows, irr_upper=IRR_UPPER_BOUND)
+        self.assertEqual(evaluate_batch([1000], [20000], [0.05], [5], irr_upper=IRR_UPPER_BOUND)
+                         ['internal_rate_of_return'], [IRR_UPPER_BOUND])
+
+
+class ScenarioGoldenValueTests(TestCase):
+    """
+    Οι δείκτες που αποθηκεύει το save() κάθε σεναρίου είναι ίδιοι με αυτούς των
+    αρχικών βρόχων ανά μοντέλο (SCENARIO_GOLDEN_VALUES). Κάθε μοντέλο ελέγχεται
+    με χαμηλό και υψηλό (expensive) κόστος επένδυσης, ώστε να καλύπτονται και
+    επενδύσεις που δεν αποπληρώνονται (αρνητικό NPV / IRR).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='golden@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B', annual_solar_radiation=1700)
+        cls.project = Project.objects.create(
+            user=cls.user, name='Golden', cost_per_kwh_electricity=Decimal('0.2'),
+            oil_price_per_liter=Decimal('1.1'), natural_gas_price_per_m3=Decimal('0.09'),
+        )
+        cls.brick = Material.objects.create(name='Brick', category='masonry', thermal_conductivity=0.8)
+        cls.eps = Material.objects.create(name='EPS', category='insulation', thermal_conductivity=0.035)
+
+    def create_building(self):
+        return Building.objects.create(
+            project=self.project, user=self.user, name=f'Building {Building.objects.count()}', usage='Γραφεία',
+            description='Test', address='Test', prefecture=self.prefecture, total_area=500, examined_area=400,
+        )
+
+    def window_replacement(self, expensive):
+        window = WindowReplacement(
+            user=self.user, building=self.create_building(), project=self.project, old_thermal_conductivity=5.8,
+            new_thermal_conductivity=1.8, window_area=25, old_losses_summer=900, old_losses_winter=2400,
+            new_losses_summer=400, new_losses_winter=900, cost_per_sqm=900 if expensive else 120,
+            energy_cost_kwh=0.2, maintenance_cost_annual=20, lifespan_years=20, discount_rate=5,
+        )
+        window.calculate_energy_savings()
+        window.calculate_economic_benefits()
+        window.save()
+        return window
+
+    def bulb_replacement(self, expensive):
+        return BulbReplacement.objects.create(
+            user=self.user, building=self.create_building(), project=self.project, old_power_per_bulb=60,
+            old_bulb_count=50, old_operating_hours=3000, new_power_per_bulb=9, new_bulb_count=50,
+            new_operating_hours=3000, cost_per_new_bulb=400 if expensive else 8, installation_cost=200,
+            energy_cost_kwh=0.2, maintenance_cost_annual=10, lifespan_years=10,
+        )
+
+    def boiler_replacement(self, expensive):
+        return BoilerReplacement.objects.create(
+            building=self.create_building(), project=self.project, old_boiler_efficiency=Decimal('78'),
+            new_boiler_efficiency=Decimal('94'), boiler_cost=Decimal('15000' if expensive else '2500'),
+            installation_cost=Decimal('800'), maintenance_cost=Decimal('50'),
+            annual_heating_consumption_liters=3000, oil_price_per_liter=Decimal('1.1'), time_period=15,
+            discount_rate=Decimal('6'),
+        )
+
+    def air_conditioning(self, expensive):
+        building = self.create_building()
+        OldAirConditioning.objects.create(
+            building=building, project=self.project, user=self.user, btu_type=12000, cop_percentage=2.5,
+            eer_percentage=2.2, heating_hours_per_year=800, cooling_hours_per_year=600, quantity=4,
+        )
+        NewAirConditioning.objects.create(
+            building=building, project=self.project, user=self.user, btu_type=12000, cop_percentage=4.6,
+            eer_percentage=4.1, heating_hours_per_year=800, cooling_hours_per_year=600, quantity=4,
+            cost_per_unit=4000 if expensive else 700, installation_cost=150,
+        )
+        return AirConditioningAnalysis.objects.create(
+            building=building, project=self.project, user=self.user, energy_cost_kwh=0.05 if expensive else 0.2,
+            lifespan_years=15, discount_rate=5,
+        )
+
+    def roof_thermal_insulation(self, expensive):
+        roof = RoofThermalInsulation.objects.create(
+            building=self.create_building(), project=self.project, created_by=self.user,
+            heating_hours_per_year=1500, cooling_hours_per_year=700, total_cost=40000 if expensive else 4000,
+            time_period_years=25, annual_operating_costs=20, discount_rate=5,
+        )
+        for material, material_type, thickness in ((self.brick, 'old', 0.2), (self.eps, 'new', 0.1)):
+            RoofThermalInsulationMaterialLayer.objects.create(
+                roof_thermal_insulation=roof, material=material, material_type=material_type,
+                thickness=thickness, surface_area=150, cost=0,
+            )
+        roof.save()
+        return roof
+
+    def wall_thermal_insulation(self, expensive):
+        wall = ExternalWallThermalInsulation.objects.create(
+            user=self.user, building=self.create_building(), project=self.project, heating_hours_per_year=1500,
+            cooling_hours_per_year=700, total_cost=60000 if expensive else 6000, time_period_years=25,
+            annual_operating_costs=20, discount_rate=5,
+        )
+        for material, material_type, thickness in ((self.brick, 'old', 0.25), (self.eps, 'new', 0.08)):
+            ThermalInsulationMaterialLayer.objects.create(
+                thermal_insulation=wall, material=material, material_type=material_type,
+                surface_type='external_walls_outdoor', thickness=thickness, surface_area=200, cost=0,
+            )
+        wall.save()
+        return wall
+
+    def exterior_blinds(self, expensive):
+        return ExteriorBlinds.objects.create(
+            building=self.create_building(), project=self.project, window_area=30, shading_coefficient=70,
+            solar_radiation=6, cooling_months=4, cooling_system_eer=3, cost_per_m2=600 if expensive else 60,
+            installation_cost=300, maintenance_cost=20, energy_cost_kwh=0.2, time_period=15, discount_rate=5,
+        )
+
+    def photovoltaic_system(self, expensive):
+        return PhotovoltaicSystem.objects.create(
+            user=self.user, building=self.create_building(), project=self.project,
+            pv_panels_quantity=Decimal('20'), pv_panels_unit_price=Decimal('2000' if expensive else '200'),
+            metal_bases_quantity=Decimal('20'), metal_bases_unit_price=Decimal('30'),
+            piping_quantity=Decimal('1'), piping_unit_price=Decimal('200'),
+            wiring_quantity=Decimal('1'), wiring_unit_price=Decimal('300'),
+            inverter_quantity=Decimal('1'), inverter_unit_price=Decimal('1500'),
+            installation_quantity=Decimal('1'), installation_unit_price=Decimal('1000'),
+            power_per_panel=Decimal('400'), collector_efficiency=Decimal('21'), installation_angle=Decimal('30'),
+            discount_rate=Decimal('5'), annual_operational_costs=Decimal('50'),
+        )
+
+    def hot_water_upgrade(self, expensive):
+        building = self.create_building()
+        return HotWaterUpgrade.objects.create(
+            building=str(building.uuid), project=str(self.project.uuid), solar_collectors_quantity=2,
+            solar_collectors_unit_price=7000 if expensive else 700, metal_support_bases_quantity=2,
+            metal_support_bases_unit_price=100, solar_system_quantity=1, solar_system_unit_price=400,
+            insulated_pipes_quantity=10, insulated_pipes_unit_price=15, central_heater_installation_quantity=1,
+            central_heater_installation_unit_price=300, electric_heater_power=4000, operating_hours_per_year=1500,
+            solar_utilization_percentage=70, energy_cost_kwh=0.2, lifespan_years=15, discount_rate=5,
+            annual_operating_expenses=30,
+        )
+
+    def automatic_lighting_control(self, expensive):
+        return AutomaticLightingControl.objects.create(
+            building=self.create_building(), project=self.project, lighting_area=500,
+            cost_per_m2=Decimal('150' if expensive else '15'), installation_cost=Decimal('1000'),
+            maintenance_cost=Decimal('50'), current_lighting_power_density=10, operating_hours_per_day=10,
+            operating_days_per_year=250, estimated_savings_percentage=30, energy_cost_kwh=Decimal('0.2'),
+            time_period=10, discount_rate=Decimal('5'),
+        )
+
+    def natural_gas_network(self, expensive):
+        return NaturalGasNetwork.objects.create(
+            building=self.create_building(), project=self.project, burner_replacement_quantity=1,
+            burner_replacement_unit_price=30000 if expensive else 1500, gas_pipes_quantity=20,
+            gas_pipes_unit_price=25, gas_detection_systems_quantity=1, gas_detection_systems_unit_price=300,
+            boiler_cleaning_quantity=1, boiler_cleaning_unit_price=120, annual_energy_savings=1800,
+            lifespan_years=15, discount_rate=5, annual_operating_expenses=100,
+        )
+
+    def setUp(self):
+        # Οι συντελεστές (NumericValue) είναι οι προεπιλεγμένοι, όπως στο baseline
+        numeric_cache.reset()
+
+    def test_saved_metrics_match_baseline(self):
+        for (name, cost), expected in SCENARIO_GOLDEN_VALUES.items():
+            with self.subTest(scenario=name, cost=cost):
+                scenario = getattr(self, name)(cost == 'high_cost')
+                scenario.refresh_from_db()
+                saved = (
+                    scenario.payback_period, scenario.discounted_payback_period,
+                    scenario.net_present_value, scenario.internal_rate_of_return,
+                )
+                for value, expected_value in zip(saved, expected):
+                    self.assertAlmostEqual(float(value), expected_value, places=4)
+
+
+class BulkDeletionTests(TestCase):
+    """
+    Τα delete_projects / delete_users αφήνουν τη βάση και τους μετρητές όπως το
+    queryset.delete() με τα signals του, εκτός από τα HotWaterUpgrade, που το
+    queryset.delete() άφηνε ορφανά. Ο Bob έχει κτίριο και σενάριο στο έργο της
+    Alice, ώστε οι μετρητές και η πρόοδος της Alice να αλλάζουν.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user(email='alice@bemat.local', password=None)
+        cls.bob = User.objects.create_user(email='bob@bemat.local', password=None)
+        prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+        cls.alice_project = Project.objects.create(user=cls.alice, name='Alice', cost_per_kwh_electricity=Decimal('0.2'))
+        cls.bob_project = Project.objects.create(user=cls.bob, name='Bob', cost_per_kwh_electricity=Decimal('0.2'))
+
+        def building(project, user, name):
+            return Building.objects.create(
+                project=project, user=user, name=name, usage='Γραφεία', description='Test',
+                address='Test', prefecture=prefecture, total_area=500, examined_area=400,
+            )
+
+        cls.alice_building = building(cls.alice_project, cls.alice, 'Alice 1')
+        cls.shared_building = building(cls.alice_project, cls.bob, 'Bob στο έργο της Alice')
+        cls.bob_building = building(cls.bob_project, cls.bob, 'Bob 1')
+
+        for user, target in ((cls.alice, cls.alice_building), (cls.bob, cls.bob_building)):
+            WindowReplacement.objects.create(
+                user=user, building=target, project=target.project, old_thermal_conductivity=5.8,
+                new_thermal_conductivity=1.8, window_area=10, net_present_value=1000,
+            )
+        # Σενάριο του Bob σε κτίριο της Alice: η διαγραφή του Bob αλλάζει την πρόοδό του
+        BulbReplacement.objects.create(
+            user=cls.bob, building=cls.alice_building, project=cls.alice_project, old_power_per_bulb=60,
+            old_bulb_count=10, old_operating_hours=3000, new_power_per_bulb=9, new_bulb_count=10,
+            new_operating_hours=3000, cost_per_new_bulb=8, installation_cost=100, energy_cost_kwh=0.2,
+            lifespan_years=10,
+        )
+        HeatingSystem.objects.create(user=cls.bob, building=cls.bob_building, project=cls.bob_project)
+        for target in (cls.alice_building, cls.bob_building):
+            HotWaterUpgrade.objects.create(building=str(target.uuid), project=str(target.project_id))
+        reconcile()
+
+    def snapshot(self):
+        return {
+            'tables': {
+                model._meta.label: model._base_manager.count()
+                for model in apps.get_models() if not model._meta.proxy
+            },
+            'counters': dict(StatisticCounter.objects.values_list('name', 'value')),
+            'user_statistics': {
+                user_id: (projects, buildings)
+                for user_id, projects, buildings in
+                UserStatistics.objects.values_list('user_id', 'projects_count', 'buildings_count')
+            },
+            'buildings_count': dict(Project.objects.values_list('pk', 'buildings_count')),
+            'progress': {
+                building_id: (systems, scenarios)
+                for building_id, systems, scenarios in
+                BuildingProgress.objects.values_list('building_id', 'systems_mask', 'scenarios_mask')
+            },
+        }
+
+    def state_after(self, delete):
+        """Η κατάσταση μετά το `delete()`, που στη συνέχεια αναιρείται."""
+        with transaction.atomic():
+            with self.captureOnCommitCallbacks(execute=True):
+                delete()
+            state = self.snapshot()
+            transaction.set_rollback(True)
+        return state
+
+    def assertSameAsQuerysetDelete(self, queryset, bulk):
+        expected = self.state_after(queryset.delete)
+        with transaction.atomic():
+            queryset.delete()
+            buildings = [str(pk) for pk in Building.objects.values_list('pk', flat=True)]
+            orphaned = HotWaterUpgrade.objects.exclude(building__in=buildings).count()
+            transaction.set_rollback(True)
+        self.assertGreater(orphaned, 0)
+        expected['tables']['hotWaterUpgrade.HotWaterUpgrade'] -= orphaned
+
+        actual = self.state_after(bulk)
+        self.assertEqual(actual, expected)
+        return actual
+
+    def test_delete_projects_matches_queryset_delete(self):
+        state = self.assertSameAsQuerysetDelete(
+            Project.objects.filter(pk=self.alice_project.pk),
+            lambda: delete_projects([self.alice_project.pk]),
+        )
+        self.assertEqual(state['tables']['building.Building'], 1)
+        self.assertEqual(state['tables']['hotWaterUpgrade.HotWaterUpgrade'], 1)
+        # Το κοινό κτίριο ανήκε στον Bob
+        self.assertEqual(state['user_statistics'][self.bob.pk], (1, 1))
+        self.assertEqual(state['user_statistics'][self.alice.pk], (0, 0))
+
+    def test_delete_users_matches_queryset_delete(self):
+        state = self.assertSameAsQuerysetDelete(
+            User.objects.filter(pk=self.bob.pk),
+            lambda: delete_users([self.bob.pk]),
+        )
+        self.assertEqual(state['counters']['users_total'], 1)
+        self.assertEqual(state['counters']['buildings_total'], 1)
+        self.assertEqual(state['buildings_count'], {self.alice_project.pk: 1})
+        # Έμεινε μόνο το WindowReplacement της Alice στο κτίριό της
+        window_bit = 1 << [label for _, label in SCENARIO_MODELS].index('windowReplacement.WindowReplacement')
+        self.assertEqual(state['progress'], {self.alice_building.pk: (0, window_bit)})
+
+    def test_protected_relation_raises_before_deleting(self):
+        field = Building._meta.get_field('project')
+        with mock.patch.object(field.remote_field, 'on_delete', models.PROTECT):
+            with self.assertRaises(DeletionError):
+                delete_projects([self.alice_project.pk])
+        self.assertTrue(Project.objects.filter(pk=self.alice_project.pk).exists())
+        self.assertEqual(Building.objects.count(), 3)
+
+
+class BulkCreateTests(TestCase):
+    """Τα bulk-create endpoints: όλα ή τίποτα, σφάλματα ανά γραμμή, ίδια αποτελέσματα με το save()."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='bulk@bemat.local', password=None)
+        cls.other = User.objects.create_user(email='other@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+        cls.project = Project.objects.create(user=cls.user, name='Bulk', cost_per_kwh_electricity=Decimal('0.2'))
+        cls.other_project = Project.objects.create(user=cls.other, name='Other', cost_per_kwh_electricity=Decimal('0.2'))
+        cls.first = cls.create_building(cls.project, cls.user, 'Πρώτο')
+        cls.second = cls.create_building(cls.project, cls.user, 'Δεύτερο')
+        cls.foreign = cls.create_building(cls.other_project, cls.other, 'Ξένο')
+        cls.zone = ThermalZone.objects.create(building=cls.first, project=cls.project, user=cls.user)
+        cls.second_zone = ThermalZone.objects.create(building=cls.second, project=cls.project, user=cls.user)
+
+    @classmethod
+    def create_building(cls, project, user, name):
+        return Building.objects.create(
+            project=project, user=user, name=name, usage='Γραφεία', description='Test',
+            address='Test', prefecture=cls.prefecture, total_area=500, examined_area=400,
+        )
+
+    def setUp(self):
+        numeric_cache.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def post(self, url, items):
+        return self.client.post(url, {'items': items}, format='json')
+
+    def heating_row(self, building, **fields):
+        return {'building': str(building.pk), 'project': str(building.project_id), **fields}
+
+    def consumption_row(self, building, zone, **fields):
+        return {
+            'building': str(building.pk), 'project': str(building.project_id), 'thermal_zone': str(zone.pk),
+            'consumption_type': 'lighting', **fields,
+        }
+
+    def test_invalid_row_creates_nothing(self):
+        response = self.post('/api/electrical_consumptions/bulk-create/', [
+            self.consumption_row(self.first, self.zone),
+            self.consumption_row(self.first, self.zone, consumption_type='unknown'),
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0], {})
+        self.assertIn('consumption_type', response.data['errors'][1])
+        self.assertFalse(ElectricalConsumption.objects.exists())
+
+    def test_failure_after_insert_rolls_back(self):
+        with mock.patch('common.bulk.refresh_building_progress', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.post('/api/heating_systems/bulk-create/', [self.heating_row(self.first)])
+        self.assertFalse(HeatingSystem.objects.exists())
+
+    def test_zone_of_other_building_is_reported_per_row(self):
+        response = self.post('/api/electrical_consumptions/bulk-create/', [
+            self.consumption_row(self.first, self.zone),
+            self.consumption_row(self.first, self.second_zone),
+            self.consumption_row(self.second, self.second_zone),
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'], [
+            {}, {'thermal_zone': ['Thermal zone does not belong to this building.']}, {},
+        ])
+        self.assertFalse(ElectricalConsumption.objects.exists())
+
+        response = self.post('/api/electrical_consumptions/bulk-create/', [
+            self.consumption_row(self.first, self.zone, load_power='100.00', quantity=3),
+            self.consumption_row(self.second, self.second_zone),
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            set(ElectricalConsumption.objects.values_list('building', 'thermal_zone', 'user')),
+            {(self.first.pk, self.zone.pk, self.user.uuid), (self.second.pk, self.second_zone.pk, self.user.uuid)},
+        )
+
+    def test_other_users_building_is_denied(self):
+        response = self.post('/api/heating_systems/bulk-create/', [
+            self.heating_row(self.first), self.heating_row(self.foreign),
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0], {})
+        self.assertEqual(response.data['errors'][1], {
+            'building': ['Access denied: you do not own this building.'],
+            'project': ['Access denied: you do not own this project.'],
+        })
+        self.assertFalse(HeatingSystem.objects.exists())
+
+    def test_unique_together_duplicates_within_request(self):
+        response = self.post('/api/heating_systems/bulk-create/', [
+            self.heating_row(self.first), self.heating_row(self.second), self.heating_row(self.first),
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'], [
+            {}, {}, {'non_field_errors': ['The fields building, user must make a unique set.']},
+        ])
+        self.assertFalse(HeatingSystem.objects.exists())
+
+        HeatingSystem.objects.create(user=self.user, building=self.second, project=self.project)
+        response = self.post('/api/heating_systems/bulk-create/', [
+            self.heating_row(self.first), self.heating_row(self.second),
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0], {})
+        self.assertIn('non_field_errors', response.data['errors'][1])
+
+    def test_air_conditionings_match_single_save(self):
+        fields = {
+            'btu_type': 12000, 'cop_percentage': 3.2, 'eer_percentage': 2.9, 'heating_hours_per_year': 800,
+            'cooling_hours_per_year': 600, 'quantity': 3,
+        }
+        for model, url, extra in (
+            (OldAirConditioning, '/api/air_conditioning_replacements/old/bulk-create/', {}),
+            (NewAirConditioning, '/api/air_conditioning_replacements/new/bulk-create/',
+             {'cost_per_unit': 650, 'installation_cost': 120}),
+        ):
+            with self.subTest(model=model.__name__):
+                response = self.post(url, [self.heating_row(self.first, **fields, **extra)])
+                self.assertEqual(response.status_code, 201)
+                self.assertTrue(response.data['success'])
+
+                saved = model.objects.create(
+                    user=self.user, building=self.second, project=self.project, **fields, **extra
+                )
+                created = model.objects.get(building=self.first)
+                self.assertGreater(saved.total_consumption_kwh, 0)
+                for name in ('heating_consumption_kwh', 'cooling_consumption_kwh', 'total_consumption_kwh'):
+                    self.assertAlmostEqual(getattr(created, name), getattr(saved, name))
+                if model is NewAirConditioning:
+                    self.assertEqual(created.total_cost, saved.total_cost)
+                    self.assertEqual(created.total_cost, 650 * 3 + 120)
+
+    def test_progress_is_refreshed(self):
+        response = self.post('/api/heating_systems/bulk-create/', [
+            self.heating_row(self.first), self.heating_row(self.second),
+        ])
+        self.assertEqual(response.status_code, 201)
+        heating_bit = 1 << [label for _, label in SYSTEM_MODELS].index('heatingSystem.HeatingSystem')
+        for building in (self.first, self.second):
+            progress = BuildingProgress.objects.get(building=building)
+            self.assertEqual(progress.systems_mask, heating_bit)
+            self.assertEqual(progress.systems_completed, 1)
+        self.assertFalse(BuildingProgress.objects.filter(building=self.foreign, systems_mask__gt=0).exists())
+
+
+class ListingTestCase(TestCase):
+    """Έργα και κτίρια ενός χρήστη για τα endpoints λίστας."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='listing@bemat.local', password=None)
+        cls.other = User.objects.create_user(email='stranger@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+        # Ίδια date_created σε όλα: η σειρά κρίνεται μόνο από το uuid
+        cls.projects = [
+            Project.objects.create(user=cls.user, name=f'Έργο {index}', cost_per_kwh_electricity=Decimal('0.2'))
+            for index in range(7)
+        ]
+        cls.buildings = [
+            Building.objects.create(
+                project=cls.projects[0], user=cls.user, name=f'Κτίριο {index}', usage='Γραφεία',
+                description='Test', address='Test', prefecture=cls.prefecture, total_area=500, examined_area=400,
+            )
+            for index in range(5)
+        ]
+        Building.objects.filter(pk__in=[building.pk for building in cls.buildings[:3]]).update(
+            date_created=cls.buildings[0].date_created,
+        )
+        cls.material = Material.objects.create(name='EPS', category='insulation', thermal_conductivity=0.035)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+
+class ConditionalGetTests(ListingTestCase):
+    """ETag και If-None-Match (common.conditional) στα endpoints λίστας και λεπτομερειών."""
+
+    def test_if_none_match_returns_304(self):
+        for url in (
+            '/api/projects/get/', f'/api/projects/get/{self.projects[0].pk}/', '/api/buildings/get/',
+            f'/api/buildings/get/{self.buildings[0].pk}/', '/api/materials/',
+        ):
+            with self.subTest(url=url):
+                # Η πρώτη λίστα έργων αποθηκεύει την πρόοδο των νέων κτιρίων (get_buildings_progress)
+                self.get(url)
+                etag = self.get(url)['ETag']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=f'W/"other", {etag}')
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='W/"other"').status_code, 200)
+
+    def test_error_responses_have_no_etag(self):
+        self.client.force_authenticate(user=self.other)
+        response = self.client.get(f'/api/projects/get/{self.projects[0].pk}/')
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('ETag', response)
+
+    def test_etag_changes_after_delete(self):
+        # Διαγραφή της παλαιότερης εγγραφής: το μέγιστο updated_at μένει ίδιο
+        for url, delete in (
+            ('/api/projects/get/', lambda: self.projects[-1].delete()),
+            ('/api/buildings/get/', lambda: self.buildings[0].delete()),
+            ('/api/materials/', lambda: self.material.delete()),
+        ):
+            with self.subTest(url=url):
+                before = self.get(url)['ETag']
+                delete()
+                self.assertNotEqual(self.get(url)['ETag'], before)
+
+
+class KeysetPageTests(ListingTestCase):
+    """Σελιδοποίηση keyset και ?fields= (common.listing) στις λίστες έργων και κτιρίων."""
+
+    def walk(self, url, rows, page_size):
+        """Όλες οι σελίδες μέσω του next_cursor· επιστρέφει τα uuid με τη σειρά."""
+        uuids = []
+        params = {'page_size': page_size}
+        while True:
+            body = self.get(url, **params).json()
+            uuids.extend(row['uuid'] for row in rows(body['data']))
+            self.assertLessEqual(len(rows(body['data'])), page_size)
+            if body['pagination']['next_cursor'] is None:
+                self.assertIsNone(body['pagination']['next'])
+                return uuids
+            params['cursor'] = body['pagination']['next_cursor']
+
+    def test_keyset_walk_returns_every_row_once(self):
+        for url, rows, expected in (
+            ('/api/projects/get/', lambda data: data['projects'], self.projects),
+            ('/api/buildings/get/', lambda data: data, self.buildings),
+        ):
+            for page_size in (1, 2, 3, 500):
+                with self.subTest(url=url, page_size=page_size):
+                    uuids = self.walk(url, rows, page_size)
+                    self.assertEqual(len(uuids), len(set(uuids)))
+                    self.assertEqual(set(uuids), {str(row.pk) for row in expected})
+                    self.assertEqual(uuids, [
+                        str(pk) for pk in type(expected[0]).objects.order_by('date_created', 'uuid')
+                        .values_list('pk', flat=True)
+                    ])
+
+    def test_fields_selects_serializer_fields(self):
+        body = self.get('/api/buildings/get/', fields='uuid,name').json()
+        self.assertEqual({tuple(sorted(row)) for row in body['data']}, {('name', 'uuid')})
+
+    def test_invalid_parameters_return_400(self):
+        invalid = {
+            'cursor': ['not-base64!', 'YWJj', base64.urlsafe_b64encode(b'2024-01-01|not-a-uuid').decode()],
+            'page_size': ['0', '501', 'ten'],
+            'fields': ['uuid,unknown'],
+        }
+        for url in ('/api/projects/get/', '/api/buildings/get/'):
+            for name, values in invalid.items():
+                for value in values:
+                    with self.subTest(url=url, **{name: value}):
+                        response = self.client.get(url, {name: value})
+                        self.assertEqual(response.status_code, 400)
+                        self.assertNotIn('ETag', response)
+
+
+class PerformanceStoreTests(SimpleTestCase):
+
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 11))
+        self.assertEqual([percentile(values, percent) for percent in (0, 50, 90, 99, 100)], [1, 5, 9, 10, 10])
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_store_keeps_latest_samples_and_counts_errors(self):
+        store = PerformanceStore(sample_size=3)
+        for index, status_code in enumerate((200, 404, 500, 200, 503)):
+            store.record('GET /api/x/', status_code, (index,))
+        snapshot = store.snapshot()['GET /api/x/']
+        self.assertEqual((snapshot['count'], snapshot['errors']), (5, 2))
+        self.assertEqual(snapshot['samples'], [(2,), (3,), (4,)])
+
+        store.reset()
+        self.assertEqual(store.snapshot(), {})
+
+
+@override_settings(PERFORMANCE_MONITORING=True, PERFORMANCE_FLUSH_INTERVAL=0)
+class PerformanceMiddlewareTests(ListingTestCase):
+    """common.performance.PerformanceMiddleware και το /api/admin-api/perf/."""
+
+    PROJECTS_ROUTE = 'GET /api/projects/get/'
+    DETAIL_ROUTE = 'GET /api/projects/get/<uuid:project_uuid>/'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_user(email='perf-admin@bemat.local', password=None, is_staff=True)
+
+    def setUp(self):
+        super().setUp()
+        reset_stats()
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(user=self.admin)
+
+    def routes(self):
+        return {route['route']: route for route in collect_stats()[0]}
+
+    def test_server_timing_header(self):
+        # Χωρίς flush: τα ερωτήματα του cache γίνονται έξω από τη μέτρηση του request
+        with mock.patch.object(performance.store, 'flush'), CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/projects/get/', HTTP_ORIGIN='http://localhost:3000')
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        for part in ('db;dur=', 'serializer;dur=', 'app;dur=', 'total;dur='):
+            self.assertIn(part, timing)
+        self.assertIn(f'desc="{len(context)} queries"', timing)
+        self.assertEqual(response['Timing-Allow-Origin'], 'http://localhost:3000')
+
+        response = self.client.get('/api/projects/get/', HTTP_ORIGIN='http://evil.example')
+        self.assertNotIn('Timing-Allow-Origin', response)
+
+    @override_settings(PERFORMANCE_MONITORING=False)
+    def test_disabled_middleware_records_nothing(self):
+        response = self.get('/api/projects/get/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(self.routes(), {})
+
+    def test_samples_are_grouped_by_route_pattern(self):
+        for project in self.projects[:3]:
+            self.get(f'/api/projects/get/{project.pk}/')
+        self.get('/api/projects/get/')
+        self.client.get('/api/no-such-url/')
+
+        routes = self.routes()
+        self.assertEqual(routes[self.DETAIL_ROUTE]['count'], 3)
+        self.assertEqual(routes[self.PROJECTS_ROUTE]['count'], 1)
+        self.assertEqual(routes['GET <unresolved>']['count'], 1)
+        detail = routes[self.DETAIL_ROUTE]
+        self.assertEqual(detail['samples'], 3)
+        self.assertEqual(set(detail['duration_ms']), {'p50', 'p90', 'p99', 'max'})
+        self.assertLessEqual(detail['duration_ms']['p50'], detail['duration_ms']['max'])
+        self.assertGreater(detail['queries']['p50'], 0)
+        self.assertGreater(detail['response_bytes']['max'], 0)
+
+    def test_perf_endpoint_requires_admin(self):
+        for method in ('get', 'delete'):
+            with self.subTest(method=method):
+                response = getattr(self.client, method)('/api/admin-api/perf/')
+                self.assertEqual(response.status_code, 403)
+
+    def test_perf_endpoint_sorting_limit_and_reset(self):
+        for project in self.projects[:3]:
+            self.get(f'/api/projects/get/{project.pk}/')
+        self.get('/api/projects/get/')
+
+        response = self.admin_client.get('/api/admin-api/perf/', {'sort': 'count'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertTrue(data['enabled'])
+        self.assertEqual([route['route'] for route in data['routes'][:2]], [self.DETAIL_ROUTE, self.PROJECTS_ROUTE])
+
+        response = self.admin_client.get('/api/admin-api/perf/', {'sort': 'queries', 'limit': 1})
+        self.assertEqual(len(response.json()['data']['routes']), 1)
+
+        for params in ({'sort': 'unknown'}, {'limit': '0'}, {'limit': 'ten'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.admin_client.get('/api/admin-api/perf/', params).status_code, 400)
+
+        self.assertEqual(self.admin_client.delete('/api/admin-api/perf/').status_code, 200)
+        # Μένει μόνο το ίδιο το DELETE, που καταγράφεται μετά το reset
+        self.assertEqual(list(self.routes()), ['DELETE /api/admin-api/perf/'])
+
+
+@skipUnless(metrics.Counter is not None, 'prometheus_client is not installed')
+@override_settings(METRICS_ENABLED=True, METRICS_ALLOWED_IPS=['127.0.0.1'])
+class MetricsTests(ListingTestCase):
+    """Το /metrics (common.metrics): περιεχόμενο και περιορισμός ανά IP."""
+
+    def sample(self, name, **labels):
+        return metrics.REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_requests_and_queries_are_exported_per_route(self):
+        labels = {'method': 'GET', 'route': '/api/projects/get/'}
+        before = self.sample('bemat_http_requests_total', status='200', **labels)
+        self.get('/api/projects/get/')
+        self.get('/api/projects/get/')
+
+        self.assertEqual(self.sample('bemat_http_requests_total', status='200', **labels), before + 2)
+        self.assertGreater(self.sample('bemat_db_queries_per_request_sum', **labels), 0)
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE_LATEST)
+        body = response.content.decode()
+        self.assertIn('bemat_http_requests_total{method="GET",route="/api/projects/get/",status="200"}', body)
+        self.assertIn('bemat_http_request_duration_seconds_bucket', body)
+        # Το route είναι το pattern του URL, όχι το πραγματικό path
+        self.get(f'/api/projects/get/{self.projects[0].pk}/')
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('route="/api/projects/get/<uuid:project_uuid>/"', body)
+        self.assertNotIn(str(self.projects[0].pk), body)
+
+    def test_scenario_save_is_observed(self):
+        self.get('/api/projects/get/')
+        label = ExteriorBlinds._meta.label
+        before = self.sample('bemat_scenario_save_duration_seconds_count', model=label)
+        blinds = ExteriorBlinds.objects.create(
+            building=self.buildings[0], project=self.projects[0], window_area=20, cost_per_m2=60,
+        )
+        blinds.save()
+        self.assertEqual(self.sample('bemat_scenario_save_duration_seconds_count', model=label), before + 2)
+        self.assertNotIn('_metrics_save_started', blinds.__dict__)
+
+    def test_access_is_limited_to_allowed_ips(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code, 403)
+        with override_settings(METRICS_ALLOWED_IPS=['10.0.0.5']):
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code, 200)
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled_metrics_return_404(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
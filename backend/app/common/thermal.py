@@ -0,0 +1,78 @@
+"""
+Θερμικά μεγέθη ενός δομικού στοιχείου (τοίχου ή οροφής) από τις στρώσεις
+υλικών του, με ένα πέρασμα.
+
+Οι στρώσεις διαβάζονται μία φορά (με select_related('material') ή από
+prefetch) και για κάθε τύπο υλικού ('old' / 'new') κρατιούνται το άθροισμα
+των θερμικών αντιστάσεων d/λ, η συνολική επιφάνεια και το πλήθος στρώσεων.
+Από αυτά προκύπτουν ο συντελεστής U και οι ωριαίες απώλειες, χωρίς νέα
+ερωτήματα για κάθε συνδυασμό εποχής και τύπου υλικού.
+"""
+
+# Διαφορά θερμοκρασίας εσωτερικού - εξωτερικού χώρου (K)
+WINTER_TEMPERATURE_DIFFERENCE = 17
+SUMMER_TEMPERATURE_DIFFERENCE = 13
+
+
+def material_conductivity(layer):
+    """Συντελεστής λ της στρώσης από το συνδεδεμένο υλικό."""
+    return layer.material.thermal_conductivity
+
+
+class ThermalAssembly:
+    """
+    Σύνολα ανά τύπο υλικού για τις στρώσεις ενός στοιχείου.
+    R_total = R_si + R_se + Σ(d/λ), U = 1 / R_total,
+    ωριαίες απώλειες = U × A × ΔT / 1000 (kW).
+    """
+
+    def __init__(self, layers, r_si, r_se, conductivity=material_conductivity):
+        self.r_si = r_si
+        self.r_se = r_se
+        self._totals = {}
+        for layer in layers:
+            totals = self._totals.setdefault(layer.material_type, {'resistance': 0.0, 'area': 0.0, 'count': 0})
+            totals['count'] += 1
+            try:
+                thickness = float(layer.thickness or 0)
+                thermal_conductivity = float(conductivity(layer) or 0)
+                surface_area = float(layer.surface_area or 0)
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if thermal_conductivity > 0 and thickness > 0:
+                totals['resistance'] += thickness / thermal_conductivity
+            totals['area'] += surface_area
+
+    def _get(self, material_type, key):
+        totals = self._totals.get(material_type)
+        return totals[key] if totals else 0
+
+    def has_layers(self, material_type):
+        return self._get(material_type, 'count') > 0
+
+    def thermal_resistance(self, material_type):
+        """Σ(d/λ) των στρώσεων του τύπου."""
+        return self._get(material_type, 'resistance')
+
+    def surface_area(self, material_type):
+        return self._get(material_type, 'area')
+
+    def r_total(self, material_type):
+        return self.r_si + self.r_se + self.thermal_resistance(material_type)
+
+    def u_value(self, material_type):
+        r_total = self.r_total(material_type)
+        return 1 / r_total if r_total > 0 else 0
+
+    def hourly_losses(self, material_type, temperature_difference):
+        """Ωριαίες απώλειες (kW) των στρώσεων του τύπου· 0 αν δεν υπάρχουν στρώσεις."""
+        if not self.has_layers(material_type):
+            return 0
+        return self.u_value(material_type) * self.surface_area(material_type) * temperature_difference / 1000
+
+    def losses_saved(self, temperature_difference):
+        """Μείωση των ωριαίων απωλειών (kW) από τα παλιά στα νέα υλικά."""
+        return (
+            self.hourly_losses('old', temperature_difference)
+            - self.hourly_losses('new', temperature_difference)
+        )
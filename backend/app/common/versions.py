@@ -0,0 +1,57 @@
+"""
+Κοινός αριθμός έκδοσης στο Django cache, με τοπικό αντίγραφο ανά process.
+
+Με το DatabaseCache κάθε cache.get είναι ένα SELECT στον πίνακα bemat_cache.
+Η έκδοση που διαβάστηκε κρατιέται στη μνήμη του process για
+VERSION_CHECK_INTERVAL δευτερόλεπτα, οπότε στο hot path γίνεται το πολύ ένα
+ερώτημα ανά διάστημα και όχι ένα ανά ανάγνωση. Μια αλλαγή στο ίδιο process
+φαίνεται αμέσως (bump), σε άλλο process το αργότερο μετά από ένα διάστημα.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+
+VERSION_CHECK_INTERVAL = 2.0
+
+
+def new_version():
+    # Χρονική σφραγίδα (μs) αντί για αύξηση: το incr του DatabaseCache δεν είναι
+    # ατομικό, και ένας μετρητής που χάθηκε από το cache (eviction / restart) δεν
+    # πρέπει να συμπέσει με παλιότερη έκδοση κάποιου worker.
+    return time.time_ns() // 1000
+
+
+class SharedVersion:
+    """Η έκδοση ενός κλειδιού του cache, που διαβάζεται το πολύ μία φορά ανά VERSION_CHECK_INTERVAL."""
+
+    def __init__(self, key):
+        self.key = key
+        self._lock = threading.Lock()
+        # (χρόνος ελέγχου, έκδοση) σε ένα tuple, ώστε να διαβάζεται ατομικά
+        self._checked = None
+
+    def get(self):
+        """Τρέχουσα έκδοση (δημιουργείται αν λείπει από το cache)."""
+        checked = self._checked
+        if checked is not None and time.monotonic() - checked[0] < VERSION_CHECK_INTERVAL:
+            return checked[1]
+
+        with self._lock:
+            version = cache.get(self.key)
+            if version is None:
+                cache.add(self.key, new_version(), None)
+                version = cache.get(self.key)
+            self._checked = (time.monotonic(), version)
+        return version
+
+    def bump(self):
+        """Νέα έκδοση για όλα τα processes· το τρέχον τη βλέπει αμέσως."""
+        version = new_version()
+        cache.set(self.key, version, None)
+        self._checked = (time.monotonic(), version)
+        return version
+
+    def reset(self):
+        """Η επόμενη ανάγνωση θα πάει στο cache (π.χ. στα tests, μετά από rollback)."""
+        self._checked = None
@@ -8,9 +8,10 @@ from rest_framework import status
 import logging
 
 from .models import CoolingSystem
-from .serializer import CoolingSystemSerializer
+from .serializer import CoolingSystemSerializer, CoolingSystemBulkSerializer
 from building.models import Building
 from project.models import Project
+from common.bulk import bulk_create_response
 from common.utils import (
     get_user_from_token, 
     standard_error_response, 
@@ -75,6 +76,17 @@ def create_cooling_system(request):
     except Exception as e:
         return standard_error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_create_cooling_systems(request):
+    """
+    Create many cooling systems in one request: {"items": [{"building", "project", ...}, ...]}.
+    The building and project of all rows are looked up together and nothing is
+    created if any row is invalid (errors are returned per row).
+    """
+    return bulk_create_response(request, CoolingSystemBulkSerializer, CoolingSystemSerializer, "cooling systems")
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_building_cooling_systems(request, building_uuid):
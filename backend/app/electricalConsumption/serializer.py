@@ -14,3 +14,18 @@ class ElectricalConsumptionSerializer(serializers.ModelSerializer):
     class Meta:
         model = ElectricalConsumption
         fields = '__all__'
+
+
+class ElectricalConsumptionBulkSerializer(serializers.ModelSerializer):
+    """
+    One row of a bulk create. Related objects are given by UUID and resolved
+    for all rows with a single query per relation.
+    """
+    building = serializers.UUIDField()
+    project = serializers.UUIDField()
+    thermal_zone = serializers.UUIDField()
+    energy_consumption = serializers.UUIDField(required=False, allow_null=True)
+
+    class Meta:
+        model = ElectricalConsumption
+        exclude = ('uuid', 'user', 'created_at', 'updated_at')
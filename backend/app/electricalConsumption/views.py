@@ -8,11 +8,12 @@ from rest_framework import status
 import logging
 
 from .models import ElectricalConsumption
-from .serializer import ElectricalConsumptionSerializer
+from .serializer import ElectricalConsumptionSerializer, ElectricalConsumptionBulkSerializer
 from building.models import Building
 from project.models import Project
 from thermalZone.models import ThermalZone
 from energyConsumption.models import EnergyConsumption
+from common.bulk import bulk_create_response
 from common.utils import (
     get_user_from_token, 
     standard_error_response, 
@@ -104,6 +105,21 @@ def create_electrical_consumption(request):
         return standard_error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_create_electrical_consumptions(request):
+    """
+    Create many electrical consumptions in one request: {"items": [{"building", "project", ...}, ...]}.
+    The building, project, thermal zone and energy consumption of all rows are
+    looked up together and nothing is created if any row is invalid (errors are
+    returned per row).
+    """
+    return bulk_create_response(
+        request, ElectricalConsumptionBulkSerializer, ElectricalConsumptionSerializer, "electrical consumptions",
+        in_building=('thermal_zone', 'energy_consumption'),
+    )
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_building_electrical_consumptions(request, building_uuid):
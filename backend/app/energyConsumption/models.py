@@ -66,6 +66,7 @@ class EnergyConsumption(models.Model):
         editable=False,
         verbose_name="Ισοδύναμο kWh"
     )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Τελευταία Ενημέρωση")
     
     def save(self, *args, **kwargs):
         self.unit = self.ENERGY_UNITS.get(self.energy_source, '')
@@ -23,6 +23,10 @@ echo "Running database migrations..."
 python manage.py migrate --noinput
 echo "✅ Migrations completed"
 
+echo "Creating cache table..."
+python manage.py createcachetable
+echo "✅ Cache table ready"
+
 echo "Loading initial prefectures data..."
 python manage.py populate_prefectures || echo "⚠️  Prefectures already loaded or command not found"
 
@@ -43,6 +47,10 @@ echo "Threads: ${GUNICORN_THREADS:-2}"
 echo "Timeout: ${GUNICORN_TIMEOUT:-120}s"
 echo "========================================="
 
+# Prometheus metrics from all workers are aggregated through this directory
+# (cleaned on startup by gunicorn.conf.py)
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}
+
 # Start Gunicorn
 # Use environment variables for configuration with sensible defaults
 exec gunicorn backend.wsgi:application \
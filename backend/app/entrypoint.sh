@@ -16,6 +16,9 @@ sleep 2
 echo "Running database migrations..."
 python manage.py migrate --noinput
 
+echo "Creating cache table..."
+python manage.py createcachetable
+
 echo "Loading initial prefectures data..."
 python manage.py populate_prefectures
 
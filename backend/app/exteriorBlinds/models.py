@@ -3,6 +3,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 from building.models import Building
 from project.models import Project
+from common.finance import discounted_payback, internal_rate_of_return, net_present_value
 
 
 class ExteriorBlinds(models.Model):
@@ -198,79 +199,32 @@ class ExteriorBlinds(models.Model):
             else:
                 self.payback_period = None
             
-            # Discounted Payback Period calculation
+            # Discounted Payback Period και NPV (time_period + 1 αν δεν αποπληρώνεται)
             if self.annual_economic_benefit > 0 and self.discount_rate > 0:
                 discount_factor = self.discount_rate / 100
-                cumulative_discounted_cash_flow = 0
-                self.discounted_payback_period = None
-                
-                for year in range(1, self.time_period + 1):
-                    discounted_cash_flow = self.annual_economic_benefit / ((1 + discount_factor) ** year)
-                    cumulative_discounted_cash_flow += discounted_cash_flow
-                    
-                    if cumulative_discounted_cash_flow >= self.total_investment_cost:
-                        # Linear interpolation for precise payback period
-                        previous = cumulative_discounted_cash_flow - discounted_cash_flow
-                        fraction = (self.total_investment_cost - previous) / discounted_cash_flow
-                        self.discounted_payback_period = (year - 1) + fraction
-                        break
-                
-                # If payback not achieved within time period, set to time_period + 1
-                if self.discounted_payback_period is None:
-                    self.discounted_payback_period = self.time_period + 1
+                self.discounted_payback_period = discounted_payback(
+                    self.total_investment_cost, self.annual_economic_benefit, discount_factor, self.time_period
+                )
+                npv_value = net_present_value(
+                    self.total_investment_cost, self.annual_economic_benefit, discount_factor, self.time_period
+                )
             else:
                 self.discounted_payback_period = None
-            
-            if self.annual_economic_benefit > 0 and self.discount_rate > 0:
-                discount_factor = self.discount_rate / 100
-                npv = 0
-                for year in range(1, self.time_period + 1):
-                    npv += self.annual_economic_benefit / ((1 + discount_factor) ** year)
-                npv_value = npv - self.total_investment_cost
-            else:
                 npv_value = -self.total_investment_cost
             
             # Μετατροπή σε Decimal με 2 δεκαδικά
             from decimal import Decimal, ROUND_HALF_UP
             self.net_present_value = Decimal(str(npv_value)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
             
-            # IRR υπολογισμός με Newton-Raphson
+            # IRR υπολογισμός
             if self.total_investment_cost > 0 and self.annual_economic_benefit > 0:
                 # Υπολογισμός IRR: βρίσκουμε το επιτόκιο όπου NPV = 0
                 initial_investment = float(self.total_investment_cost)
                 annual_benefit = float(self.annual_economic_benefit)
                 years = int(self.time_period)
                 
-                # Αρχική εκτίμηση IRR
-                irr = 0.1  # 10%
-                tolerance = 0.00001
-                max_iterations = 1000
-                
-                for _ in range(max_iterations):
-                    # Υπολογισμός NPV με το τρέχον IRR
-                    npv = -initial_investment
-                    npv_derivative = 0
-                    
-                    for year in range(1, years + 1):
-                        factor = (1 + irr) ** year
-                        npv += annual_benefit / factor
-                        npv_derivative -= year * annual_benefit / (factor * (1 + irr))
-                    
-                    # Έλεγχος σύγκλισης
-                    if abs(npv) < tolerance:
-                        break
-                    
-                    # Newton-Raphson update
-                    if npv_derivative != 0:
-                        irr = irr - npv / npv_derivative
-                    else:
-                        break
-                    
-                    # Αποφυγή αρνητικών IRR
-                    if irr < -0.99:
-                        irr = -0.99
-                
-                self.internal_rate_of_return = irr * 100
+                irr = internal_rate_of_return(initial_investment, annual_benefit, years)
+                self.internal_rate_of_return = irr * 100 if irr is not None else 0
             else:
                 self.internal_rate_of_return = 0
                 
@@ -283,7 +237,11 @@ class ExteriorBlinds(models.Model):
             self.net_present_value = None
             self.internal_rate_of_return = None
     
+    def recalculate(self):
+        """Υπολογισμός κόστους και οικονομικών δεικτών (χωρίς αποθήκευση)"""
+        self._calculate_economics()
+
     def save(self, *args, **kwargs):
         """Αυτόματος υπολογισμός οικονομικών δεικτών πριν την αποθήκευση"""
-        self._calculate_economics()
+        self.recalculate()
         super().save(*args, **kwargs)
@@ -0,0 +1,26 @@
+"""
+Ρυθμίσεις gunicorn (φορτώνονται αυτόματα από τον τρέχοντα φάκελο).
+
+Με PROMETHEUS_MULTIPROC_DIR κάθε worker γράφει τις μετρικές του σε αρχεία
+στον φάκελο αυτό (common.metrics). Ο φάκελος αδειάζει στην εκκίνηση, ώστε να
+μη μένουν τιμές από προηγούμενη εκτέλεση, και τα αρχεία των workers που
+τερματίζονται σημειώνονται ως νεκρά.
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    multiproc_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        try:
+            from prometheus_client import multiprocess
+        except ImportError:
+            return
+        multiprocess.mark_process_dead(worker.pid)
@@ -4,4 +4,17 @@ from .models import HeatingSystem
 class HeatingSystemSerializer(serializers.ModelSerializer):
     class Meta:
         model = HeatingSystem
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+
+class HeatingSystemBulkSerializer(serializers.ModelSerializer):
+    """
+    One row of a bulk create. Related objects are given by UUID and resolved
+    for all rows with a single query per relation.
+    """
+    building = serializers.UUIDField()
+    project = serializers.UUIDField()
+
+    class Meta:
+        model = HeatingSystem
+        exclude = ('uuid', 'user', 'created_at', 'updated_at')
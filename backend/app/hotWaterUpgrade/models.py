@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from django.contrib.auth.models import User
+from common.finance import IRR_UPPER_BOUND, discounted_payback, internal_rate_of_return, net_present_value
 
 
 class HotWaterUpgrade(models.Model):
@@ -55,7 +56,8 @@ class HotWaterUpgrade(models.Model):
         verbose_name_plural = "Αναβαθμίσεις Ζεστού Νερού"
         unique_together = [['building', 'project']]
 
-    def save(self, *args, **kwargs):
+    def recalculate(self):
+        """Υπολογισμός κόστους και οικονομικών δεικτών (χωρίς αποθήκευση)"""
         self.solar_collectors_subtotal = self.solar_collectors_quantity * self.solar_collectors_unit_price
         self.metal_support_bases_subtotal = self.metal_support_bases_quantity * self.metal_support_bases_unit_price
         self.solar_system_subtotal = self.solar_system_quantity * self.solar_system_unit_price
@@ -84,63 +86,27 @@ class HotWaterUpgrade(models.Model):
         net_annual_benefit = self.annual_economic_benefit - self.annual_operating_expenses
         
         if self.lifespan_years > 0 and self.annual_economic_benefit > 0:
-            npv = 0
-            cumulative_discounted_cash_flow = 0
-            self.discounted_payback_period = self.lifespan_years + 1  # Default: δεν αποπληρώνεται
-            
-            for year in range(1, self.lifespan_years + 1):
-                discounted_cash_flow = net_annual_benefit / ((1 + discount_rate_decimal) ** year)
-                cumulative_discounted_cash_flow += discounted_cash_flow
-                npv += discounted_cash_flow
-                
-                # Έλεγχος αν έχει αποπληρωθεί η επένδυση
-                if cumulative_discounted_cash_flow >= self.total_investment_cost and self.discounted_payback_period > self.lifespan_years:
-                    previous_cumulative = cumulative_discounted_cash_flow - discounted_cash_flow
-                    fraction_of_year = (self.total_investment_cost - previous_cumulative) / discounted_cash_flow
-                    self.discounted_payback_period = (year - 1) + fraction_of_year
-                    
-            self.net_present_value = npv - self.total_investment_cost
+            self.net_present_value = net_present_value(
+                self.total_investment_cost, net_annual_benefit, discount_rate_decimal, self.lifespan_years
+            )
+            self.discounted_payback_period = discounted_payback(
+                self.total_investment_cost, net_annual_benefit, discount_rate_decimal, self.lifespan_years
+            )
         else:
             self.net_present_value = -self.total_investment_cost
             self.discounted_payback_period = 0
             
-        # Calculate IRR using Newton-Raphson method
+        # Calculate IRR (capped at 1000%)
         if self.total_investment_cost > 0 and net_annual_benefit > 0 and self.lifespan_years > 0:
-            guess = 0.1  # Initial guess 10%
-            max_iterations = 1000
-            tolerance = 0.00001
-            
-            for i in range(max_iterations):
-                npv_at_guess = -self.total_investment_cost
-                derivative_npv = 0
-                
-                for year in range(1, self.lifespan_years + 1):
-                    discount_factor = (1 + guess) ** year
-                    npv_at_guess += net_annual_benefit / discount_factor
-                    derivative_npv -= (year * net_annual_benefit) / ((1 + guess) ** (year + 1))
-                
-                # Check for convergence
-                if abs(npv_at_guess) < tolerance:
-                    self.internal_rate_of_return = guess * 100
-                    break
-                
-                # Newton-Raphson update
-                if abs(derivative_npv) > 0.000001:
-                    guess = guess - npv_at_guess / derivative_npv
-                else:
-                    self.internal_rate_of_return = 0
-                    break
-                
-                # Keep guess within reasonable bounds
-                if guess < -0.99:
-                    guess = -0.99
-                if guess > 10:
-                    guess = 10
-            else:
-                self.internal_rate_of_return = guess * 100 if guess > -0.99 else 0
+            irr = internal_rate_of_return(
+                self.total_investment_cost, net_annual_benefit, self.lifespan_years, upper=IRR_UPPER_BOUND
+            )
+            self.internal_rate_of_return = irr * 100
         else:
             self.internal_rate_of_return = 0
-        
+
+    def save(self, *args, **kwargs):
+        self.recalculate()
         super().save(*args, **kwargs)
 
     def __str__(self):
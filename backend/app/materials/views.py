@@ -5,13 +5,15 @@ from rest_framework.decorators import api_view, permission_classes
 from django.shortcuts import get_object_or_404
 import logging
 
+from common.conditional import ConditionalETagMixin, conditional_etag, make_etag, queryset_version
+from referenceData.cache import get_reference_data, reference_etag
 from .models import Material
 from .serializers import MaterialSerializer, MaterialListSerializer
 
 logger = logging.getLogger(__name__)
 
 
-class MaterialListCreateView(generics.ListCreateAPIView):
+class MaterialListCreateView(ConditionalETagMixin, generics.ListCreateAPIView):
     queryset = Material.objects.filter(is_active=True)
     permission_classes = [IsAuthenticated]
     
@@ -33,17 +35,24 @@ class MaterialDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = 'uuid'
 
 
+def _active_materials_etag(request, category=None):
+    # Τα ενεργά υλικά διαβάζονται από το snapshot των δεδομένων αναφοράς
+    return reference_etag()
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(_active_materials_etag)
 def get_materials_by_category(request, category):
     """Get all materials for a specific category"""
     try:
-        materials = Material.objects.filter(category=category, is_active=True)
-        serializer = MaterialListSerializer(materials, many=True)
+        materials = [
+            material for material in get_reference_data()['materials'] if material['category'] == category
+        ]
         return Response({
             "success": True,
-            "data": serializer.data,
-            "count": len(serializer.data)
+            "data": materials,
+            "count": len(materials)
         })
         
     except Exception as e:
@@ -55,15 +64,15 @@ def get_materials_by_category(request, category):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(_active_materials_etag)
 def get_all_active_materials(request):
     """Get all active materials"""
     try:
-        materials = Material.objects.filter(is_active=True)
-        serializer = MaterialListSerializer(materials, many=True)
+        materials = get_reference_data()['materials']
         return Response({
             "success": True,
-            "data": serializer.data,
-            "count": len(serializer.data)
+            "data": materials,
+            "count": len(materials)
         })
         
     except Exception as e:
@@ -97,6 +106,7 @@ def get_material_categories(request):
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
+@conditional_etag(lambda request: make_etag(*queryset_version(Material.objects.all())))
 def get_all_materials_admin(request):
     """Get all materials for admin (including inactive ones)"""
     try:
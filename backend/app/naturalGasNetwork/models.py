@@ -3,6 +3,7 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from building.models import Building
 from project.models import Project
+from common.finance import IRR_UPPER_BOUND, discounted_payback, internal_rate_of_return, net_present_value
 
 
 class NaturalGasNetwork(models.Model):
@@ -109,7 +110,8 @@ class NaturalGasNetwork(models.Model):
         except Exception as e:
             pass
     
-    def save(self, *args, **kwargs):
+    def recalculate(self):
+        """Υπολογισμός κόστους και οικονομικών δεικτών (χωρίς αποθήκευση)"""
         # Ενημέρωση τιμής φυσικού αερίου από το Project
         project = self.project or (self.building.project if self.building else None)
         if project and project.natural_gas_price_per_m3:
@@ -172,30 +174,21 @@ class NaturalGasNetwork(models.Model):
         
         discount_rate_decimal = float(self.discount_rate or 5) / 100.0
         years = self.lifespan_years
-        npv = 0.0
-        cumulative_discounted_cash_flow = 0.0
-        self.discounted_payback_period = years + 1  # Default: δεν αποπληρώνεται
         
         if self.annual_economic_benefit > 0:
-            for year in range(1, years + 1):
-                discounted_cash_flow = self.annual_economic_benefit / ((1 + discount_rate_decimal) ** year)
-                cumulative_discounted_cash_flow += discounted_cash_flow
-                npv += discounted_cash_flow
-                
-                # Έλεγχος αν έχει αποπληρωθεί η επένδυση
-                if cumulative_discounted_cash_flow >= self.total_investment_cost and self.discounted_payback_period > years:
-                    previous_cumulative = cumulative_discounted_cash_flow - discounted_cash_flow
-                    fraction_of_year = (self.total_investment_cost - previous_cumulative) / discounted_cash_flow
-                    self.discounted_payback_period = (year - 1) + fraction_of_year
-                    
-            npv -= self.total_investment_cost
+            npv = net_present_value(
+                self.total_investment_cost, self.annual_economic_benefit, discount_rate_decimal, years
+            )
+            self.discounted_payback_period = discounted_payback(
+                self.total_investment_cost, self.annual_economic_benefit, discount_rate_decimal, years
+            )
         else:
             npv = -self.total_investment_cost
             self.discounted_payback_period = 0
         
         self.net_present_value = round(npv, 2)
         
-        # IRR υπολογισμός με Newton-Raphson
+        # IRR υπολογισμός
         if self.total_investment_cost > 0 and self.annual_economic_benefit > 0:
             initial_investment = float(self.total_investment_cost)
             annual_benefit = float(self.annual_economic_benefit)
@@ -207,42 +200,11 @@ class NaturalGasNetwork(models.Model):
                 # Αν το συνολικό όφελος δεν καλύπτει την επένδυση, IRR είναι αρνητικό
                 self.internal_rate_of_return = -100.0
             else:
-                # Αρχική εκτίμηση IRR βασισμένη στο απλό ROI
-                simple_roi = annual_benefit / initial_investment
-                irr = simple_roi * 0.8  # Πιο συντηρητική αρχική εκτίμηση
-                
-                tolerance = 0.00001
-                max_iterations = 1000
-                
-                for iteration in range(max_iterations):
-                    # Υπολογισμός NPV με το τρέχον IRR
-                    npv_calc = -initial_investment
-                    npv_derivative = 0
-                    
-                    for year in range(1, years + 1):
-                        factor = (1 + irr) ** year
-                        npv_calc += annual_benefit / factor
-                        npv_derivative -= year * annual_benefit / (factor * (1 + irr))
-                    
-                    # Έλεγχος σύγκλισης
-                    if abs(npv_calc) < tolerance:
-                        break
-                    
-                    # Newton-Raphson update
-                    if abs(npv_derivative) > 0.000001:
-                        delta = npv_calc / npv_derivative
-                        irr = irr - delta
-                        
-                        # Όρια για σταθερότητα
-                        if irr < -0.99:
-                            irr = -0.99
-                        elif irr > 10.0:  # 1000% ως ανώτατο όριο
-                            irr = 10.0
-                    else:
-                        break
-                
+                irr = internal_rate_of_return(initial_investment, annual_benefit, years, upper=IRR_UPPER_BOUND)
                 self.internal_rate_of_return = round(irr * 100, 2)
         else:
             self.internal_rate_of_return = 0.0
-        
+
+    def save(self, *args, **kwargs):
+        self.recalculate()
         super().save(*args, **kwargs)
@@ -10,4 +10,4 @@ class NumericValuesConfig(AppConfig):
         """
         Καλείται όταν το app είναι έτοιμο
         """
-        pass
\ No newline at end of file
+        import numericValues.signals
\ No newline at end of file
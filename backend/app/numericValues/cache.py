@@ -0,0 +1,52 @@
+"""
+Cache των αριθμητικών τιμών (NumericValue) ανά process.
+
+Όλες οι τιμές φορτώνονται μία φορά σε ένα λεξικό {name: value}, μαζί με τον
+αριθμό έκδοσης που είχε εκείνη τη στιγμή ο κοινός μετρητής στο Django cache.
+Κάθε αποθήκευση/διαγραφή NumericValue γράφει νέα έκδοση, οπότε όλοι οι
+workers ξαναφορτώνουν το snapshot. Γι' αυτό το CACHES πρέπει να είναι κοινό
+(προεπιλογή ο πίνακας cache της βάσης). Η έκδοση διαβάζεται από το cache το
+πολύ μία φορά ανά common.versions.VERSION_CHECK_INTERVAL, οπότε οι αναγνώσεις
+στο hot path δεν κάνουν κανένα ερώτημα.
+"""
+import threading
+
+from common.versions import SharedVersion
+
+VERSION_CACHE_KEY = 'numeric_values:version'
+
+_lock = threading.Lock()
+_snapshot = {'version': None, 'values': None}
+_version = SharedVersion(VERSION_CACHE_KEY)
+
+
+def get_version():
+    """Τρέχουσα έκδοση του κοινού μετρητή (δημιουργείται αν λείπει)."""
+    return _version.get()
+
+
+def bump_version():
+    """Ακυρώνει τα snapshots όλων των workers."""
+    _version.bump()
+    _snapshot['version'] = None
+
+
+def reset():
+    """Ξεχνά την έκδοση και το snapshot του process (π.χ. στα tests)."""
+    _version.reset()
+    _snapshot['version'] = None
+
+
+def get_numeric_values():
+    """Λεξικό {name: value} με όλες τις αριθμητικές τιμές."""
+    version = get_version()
+    if _snapshot['version'] == version and _snapshot['values'] is not None:
+        return _snapshot['values']
+
+    from .models import NumericValue
+
+    with _lock:
+        if _snapshot['version'] != version or _snapshot['values'] is None:
+            _snapshot['values'] = dict(NumericValue.objects.values_list('name', 'value'))
+            _snapshot['version'] = version
+        return _snapshot['values']
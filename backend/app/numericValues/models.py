@@ -43,23 +43,27 @@ class NumericValue(models.Model):
     def get_value(cls, name):
         """
         Helper method για την ανάκτηση τιμής βάσει ονόματος
+        Διαβάζει από το cache του process (numericValues.cache), χωρίς ερώτημα
+        στη βάση όσο δεν έχει αλλάξει καμία τιμή.
         """
-        try:
-            numeric_value = cls.objects.get(name=name)
-            return numeric_value.value
-        except cls.DoesNotExist:
-            defaults = {
-                'Εσωτερική Οροφής (Rsi)': 0.10,
-                'Εσωτερική Τοίχου (Rsi)': 0.13,
-                'Εξωτερική (Rse)': 0.04,
-                'Ηλιακή ακτινοβολία (kWh/m²/έτος)': 1600.0,
-                'Performance Ratio (PR)': 0.80,
-                'Απόδοση αναφοράς συλλέκτη (%)': 21.0,
-                'Απρόβλεπτα έξοδα (%)': 9.0,
-                'Φορολογική επιβάρυνση (%)': 24.0,
-                'Συντελεστής μετατροπής BTU σε Watts': 0.293,
-            }
-            return defaults.get(name, 0.0)
+        from .cache import get_numeric_values
+
+        values = get_numeric_values()
+        if name in values:
+            return values[name]
+
+        defaults = {
+            'Εσωτερική Οροφής (Rsi)': 0.10,
+            'Εσωτερική Τοίχου (Rsi)': 0.13,
+            'Εξωτερική (Rse)': 0.04,
+            'Ηλιακή ακτινοβολία (kWh/m²/έτος)': 1600.0,
+            'Performance Ratio (PR)': 0.80,
+            'Απόδοση αναφοράς συλλέκτη (%)': 21.0,
+            'Απρόβλεπτα έξοδα (%)': 9.0,
+            'Φορολογική επιβάρυνση (%)': 24.0,
+            'Συντελεστής μετατροπής BTU σε Watts': 0.293,
+        }
+        return defaults.get(name, 0.0)
 
     @classmethod
     def get_roof_resistances(cls):
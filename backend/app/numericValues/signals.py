@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import NumericValue
+from .cache import bump_version
+
+
+@receiver(post_save, sender=NumericValue)
+@receiver(post_delete, sender=NumericValue)
+def invalidate_numeric_values_cache(sender, instance, **kwargs):
+    """
+    Κάθε αλλαγή (admin, NumericValueUpdateView, migrations) ακυρώνει τα cached
+    snapshots όλων των workers, αφού ολοκληρωθεί το transaction.
+    """
+    transaction.on_commit(bump_version)
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from common.versions import new_version
+from user.models import User
+
+from . import cache as numeric_cache
+from .models import NumericValue
+
+
+class NumericValueCacheTests(TestCase):
+    """Το NumericValue.get_value με το προεπιλεγμένο (κοινό) cache της βάσης."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='admin@bemat.local', password=None)
+        cls.value = NumericValue.objects.create(name='Εξωτερική (Rse)', value=0.04, created_by=cls.user)
+
+    def setUp(self):
+        numeric_cache.reset()
+
+    def test_repeated_reads_run_no_queries(self):
+        self.assertEqual(NumericValue.get_value('Εξωτερική (Rse)'), 0.04)
+        with self.assertNumQueries(0):
+            for _ in range(5):
+                self.assertEqual(NumericValue.get_value('Εξωτερική (Rse)'), 0.04)
+
+    def test_save_invalidates_cached_values(self):
+        self.assertEqual(NumericValue.get_value('Εξωτερική (Rse)'), 0.04)
+
+        self.value.value = 0.05
+        with self.captureOnCommitCallbacks(execute=True):
+            self.value.save()
+        self.assertEqual(NumericValue.get_value('Εξωτερική (Rse)'), 0.05)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NumericValue.objects.create(name='Νέα τιμή', value=2.5, created_by=self.user)
+        self.assertEqual(NumericValue.get_value('Νέα τιμή'), 2.5)
+
+    def test_other_process_bump_seen_after_check_interval(self):
+        self.assertEqual(NumericValue.get_value('Εξωτερική (Rse)'), 0.04)
+
+        # Αλλαγή από άλλο process: νέα τιμή στη βάση και νέα έκδοση στο κοινό cache
+        NumericValue.objects.filter(pk=self.value.pk).update(value=0.06)
+        cache.set(numeric_cache.VERSION_CACHE_KEY, new_version(), None)
+        self.assertEqual(NumericValue.get_value('Εξωτερική (Rse)'), 0.04)
+
+        # Όπως όταν περάσει το VERSION_CHECK_INTERVAL
+        numeric_cache._version.reset()
+        self.assertEqual(NumericValue.get_value('Εξωτερική (Rse)'), 0.06)
@@ -3,6 +3,7 @@ import uuid
 from decimal import Decimal
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
+from common.finance import net_present_value, discounted_payback, internal_rate_of_return
 
 class PhotovoltaicSystem(models.Model):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -440,26 +441,16 @@ class PhotovoltaicSystem(models.Model):
             if annual_net_benefit <= 0:
                 return Decimal('0')
             
-            cumulative_discounted_cash_flow = 0
-            
-            for year in range(1, project_lifetime_years + 1):
-                discounted_cash_flow = annual_net_benefit / ((1 + discount_rate) ** year)
-                cumulative_discounted_cash_flow += discounted_cash_flow
-                
-                if cumulative_discounted_cash_flow >= initial_investment:
-                    # Linear interpolation for precise payback period
-                    previous = cumulative_discounted_cash_flow - discounted_cash_flow
-                    fraction = (initial_investment - previous) / discounted_cash_flow
-                    return round(Decimal(str((year - 1) + fraction)), 2)
-            
-            # If payback not achieved within time period
-            return Decimal(str(project_lifetime_years + 1))
+            payback = discounted_payback(
+                initial_investment, annual_net_benefit, discount_rate, project_lifetime_years
+            )
+            return round(Decimal(str(payback)), 2)
         except (TypeError, ValueError, ZeroDivisionError):
             return Decimal('0')
     
     def calculate_internal_rate_of_return(self):
         """
-        Υπολογισμός IRR με Newton-Raphson method
+        Υπολογισμός IRR (κοινός επιλυτής common.finance)
         IRR είναι το επιτόκιο όπου NPV = 0
         """
         try:
@@ -476,34 +467,7 @@ class PhotovoltaicSystem(models.Model):
             if annual_net_benefit <= 0:
                 return Decimal('0')
             
-            # Αρχική εκτίμηση IRR
-            irr = 0.1  # 10%
-            tolerance = 0.00001
-            max_iterations = 1000
-            
-            for _ in range(max_iterations):
-                # Υπολογισμός NPV με το τρέχον IRR
-                npv = -initial_investment
-                npv_derivative = 0
-                
-                for year in range(1, project_lifetime_years + 1):
-                    factor = (1 + irr) ** year
-                    npv += annual_net_benefit / factor
-                    npv_derivative -= year * annual_net_benefit / (factor * (1 + irr))
-                
-                # Έλεγχος σύγκλισης
-                if abs(npv) < tolerance:
-                    break
-                
-                # Newton-Raphson update
-                if npv_derivative != 0:
-                    irr = irr - npv / npv_derivative
-                else:
-                    break
-                
-                # Αποφυγή αρνητικών IRR
-                if irr < -0.99:
-                    irr = -0.99
+            irr = internal_rate_of_return(initial_investment, annual_net_benefit, project_lifetime_years)
             
             return round(Decimal(str(irr * 100)), 2)
         except (TypeError, ValueError, ZeroDivisionError):
@@ -523,9 +487,7 @@ class PhotovoltaicSystem(models.Model):
             if initial_investment <= 0 or annual_savings <= 0:
                 return 0
             
-            npv = -initial_investment
-            for year in range(1, project_lifetime_years + 1):
-                npv += annual_savings / ((1 + discount_rate) ** year)
+            npv = net_present_value(initial_investment, annual_savings, discount_rate, project_lifetime_years)
             
             return round(npv, 2)
         except (TypeError, ValueError, ZeroDivisionError):
@@ -590,8 +552,8 @@ class PhotovoltaicSystem(models.Model):
         except (TypeError, ValueError, ZeroDivisionError):
             return Decimal('0')
     
-    def save(self, *args, **kwargs):
-        """Αυτόματος υπολογισμός οικονομικών δεικτών κατά την αποθήκευση"""
+    def recalculate(self):
+        """Υπολογισμός κόστους και οικονομικών δεικτών (χωρίς αποθήκευση)"""
         if self.pv_panels_quantity and self.pv_panels_unit_price:
             self.pv_panels_cost = self.pv_panels_quantity * self.pv_panels_unit_price
         
@@ -633,5 +595,8 @@ class PhotovoltaicSystem(models.Model):
         self.internal_rate_of_return = self.calculate_internal_rate_of_return()
         
         self.net_present_value = self.calculate_net_present_value()
-        
+
+    def save(self, *args, **kwargs):
+        """Αυτόματος υπολογισμός οικονομικών δεικτών κατά την αποθήκευση"""
+        self.recalculate()
         super().save(*args, **kwargs)
@@ -5,13 +5,15 @@ from rest_framework.decorators import api_view, permission_classes
 from django.shortcuts import get_object_or_404
 import logging
 
+from common.conditional import ConditionalETagMixin, conditional_etag, make_etag, queryset_version
+from referenceData.cache import get_reference_data, reference_etag
 from .models import Prefecture
 from .serializers import PrefectureSerializer, PrefectureListSerializer
 
 logger = logging.getLogger(__name__)
 
 
-class PrefectureListCreateView(generics.ListCreateAPIView):
+class PrefectureListCreateView(ConditionalETagMixin, generics.ListCreateAPIView):
     queryset = Prefecture.objects.filter(is_active=True)
     permission_classes = [IsAuthenticated]
     
@@ -33,22 +35,26 @@ class PrefectureDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = 'uuid'
 
 
+def _active_prefectures_etag(request, zone=None):
+    # Οι ενεργοί νομοί διαβάζονται από το snapshot των δεδομένων αναφοράς
+    return reference_etag()
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(_active_prefectures_etag)
 def get_prefectures_by_zone(request, zone):
     """Get all prefectures for a specific energy zone"""
-    prefectures = Prefecture.objects.filter(zone=zone, is_active=True)
-    serializer = PrefectureListSerializer(prefectures, many=True)
-    return Response(serializer.data)
+    prefectures = get_reference_data()['prefectures']
+    return Response([prefecture for prefecture in prefectures if prefecture['zone'] == zone])
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(_active_prefectures_etag)
 def get_all_active_prefectures(request):
     """Get all active prefectures"""
-    prefectures = Prefecture.objects.filter(is_active=True)
-    serializer = PrefectureListSerializer(prefectures, many=True)
-    return Response(serializer.data)
+    return Response(get_reference_data()['prefectures'])
 
 
 @api_view(['GET'])
@@ -61,6 +67,7 @@ def get_energy_zones(request):
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
+@conditional_etag(lambda request: make_etag(*queryset_version(Prefecture.objects.all())))
 def get_all_prefectures_admin(request):
     """Get all prefectures (active and inactive) for admin panel"""
     prefectures = Prefecture.objects.all()
@@ -4,7 +4,7 @@ from django.urls import path
 from django.shortcuts import render
 from django.contrib import messages
 from django.db import transaction
-from .models import Project
+from .models import Project, BuildingProgress
 
 def bulk_delete_projects(modeladmin, request, queryset):
     """Custom bulk delete action with confirmation page."""
@@ -89,4 +89,22 @@ class ProjectAdmin(admin.ModelAdmin):
         """Show count of buildings in this project."""
         return obj.buildings.count()
     buildings_count.short_description = "Buildings"
-    buildings_count.admin_order_field = "buildings__count"
\ No newline at end of file
+    buildings_count.admin_order_field = "buildings__count"
+
+
+@admin.register(BuildingProgress)
+class BuildingProgressAdmin(admin.ModelAdmin):
+    list_display = (
+        "building",
+        "systems_completed",
+        "scenarios_completed",
+        "systems_percentage",
+        "scenarios_percentage",
+        "updated_at",
+    )
+    search_fields = ("building__name", "building__uuid")
+    readonly_fields = (
+        "building", "systems_mask", "scenarios_mask", "systems_completed",
+        "scenarios_completed", "systems_percentage", "scenarios_percentage", "updated_at",
+    )
+    list_per_page = 25
@@ -0,0 +1,281 @@
+"""
+Set-based υπολογισμός προόδου (συστήματα / σενάρια) για κτίρια και έργα.
+
+Αντί για ερωτήματα `.exists()` ανά κτίριο, κάθε σύστημα/σενάριο γίνεται
+annotate ως `Exists` subquery πάνω στο queryset των κτιρίων, οπότε η πρόοδος
+μιας ολόκληρης λίστας έργων υπολογίζεται με σταθερό αριθμό ερωτημάτων.
+
+Το αποτέλεσμα αποθηκεύεται στον πίνακα BuildingProgress (bitmasks και ποσοστά)
+και διατηρείται ενημερωμένο από τα signals του project.signals, οπότε οι
+αναγνώσεις προόδου δεν επαναϋπολογίζουν τίποτα.
+"""
+from django.apps import apps
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+SYSTEMS_TOTAL = 5
+SCENARIOS_TOTAL = 11
+
+# (annotation, model label) - συστήματα: αρκεί να υπάρχει εγγραφή
+SYSTEM_MODELS = [
+    ('has_boiler_detail', 'boilerDetail.BoilerDetail'),
+    ('has_cooling_system', 'coolingSystem.CoolingSystem'),
+    ('has_heating_system', 'heatingSystem.HeatingSystem'),
+    ('has_domestic_hot_water_system', 'domesticHotWaterSystem.DomesticHotWaterSystem'),
+    ('has_solar_collector', 'solarCollectors.SolarCollector'),
+]
+
+# (annotation, model label) - σενάρια: ολοκληρωμένα όταν έχουν μη μηδενικό NPV
+SCENARIO_MODELS = [
+    ('has_window_replacement', 'windowReplacement.WindowReplacement'),
+    ('has_bulb_replacement', 'bulbReplacement.BulbReplacement'),
+    ('has_boiler_replacement', 'boilerReplacement.BoilerReplacement'),
+    ('has_ac_analysis', 'airConditioningReplacement.AirConditioningAnalysis'),
+    ('has_roof_thermal_insulation', 'roofThermalInsulation.RoofThermalInsulation'),
+    ('has_external_wall_thermal_insulation', 'thermalInsulation.ExternalWallThermalInsulation'),
+    ('has_exterior_blinds', 'exteriorBlinds.ExteriorBlinds'),
+    ('has_photovoltaic_system', 'photovoltaicSystem.PhotovoltaicSystem'),
+    ('has_hot_water_upgrade', 'hotWaterUpgrade.HotWaterUpgrade'),
+    ('has_automatic_lighting_control', 'automaticLightingControl.AutomaticLightingControl'),
+    ('has_natural_gas_network', 'naturalGasNetwork.NaturalGasNetwork'),
+]
+
+# Το HotWaterUpgrade αποθηκεύει το κτίριο ως string UUID (CharField) και όχι ως
+# ForeignKey, οπότε δεν μπορεί να γίνει correlated subquery με ασφάλεια σε όλες
+# τις βάσεις - ελέγχεται με ένα ξεχωριστό ερώτημα `building__in`.
+CHAR_KEYED_SCENARIOS = {'hotWaterUpgrade.HotWaterUpgrade'}
+
+
+def completed_scenarios(model):
+    """Queryset με τα σενάρια που θεωρούνται ολοκληρωμένα (NPV υπολογισμένο)."""
+    return model.objects.filter(net_present_value__isnull=False).exclude(net_present_value=0)
+
+
+def annotate_building_progress(buildings):
+    """Προσθέτει ένα boolean annotation `Exists` ανά σύστημα/σενάριο."""
+    annotations = {}
+    for name, label in SYSTEM_MODELS:
+        model = apps.get_model(label)
+        annotations[name] = Exists(model.objects.filter(building=OuterRef('pk')))
+    for name, label in SCENARIO_MODELS:
+        if label in CHAR_KEYED_SCENARIOS:
+            continue
+        model = apps.get_model(label)
+        annotations[name] = Exists(completed_scenarios(model).filter(building=OuterRef('pk')))
+    return buildings.annotate(**annotations)
+
+
+def compute_progress_masks(buildings):
+    """
+    Υπολογίζει τα bitmasks συστημάτων/σεναρίων για ένα queryset κτιρίων με δύο
+    ερωτήματα συνολικά. Επιστρέφει λίστα (building, systems_mask, scenarios_mask).
+    """
+    buildings = list(annotate_building_progress(buildings))
+    if not buildings:
+        return []
+
+    char_keyed_done = {}
+    building_keys = [str(building.uuid) for building in buildings]
+    for label in CHAR_KEYED_SCENARIOS:
+        model = apps.get_model(label)
+        char_keyed_done[label] = set(
+            completed_scenarios(model)
+            .filter(building__in=building_keys)
+            .values_list('building', flat=True)
+        )
+
+    results = []
+    for building in buildings:
+        systems_mask = 0
+        for bit, (name, _) in enumerate(SYSTEM_MODELS):
+            if getattr(building, name):
+                systems_mask |= 1 << bit
+        scenarios_mask = 0
+        for bit, (name, label) in enumerate(SCENARIO_MODELS):
+            if label in CHAR_KEYED_SCENARIOS:
+                done = str(building.uuid) in char_keyed_done[label]
+            else:
+                done = getattr(building, name)
+            if done:
+                scenarios_mask |= 1 << bit
+        results.append((building, systems_mask, scenarios_mask))
+    return results
+
+
+def _progress_from_masks(building_id, systems_mask, scenarios_mask):
+    from .models import BuildingProgress
+
+    systems_completed = bin(systems_mask).count('1')
+    scenarios_completed = bin(scenarios_mask).count('1')
+    return BuildingProgress(
+        building_id=building_id,
+        systems_mask=systems_mask,
+        scenarios_mask=scenarios_mask,
+        systems_completed=systems_completed,
+        scenarios_completed=scenarios_completed,
+        systems_percentage=round((systems_completed / SYSTEMS_TOTAL) * 100, 1),
+        scenarios_percentage=round((scenarios_completed / SCENARIOS_TOTAL) * 100, 1),
+    )
+
+
+PROGRESS_UPDATE_FIELDS = [
+    'systems_mask', 'scenarios_mask', 'systems_completed', 'scenarios_completed',
+    'systems_percentage', 'scenarios_percentage', 'updated_at',
+]
+
+
+def refresh_building_progress(buildings):
+    """
+    Επαναϋπολογίζει και αποθηκεύει (upsert) τις εγγραφές BuildingProgress για
+    ένα queryset κτιρίων. Επιστρέφει dict {building_pk: BuildingProgress}.
+    """
+    from .models import BuildingProgress
+
+    rows = [
+        _progress_from_masks(building.pk, systems_mask, scenarios_mask)
+        for building, systems_mask, scenarios_mask in compute_progress_masks(buildings)
+    ]
+    if rows:
+        BuildingProgress.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['building'],
+            update_fields=PROGRESS_UPDATE_FIELDS,
+        )
+    return {row.building_id: row for row in rows}
+
+
+def update_existing_building_progress(building_id):
+    """
+    Ενημερώνει την εγγραφή προόδου μόνο αν υπάρχει ήδη (χωρίς INSERT).
+    Χρησιμοποιείται από τα post_delete signals: κατά το cascade delete ενός
+    κτιρίου δεν πρέπει να δημιουργηθεί νέα εγγραφή που θα έμενε ορφανή.
+    """
+    from building.models import Building
+    from .models import BuildingProgress
+
+    computed = compute_progress_masks(Building.objects.filter(pk=building_id))
+    if not computed:
+        return
+    _, systems_mask, scenarios_mask = computed[0]
+    row = _progress_from_masks(building_id, systems_mask, scenarios_mask)
+    # Το update() δεν ενημερώνει το auto_now updated_at (βλ. ETag του get_projects)
+    BuildingProgress.objects.filter(building_id=building_id).update(
+        updated_at=timezone.now(),
+        **{field: getattr(row, field) for field in PROGRESS_UPDATE_FIELDS if field != 'updated_at'}
+    )
+
+
+def build_building_progress(building, progress):
+    return {
+        'building_uuid': str(building.uuid),
+        'building_name': building.name,
+        'systems_completed': progress.systems_completed,
+        'systems_total': SYSTEMS_TOTAL,
+        'systems_percentage': progress.systems_percentage,
+        'scenarios_completed': progress.scenarios_completed,
+        'scenarios_total': SCENARIOS_TOTAL,
+        'scenarios_percentage': progress.scenarios_percentage,
+        'is_complete': progress.systems_completed == SYSTEMS_TOTAL and progress.scenarios_completed == SCENARIOS_TOTAL
+    }
+
+
+def get_single_building_progress(building):
+    """
+    Πρόοδος ενός κτιρίου από την αποθηκευμένη εγγραφή του. Με
+    `select_related('progress')` στο building δεν χρειάζεται κανένα ερώτημα.
+    """
+    from building.models import Building
+    from .models import BuildingProgress
+
+    try:
+        progress = building.progress
+    except BuildingProgress.DoesNotExist:
+        progress = refresh_building_progress(Building.objects.filter(pk=building.pk))[building.pk]
+    return build_building_progress(building, progress)
+
+
+def get_buildings_progress(buildings):
+    """
+    Πρόοδος για ένα queryset κτιρίων, διαβάζοντας τις αποθηκευμένες εγγραφές
+    BuildingProgress. Όσα κτίρια δεν έχουν ακόμη εγγραφή υπολογίζονται και
+    αποθηκεύονται εκείνη τη στιγμή.
+    Επιστρέφει λίστα (building, progress_dict) με τη σειρά του queryset.
+    """
+    from .models import BuildingProgress
+
+    buildings = list(buildings.select_related('progress'))
+    stored = {}
+    missing = []
+    for building in buildings:
+        try:
+            stored[building.pk] = building.progress
+        except BuildingProgress.DoesNotExist:
+            missing.append(building.pk)
+
+    if missing:
+        from building.models import Building
+        stored.update(refresh_building_progress(Building.objects.filter(pk__in=missing)))
+
+    return [
+        (building, build_building_progress(building, stored[building.pk]))
+        for building in buildings
+        if building.pk in stored
+    ]
+
+
+def build_completion_status(buildings_progress):
+    """Συγκεντρωτική κατάσταση ολοκλήρωσης ενός έργου από την πρόοδο των κτιρίων του."""
+    total_buildings = len(buildings_progress)
+
+    if total_buildings == 0:
+        return {
+            'total_buildings': 0,
+            'buildings_progress': [],
+            'overall_systems_progress': 0,
+            'overall_scenarios_progress': 0,
+            'can_submit': False
+        }
+
+    total_systems_required = total_buildings * SYSTEMS_TOTAL
+    total_scenarios_required = total_buildings * SCENARIOS_TOTAL
+    total_systems_completed = sum(progress['systems_completed'] for progress in buildings_progress)
+    total_scenarios_completed = sum(progress['scenarios_completed'] for progress in buildings_progress)
+
+    overall_systems_progress = round((total_systems_completed / total_systems_required) * 100, 1)
+    overall_scenarios_progress = round((total_scenarios_completed / total_scenarios_required) * 100, 1)
+
+    return {
+        'total_buildings': total_buildings,
+        'buildings_progress': buildings_progress,
+        'overall_systems_progress': overall_systems_progress,
+        'overall_scenarios_progress': overall_scenarios_progress,
+        'can_submit': True,
+        'systems_completed': total_systems_completed,
+        'systems_total': total_systems_required,
+        'scenarios_completed': total_scenarios_completed,
+        'scenarios_total': total_scenarios_required
+    }
+
+
+def get_projects_completion_status(projects):
+    """
+    Κατάσταση ολοκλήρωσης για πολλά έργα μαζί, με σταθερό αριθμό ερωτημάτων
+    ανεξάρτητα από το πλήθος έργων και κτιρίων.
+    Επιστρέφει dict {project_pk: completion_status}.
+    """
+    from building.models import Building
+
+    project_ids = [project.pk for project in projects]
+    grouped = {project_id: [] for project_id in project_ids}
+    if not project_ids:
+        return {}
+
+    buildings = Building.objects.filter(project_id__in=project_ids)
+    for building, progress in get_buildings_progress(buildings):
+        grouped[building.project_id].append(progress)
+
+    return {
+        project_id: build_completion_status(progress_list)
+        for project_id, progress_list in grouped.items()
+    }
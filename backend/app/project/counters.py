@@ -0,0 +1,70 @@
+"""
+Το buildings_count του έργου χωρίς COUNT και save() σε κάθε αποθήκευση κτιρίου.
+
+Ο μετρητής αλλάζει με ένα UPDATE ... SET buildings_count = buildings_count ± n
+μόνο όταν ένα κτίριο δημιουργείται, διαγράφεται ή μεταφέρεται σε άλλο έργο
+(project.signals). Οι απλές επεξεργασίες κτιρίου δεν τον αγγίζουν, και το
+update() δεν στέλνει το post_save του έργου, που θα ξαναϋπολόγιζε όλα τα
+σενάριά του. Το bulk_create δεν στέλνει signals: μετά από αυτό καλείται το
+count_created_buildings. Η εντολή reconcile_buildings_count διορθώνει όσα
+έμειναν πίσω (π.χ. από queryset.update).
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from .models import Project
+
+RECONCILE_CHUNK_SIZE = 5000
+
+
+def adjust_buildings_count(project_id, delta):
+    if not project_id or not delta:
+        return
+    # Greatest: ένας μετρητής που έμεινε πίσω δεν γίνεται αρνητικός (τον διορθώνει το reconcile)
+    Project.objects.filter(pk=project_id).update(buildings_count=Greatest(F('buildings_count') + delta, 0))
+
+
+def count_created_buildings(buildings):
+    """Ένα UPDATE ανά έργο για κτίρια που γράφτηκαν με bulk_create."""
+    per_project = Counter(building.project_id for building in buildings)
+    for project_id, count in per_project.items():
+        adjust_buildings_count(project_id, count)
+
+
+def reconcile_buildings_count(project_id=None, chunk_size=RECONCILE_CHUNK_SIZE):
+    """
+    Ξαναϋπολογίζει το buildings_count από τον πίνακα των κτιρίων, ανά
+    `chunk_size` έργα. Επιστρέφει πόσα έργα ελέγχθηκαν και πόσα διορθώθηκαν.
+    """
+    from building.models import Building
+
+    checked = updated = 0
+    last_pk = None
+    while True:
+        projects = Project.objects.order_by('pk')
+        if project_id is not None:
+            projects = projects.filter(pk=project_id)
+        if last_pk is not None:
+            projects = projects.filter(pk__gt=last_pk)
+        stored = dict(projects.values_list('pk', 'buildings_count')[:chunk_size])
+        if not stored:
+            break
+        last_pk = list(stored)[-1]
+
+        with transaction.atomic():
+            actual = dict(
+                Building.objects.filter(project_id__in=stored).order_by()
+                .values('project').annotate(count=Count('pk')).values_list('project', 'count')
+            )
+            wrong = [
+                Project(pk=pk, buildings_count=actual.get(pk, 0))
+                for pk, count in stored.items() if count != actual.get(pk, 0)
+            ]
+            # bulk_update και όχι save(): χωρίς το post_save του έργου
+            Project.objects.bulk_update(wrong, ['buildings_count'], batch_size=500)
+        checked += len(stored)
+        updated += len(wrong)
+    return {'projects_checked': checked, 'projects_updated': updated}
@@ -0,0 +1,201 @@
+"""
+Εξαγωγή των αποτελεσμάτων των σεναρίων ενός χαρτοφυλακίου (κτίρια × σενάρια)
+σε NDJSON, CSV ή XLSX.
+
+Μία γραμμή ανά κτίριο με τους δείκτες κάθε σεναρίου (επένδυση, ετήσιο
+όφελος, απλή / προεξοφλημένη αποπληρωμή, NPV, IRR). Τα κτίρια διαβάζονται με
+.iterator(chunk_size=CHUNK_SIZE) και για κάθε κομμάτι γίνεται ένα ερώτημα ανά
+τύπο σεναρίου (building__in), οπότε η μνήμη δεν εξαρτάται από το μέγεθος του
+χαρτοφυλακίου και η απάντηση (StreamingHttpResponse) ξεκινά αμέσως. Αν ένα
+κτίριο έχει πολλές εγγραφές του ίδιου σεναρίου εξάγεται η πιο πρόσφατη.
+"""
+import csv
+import json
+import tempfile
+import uuid
+from decimal import Decimal
+from itertools import islice
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # Το XLSX είναι προαιρετικό.
+    Workbook = None
+
+from .completion import CHAR_KEYED_SCENARIOS, SCENARIO_MODELS
+
+CHUNK_SIZE = 500
+FILE_CHUNK_SIZE = 64 * 1024
+FORMATS = ('ndjson', 'csv', 'xlsx')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Τα πεδία επένδυσης και ετήσιου οικονομικού οφέλους έχουν διαφορετικό όνομα ανά σενάριο
+SCENARIO_FIELDS = {
+    'windowReplacement.WindowReplacement': ('window_replacement', 'total_investment_cost', 'annual_cost_savings'),
+    'bulbReplacement.BulbReplacement': ('bulb_replacement', 'total_investment_cost', 'annual_cost_savings'),
+    'boilerReplacement.BoilerReplacement': ('boiler_replacement', 'total_investment_cost', 'annual_economic_benefit'),
+    'airConditioningReplacement.AirConditioningAnalysis': (
+        'air_conditioning', 'total_investment_cost', 'annual_economic_benefit',
+    ),
+    'roofThermalInsulation.RoofThermalInsulation': ('roof_thermal_insulation', 'total_cost', 'annual_benefit'),
+    'thermalInsulation.ExternalWallThermalInsulation': ('wall_thermal_insulation', 'total_cost', 'annual_benefit'),
+    'exteriorBlinds.ExteriorBlinds': ('exterior_blinds', 'total_investment_cost', 'annual_economic_benefit'),
+    'photovoltaicSystem.PhotovoltaicSystem': ('photovoltaic_system', 'total_cost', 'annual_savings'),
+    'hotWaterUpgrade.HotWaterUpgrade': ('hot_water_upgrade', 'total_investment_cost', 'annual_economic_benefit'),
+    'automaticLightingControl.AutomaticLightingControl': (
+        'automatic_lighting_control', 'total_investment_cost', 'annual_economic_benefit',
+    ),
+    'naturalGasNetwork.NaturalGasNetwork': ('natural_gas_network', 'total_investment_cost', 'annual_economic_benefit'),
+}
+SCENARIOS = [(label, *SCENARIO_FIELDS[label]) for _, label in SCENARIO_MODELS]
+
+COMMON_METRICS = ('payback_period', 'discounted_payback_period', 'net_present_value', 'internal_rate_of_return')
+METRICS = ('investment', 'annual_savings', *COMMON_METRICS)
+BUILDING_COLUMNS = ('project_uuid', 'project_name', 'building_uuid', 'building_name', 'usage', 'total_area')
+COLUMNS = BUILDING_COLUMNS + tuple(f'{name}_{metric}' for _, name, _, _ in SCENARIOS for metric in METRICS)
+
+# Κείμενα που το Excel / LibreOffice θα εκτελούσαν ως τύπο (CSV / formula injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _number(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def _scenario_metrics(label, investment_field, savings_field, building_ids):
+    """{building_pk: δείκτες} για ένα σενάριο και ένα κομμάτι κτιρίων, με ένα ερώτημα."""
+    model = apps.get_model(label)
+    char_keyed = label in CHAR_KEYED_SCENARIOS
+    keys = [str(pk) for pk in building_ids] if char_keyed else building_ids
+    rows = (
+        model.objects.filter(building__in=keys)
+        .order_by('updated_at')
+        .values_list('building', investment_field, savings_field, *COMMON_METRICS)
+    )
+    metrics = {}
+    for building, *values in rows:
+        # Η τελευταία (πιο πρόσφατη) εγγραφή ανά κτίριο υπερισχύει
+        metrics[uuid.UUID(building) if char_keyed else building] = dict(zip(METRICS, map(_number, values)))
+    return metrics
+
+
+def iter_records(buildings, progress=None):
+    """
+    Ένα dict ανά κτίριο: {'project': {...}, 'building': {...}, 'scenarios':
+    {σενάριο: δείκτες ή None}}. `buildings` είναι queryset κτιρίων. Το
+    `progress(κτίρια)` καλείται μετά από κάθε κομμάτι.
+    """
+    rows = (
+        buildings.order_by('project_id', 'date_created', 'uuid')
+        .values_list('project_id', 'project__name', 'uuid', 'name', 'usage', 'total_area')
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    done = 0
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            return
+        building_ids = [row[2] for row in chunk]
+        per_scenario = [
+            (name, _scenario_metrics(label, investment_field, savings_field, building_ids))
+            for label, name, investment_field, savings_field in SCENARIOS
+        ]
+        for project_id, project_name, building_id, building_name, usage, total_area in chunk:
+            yield {
+                'project': {'uuid': project_id, 'name': project_name},
+                'building': {
+                    'uuid': building_id, 'name': building_name, 'usage': usage, 'total_area': _number(total_area),
+                },
+                'scenarios': {name: metrics.get(building_id) for name, metrics in per_scenario},
+            }
+        done += len(chunk)
+        if progress:
+            progress(done)
+
+
+def _text(value):
+    """Κείμενο του χρήστη για κελί CSV / XLSX: με ' μπροστά αν ξεκινά σαν τύπος."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _flatten(record):
+    row = [
+        record['project']['uuid'], _text(record['project']['name']),
+        record['building']['uuid'], _text(record['building']['name']),
+        _text(record['building']['usage']), record['building']['total_area'],
+    ]
+    for _, name, _, _ in SCENARIOS:
+        metrics = record['scenarios'][name] or {}
+        row.extend(metrics.get(metric) for metric in METRICS)
+    return row
+
+
+def _batches(records, size=CHUNK_SIZE):
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def stream_ndjson(records):
+    for batch in _batches(records):
+        yield ''.join(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for record in batch)
+
+
+class _Echo:
+    """Ψευδο-αρχείο για το csv.writer: επιστρέφει τη γραμμή αντί να τη γράφει."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(records):
+    writer = csv.writer(_Echo())
+    # BOM ώστε το Excel να ανοίγει σωστά τα ελληνικά
+    yield '\ufeff' + writer.writerow(COLUMNS)
+    for batch in _batches(records):
+        yield ''.join(
+            writer.writerow(['' if value is None else value for value in _flatten(record)]) for record in batch
+        )
+
+
+def stream_xlsx(records):
+    """
+    Το XLSX είναι zip και γράφεται ολόκληρο πριν σταλεί: το openpyxl σε
+    write_only κρατά τις γραμμές σε προσωρινό αρχείο και όχι στη μνήμη, και
+    το τελικό αρχείο στέλνεται σε κομμάτια.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Scenarios')
+    sheet.append(COLUMNS)
+    for record in records:
+        sheet.append([str(value) if isinstance(value, uuid.UUID) else value for value in _flatten(record)])
+    with tempfile.TemporaryFile() as target:
+        workbook.save(target)
+        target.seek(0)
+        while True:
+            data = target.read(FILE_CHUNK_SIZE)
+            if not data:
+                return
+            yield data
+
+
+STREAMS = {'ndjson': stream_ndjson, 'csv': stream_csv, 'xlsx': stream_xlsx}
+
+
+def format_available(export_format):
+    return export_format in FORMATS and (export_format != 'xlsx' or Workbook is not None)
+
+
+def stream_export(buildings, export_format, progress=None):
+    """Τα κομμάτια (str ή bytes) του αρχείου εξαγωγής για τα `buildings`."""
+    return STREAMS[export_format](iter_records(buildings, progress))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from building.models import Building
+from project.completion import refresh_building_progress
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized BuildingProgress table from the systems and scenarios tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            help='Rebuild only the buildings of this project UUID'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of buildings recalculated per batch (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        buildings = Building.objects.order_by('pk')
+        if options['project']:
+            buildings = buildings.filter(project_id=options['project'])
+
+        chunk_size = options['chunk_size']
+        building_ids = list(buildings.values_list('pk', flat=True))
+        total = len(building_ids)
+
+        for start in range(0, total, chunk_size):
+            chunk = building_ids[start:start + chunk_size]
+            refresh_building_progress(Building.objects.filter(pk__in=chunk))
+            self.stdout.write(f"Rebuilt progress for {min(start + chunk_size, total)}/{total} buildings")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully rebuilt progress for {total} buildings")
+        )
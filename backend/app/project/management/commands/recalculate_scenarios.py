@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+from project.models import Project
+from project.recalculation import DEFAULT_CHUNK_SIZE, parse_since, recalculate_scenarios
+
+
+class Command(BaseCommand):
+    help = 'Recalculate the stored savings and financial metrics of every scenario in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            help='Recalculate only the scenarios of this project UUID'
+        )
+        parser.add_argument(
+            '--since',
+            help='Recalculate only scenarios updated on or after this date (YYYY-MM-DD or ISO datetime)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Number of rows loaded and written per batch (default: {DEFAULT_CHUNK_SIZE})'
+        )
+        parser.add_argument(
+            '--sync-prices',
+            action='store_true',
+            help='Copy the current project energy prices into the scenarios before recalculating'
+        )
+
+    def handle(self, *args, **options):
+        project = None
+        if options['project']:
+            try:
+                project = Project.objects.get(uuid=options['project'])
+            except (Project.DoesNotExist, ValueError):
+                raise CommandError(f"Project {options['project']} not found")
+
+        since = None
+        if options['since']:
+            try:
+                since = parse_since(options['since'])
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive integer')
+
+        def report(label, processed, total):
+            self.stdout.write(f"{label}: {processed}/{total}")
+
+        result = recalculate_scenarios(
+            project=project,
+            since=since,
+            chunk_size=options['chunk_size'],
+            sync_prices=options['sync_prices'],
+            progress=report,
+        )
+
+        for item in result['models']:
+            line = f"  {item['model']}: {item['rows']} rows in {item['seconds']}s"
+            if item['failed']:
+                line += f" ({item['failed']} failed)"
+            self.stdout.write(line)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully recalculated {result['total_rows']} scenarios in {result['elapsed_seconds']}s "
+                f"({result['rows_per_second'] or 0} rows/sec), "
+                f"refreshed progress for {result['buildings_refreshed']} buildings"
+            )
+        )
+        if result['failed_rows']:
+            self.stdout.write(self.style.WARNING(f"{result['failed_rows']} scenarios could not be recalculated"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from project.counters import RECONCILE_CHUNK_SIZE, reconcile_buildings_count
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute Project.buildings_count from the buildings table and fix the projects whose '
+        'counter drifted (e.g. after bulk_create or queryset.update). Run periodically, e.g. nightly from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            help='Reconcile only this project UUID'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=RECONCILE_CHUNK_SIZE,
+            help=f'Number of projects checked per batch (default: {RECONCILE_CHUNK_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive integer')
+
+        result = reconcile_buildings_count(project_id=options['project'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {result['projects_checked']} projects, "
+            f"corrected buildings_count of {result['projects_updated']}"
+        ))
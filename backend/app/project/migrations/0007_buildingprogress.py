@@ -0,0 +1,32 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('building', '0007_alter_building_prefecture'),
+        ('project', '0006_alter_project_natural_gas_price_per_m3'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BuildingProgress',
+            fields=[
+                ('building', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='progress', serialize=False, to='building.building')),
+                ('systems_mask', models.PositiveIntegerField(default=0)),
+                ('scenarios_mask', models.PositiveIntegerField(default=0)),
+                ('systems_completed', models.PositiveSmallIntegerField(default=0)),
+                ('scenarios_completed', models.PositiveSmallIntegerField(default=0)),
+                ('systems_percentage', models.FloatField(default=0)),
+                ('scenarios_percentage', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Πρόοδος Κτιρίου',
+                'verbose_name_plural': 'Πρόοδος Κτιρίων',
+            },
+        ),
+    ]
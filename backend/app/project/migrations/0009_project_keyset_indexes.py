@@ -0,0 +1,21 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0008_project_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['date_created', 'uuid'], name='project_created_uuid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', 'date_created', 'uuid'], name='project_user_created_uuid_idx'),
+        ),
+    ]
@@ -10,6 +10,7 @@ class Project(models.Model):
     )
     name = models.CharField(max_length=100)
     date_created = models.DateField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
     oil_price_per_liter = models.DecimalField(
         max_digits=6,
         decimal_places=3,
@@ -54,6 +55,18 @@ class Project(models.Model):
 
     class Meta:
         unique_together = (("user", "name"),)
+        # Σελιδοποίηση keyset του get_projects (common.listing)
+        indexes = [
+            models.Index(fields=['date_created', 'uuid'], name='project_created_uuid_idx'),
+            models.Index(fields=['user', 'date_created', 'uuid'], name='project_user_created_uuid_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Ο χρήστης κατά τη φόρτωση: το adminStats.signals εντοπίζει τη μεταφορά χωρίς ερώτημα
+        instance._loaded_user_id = instance.__dict__.get('user_id')
+        return instance
 
     def get_completion_status(self):
         """
@@ -65,91 +78,37 @@ class Project(models.Model):
         - overall_scenarios_progress: overall scenarios completion percentage
         - can_submit: whether project can be submitted
         """
-        buildings = self.buildings.all()
-        total_buildings = buildings.count()
-        
-        if total_buildings == 0:
-            return {
-                'total_buildings': 0,
-                'buildings_progress': [],
-                'overall_systems_progress': 0,
-                'overall_scenarios_progress': 0,
-                'can_submit': False
-            }
-        
-        buildings_progress = []
-        total_systems_completed = 0
-        total_scenarios_completed = 0
-        total_systems_required = total_buildings * 5 
-        total_scenarios_required = total_buildings * 11
-        
-        for building in buildings:
-            systems_completed = 0
-            if hasattr(building, 'boiler_details') and building.boiler_details.exists():
-                systems_completed += 1
-            if hasattr(building, 'cooling_systems') and building.cooling_systems.exists():
-                systems_completed += 1
-            if hasattr(building, 'heating_systems') and building.heating_systems.exists():
-                systems_completed += 1
-            if hasattr(building, 'domestic_hot_water_systems') and building.domestic_hot_water_systems.exists():
-                systems_completed += 1
-            if hasattr(building, 'solar_collectors') and building.solar_collectors.exists():
-                systems_completed += 1
-            
-            scenarios_completed = 0
-            if hasattr(building, 'windowreplacement_set') and building.windowreplacement_set.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-                scenarios_completed += 1
-            if hasattr(building, 'bulbreplacement_set') and building.bulbreplacement_set.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-                scenarios_completed += 1
-            if hasattr(building, 'boiler_replacements') and building.boiler_replacements.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-                scenarios_completed += 1
-            if hasattr(building, 'ac_analyses') and building.ac_analyses.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-                scenarios_completed += 1
-            if hasattr(building, 'roof_thermal_insulations') and building.roof_thermal_insulations.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-                scenarios_completed += 1
-            if hasattr(building, 'externalwallthermalinsulation_set') and building.externalwallthermalinsulation_set.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-                scenarios_completed += 1
-            if hasattr(building, 'exterior_blinds') and building.exterior_blinds.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-                scenarios_completed += 1
-            if hasattr(building, 'photovoltaic_systems') and building.photovoltaic_systems.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-                scenarios_completed += 1
-            if hasattr(building, 'hotwaterupgrade_set') and building.hotwaterupgrade_set.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-                scenarios_completed += 1
-            if hasattr(building, 'automatic_lighting_controls') and building.automatic_lighting_controls.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-                scenarios_completed += 1
-            
-            building_progress = {
-                'building_uuid': str(building.uuid),
-                'building_name': building.name,
-                'systems_completed': systems_completed,
-                'systems_total': 5,
-                'systems_percentage': round((systems_completed / 5) * 100, 1),
-                'scenarios_completed': scenarios_completed,
-                'scenarios_total': 11,
-                'scenarios_percentage': round((scenarios_completed / 11) * 100, 1),
-                'is_complete': systems_completed == 5 and scenarios_completed == 11
-            }
-            
-            buildings_progress.append(building_progress)
-            total_systems_completed += systems_completed
-            total_scenarios_completed += scenarios_completed
-        
-        overall_systems_progress = round((total_systems_completed / total_systems_required) * 100, 1) if total_systems_required > 0 else 0
-        overall_scenarios_progress = round((total_scenarios_completed / total_scenarios_required) * 100, 1) if total_scenarios_required > 0 else 0
-        
-        can_submit = True
-        
-        return {
-            'total_buildings': total_buildings,
-            'buildings_progress': buildings_progress,
-            'overall_systems_progress': overall_systems_progress,
-            'overall_scenarios_progress': overall_scenarios_progress,
-            'can_submit': can_submit,
-            'systems_completed': total_systems_completed,
-            'systems_total': total_systems_required,
-            'scenarios_completed': total_scenarios_completed,
-            'scenarios_total': total_scenarios_required
-        }
+        from .completion import get_projects_completion_status
+        return get_projects_completion_status([self])[self.pk]
+
+    def __str__(self):
+        return self.name
+
+class BuildingProgress(models.Model):
+    """
+    Αποθηκευμένη (denormalized) πρόοδος ενός κτιρίου σε συστήματα και σενάρια.
+    Ενημερώνεται από τα signals του project.signals σε κάθε αποθήκευση/διαγραφή
+    συστήματος ή σεναρίου, ώστε η ανάγνωση της προόδου να είναι ένα lookup.
+    Τα bitmasks ακολουθούν τη σειρά των SYSTEM_MODELS / SCENARIO_MODELS στο
+    project.completion.
+    """
+    building = models.OneToOneField(
+        'building.Building',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='progress'
+    )
+    systems_mask = models.PositiveIntegerField(default=0)
+    scenarios_mask = models.PositiveIntegerField(default=0)
+    systems_completed = models.PositiveSmallIntegerField(default=0)
+    scenarios_completed = models.PositiveSmallIntegerField(default=0)
+    systems_percentage = models.FloatField(default=0)
+    scenarios_percentage = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Πρόοδος Κτιρίου"
+        verbose_name_plural = "Πρόοδος Κτιρίων"
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f"Πρόοδος κτιρίου {self.building_id}: {self.systems_completed} συστήματα, {self.scenarios_completed} σενάρια"
@@ -0,0 +1,243 @@
+"""
+Μαζικός επαναϋπολογισμός των αποθηκευμένων οικονομικών δεικτών των σεναρίων.
+
+Όταν αλλάζουν οι τιμές ενέργειας ενός έργου (π.χ. cost_per_kwh_electricity,
+oil_price_per_liter), τα υπολογισμένα πεδία κάθε σεναρίου (εξοικονόμηση, NPV,
+IRR κ.λπ.) μένουν παλιά. Εδώ οι εγγραφές διαβάζονται σε τμήματα (keyset στο pk),
+επαναϋπολογίζονται στη μνήμη με το `recalculate()` κάθε μοντέλου και
+γράφονται πίσω με ένα `bulk_update` ανά τμήμα, χωρίς save() ανά εγγραφή.
+Στο τέλος ενημερώνεται η πρόοδος (BuildingProgress) των κτιρίων που άλλαξαν.
+
+Ο υπολογισμός μένει ανά εγγραφή και δεν περνά από το common.finance.evaluate_batch:
+κάθε μοντέλο δίνει διαφορετικά ορίσματα σε κάθε δείκτη (π.χ. άλλη ταμειακή ροή
+για payback και για NPV, στρογγυλοποιήσεις, όριο IRR), οπότε οι δείκτες δεν
+είναι μία γραμμή (επένδυση, όφελος, επιτόκιο, έτη) ανά εγγραφή. Με τους
+κλειστούς τύπους μια εγγραφή κοστίζει λίγα μικροδευτερόλεπτα (βλ. το
+finance.evaluate.10000 του run_benchmarks). Το κόστος είναι τα ερωτήματα, που
+εδώ είναι σταθερά ανά τμήμα και όχι ανά εγγραφή.
+"""
+import logging
+import time
+from datetime import datetime, time as datetime_time
+
+from django.apps import apps
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.db import transaction
+
+from common.utils import validate_uuid
+from .completion import CHAR_KEYED_SCENARIOS, refresh_building_progress
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+FINANCIAL_FIELDS = [
+    'payback_period', 'discounted_payback_period', 'net_present_value', 'internal_rate_of_return',
+]
+
+# (model label, select_related, πεδία που υπολογίζει το recalculate())
+SCENARIO_RECALCULATION = [
+    ('windowReplacement.WindowReplacement', ['project', 'building'], [
+        'energy_savings_summer', 'energy_savings_winter', 'total_energy_savings',
+        'annual_cost_savings', 'total_investment_cost',
+    ] + FINANCIAL_FIELDS),
+    ('bulbReplacement.BulbReplacement', ['project', 'building'], [
+        'old_consumption_kwh', 'new_consumption_kwh', 'energy_savings_kwh',
+        'annual_cost_savings', 'total_investment_cost',
+    ] + FINANCIAL_FIELDS),
+    ('boilerReplacement.BoilerReplacement', ['project', 'building'], [
+        'oil_price_per_liter', 'heating_oil_savings_liters', 'annual_energy_savings',
+        'annual_economic_benefit', 'total_investment_cost',
+    ] + FINANCIAL_FIELDS),
+    ('airConditioningReplacement.AirConditioningAnalysis', ['project', 'building'], [
+        'total_old_consumption', 'total_new_consumption', 'energy_savings_kwh', 'energy_cost_kwh',
+        'annual_energy_savings', 'annual_economic_benefit', 'total_investment_cost',
+    ] + FINANCIAL_FIELDS),
+    ('roofThermalInsulation.RoofThermalInsulation', ['project', 'building'], [
+        'u_coefficient', 'annual_benefit',
+    ] + FINANCIAL_FIELDS),
+    ('thermalInsulation.ExternalWallThermalInsulation', ['project', 'building'], [
+        'u_coefficient', 'annual_benefit',
+    ] + FINANCIAL_FIELDS),
+    ('exteriorBlinds.ExteriorBlinds', ['project', 'building'], [
+        'cooling_energy_savings', 'annual_energy_savings', 'annual_economic_benefit', 'total_investment_cost',
+    ] + FINANCIAL_FIELDS),
+    ('photovoltaicSystem.PhotovoltaicSystem', ['project', 'building__prefecture'], [
+        'pv_panels_cost', 'metal_bases_cost', 'piping_cost', 'wiring_cost', 'inverter_cost',
+        'installation_cost', 'estimated_cost', 'unexpected_expenses', 'value_after_unexpected',
+        'tax_burden', 'total_cost', 'net_cost', 'annual_energy_production', 'annual_savings',
+    ] + FINANCIAL_FIELDS),
+    ('hotWaterUpgrade.HotWaterUpgrade', [], [
+        'solar_collectors_subtotal', 'metal_support_bases_subtotal', 'solar_system_subtotal',
+        'insulated_pipes_subtotal', 'central_heater_installation_subtotal', 'total_investment_cost',
+        'annual_energy_consumption_kwh', 'annual_solar_savings_kwh', 'annual_economic_benefit',
+    ] + FINANCIAL_FIELDS),
+    ('automaticLightingControl.AutomaticLightingControl', ['project', 'building'], [
+        'lighting_energy_savings', 'energy_cost_kwh', 'annual_energy_savings',
+        'annual_economic_benefit', 'total_investment_cost',
+    ] + FINANCIAL_FIELDS),
+    ('naturalGasNetwork.NaturalGasNetwork', ['project', 'building__project'], [
+        'natural_gas_price_per_kwh', 'current_energy_cost_per_year', 'natural_gas_cost_per_year',
+        'burner_replacement_subtotal', 'gas_pipes_subtotal', 'gas_detection_systems_subtotal',
+        'boiler_cleaning_subtotal', 'total_investment_cost', 'annual_energy_savings',
+        'annual_economic_benefit',
+    ] + FINANCIAL_FIELDS),
+]
+
+# Σχέσεις που φορτώνονται με prefetch ανά τμήμα, ώστε το recalculate() να μην
+# κάνει ερωτήματα ανά εγγραφή (π.χ. οι στρώσεις υλικών των θερμομονώσεων)
+SCENARIO_PREFETCH = {
+    'roofThermalInsulation.RoofThermalInsulation': ['material_layers'],
+    'thermalInsulation.ExternalWallThermalInsulation': ['material_layers__material'],
+}
+
+# Τιμές που τα σενάρια κρατούν ως αντίγραφο της τιμής του έργου:
+# (πεδίο σεναρίου, πεδίο έργου). Συγχρονίζονται μόνο με sync_prices=True,
+# ώστε να μην χαθούν τιμές που όρισε χειροκίνητα ο χρήστης.
+PROJECT_PRICE_FIELDS = {
+    'windowReplacement.WindowReplacement': [('energy_cost_kwh', 'cost_per_kwh_electricity')],
+    'bulbReplacement.BulbReplacement': [('energy_cost_kwh', 'cost_per_kwh_electricity')],
+    'boilerReplacement.BoilerReplacement': [('oil_price_per_liter', 'oil_price_per_liter')],
+    'airConditioningReplacement.AirConditioningAnalysis': [('energy_cost_kwh', 'cost_per_kwh_electricity')],
+    'exteriorBlinds.ExteriorBlinds': [('energy_cost_kwh', 'cost_per_kwh_electricity')],
+    'automaticLightingControl.AutomaticLightingControl': [('energy_cost_kwh', 'cost_per_kwh_electricity')],
+}
+
+
+def parse_since(value):
+    """
+    Μετατρέπει ημερομηνία (YYYY-MM-DD) ή ISO datetime σε aware datetime.
+    Προκαλεί ValueError για μη έγκυρη τιμή.
+    """
+    parsed = parse_datetime(value)
+    if parsed is None:
+        parsed_date = parse_date(value)
+        if parsed_date is None:
+            raise ValueError(f"Invalid date: {value}")
+        parsed = datetime.combine(parsed_date, datetime_time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def scenario_queryset(label, select_related, project=None, since=None):
+    """Queryset ενός μοντέλου σεναρίου με τα φίλτρα έργου / ημερομηνίας."""
+    model = apps.get_model(label)
+    queryset = model.objects.all()
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if label in SCENARIO_PREFETCH:
+        queryset = queryset.prefetch_related(*SCENARIO_PREFETCH[label])
+    if project is not None:
+        project_id = getattr(project, 'pk', project)
+        if label in CHAR_KEYED_SCENARIOS:
+            queryset = queryset.filter(project=str(project_id))
+        else:
+            queryset = queryset.filter(project_id=project_id)
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    return queryset
+
+
+def iterate_chunks(queryset, chunk_size):
+    """Διατρέχει το queryset σε τμήματα με keyset pagination στο pk."""
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def _sync_project_prices(obj, price_fields):
+    project = getattr(obj, 'project', None)
+    if project is None:
+        return
+    for field_name, project_field_name in price_fields:
+        value = getattr(project, project_field_name)
+        if value is not None:
+            field = obj._meta.get_field(field_name)
+            setattr(obj, field_name, field.to_python(value))
+
+
+def _scenario_building_id(label, obj):
+    if label in CHAR_KEYED_SCENARIOS:
+        return obj.building if validate_uuid(obj.building) else None
+    return str(obj.building_id) if obj.building_id else None
+
+
+def recalculate_scenarios(project=None, since=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                          sync_prices=False, progress=None):
+    """
+    Επαναϋπολογίζει όλα τα σενάρια (προαιρετικά ενός έργου ή όσα άλλαξαν από
+    `since`) και επιστρέφει συνοπτικά στατιστικά με τον ρυθμό (rows/sec).
+    Το `progress(label, processed, total)` καλείται μετά από κάθε τμήμα.
+    """
+    started = time.monotonic()
+    summary = []
+    touched_buildings = set()
+
+    for label, select_related, fields in SCENARIO_RECALCULATION:
+        model_started = time.monotonic()
+        queryset = scenario_queryset(label, select_related, project=project, since=since)
+        total = queryset.count()
+        price_fields = PROJECT_PRICE_FIELDS.get(label, []) if sync_prices else []
+        update_fields = list(dict.fromkeys(fields + [name for name, _ in price_fields] + ['updated_at']))
+
+        processed = 0
+        failed = 0
+        for chunk in iterate_chunks(queryset, chunk_size):
+            now = timezone.now()
+            recalculated = []
+            for obj in chunk:
+                try:
+                    _sync_project_prices(obj, price_fields)
+                    obj.recalculate()
+                except Exception as e:
+                    failed += 1
+                    logger.warning(f"Recalculation failed for {label} {obj.pk}: {e}")
+                    continue
+                obj.updated_at = now
+                recalculated.append(obj)
+
+            if recalculated:
+                with transaction.atomic():
+                    apps.get_model(label).objects.bulk_update(recalculated, update_fields)
+                touched_buildings.update(
+                    building_id for building_id in
+                    (_scenario_building_id(label, obj) for obj in recalculated)
+                    if building_id
+                )
+            processed += len(chunk)
+            if progress:
+                progress(label, processed, total)
+
+        elapsed = time.monotonic() - model_started
+        summary.append({
+            'model': label,
+            'rows': processed - failed,
+            'failed': failed,
+            'seconds': round(elapsed, 3),
+        })
+
+    if touched_buildings:
+        from building.models import Building
+
+        building_ids = list(touched_buildings)
+        for start in range(0, len(building_ids), chunk_size):
+            refresh_building_progress(Building.objects.filter(pk__in=building_ids[start:start + chunk_size]))
+
+    elapsed = time.monotonic() - started
+    total_rows = sum(item['rows'] for item in summary)
+    return {
+        'models': summary,
+        'total_rows': total_rows,
+        'failed_rows': sum(item['failed'] for item in summary),
+        'buildings_refreshed': len(touched_buildings),
+        'elapsed_seconds': round(elapsed, 3),
+        'rows_per_second': round(total_rows / elapsed, 1) if elapsed > 0 else None,
+    }
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import Project
+from common.listing import SparseFieldsMixin
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     buildings_count = serializers.ReadOnlyField()
     completion_status = serializers.SerializerMethodField()
     
@@ -13,4 +14,7 @@ class ProjectSerializer(serializers.ModelSerializer):
     
     def get_completion_status(self, obj):
         """Get the completion status for this project"""
-        return obj.get_completion_status()
\ No newline at end of file
+        statuses = self.context.get('completion_statuses')
+        if statuses is not None and obj.pk in statuses:
+            return statuses[obj.pk]
+        return obj.get_completion_status()
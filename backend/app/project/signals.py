@@ -1,6 +1,16 @@
-from django.db.models.signals import post_save
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
+from common.utils import validate_uuid
+from building.models import Building
 from .models import Project
+from .counters import adjust_buildings_count
+from .completion import (
+    SYSTEM_MODELS,
+    SCENARIO_MODELS,
+    refresh_building_progress,
+    update_existing_building_progress,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -102,3 +112,82 @@ def update_all_scenarios_on_project_change(sender, instance, **kwargs):
         
     except Exception as e:
         logger.error(f"Error updating scenarios for project {instance.uuid}: {str(e)}")
+
+
+@receiver(post_save, sender=Building)
+def count_saved_building(sender, instance, created, update_fields=None, **kwargs):
+    """
+    buildings_count με F() μόνο για νέο κτίριο ή μεταφορά σε άλλο έργο· μια
+    απλή επεξεργασία δεν κάνει κανένα ερώτημα. Για κτίριο που δεν φορτώθηκε από
+    τη βάση (from_db) θεωρείται ότι το έργο δεν άλλαξε.
+    """
+    if created:
+        adjust_buildings_count(instance.project_id, 1)
+    elif update_fields is None or 'project' in update_fields:
+        previous = getattr(instance, '_loaded_project_id', instance.project_id)
+        if str(previous) != str(instance.project_id):
+            adjust_buildings_count(previous, -1)
+            adjust_buildings_count(instance.project_id, 1)
+    instance._loaded_project_id = instance.project_id
+
+
+@receiver(post_delete, sender=Building)
+def count_deleted_building(sender, instance, **kwargs):
+    adjust_buildings_count(instance.project_id, -1)
+
+
+def _progress_building_id(instance):
+    """Το κτίριο ενός συστήματος/σεναρίου (το HotWaterUpgrade το κρατά ως string)."""
+    building_id = getattr(instance, 'building_id', None)
+    if building_id is None:
+        building_id = getattr(instance, 'building', None)
+    if building_id is None or not validate_uuid(building_id):
+        return None
+    return building_id
+
+
+def refresh_progress_on_save(sender, instance, **kwargs):
+    building_id = _progress_building_id(instance)
+    if building_id is None:
+        return
+    try:
+        from building.models import Building
+        refresh_building_progress(Building.objects.filter(pk=building_id))
+    except Exception as e:
+        logger.error(f"Error refreshing progress for building {building_id}: {str(e)}")
+
+
+@receiver(pre_delete, sender=Building)
+def remember_deleted_building(sender, instance, origin=None, **kwargs):
+    """
+    Σημειώνει στο `origin` (το αντικείμενο ή queryset του delete()) τα κτίρια
+    που διαγράφονται. Ο Collector στέλνει όλα τα pre_delete πριν από τις
+    διαγραφές, οπότε τα post_delete των συστημάτων/σεναρίων του cascade
+    ξέρουν ότι η πρόοδος του κτιρίου θα διαγραφεί μαζί του.
+    """
+    if origin is not None:
+        deleting = origin.__dict__.setdefault('_deleting_buildings', set())
+        deleting.add(str(instance.pk))
+
+
+def refresh_progress_on_delete(sender, instance, origin=None, **kwargs):
+    building_id = _progress_building_id(instance)
+    if building_id is None:
+        return
+    if str(building_id) in getattr(origin, '_deleting_buildings', ()):
+        return
+    try:
+        update_existing_building_progress(building_id)
+    except Exception as e:
+        logger.error(f"Error refreshing progress for building {building_id}: {str(e)}")
+
+
+def connect_progress_signals():
+    """Σύνδεση των signals προόδου στα 5 μοντέλα συστημάτων και τα 11 σενάρια."""
+    for _, label in SYSTEM_MODELS + SCENARIO_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(refresh_progress_on_save, sender=model, dispatch_uid=f'building_progress_save_{label}')
+        post_delete.connect(refresh_progress_on_delete, sender=model, dispatch_uid=f'building_progress_delete_{label}')
+
+
+connect_progress_signals()
@@ -0,0 +1,361 @@
+import csv
+import io
+from decimal import Decimal
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from openpyxl import load_workbook
+from rest_framework.test import APIClient
+
+from building.models import Building
+from heatingSystem.models import HeatingSystem
+from hotWaterUpgrade.models import HotWaterUpgrade
+from prefectures.models import Prefecture
+from user.models import User
+from windowReplacement.models import WindowReplacement
+
+from .completion import SCENARIO_MODELS, SYSTEM_MODELS
+from .counters import count_created_buildings, reconcile_buildings_count
+from .export import COLUMNS, stream_export
+from .models import BuildingProgress, Project
+from .recalculation import recalculate_scenarios
+
+
+def create_project(user, name):
+    return Project.objects.create(user=user, name=name, cost_per_kwh_electricity=Decimal('0.2'))
+
+
+def create_building(project, prefecture, name):
+    return Building.objects.create(
+        project=project, user=project.user, name=name, usage='Γραφεία', description='Test',
+        address='Test', prefecture=prefecture, total_area=500, examined_area=400,
+    )
+
+
+class GetProjectsQueryCountTests(TestCase):
+    """Το get_projects με το completion_status κάνει σταθερό πλήθος ερωτημάτων (project.completion)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def add_projects(self, projects, buildings):
+        for project_index in range(projects):
+            project = create_project(self.user, f'Project {Project.objects.count()}')
+            for building_index in range(buildings):
+                building = create_building(project, self.prefecture, f'Building {project_index}.{building_index}')
+                WindowReplacement.objects.create(
+                    user=self.user, building=building, project=project, old_thermal_conductivity=5.8,
+                    new_thermal_conductivity=1.8, window_area=25, cost_per_sqm=250, energy_cost_kwh=0.2,
+                    lifespan_years=20, discount_rate=5,
+                )
+
+    def get_projects(self):
+        response = self.client.get('/api/projects/get/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']['projects']
+
+    def test_query_count_does_not_depend_on_projects_or_buildings(self):
+        self.add_projects(1, 1)
+        with CaptureQueriesContext(connection) as baseline:
+            self.get_projects()
+
+        self.add_projects(5, 4)
+        with self.assertNumQueries(len(baseline)):
+            projects = self.get_projects()
+        self.assertEqual(len(projects), 6)
+
+        self.add_projects(4, 10)
+        with self.assertNumQueries(len(baseline)):
+            projects = self.get_projects()
+        self.assertEqual(len(projects), 10)
+
+    def test_completion_status_matches_per_project_path(self):
+        self.add_projects(3, 2)
+        for data in self.get_projects():
+            project = Project.objects.get(pk=data['uuid'])
+            self.assertEqual(data['completion_status'], project.get_completion_status())
+            self.assertEqual(data['completion_status']['total_buildings'], 2)
+
+
+class BuildingsCountTests(TestCase):
+    """Το buildings_count με F() από τα signals και το count_created_buildings (project.counters)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+
+    def setUp(self):
+        self.first = create_project(self.user, 'First')
+        self.second = create_project(self.user, 'Second')
+
+    def assertBuildingsCount(self, project, expected):
+        project.refresh_from_db(fields=['buildings_count'])
+        self.assertEqual(project.buildings_count, expected)
+        self.assertEqual(project.buildings_count, Building.objects.filter(project=project).count())
+
+    def test_bulk_created_buildings_counted_with_one_update_per_project(self):
+        buildings = Building.objects.bulk_create([
+            Building(
+                project=self.first if index % 4 else self.second, user=self.user, name=f'Building {index}',
+                usage='Γραφεία', description='Test', address='Test', prefecture=self.prefecture,
+                total_area=500, examined_area=400,
+            )
+            for index in range(1000)
+        ])
+        # Το bulk_create δεν στέλνει signals
+        self.first.refresh_from_db(fields=['buildings_count'])
+        self.assertEqual(self.first.buildings_count, 0)
+
+        with self.assertNumQueries(2):
+            count_created_buildings(buildings)
+        self.assertBuildingsCount(self.first, 750)
+        self.assertBuildingsCount(self.second, 250)
+
+    def test_create_reassign_and_delete_adjust_count(self):
+        building = create_building(self.first, self.prefecture, 'Building')
+        create_building(self.first, self.prefecture, 'Other')
+        self.assertBuildingsCount(self.first, 2)
+        self.assertBuildingsCount(self.second, 0)
+
+        building.project = self.second
+        building.save()
+        self.assertBuildingsCount(self.first, 1)
+        self.assertBuildingsCount(self.second, 1)
+
+        # Μεταφορά ενός κτιρίου που φορτώθηκε από τη βάση
+        loaded = Building.objects.get(pk=building.pk)
+        loaded.project = self.first
+        loaded.save()
+        self.assertBuildingsCount(self.first, 2)
+        self.assertBuildingsCount(self.second, 0)
+
+        loaded.delete()
+        self.assertBuildingsCount(self.first, 1)
+        self.assertBuildingsCount(self.second, 0)
+
+    def test_plain_edit_does_not_touch_count(self):
+        building = create_building(self.first, self.prefecture, 'Building')
+        building = Building.objects.get(pk=building.pk)
+        building.name = 'Renamed'
+        with CaptureQueriesContext(connection) as queries:
+            building.save()
+        self.assertFalse([query for query in queries if 'UPDATE "project_project"' in query['sql']])
+        self.assertBuildingsCount(self.first, 1)
+
+    def test_reconcile_fixes_drifted_counts(self):
+        create_building(self.first, self.prefecture, 'Building')
+        create_building(self.first, self.prefecture, 'Other')
+        # Το queryset.update() παρακάμπτει τα signals
+        Building.objects.filter(project=self.first).update(project=self.second)
+        Project.objects.filter(pk=self.second.pk).update(buildings_count=0)
+
+        result = reconcile_buildings_count(chunk_size=1)
+        self.assertEqual(result, {'projects_checked': 2, 'projects_updated': 2})
+        self.assertBuildingsCount(self.first, 0)
+        self.assertBuildingsCount(self.second, 2)
+
+        self.assertEqual(reconcile_buildings_count()['projects_updated'], 0)
+
+
+class BuildingProgressTests(TestCase):
+    """Η αποθηκευμένη πρόοδος (BuildingProgress) από τα signals και την rebuild_building_progress."""
+
+    HEATING_BIT = 1 << [label for _, label in SYSTEM_MODELS].index('heatingSystem.HeatingSystem')
+    WINDOW_BIT = 1 << [label for _, label in SCENARIO_MODELS].index('windowReplacement.WindowReplacement')
+    HOT_WATER_BIT = 1 << [label for _, label in SCENARIO_MODELS].index('hotWaterUpgrade.HotWaterUpgrade')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+
+    def setUp(self):
+        self.project = create_project(self.user, 'Progress')
+        self.building = create_building(self.project, self.prefecture, 'Building')
+
+    def masks(self, building=None):
+        progress = BuildingProgress.objects.get(building=building or self.building)
+        return progress.systems_mask, progress.scenarios_mask
+
+    def add_window(self, net_present_value):
+        return WindowReplacement.objects.create(
+            user=self.user, building=self.building, project=self.project, old_thermal_conductivity=5.8,
+            new_thermal_conductivity=1.8, window_area=10, net_present_value=net_present_value,
+        )
+
+    def test_system_save_and_delete_update_progress(self):
+        system = HeatingSystem.objects.create(user=self.user, building=self.building, project=self.project)
+        self.assertEqual(self.masks(), (self.HEATING_BIT, 0))
+        progress = BuildingProgress.objects.get(building=self.building)
+        self.assertEqual((progress.systems_completed, progress.systems_percentage), (1, 20.0))
+
+        system.delete()
+        self.assertEqual(self.masks(), (0, 0))
+
+    def test_scenario_counts_only_with_net_present_value(self):
+        window = self.add_window(net_present_value=0)
+        self.assertEqual(self.masks(), (0, 0))
+
+        window.net_present_value = 1500
+        window.save()
+        self.assertEqual(self.masks(), (0, self.WINDOW_BIT))
+
+        window.delete()
+        self.assertEqual(self.masks(), (0, 0))
+
+    def test_hot_water_upgrade_with_string_building(self):
+        upgrade = HotWaterUpgrade.objects.create(
+            building=str(self.building.pk), project=str(self.project.pk), solar_collectors_quantity=2,
+            solar_collectors_unit_price=700, electric_heater_power=4000, operating_hours_per_year=1500,
+            solar_utilization_percentage=70, energy_cost_kwh=0.2, lifespan_years=15, discount_rate=5,
+        )
+        self.assertNotEqual(upgrade.net_present_value, 0)
+        self.assertEqual(self.masks(), (0, self.HOT_WATER_BIT))
+        upgrade.delete()
+        self.assertEqual(self.masks(), (0, 0))
+
+    def test_building_delete_skips_progress_update(self):
+        HeatingSystem.objects.create(user=self.user, building=self.building, project=self.project)
+        self.add_window(net_present_value=1500)
+        other = create_building(self.project, self.prefecture, 'Other')
+        HeatingSystem.objects.create(user=self.user, building=other, project=self.project)
+
+        with mock.patch('project.signals.update_existing_building_progress') as update:
+            self.building.delete()
+            update.assert_not_called()
+            # Το ίδιο σε cascade από τη διαγραφή του έργου
+            self.project.delete()
+            update.assert_not_called()
+        self.assertFalse(BuildingProgress.objects.exists())
+
+    def test_system_delete_outside_building_cascade_updates_progress(self):
+        system = HeatingSystem.objects.create(user=self.user, building=self.building, project=self.project)
+        with mock.patch('project.signals.update_existing_building_progress') as update:
+            HeatingSystem.objects.filter(pk=system.pk).delete()
+        update.assert_called_once_with(self.building.pk)
+
+    def test_rebuild_command_fixes_drifted_progress(self):
+        HeatingSystem.objects.create(user=self.user, building=self.building, project=self.project)
+        self.add_window(net_present_value=1500)
+        other_project = create_project(self.user, 'Other')
+        other = create_building(other_project, self.prefecture, 'Other')
+        HeatingSystem.objects.create(user=self.user, building=other, project=other_project)
+        expected = {building.pk: self.masks(building) for building in (self.building, other)}
+
+        # Το queryset.update() και το bulk_create δεν στέλνουν signals
+        BuildingProgress.objects.update(systems_mask=0, scenarios_mask=0, systems_completed=0)
+        extra = create_building(self.project, self.prefecture, 'Χωρίς πρόοδο')
+        BuildingProgress.objects.filter(building=extra).delete()
+
+        out = io.StringIO()
+        call_command('rebuild_building_progress', project=str(self.project.pk), chunk_size=1, stdout=out)
+        self.assertIn('Successfully rebuilt progress for 2 buildings', out.getvalue())
+        self.assertEqual(self.masks(), expected[self.building.pk])
+        self.assertEqual(self.masks(extra), (0, 0))
+        self.assertEqual(self.masks(other), (0, 0))
+
+        call_command('rebuild_building_progress', stdout=io.StringIO())
+        self.assertEqual(self.masks(other), expected[other.pk])
+        progress = BuildingProgress.objects.get(building=self.building)
+        self.assertEqual((progress.systems_completed, progress.scenarios_completed), (1, 1))
+
+
+class RecalculateScenariosTests(TestCase):
+    """Ο μαζικός επαναϋπολογισμός (project.recalculation) με σταθερό πλήθος ερωτημάτων ανά τμήμα."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+
+    def add_windows(self, project, count):
+        for index in range(count):
+            building = create_building(project, self.prefecture, f'Building {index}')
+            window = WindowReplacement(
+                user=self.user, building=building, project=project, old_thermal_conductivity=5.8,
+                new_thermal_conductivity=1.8, window_area=25, old_losses_summer=900, old_losses_winter=2400,
+                new_losses_summer=400, new_losses_winter=900 + index * 50, cost_per_sqm=250,
+                energy_cost_kwh=0.2, lifespan_years=20, discount_rate=5,
+            )
+            window.recalculate()
+            window.save()
+
+    def recalculate(self, project):
+        # Νέα τιμή ρεύματος χωρίς το post_save του έργου
+        Project.objects.filter(pk=project.pk).update(cost_per_kwh_electricity=Decimal('0.3'))
+        with CaptureQueriesContext(connection) as queries:
+            result = recalculate_scenarios(project=project, sync_prices=True)
+        return result, len(queries)
+
+    def test_query_count_does_not_depend_on_rows(self):
+        small = create_project(self.user, 'Small')
+        self.add_windows(small, 2)
+        result, small_queries = self.recalculate(small)
+        self.assertEqual(result['total_rows'], 2)
+
+        large = create_project(self.user, 'Large')
+        self.add_windows(large, 8)
+        result, large_queries = self.recalculate(large)
+        self.assertEqual(result['total_rows'], 8)
+        self.assertEqual(result['failed_rows'], 0)
+        self.assertEqual(large_queries, small_queries)
+
+    def test_recalculated_values_match_model_logic(self):
+        project = create_project(self.user, 'Project')
+        self.add_windows(project, 3)
+        self.recalculate(project)
+
+        for window in WindowReplacement.objects.filter(project=project):
+            self.assertEqual(window.energy_cost_kwh, 0.3)
+            self.assertAlmostEqual(window.annual_cost_savings, window.total_energy_savings * 0.3)
+            expected = WindowReplacement.objects.get(pk=window.pk)
+            expected.recalculate()
+            self.assertAlmostEqual(window.net_present_value, expected.net_present_value)
+            self.assertAlmostEqual(window.internal_rate_of_return, expected.internal_rate_of_return)
+            self.assertAlmostEqual(window.discounted_payback_period, expected.discounted_payback_period)
+
+
+class ExportFormulaInjectionTests(TestCase):
+    """Τα ονόματα του χρήστη δεν εξάγονται ως τύποι στο CSV / XLSX (project.export)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(email='owner@bemat.local', password=None)
+        prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+        cls.project = create_project(user, '=HYPERLINK("http://example.com","Open")')
+        create_building(cls.project, prefecture, '@SUM(A1:A9)')
+        building = create_building(cls.project, prefecture, 'Κτίριο - Γραφεία')
+        WindowReplacement.objects.create(
+            user=user, building=building, project=cls.project, old_thermal_conductivity=5.8,
+            new_thermal_conductivity=1.8, window_area=25, cost_per_sqm=250, energy_cost_kwh=0.2,
+            lifespan_years=20, discount_rate=5, net_present_value=-1500.0,
+        )
+
+    def rows(self, export_format):
+        chunks = stream_export(Building.objects.filter(project=self.project), export_format)
+        if export_format == 'csv':
+            return list(csv.reader(io.StringIO(''.join(chunks).lstrip('\ufeff'))))
+        sheet = load_workbook(io.BytesIO(b''.join(chunks)), read_only=True).active
+        return [list(row) for row in sheet.iter_rows(values_only=True)]
+
+    def test_formula_like_names_are_neutralised(self):
+        name, project_name = COLUMNS.index('building_name'), COLUMNS.index('project_name')
+        npv = COLUMNS.index('window_replacement_net_present_value')
+        for export_format in ('csv', 'xlsx'):
+            header, *rows = self.rows(export_format)
+            rows = {row[name]: row for row in rows}
+            self.assertEqual(set(rows), {"'@SUM(A1:A9)", 'Κτίριο - Γραφεία'}, export_format)
+            row = rows['Κτίριο - Γραφεία']
+            self.assertEqual(row[project_name], '\'=HYPERLINK("http://example.com","Open")')
+            # Οι αριθμοί (και οι αρνητικοί) μένουν αριθμοί
+            self.assertEqual(float(row[npv]), -1500.0)
@@ -10,4 +10,6 @@ urlpatterns = [
     path('submit/<uuid:uuid>/', views.submit_project, name='submit_project'),
     path('pending-percentage/', views.get_pending_projects_percentage, name='get_pending_projects_percentage'),
     path('building-progress/<uuid:building_uuid>/', views.get_building_progress, name='get_building_progress'),
+    path('export/', views.export_all_scenarios, name='export_all_scenarios'),
+    path('export/<uuid:uuid>/', views.export_project_scenarios, name='export_project_scenarios'),
 ]
\ No newline at end of file
@@ -1,11 +1,18 @@
 import logging
+from django.http import StreamingHttpResponse
 from .models import Project
+from building.models import Building
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from .serializer import ProjectSerializer
+from .completion import get_single_building_progress, get_projects_completion_status
+from .export import CONTENT_TYPES, FORMATS, format_available, stream_export
 from django.db import IntegrityError
+from django.db.models import Count, Max, Q, Sum
+from common.conditional import conditional_etag, make_etag
+from common.listing import ListingError, keyset_page, parse_fields
 from common.utils import (
     get_user_from_token, 
     standard_error_response, 
@@ -92,23 +99,72 @@ def delete_project(request, uuid):
         logger.error(f"Error during deletion of project {uuid} by user {request.user.email}. Error: {str(e)}", exc_info=True)
         return standard_error_response(f"An unexpected error occurred during project deletion: {str(e)}", status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _projects_etag(request):
+    """
+    Τα έργα και, σε δεύτερο ερώτημα, τα κτίρια και η πρόοδός τους
+    (completion_status). Το άθροισμα των buildings_count μετρά χωριστά: ο
+    μετρητής αλλάζει με update() χωρίς να αλλάζει το updated_at του έργου, και
+    στο ερώτημα με το join των κτιρίων θα μετρούσε μία φορά ανά κτίριο.
+    """
+    projects = Project.objects.all()
+    if not is_admin_user(request.user):
+        projects = projects.filter(user=request.user)
+    version = projects.order_by().aggregate(
+        count=Count('pk'),
+        changed=Max('updated_at'),
+        buildings_counts=Sum('buildings_count'),
+    )
+    version.update(Building.objects.filter(project__in=projects).order_by().aggregate(
+        buildings_total=Count('pk', distinct=True),
+        buildings_changed=Max('updated_at'),
+        progress_changed=Max('progress__updated_at'),
+    ))
+    return make_etag(request.user.pk, *version.values())
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(_projects_etag)
 def get_projects(request):
+    """
+    Τα έργα του χρήστη (όλα για διαχειριστές), σε σελίδες όπως το
+    get_buildings (?page_size=, ?cursor=, ?fields=). Το completion_status
+    υπολογίζεται μόνο αν ζητηθεί.
+    """
     try:
         if is_admin_user(request.user):
             projects = Project.objects.all()
         else:
             projects = Project.objects.filter(user=request.user)
         
-        serializer = ProjectSerializer(projects, many=True)
-        return standard_success_response({"projects": serializer.data})
-        
+        fields = parse_fields(request, ProjectSerializer)
+        projects, pagination = keyset_page(projects, request)
+        context = {}
+        if fields is None or 'completion_status' in fields:
+            context['completion_statuses'] = get_projects_completion_status(projects)
+        serializer = ProjectSerializer(projects, many=True, fields=fields, context=context)
+        response = standard_success_response({"projects": serializer.data})
+        response.data['pagination'] = pagination
+        return response
+
+    except ListingError as e:
+        return standard_error_response(str(e), status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return standard_error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _project_detail_etag(request, project_uuid):
+    if not validate_uuid(project_uuid):
+        return None
+    project = Project.objects.select_related('user').filter(uuid=project_uuid).first()
+    if project is None or not has_access_permission(request.user, project):
+        return None
+    # Το buildings_count αλλάζει με update() (project.counters) χωρίς το updated_at
+    return make_etag(project.updated_at, project.buildings_count, project.user.email)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(_project_detail_etag)
 def get_project_detail(request, project_uuid):
     """
     Endpoint για την ανάκτηση λεπτομερειών ενός συγκεκριμένου έργου.
@@ -213,8 +269,11 @@ def get_pending_projects_percentage(request):
     Get the percentage of pending (non-submitted) projects for the notification bell.
     """
     try:
-        user_projects = Project.objects.filter(user=request.user)
-        total_projects = user_projects.count()
+        counts = Project.objects.filter(user=request.user).aggregate(
+            total=Count('uuid'),
+            pending=Count('uuid', filter=Q(is_submitted=False))
+        )
+        total_projects = counts['total']
         
         if total_projects == 0:
             return standard_success_response({
@@ -223,7 +282,7 @@ def get_pending_projects_percentage(request):
                 "total_count": 0
             })
         
-        pending_projects = user_projects.filter(is_submitted=False).count()
+        pending_projects = counts['pending']
         pending_percentage = round((pending_projects / total_projects) * 100, 1)
         
         return standard_success_response({
@@ -247,77 +306,12 @@ def get_building_progress(request, building_uuid):
             return standard_error_response("Invalid building UUID", status.HTTP_400_BAD_REQUEST)
         
         from building.models import Building
-        building = Building.objects.get(uuid=building_uuid)
+        building = Building.objects.select_related('project', 'progress').get(uuid=building_uuid)
         
         if not has_access_permission(request.user, building.project):
             return standard_error_response("Access denied: You do not own this building's project", status.HTTP_403_FORBIDDEN)
         
-        systems_completed = 0
-        
-        if hasattr(building, 'boiler_details') and building.boiler_details.exists():
-            systems_completed += 1
-            
-        if hasattr(building, 'cooling_systems') and building.cooling_systems.exists():
-            systems_completed += 1
-            
-        if hasattr(building, 'heating_systems') and building.heating_systems.exists():
-            systems_completed += 1
-            
-        if hasattr(building, 'domestic_hot_water_systems') and building.domestic_hot_water_systems.exists():
-            systems_completed += 1
-            
-        if hasattr(building, 'solar_collectors') and building.solar_collectors.exists():
-            systems_completed += 1
-        
-        scenarios_completed = 0
-        
-        if hasattr(building, 'externalwallthermalinsulation_set') and building.externalwallthermalinsulation_set.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-            scenarios_completed += 1
-            
-        if hasattr(building, 'roof_thermal_insulations') and building.roof_thermal_insulations.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-            scenarios_completed += 1
-            
-        if hasattr(building, 'photovoltaic_systems') and building.photovoltaic_systems.exists():
-            scenarios_completed += 1
-            
-        if hasattr(building, 'windowreplacement_set') and building.windowreplacement_set.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-            scenarios_completed += 1
-            
-        if hasattr(building, 'bulbreplacement_set') and building.bulbreplacement_set.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-            scenarios_completed += 1
-            
-        if hasattr(building, 'ac_analyses') and building.ac_analyses.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-            scenarios_completed += 1
-            
-        if hasattr(building, 'hotwaterupgrade_set') and building.hotwaterupgrade_set.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-            scenarios_completed += 1
-            
-        if hasattr(building, 'natural_gas_networks') and building.natural_gas_networks.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-            scenarios_completed += 1
-            
-        if hasattr(building, 'exterior_blinds') and building.exterior_blinds.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-            scenarios_completed += 1
-            
-        if hasattr(building, 'automatic_lighting_controls') and building.automatic_lighting_controls.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-            scenarios_completed += 1
-            
-        if hasattr(building, 'boiler_replacements') and building.boiler_replacements.filter(net_present_value__isnull=False).exclude(net_present_value=0).exists():
-            scenarios_completed += 1
-        
-        systems_percentage = round((systems_completed / 5) * 100, 1)
-        scenarios_percentage = round((scenarios_completed / 11) * 100, 1)
-        
-        progress_data = {
-            'building_uuid': str(building.uuid),
-            'building_name': building.name,
-            'systems_completed': systems_completed,
-            'systems_total': 5,
-            'systems_percentage': systems_percentage,
-            'scenarios_completed': scenarios_completed,
-            'scenarios_total': 11,
-            'scenarios_percentage': scenarios_percentage,
-            'is_complete': systems_completed == 5 and scenarios_completed == 11
-        }
+        progress_data = get_single_building_progress(building)
         
         return standard_success_response(progress_data)
         
@@ -325,4 +319,47 @@ def get_building_progress(request, building_uuid):
         return standard_error_response("Building not found", status.HTTP_404_NOT_FOUND)
     except Exception as e:
         logger.error(f"Error getting building progress for building {building_uuid} by user {request.user.email}. Error: {str(e)}", exc_info=True)
-        return standard_error_response(f"An unexpected error occurred: {str(e)}", status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return standard_error_response(f"An unexpected error occurred: {str(e)}", status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _export_response(request, buildings, filename):
+    export_format = request.query_params.get('as', 'csv')
+    if export_format not in FORMATS:
+        return standard_error_response(f"as must be one of: {', '.join(FORMATS)}", status.HTTP_400_BAD_REQUEST)
+    if not format_available(export_format):
+        return standard_error_response("XLSX export requires openpyxl", status.HTTP_400_BAD_REQUEST)
+    response = StreamingHttpResponse(stream_export(buildings, export_format), content_type=CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_project_scenarios(request, uuid):
+    """
+    Τα αποτελέσματα όλων των σεναρίων των κτιρίων ενός έργου, μία γραμμή ανά
+    κτίριο (βλ. project.export), ως ροή ?as=csv (προεπιλογή), ndjson ή xlsx.
+    """
+    try:
+        project = Project.objects.get(uuid=uuid)
+    except Project.DoesNotExist:
+        return standard_error_response("Project not found", status.HTTP_404_NOT_FOUND)
+
+    if not has_access_permission(request.user, project):
+        return standard_error_response("Access denied: You do not own this project", status.HTTP_403_FORBIDDEN)
+
+    buildings = project.buildings.all()
+    if not is_admin_user(request.user):
+        buildings = buildings.filter(user=request.user)
+    return _export_response(request, buildings, f"project-{project.uuid}-scenarios")
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_all_scenarios(request):
+    """Όπως το export_project_scenarios, για όλα τα έργα (μόνο διαχειριστές)."""
+    if not is_admin_user(request.user):
+        return standard_error_response("Access denied: Admin privileges required", status.HTTP_403_FORBIDDEN)
+
+    from building.models import Building
+    return _export_response(request, Building.objects.all(), "all-projects-scenarios")
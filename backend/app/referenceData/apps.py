@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class ReferenceDataConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'referenceData'
+    verbose_name = 'Δεδομένα Αναφοράς'
+
+    def ready(self):
+        """
+        Καλείται όταν το app είναι έτοιμο
+        """
+        import referenceData.signals
@@ -0,0 +1,109 @@
+"""
+Snapshot των δεδομένων αναφοράς (ενεργοί νομοί, ενεργά υλικά, ενεργειακές
+ζώνες, κατηγορίες υλικών) με αριθμό έκδοσης.
+
+Όπως στο numericValues.cache, ένας κοινός μετρητής στο Django cache παίρνει νέα
+τιμή σε κάθε αλλαγή νομού ή υλικού (referenceData.signals), και από όποιο
+process κι αν γίνει η αλλαγή (admin, populate_prefectures, load_materials)
+φτάνει σε όλους τους workers μόνο αν το CACHES είναι κοινό. Το snapshot
+αποθηκεύεται ήδη σε JSON στο κοινό cache ανά έκδοση, ώστε μόνο ο πρώτος
+worker να κάνει τα ερωτήματα και το serialization, και κρατιέται και στη
+μνήμη κάθε process. Η έκδοση διαβάζεται από το κοινό cache το πολύ μία φορά
+ανά common.versions.VERSION_CHECK_INTERVAL, οπότε στο hot path δεν εκτελείται
+κανένα ερώτημα στη βάση.
+"""
+import json
+import threading
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.renderers import JSONRenderer
+
+from common.conditional import make_etag
+from common.versions import SharedVersion
+
+VERSION_CACHE_KEY = 'reference_data:version'
+SNAPSHOT_CACHE_KEY = 'reference_data:snapshot:{version}'
+# Οι παλιές εκδόσεις δεν ξαναζητούνται, οπότε αρκεί να λήγουν κάποια στιγμή
+SNAPSHOT_CACHE_TTL = 24 * 60 * 60
+
+_lock = threading.Lock()
+# (έκδοση, δεδομένα, σώμα) σε ένα tuple, ώστε να διαβάζεται ατομικά
+_snapshot = {'current': None}
+_version = SharedVersion(VERSION_CACHE_KEY)
+
+
+def is_shared():
+    """
+    Αν το cache είναι κοινό για όλα τα processes. Με LocMemCache / DummyCache
+    κάθε worker έχει δική του έκδοση, οπότε ένα URL ?v= δεν είναι αμετάβλητο.
+    """
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def get_version():
+    """Τρέχουσα έκδοση του κοινού μετρητή (δημιουργείται αν λείπει)."""
+    return _version.get()
+
+
+def bump_version():
+    """Νέα έκδοση: ακυρώνει τα snapshots όλων των workers και τα cached URLs ?v=."""
+    _version.bump()
+    _snapshot['current'] = None
+
+
+def reset():
+    """Ξεχνά την έκδοση και το snapshot του process (π.χ. στα tests)."""
+    _version.reset()
+    _snapshot['current'] = None
+
+
+def reference_etag(version=None):
+    return make_etag('reference', get_version() if version is None else version)
+
+
+def _render(version):
+    from materials.models import Material
+    from materials.serializers import MaterialListSerializer
+    from prefectures.models import Prefecture
+    from prefectures.serializers import PrefectureListSerializer
+
+    data = {
+        'version': version,
+        'prefectures': PrefectureListSerializer(Prefecture.objects.filter(is_active=True), many=True).data,
+        'energy_zones': [{'value': value, 'label': label} for value, label in Prefecture.ENERGY_ZONE_CHOICES],
+        'materials': MaterialListSerializer(Material.objects.filter(is_active=True), many=True).data,
+        'material_categories': [
+            {'value': value, 'label': label} for value, label in Material.MATERIAL_CATEGORY_CHOICES
+        ],
+    }
+    return JSONRenderer().render({'status': 'success', 'data': data})
+
+
+def get_snapshot():
+    """
+    (έκδοση, δεδομένα, JSON σώμα της απάντησης) της τρέχουσας έκδοσης: από τη
+    μνήμη του process, αλλιώς από το κοινό cache, αλλιώς από τη βάση.
+    """
+    version = get_version()
+    current = _snapshot['current']
+    if current is not None and current[0] == version:
+        return current
+
+    with _lock:
+        current = _snapshot['current']
+        if current is None or current[0] != version:
+            key = SNAPSHOT_CACHE_KEY.format(version=version)
+            body = cache.get(key)
+            if body is None:
+                body = _render(version)
+                cache.set(key, body, SNAPSHOT_CACHE_TTL)
+            current = (version, json.loads(body)['data'], body)
+            _snapshot['current'] = current
+        return current
+
+
+def get_reference_data():
+    """Τα δεδομένα αναφοράς (dict) της τρέχουσας έκδοσης."""
+    return get_snapshot()[1]
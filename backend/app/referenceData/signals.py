@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from materials.models import Material
+from prefectures.models import Prefecture
+from .cache import bump_version
+
+
+@receiver(post_save, sender=Prefecture)
+@receiver(post_delete, sender=Prefecture)
+@receiver(post_save, sender=Material)
+@receiver(post_delete, sender=Material)
+def invalidate_reference_data(sender, instance, **kwargs):
+    """
+    Κάθε αλλαγή νομού ή υλικού (admin, API, populate_prefectures,
+    load_materials) δίνει νέα έκδοση στα δεδομένα αναφοράς, αφού ολοκληρωθεί
+    το transaction.
+    """
+    transaction.on_commit(bump_version)
@@ -0,0 +1,86 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from materials.models import Material
+from prefectures.models import Prefecture
+from user.models import User
+
+from . import cache as reference_cache
+
+REFERENCE_URL = '/api/reference/'
+VERSION_URL = '/api/reference/version/'
+
+
+class ReferenceDataTests(TestCase):
+    """Το /api/reference/ με το προεπιλεγμένο (κοινό) cache της βάσης."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+        cls.material = Material.objects.create(name='EPS', category='insulation', thermal_conductivity=0.035)
+
+    def setUp(self):
+        reference_cache.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def get_version(self):
+        response = self.client.get(VERSION_URL)
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']['version']
+
+    def test_snapshot_and_version_run_no_queries_once_warm(self):
+        response = self.client.get(REFERENCE_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['name'] for item in response.json()['data']['prefectures']], ['Αττική'])
+
+        with self.assertNumQueries(0):
+            self.client.get(REFERENCE_URL)
+            self.client.get(REFERENCE_URL)
+            self.get_version()
+
+    def test_prefecture_and_material_saves_bump_version(self):
+        version = self.get_version()
+
+        self.prefecture.name = 'Αττικής'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.prefecture.save()
+        prefecture_version = self.get_version()
+        self.assertNotEqual(prefecture_version, version)
+        data = self.client.get(REFERENCE_URL).json()['data']
+        self.assertEqual(data['version'], prefecture_version)
+        self.assertEqual(data['prefectures'][0]['name'], 'Αττικής')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.material.delete()
+        self.assertNotEqual(self.get_version(), prefecture_version)
+        self.assertEqual(self.client.get(REFERENCE_URL).json()['data']['materials'], [])
+
+    def test_current_version_url_is_immutable(self):
+        version = self.get_version()
+        response = self.client.get(REFERENCE_URL, {'v': version})
+        self.assertIn('immutable', response['Cache-Control'])
+
+        # Παλιό ή χωρίς ?v=: ο browser ξαναρωτά με ETag
+        for params in ({'v': version - 1}, {}):
+            response = self.client.get(REFERENCE_URL, params)
+            self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_per_process_cache_is_never_immutable(self):
+        reference_cache.reset()
+        response = self.client.get(REFERENCE_URL, {'v': self.get_version()})
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+    def test_if_none_match_returns_304_until_a_change(self):
+        etag = self.client.get(REFERENCE_URL)['ETag']
+        response = self.client.get(REFERENCE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Material.objects.create(name='XPS', category='insulation', thermal_conductivity=0.033)
+        response = self.client.get(REFERENCE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
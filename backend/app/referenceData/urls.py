@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.get_reference_data, name='reference-data'),
+    path('version/', views.get_reference_version, name='reference-data-version'),
+]
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+
+from common.conditional import etag_matches, not_modified, set_etag
+from common.utils import standard_success_response
+from .cache import get_snapshot, get_version, is_shared, reference_etag
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_reference_data(request):
+    """
+    Νομοί, υλικά, ενεργειακές ζώνες και κατηγορίες υλικών σε μία απάντηση,
+    έτοιμη σε JSON από το cache (referenceData.cache). Με ?v=<τρέχουσα έκδοση>
+    το URL αλλάζει σε κάθε νέα έκδοση, οπότε ο browser το κρατά για πάντα
+    (immutable)· χωρίς ή με παλιό ?v= ο browser ξαναρωτά κάθε φορά με ETag.
+    Με cache ανά process (LocMemCache) η έκδοση δεν είναι κοινή και το ?v=
+    δεν κρατιέται, αφού ένας άλλος worker μπορεί να έχει νεότερα δεδομένα.
+    """
+    version, _, body = get_snapshot()
+    etag = reference_etag(version)
+    if etag_matches(request, etag):
+        response = not_modified(etag)
+    else:
+        response = set_etag(HttpResponse(body, content_type='application/json'), etag)
+    if is_shared() and request.query_params.get('v') == str(version):
+        response['Cache-Control'] = f'private, max-age={settings.REFERENCE_DATA_MAX_AGE}, immutable'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_reference_version(request):
+    """Η τρέχουσα έκδοση, για το URL /api/reference/?v=<version> (χωρίς ερώτημα στη βάση)."""
+    response = standard_success_response({'version': get_version()})
+    response['Cache-Control'] = 'no-cache'
+    return response
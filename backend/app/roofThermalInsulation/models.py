@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
 import uuid
+from common.finance import discounted_payback, internal_rate_of_return, net_present_value
+from common.thermal import SUMMER_TEMPERATURE_DIFFERENCE, WINTER_TEMPERATURE_DIFFERENCE, ThermalAssembly
 from building.models import Building
 from project.models import Project
 from materials.models import Material
@@ -104,35 +106,30 @@ class RoofThermalInsulation(models.Model):
     def __str__(self):
         return f"Θερμομόνωση Οροφής - {self.building.name} (U={self.u_coefficient:.4f})"
 
-    def calculate_u_coefficient(self):
+    def thermal_assembly(self):
+        """
+        Οι στρώσεις υλικών σε ThermalAssembly (ένα ερώτημα, κανένα αν έχει γίνει
+        prefetch). Ο συντελεστής λ διαβάζεται από το αντίγραφο στη στρώση,
+        οπότε δεν χρειάζεται join με τα υλικά.
+        """
+        return ThermalAssembly(
+            self.material_layers.all(),
+            NumericValue.get_value('Εσωτερική Οροφής (Rsi)'),
+            NumericValue.get_value('Εξωτερική (Rse)'),
+            conductivity=lambda layer: layer.material_thermal_conductivity or 1,
+        )
+
+    def calculate_u_coefficient(self, assembly=None):
         """
         Calculate the U coefficient for the roof thermal insulation
         Based on the new materials layers
         """
         try:
-            new_materials = self.material_layers.filter(material_type='new')
-            if not new_materials.exists():
+            if assembly is None:
+                assembly = self.thermal_assembly()
+            if not assembly.has_layers('new'):
                 return 0
-            
-            R_si = NumericValue.get_value('Εσωτερική Οροφής (Rsi)')
-            R_se = NumericValue.get_value('Εξωτερική (Rse)')
-            
-            materials_r_sum = 0
-            for material_layer in new_materials:
-                try:
-                    thickness = float(material_layer.thickness or 0)
-                    thermal_conductivity = float(material_layer.material_thermal_conductivity or 1)
-                    
-                    if thermal_conductivity > 0 and thickness > 0:
-                        r_material = thickness / thermal_conductivity
-                        materials_r_sum += r_material
-                except (AttributeError, TypeError, ValueError):
-                    continue
-            
-            r_total = R_si + R_se + materials_r_sum
-            u_coefficient = 1 / r_total if r_total > 0 else 0
-            
-            return round(u_coefficient, 4)
+            return round(assembly.u_value('new'), 4)
         except Exception as e:
             print(f"Error calculating U coefficient: {e}")
             return 0
@@ -154,15 +151,13 @@ class RoofThermalInsulation(models.Model):
             
             discount_rate_decimal = discount_rate_percent / 100.0
             
-            npv = -initial_investment
-            for year in range(1, time_period_years + 1):
-                npv += annual_net_benefit / ((1 + discount_rate_decimal) ** year)
+            npv = net_present_value(initial_investment, annual_net_benefit, discount_rate_decimal, time_period_years)
             return round(npv, 2) 
         except (TypeError, ValueError, ZeroDivisionError) as e:
             print(f"Error calculating NPV: {e}")
             return 0
 
-    def calculate_annual_benefit(self):
+    def calculate_annual_benefit(self, assembly=None):
         """
         Calculate annual benefit from energy savings
         Formula: (difference in winter hourly losses × heating hours per year + 
@@ -187,21 +182,11 @@ class RoofThermalInsulation(models.Model):
                 print("No electricity cost found in project")
                 return 0
         
-            old_materials = self.material_layers.filter(material_type='old')
-            new_materials = self.material_layers.filter(material_type='new')
-        
-            winter_losses_old = self._calculate_hourly_losses(old_materials, 17) 
-            winter_losses_new = self._calculate_hourly_losses(new_materials, 17)
-        
-            summer_losses_old = self._calculate_hourly_losses(old_materials, 13)  
-            summer_losses_new = self._calculate_hourly_losses(new_materials, 13)
-        
-            winter_losses_difference = winter_losses_old - winter_losses_new
-            summer_losses_difference = summer_losses_old - summer_losses_new
-            
+            if assembly is None:
+                assembly = self.thermal_assembly()
             annual_energy_savings = (
-                winter_losses_difference * heating_hours +
-                summer_losses_difference * cooling_hours
+                assembly.losses_saved(WINTER_TEMPERATURE_DIFFERENCE) * heating_hours +
+                assembly.losses_saved(SUMMER_TEMPERATURE_DIFFERENCE) * cooling_hours
             )
             
             annual_benefit = annual_energy_savings * electricity_cost
@@ -247,26 +232,15 @@ class RoofThermalInsulation(models.Model):
             if annual_net_benefit <= 0:
                 return None
             
-            cumulative_discounted_cash_flow = 0
-            
-            for year in range(1, time_period_years + 1):
-                discounted_cash_flow = annual_net_benefit / ((1 + discount_rate) ** year)
-                cumulative_discounted_cash_flow += discounted_cash_flow
-                
-                if cumulative_discounted_cash_flow >= total_cost:
-                    # Linear interpolation for precise payback period
-                    previous = cumulative_discounted_cash_flow - discounted_cash_flow
-                    fraction = (total_cost - previous) / discounted_cash_flow
-                    return round((year - 1) + fraction, 2)
-            
-            # If payback not achieved within time period
-            return time_period_years + 1
+            # time_period_years + 1 αν δεν αποπληρώνεται εντός της περιόδου
+            payback = discounted_payback(total_cost, annual_net_benefit, discount_rate, time_period_years)
+            return round(payback, 2) if payback <= time_period_years else payback
         except (TypeError, ValueError, ZeroDivisionError):
             return None
 
     def calculate_internal_rate_of_return(self):
         """
-        Calculate internal rate of return using Newton-Raphson method
+        Calculate internal rate of return
         IRR is the discount rate where NPV = 0
         """
         try:
@@ -283,93 +257,38 @@ class RoofThermalInsulation(models.Model):
             if annual_net_benefit <= 0:
                 return None
             
-            # Αρχική εκτίμηση IRR
-            irr = 0.1  # 10%
-            tolerance = 0.00001
-            max_iterations = 1000
-            
-            for _ in range(max_iterations):
-                # Υπολογισμός NPV με το τρέχον IRR
-                npv = -total_cost
-                npv_derivative = 0
-                
-                for year in range(1, time_period_years + 1):
-                    factor = (1 + irr) ** year
-                    npv += annual_net_benefit / factor
-                    npv_derivative -= year * annual_net_benefit / (factor * (1 + irr))
-                
-                # Έλεγχος σύγκλισης
-                if abs(npv) < tolerance:
-                    break
-                
-                # Newton-Raphson update
-                if npv_derivative != 0:
-                    irr = irr - npv / npv_derivative
-                else:
-                    break
-                
-                # Αποφυγή αρνητικών IRR
-                if irr < -0.99:
-                    irr = -0.99
-            
+            irr = internal_rate_of_return(total_cost, annual_net_benefit, time_period_years)
+            if irr is None:
+                return None
             return round(irr * 100, 2)
         except (TypeError, ValueError, ZeroDivisionError):
             return None
 
-    def _calculate_hourly_losses(self, materials, temperature_difference):
-        """
-        Helper method to calculate hourly losses for a set of materials
-        Formula: U × A × ΔT / 1000 (kW)
-        """
-        if not materials.exists():
-            return 0
-        
-        R_si = 0.10
-        R_se = 0.04 
-        
-        materials_r_sum = 0
-        total_area = 0
-        
-        for material_layer in materials:
-            try:
-                thickness = float(material_layer.thickness or 0)
-                thermal_conductivity = float(material_layer.material_thermal_conductivity or 1)
-                surface_area = float(material_layer.surface_area or 0)
-                
-                if thermal_conductivity > 0 and thickness > 0:
-                    r_material = thickness / thermal_conductivity
-                    materials_r_sum += r_material
-                
-                total_area += surface_area
-            except (AttributeError, TypeError, ValueError):
-                continue
-        
-        r_total = R_si + R_se + materials_r_sum
-        u_coefficient = 1 / r_total if r_total > 0 else 0
-        
-        hourly_losses = (u_coefficient * total_area * temperature_difference) / 1000
-        return hourly_losses
+    CALCULATED_FIELDS = [
+        'u_coefficient', 'annual_benefit', 'net_present_value',
+        'payback_period', 'discounted_payback_period', 'internal_rate_of_return',
+    ]
+
+    def recalculate(self):
+        """Υπολογισμός συντελεστή U και οικονομικών δεικτών (χωρίς αποθήκευση)"""
+        assembly = self.thermal_assembly()
+        self.u_coefficient = self.calculate_u_coefficient(assembly)
+        self.annual_benefit = self.calculate_annual_benefit(assembly)
+        self.net_present_value = self.calculate_npv()
+        self.payback_period = self.calculate_payback_period()
+        self.discounted_payback_period = self.calculate_discounted_payback_period()
+        self.internal_rate_of_return = self.calculate_internal_rate_of_return()
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        # Υπολογισμός πριν την αποθήκευση, ώστε να γίνεται μία μόνο εγγραφή
         try:
-            self.u_coefficient = self.calculate_u_coefficient()
-            self.annual_benefit = self.calculate_annual_benefit()
-            self.net_present_value = self.calculate_npv()
-            self.payback_period = self.calculate_payback_period()
-            self.discounted_payback_period = self.calculate_discounted_payback_period()
-            self.internal_rate_of_return = self.calculate_internal_rate_of_return()
-            
-            RoofThermalInsulation.objects.filter(uuid=self.uuid).update(
-                u_coefficient=self.u_coefficient,
-                annual_benefit=self.annual_benefit,
-                net_present_value=self.net_present_value,
-                payback_period=self.payback_period,
-                discounted_payback_period=self.discounted_payback_period,
-                internal_rate_of_return=self.internal_rate_of_return
-            )
+            self.recalculate()
         except Exception as e:
             print(f"Error in auto-calculation during save: {e}")
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | set(self.CALCULATED_FIELDS)
+        super().save(*args, **kwargs)
 
 
 class RoofThermalInsulationMaterialLayer(models.Model):
@@ -463,15 +382,17 @@ class RoofThermalInsulationMaterialLayer(models.Model):
         verbose_name_plural = "Στρώσεις Υλικών Θερμομόνωσης Οροφής"
         ordering = ['material_type', 'order']
 
-    def save(self, *args, **kwargs):
-        # Auto-populate fields from the selected material
+    def fill_material_fields(self):
+        """Auto-populate the fields copied from the selected material (also used by bulk writes)"""
         if self.material:
             self.material_name = self.material.name
             self.material_thermal_conductivity = self.material.thermal_conductivity
         
         # Auto-populate surface type display
         self.surface_type_display = dict(self.SURFACE_TYPE_CHOICES).get(self.surface_type, '')
-        
+
+    def save(self, *args, **kwargs):
+        self.fill_material_fields()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -19,6 +19,19 @@ class RoofThermalInsulationMaterialLayerSerializer(serializers.ModelSerializer):
                           'material_thermal_conductivity', 'surface_type_display']
 
 
+class RoofThermalInsulationMaterialLayerBatchSerializer(serializers.ModelSerializer):
+    """
+    One layer of a batch replace. The material is given by UUID and resolved for
+    all layers with a single query; layers with a uuid are updated in place.
+    """
+    uuid = serializers.UUIDField(required=False)
+    material = serializers.UUIDField()
+
+    class Meta:
+        model = RoofThermalInsulationMaterialLayer
+        fields = ['uuid', 'material', 'material_type', 'surface_type', 'thickness', 'surface_area', 'cost', 'order']
+
+
 class RoofThermalInsulationSerializer(serializers.ModelSerializer):
     old_materials = serializers.SerializerMethodField()
     new_materials = serializers.SerializerMethodField()
@@ -40,11 +53,12 @@ class RoofThermalInsulationSerializer(serializers.ModelSerializer):
                           'payback_period', 'discounted_payback_period', 'internal_rate_of_return', 'net_present_value', 'annual_benefit']
 
     def get_old_materials(self, obj):
-        old_materials = obj.material_layers.filter(material_type='old')
+        # .all() ώστε να χρησιμοποιείται το prefetch_related, αν υπάρχει
+        old_materials = [layer for layer in obj.material_layers.all() if layer.material_type == 'old']
         return RoofThermalInsulationMaterialLayerSerializer(old_materials, many=True).data
 
     def get_new_materials(self, obj):
-        new_materials = obj.material_layers.filter(material_type='new')
+        new_materials = [layer for layer in obj.material_layers.all() if layer.material_type == 'new']
         return RoofThermalInsulationMaterialLayerSerializer(new_materials, many=True).data
 
     def create(self, validated_data):
@@ -18,6 +18,9 @@ urlpatterns = [
     path('<uuid:roof_thermal_insulation_uuid>/recalculate/', views.recalculate_roof_thermal_insulation, 
          name='roof-recalculate-thermal-insulation'),
     
+    path('<uuid:thermal_insulation_uuid>/materials/', 
+         views.replace_material_layers, 
+         name='roof-thermal-insulation-material-layers-replace'),
     path('<uuid:thermal_insulation_uuid>/materials/add/', 
          views.RoofThermalInsulationMaterialLayerCreateView.as_view(), 
          name='roof-thermal-insulation-material-layer-create'),
@@ -3,36 +3,38 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 import json
 import logging
 
-from numericValues.models import NumericValue
 from .models import RoofThermalInsulation, RoofThermalInsulationMaterialLayer
 from .serializer import (
     RoofThermalInsulationSerializer,
     RoofThermalInsulationListSerializer,
-    RoofThermalInsulationMaterialLayerSerializer
+    RoofThermalInsulationMaterialLayerSerializer,
+    RoofThermalInsulationMaterialLayerBatchSerializer
 )
 from building.models import Building
 from project.models import Project
-from materials.models import Material
 
 logger = logging.getLogger(__name__)
-from materials.serializers import MaterialListSerializer
+from common.conditional import conditional_etag
 from common.utils import is_admin_user, has_access_permission
+from common.layers import LayerError, replace_layers
+from referenceData.cache import get_reference_data, reference_etag
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(lambda request: reference_etag())
 def get_available_materials(request):
     """Get all available materials for roof thermal insulation"""
     try:
-        materials = Material.objects.filter(is_active=True)
-        serializer = MaterialListSerializer(materials, many=True)
+        materials = get_reference_data()['materials']
         return Response({
             "success": True,
-            "data": serializer.data,
-            "count": len(serializer.data)
+            "data": materials,
+            "count": len(materials)
         })
         
     except Exception as e:
@@ -197,26 +199,20 @@ def recalculate_u_coefficient(request, thermal_insulation_uuid):
             created_by=request.user
         )
         
-        new_materials = roof_thermal_insulation.material_layers.filter(material_type='new')
+        assembly = roof_thermal_insulation.thermal_assembly()
         
-        if not new_materials.exists():
+        if not assembly.has_layers('new'):
             return Response({
                 "success": False,
                 "error": "Δεν υπάρχουν νέα υλικά για υπολογισμό"
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        R_si = NumericValue.get_value('Εσωτερική Οροφής (Rsi)')
-        R_se = NumericValue.get_value('Εξωτερική (Rse)')
-        
-        R_materials = sum([
-            material.thickness / material.material_thermal_conductivity 
-            for material in new_materials 
-            if material.material_thermal_conductivity > 0
-        ])
+        R_si = assembly.r_si
+        R_se = assembly.r_se
+        R_materials = assembly.thermal_resistance('new')
+        R_total = assembly.r_total('new')
         
-        R_total = R_si + R_se + R_materials
-        
-        u_coefficient = 1 / R_total if R_total > 0 else 0
+        u_coefficient = assembly.u_value('new')
         
         roof_thermal_insulation.u_coefficient = u_coefficient
         roof_thermal_insulation.save()
@@ -271,6 +267,46 @@ class RoofThermalInsulationMaterialLayerDetailView(generics.RetrieveUpdateDestro
         )
 
 
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+def replace_material_layers(request, thermal_insulation_uuid):
+    """
+    Replace all material layers of a roof thermal insulation in one request.
+    Body: {"layers": [{"uuid"?, "material", "material_type", ...}, ...]}; layers
+    not listed are deleted. U coefficient and financials are recalculated once.
+    """
+    layers = request.data.get('layers') if hasattr(request.data, 'get') else None
+    serializer = RoofThermalInsulationMaterialLayerBatchSerializer(data=layers, many=True)
+    if not serializer.is_valid():
+        return Response({
+            "success": False,
+            "errors": serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        with transaction.atomic():
+            roof_thermal_insulation = get_object_or_404(
+                RoofThermalInsulation.objects.select_for_update(),
+                uuid=thermal_insulation_uuid,
+                created_by=request.user
+            )
+            replace_layers(
+                roof_thermal_insulation, 'material_layers', serializer.validated_data,
+                prepare=RoofThermalInsulationMaterialLayer.fill_material_fields
+            )
+    except LayerError as e:
+        return Response({
+            "success": False,
+            "errors": e.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    logger.info(f"Replaced material layers of roof thermal insulation {roof_thermal_insulation.uuid} ({len(layers)} layers)")
+    return Response({
+        "success": True,
+        "data": RoofThermalInsulationSerializer(roof_thermal_insulation).data
+    })
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def recalculate_roof_thermal_insulation(request, roof_thermal_insulation_uuid):
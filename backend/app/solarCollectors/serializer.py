@@ -5,3 +5,16 @@ class SolarCollectorSerializer(serializers.ModelSerializer):
     class Meta:
         model = SolarCollector
         fields = '__all__'
+
+
+class SolarCollectorBulkSerializer(serializers.ModelSerializer):
+    """
+    One row of a bulk create. Related objects are given by UUID and resolved
+    for all rows with a single query per relation.
+    """
+    building = serializers.UUIDField()
+    project = serializers.UUIDField()
+
+    class Meta:
+        model = SolarCollector
+        exclude = ('uuid', 'user', 'created_at', 'updated_at')
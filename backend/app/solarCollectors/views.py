@@ -7,9 +7,10 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from .models import SolarCollector
-from .serializer import SolarCollectorSerializer
+from .serializer import SolarCollectorSerializer, SolarCollectorBulkSerializer
 from building.models import Building
 from project.models import Project
+from common.bulk import bulk_create_response
 from common.utils import (
     get_user_from_token, 
     standard_error_response, 
@@ -80,6 +81,17 @@ def create_solar_collector(request):
             f"Validation errors: {serializer.errors}"
         )
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_create_solar_collectors(request):
+    """
+    Create many solar collectors in one request: {"items": [{"building", "project", ...}, ...]}.
+    The building and project of all rows are looked up together and nothing is
+    created if any row is invalid (errors are returned per row).
+    """
+    return bulk_create_response(request, SolarCollectorBulkSerializer, SolarCollectorSerializer, "solar collectors")
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_building_solar_collectors(request, building_uuid):
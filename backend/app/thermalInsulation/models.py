@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.conf import settings
 import uuid
+from common.finance import discounted_payback, internal_rate_of_return, net_present_value
+from common.thermal import SUMMER_TEMPERATURE_DIFFERENCE, WINTER_TEMPERATURE_DIFFERENCE, ThermalAssembly
 from numericValues.models import NumericValue
 
 User = get_user_model()
@@ -119,7 +121,19 @@ class ExternalWallThermalInsulation(models.Model):
     def __str__(self):
         return f"Θερμομόνωση {self.building.name} - U: {self.u_coefficient}"
 
-    def calculate_u_coefficient(self):
+    def thermal_assembly(self):
+        """Οι στρώσεις υλικών σε ThermalAssembly (ένα ερώτημα, κανένα αν έχει γίνει prefetch)"""
+        if 'material_layers' in getattr(self, '_prefetched_objects_cache', {}):
+            layers = self.material_layers.all()
+        else:
+            layers = self.material_layers.select_related('material')
+        return ThermalAssembly(
+            layers,
+            NumericValue.get_value('Εσωτερική Τοίχου (Rsi)'),
+            NumericValue.get_value('Εξωτερική (Rse)'),
+        )
+
+    def calculate_u_coefficient(self, assembly=None):
         """
         Calculate U coefficient based on NEW materials only
         U = 1/R_total
@@ -127,18 +141,9 @@ class ExternalWallThermalInsulation(models.Model):
         R_si = 0.13 m²K/W (internal - walls)
         R_se = 0.04 m²K/W (external)
         """
-        R_si = NumericValue.get_value('Εσωτερική Τοίχου (Rsi)')
-        R_se = NumericValue.get_value('Εξωτερική (Rse)')
-        
-        materials_r_sum = 0
-        for material_layer in self.material_layers.filter(material_type='new'):
-            if material_layer.material.thermal_conductivity > 0:
-                r_material = material_layer.thickness / material_layer.material.thermal_conductivity
-                materials_r_sum += r_material
-        r_total = R_si + R_se + materials_r_sum
-        if r_total > 0:
-            return 1 / r_total
-        return 0
+        if assembly is None:
+            assembly = self.thermal_assembly()
+        return assembly.u_value('new')
 
     def calculate_npv(self):
         """Calculate Net Present Value"""
@@ -157,18 +162,16 @@ class ExternalWallThermalInsulation(models.Model):
             if total_cost <= 0:
                 return 0
                 
-            npv = -total_cost 
             annual_net_benefit = annual_benefit - annual_operating_costs
             discount_rate_decimal = discount_rate / 100
             
-            for year in range(1, time_period_years + 1):
-                npv += annual_net_benefit / ((1 + discount_rate_decimal) ** year)
+            npv = net_present_value(total_cost, annual_net_benefit, discount_rate_decimal, time_period_years)
             return round(npv, 2) 
         except (TypeError, ValueError, ZeroDivisionError) as e:
             print(f"Error calculating NPV: {e}")
             return 0
 
-    def calculate_annual_benefit(self):
+    def calculate_annual_benefit(self, assembly=None):
         """
         Calculate annual benefit from energy savings
         Formula: (difference in winter hourly losses × cooling hours per year + 
@@ -190,20 +193,11 @@ class ExternalWallThermalInsulation(models.Model):
             else:
                 return 0
         
-            old_materials = self.material_layers.filter(material_type='old')
-            new_materials = self.material_layers.filter(material_type='new')
-        
-            winter_losses_old = self._calculate_hourly_losses(old_materials, 17) 
-            winter_losses_new = self._calculate_hourly_losses(new_materials, 17)
-        
-            summer_losses_old = self._calculate_hourly_losses(old_materials, 13)  
-            summer_losses_new = self._calculate_hourly_losses(new_materials, 13)
-        
-            winter_losses_difference = winter_losses_old - winter_losses_new
-            summer_losses_difference = summer_losses_old - summer_losses_new
+            if assembly is None:
+                assembly = self.thermal_assembly()
             annual_energy_savings = (
-                winter_losses_difference * cooling_hours +
-                summer_losses_difference * heating_hours
+                assembly.losses_saved(WINTER_TEMPERATURE_DIFFERENCE) * cooling_hours +
+                assembly.losses_saved(SUMMER_TEMPERATURE_DIFFERENCE) * heating_hours
             )
             
             annual_benefit = annual_energy_savings * electricity_cost
@@ -249,26 +243,15 @@ class ExternalWallThermalInsulation(models.Model):
             if annual_net_benefit <= 0:
                 return None
             
-            cumulative_discounted_cash_flow = 0
-            
-            for year in range(1, time_period_years + 1):
-                discounted_cash_flow = annual_net_benefit / ((1 + discount_rate) ** year)
-                cumulative_discounted_cash_flow += discounted_cash_flow
-                
-                if cumulative_discounted_cash_flow >= total_cost:
-                    # Linear interpolation for precise payback period
-                    previous = cumulative_discounted_cash_flow - discounted_cash_flow
-                    fraction = (total_cost - previous) / discounted_cash_flow
-                    return round((year - 1) + fraction, 2)
-            
-            # If payback not achieved within time period
-            return time_period_years + 1
+            # time_period_years + 1 αν δεν αποπληρώνεται εντός της περιόδου
+            payback = discounted_payback(total_cost, annual_net_benefit, discount_rate, time_period_years)
+            return round(payback, 2) if payback <= time_period_years else payback
         except (TypeError, ValueError, ZeroDivisionError):
             return None
 
     def calculate_internal_rate_of_return(self):
         """
-        Calculate internal rate of return using Newton-Raphson method
+        Calculate internal rate of return
         IRR is the discount rate where NPV = 0
         """
         try:
@@ -285,94 +268,38 @@ class ExternalWallThermalInsulation(models.Model):
             if annual_net_benefit <= 0:
                 return None
             
-            # Αρχική εκτίμηση IRR
-            irr = 0.1  # 10%
-            tolerance = 0.00001
-            max_iterations = 1000
-            
-            for _ in range(max_iterations):
-                # Υπολογισμός NPV με το τρέχον IRR
-                npv = -total_cost
-                npv_derivative = 0
-                
-                for year in range(1, time_period_years + 1):
-                    factor = (1 + irr) ** year
-                    npv += annual_net_benefit / factor
-                    npv_derivative -= year * annual_net_benefit / (factor * (1 + irr))
-                
-                # Έλεγχος σύγκλισης
-                if abs(npv) < tolerance:
-                    break
-                
-                # Newton-Raphson update
-                if npv_derivative != 0:
-                    irr = irr - npv / npv_derivative
-                else:
-                    break
-                
-                # Αποφυγή αρνητικών IRR
-                if irr < -0.99:
-                    irr = -0.99
-            
+            irr = internal_rate_of_return(total_cost, annual_net_benefit, time_period_years)
+            if irr is None:
+                return None
             return round(irr * 100, 2)
         except (TypeError, ValueError, ZeroDivisionError):
             return None
 
-    def _calculate_hourly_losses(self, materials, temperature_difference):
-        """
-        Helper method to calculate hourly losses for a set of materials
-        Formula: U × A × ΔT / 1000 (kW)
-        """
-        if not materials.exists():
-            return 0
-        
-        R_si = NumericValue.get_value('Εσωτερική Τοίχου (Rsi)')
-        R_se = NumericValue.get_value('Εξωτερική (Rse)')
-        
-        materials_r_sum = 0
-        total_area = 0
-        
-        for material_layer in materials:
-            try:
-                thickness = float(material_layer.thickness or 0)
-                thermal_conductivity = float(material_layer.material.thermal_conductivity or 1)
-                surface_area = float(material_layer.surface_area or 0)
-                
-                if thermal_conductivity > 0 and thickness > 0:
-                    r_material = thickness / thermal_conductivity
-                    materials_r_sum += r_material
-                
-                total_area += surface_area
-            except (AttributeError, TypeError, ValueError):
-                continue
-        
-        r_total = R_si + R_se + materials_r_sum
-        u_coefficient = 1 / r_total if r_total > 0 else 0
-        
-        hourly_losses = (u_coefficient * total_area * temperature_difference) / 1000
-        return hourly_losses
+    CALCULATED_FIELDS = [
+        'u_coefficient', 'annual_benefit', 'net_present_value',
+        'payback_period', 'discounted_payback_period', 'internal_rate_of_return',
+    ]
+
+    def recalculate(self):
+        """Υπολογισμός συντελεστή U και οικονομικών δεικτών (χωρίς αποθήκευση)"""
+        assembly = self.thermal_assembly()
+        self.u_coefficient = self.calculate_u_coefficient(assembly)
+        self.annual_benefit = self.calculate_annual_benefit(assembly)
+        self.net_present_value = self.calculate_npv()
+        self.payback_period = self.calculate_payback_period()
+        self.discounted_payback_period = self.calculate_discounted_payback_period()
+        self.internal_rate_of_return = self.calculate_internal_rate_of_return()
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        # Υπολογισμός πριν την αποθήκευση, ώστε να γίνεται μία μόνο εγγραφή
         try:
-            self.u_coefficient = self.calculate_u_coefficient()
-            self.annual_benefit = self.calculate_annual_benefit()
-            self.net_present_value = self.calculate_npv()
-            self.payback_period = self.calculate_payback_period()
-            self.discounted_payback_period = self.calculate_discounted_payback_period()
-            self.internal_rate_of_return = self.calculate_internal_rate_of_return()
-            if self.pk:
-                ExternalWallThermalInsulation.objects.filter(pk=self.pk).update(
-                    u_coefficient=self.u_coefficient,
-                    annual_benefit=self.annual_benefit,
-                    net_present_value=self.net_present_value,
-                    payback_period=self.payback_period,
-                    discounted_payback_period=self.discounted_payback_period,
-                    internal_rate_of_return=self.internal_rate_of_return
-                )
+            self.recalculate()
         except Exception as e:
             print(f"Error calculating thermal insulation values: {e}")
-            pass
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | set(self.CALCULATED_FIELDS)
+        super().save(*args, **kwargs)
 
 
 class ThermalInsulationMaterialLayer(models.Model):
@@ -29,6 +29,19 @@ class ThermalInsulationMaterialLayerSerializer(serializers.ModelSerializer):
         read_only_fields = ['uuid', 'created_at', 'updated_at', 'thermal_resistance']
 
 
+class ThermalInsulationMaterialLayerBatchSerializer(serializers.ModelSerializer):
+    """
+    One layer of a batch replace. The material is given by UUID and resolved for
+    all layers with a single query; layers with a uuid are updated in place.
+    """
+    uuid = serializers.UUIDField(required=False)
+    material = serializers.UUIDField()
+
+    class Meta:
+        model = ThermalInsulationMaterialLayer
+        fields = ['uuid', 'material', 'material_type', 'surface_type', 'thickness', 'surface_area', 'cost']
+
+
 class ExternalWallThermalInsulationSerializer(serializers.ModelSerializer):
     material_layers = ThermalInsulationMaterialLayerSerializer(many=True, read_only=True)
     old_materials = serializers.SerializerMethodField()
@@ -58,11 +71,12 @@ class ExternalWallThermalInsulationSerializer(serializers.ModelSerializer):
             'total_materials_cost', 'total_surface_area', 'annual_benefit'
         ]    
     def get_old_materials(self, obj):
-        old_materials = obj.material_layers.filter(material_type='old')
+        # .all() ώστε να χρησιμοποιείται το prefetch_related, αν υπάρχει
+        old_materials = [layer for layer in obj.material_layers.all() if layer.material_type == 'old']
         return ThermalInsulationMaterialLayerSerializer(old_materials, many=True).data
 
     def get_new_materials(self, obj):
-        new_materials = obj.material_layers.filter(material_type='new')
+        new_materials = [layer for layer in obj.material_layers.all() if layer.material_type == 'new']
         return ThermalInsulationMaterialLayerSerializer(new_materials, many=True).data
 
     def get_total_materials_cost(self, obj):
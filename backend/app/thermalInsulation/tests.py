@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from building.models import Building
+from materials.models import Material
+from numericValues import cache as numeric_cache
+from prefectures.models import Prefecture
+from project.models import Project
+from user.models import User
+
+from .models import ExternalWallThermalInsulation
+
+LAYERS = 10
+# Ανεξάρτητο από το πλήθος των στρώσεων (common.layers): ένα DELETE / bulk_update /
+# bulk_create, ένας επαναϋπολογισμός της θερμομόνωσης και η απάντηση με prefetch.
+# Με το κοινό cache της βάσης: η έκδοση των numericValues διαβάστηκε ήδη κατά τη
+# δημιουργία της θερμομόνωσης (common.versions), οπότε κανένα ερώτημα στο cache.
+REPLACE_QUERIES = 16
+
+
+class ReplaceMaterialLayersTests(TestCase):
+    """Το PUT .../materials/ έναντι ενός POST .../materials/add/ ανά στρώση."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@bemat.local', password=None)
+        cls.prefecture = Prefecture.objects.create(name='Αττική', zone='B')
+        cls.project = Project.objects.create(user=cls.user, name='Project', cost_per_kwh_electricity=Decimal('0.2'))
+        cls.materials = [
+            Material.objects.create(
+                name=f'Material {index}', category='insulation', thermal_conductivity=0.03 + index * 0.02,
+            )
+            for index in range(LAYERS)
+        ]
+
+    def setUp(self):
+        numeric_cache.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_insulation(self):
+        # Μία θερμομόνωση εξωτερικής τοιχοποιίας ανά κτίριο και χρήστη
+        building = Building.objects.create(
+            project=self.project, user=self.user, name=f'Building {Building.objects.count()}', usage='Γραφεία',
+            description='Test', address='Test', prefecture=self.prefecture, total_area=500, examined_area=400,
+        )
+        return ExternalWallThermalInsulation.objects.create(
+            user=self.user, building=building, project=self.project, heating_hours_per_year=1200,
+            cooling_hours_per_year=600, total_cost=6000, time_period_years=20, discount_rate=5,
+        )
+
+    def layers(self, count=LAYERS):
+        return [
+            {
+                'material': str(material.uuid), 'material_type': 'old' if position % 3 == 0 else 'new',
+                'thickness': 0.02 + position * 0.01, 'surface_area': 80.0, 'cost': 100.0,
+            }
+            for position, material in enumerate(self.materials[:count])
+        ]
+
+    def replace(self, insulation, layers):
+        response = self.client.put(
+            f'/api/thermal_insulations/{insulation.uuid}/materials/', {'layers': layers}, format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_replace_query_count_for_ten_layer_wall(self):
+        insulation = self.create_insulation()
+        with self.assertNumQueries(REPLACE_QUERIES):
+            response = self.replace(insulation, self.layers())
+        self.assertEqual(len(response.data['data']['material_layers']), LAYERS)
+
+        insulation = self.create_insulation()
+        with self.assertNumQueries(REPLACE_QUERIES):
+            self.replace(insulation, self.layers(2))
+
+    def test_replace_matches_per_layer_path(self):
+        per_layer = self.create_insulation()
+        for layer in self.layers():
+            response = self.client.post(
+                f'/api/thermal_insulations/{per_layer.uuid}/materials/add/', layer, format='json',
+            )
+            self.assertEqual(response.status_code, 201, response.data)
+        per_layer.refresh_from_db()
+
+        batched = self.create_insulation()
+        self.replace(batched, self.layers())
+        batched.refresh_from_db()
+
+        self.assertEqual(batched.material_layers.count(), LAYERS)
+        self.assertIsNotNone(batched.u_coefficient)
+        self.assertAlmostEqual(batched.u_coefficient, per_layer.u_coefficient)
+        self.assertAlmostEqual(batched.annual_benefit, per_layer.annual_benefit)
+        self.assertAlmostEqual(batched.net_present_value, per_layer.net_present_value)
+
+    def test_replace_updates_and_deletes_existing_layers(self):
+        insulation = self.create_insulation()
+        created = self.replace(insulation, self.layers(3)).data['data']['material_layers']
+        kept = dict(self.layers(1)[0], uuid=created[0]['uuid'], thickness=0.1)
+
+        layers = self.replace(insulation, [kept]).data['data']['material_layers']
+        self.assertEqual([layer['uuid'] for layer in layers], [created[0]['uuid']])
+        self.assertAlmostEqual(float(layers[0]['thickness']), 0.1)
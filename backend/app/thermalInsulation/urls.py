@@ -18,6 +18,9 @@ urlpatterns = [
     path('<uuid:thermal_insulation_uuid>/recalculate/', views.recalculate_u_coefficient, 
          name='recalculate-u-coefficient'),
     
+    path('<uuid:thermal_insulation_uuid>/materials/', 
+         views.replace_material_layers, 
+         name='thermal-insulation-material-layers-replace'),
     path('<uuid:thermal_insulation_uuid>/materials/add/', 
          views.ThermalInsulationMaterialLayerCreateView.as_view(), 
          name='thermal-insulation-material-layer-create'),
@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 import json
 import logging
 
@@ -13,30 +14,35 @@ from .models import (
 from .serializer import (
     ExternalWallThermalInsulationSerializer,
     ExternalWallThermalInsulationCreateSerializer,
-    ThermalInsulationMaterialLayerSerializer
+    ThermalInsulationMaterialLayerSerializer,
+    ThermalInsulationMaterialLayerBatchSerializer
 )
 from building.models import Building
 from project.models import Project
-from materials.models import Material
-from materials.serializers import MaterialListSerializer
+from common.conditional import conditional_etag
 from common.utils import is_admin_user, has_access_permission
+from common.layers import LayerError, replace_layers
+from referenceData.cache import get_reference_data, reference_etag
 
 logger = logging.getLogger(__name__)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(lambda request: reference_etag())
 def get_available_materials(request):
     """Get all available materials for wall thermal insulation (excludes roof-only materials)"""
     try:
         # Exclude materials only suitable for roofs (e.g., tiles)
         excluded_categories = ['roof']
-        materials = Material.objects.filter(is_active=True).exclude(category__in=excluded_categories)
-        serializer = MaterialListSerializer(materials, many=True)
+        materials = [
+            material for material in get_reference_data()['materials']
+            if material['category'] not in excluded_categories
+        ]
         return Response({
             "success": True,
-            "data": serializer.data,
-            "count": len(serializer.data)
+            "data": materials,
+            "count": len(materials)
         })
         
     except Exception as e:
@@ -213,6 +219,43 @@ class ThermalInsulationMaterialLayerDetailView(generics.RetrieveUpdateDestroyAPI
         )
 
 
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+def replace_material_layers(request, thermal_insulation_uuid):
+    """
+    Replace all material layers of a thermal insulation in one request.
+    Body: {"layers": [{"uuid"?, "material", "material_type", ...}, ...]}; layers
+    not listed are deleted. U coefficient and financials are recalculated once.
+    """
+    layers = request.data.get('layers') if hasattr(request.data, 'get') else None
+    serializer = ThermalInsulationMaterialLayerBatchSerializer(data=layers, many=True)
+    if not serializer.is_valid():
+        return Response({
+            "success": False,
+            "errors": serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        with transaction.atomic():
+            thermal_insulation = get_object_or_404(
+                ExternalWallThermalInsulation.objects.select_for_update(),
+                uuid=thermal_insulation_uuid,
+                user=request.user
+            )
+            replace_layers(thermal_insulation, 'material_layers', serializer.validated_data)
+    except LayerError as e:
+        return Response({
+            "success": False,
+            "errors": e.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    logger.info(f"Replaced material layers of thermal insulation {thermal_insulation.uuid} ({len(layers)} layers)")
+    return Response({
+        "success": True,
+        "data": ExternalWallThermalInsulationSerializer(thermal_insulation).data
+    })
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def recalculate_u_coefficient(request, thermal_insulation_uuid):
@@ -6,3 +6,16 @@ class ThermalZoneSerializer(serializers.ModelSerializer):
     class Meta:
         model = ThermalZone
         fields = '__all__'
+
+
+class ThermalZoneBulkSerializer(serializers.ModelSerializer):
+    """
+    One row of a bulk create. Related objects are given by UUID and resolved
+    for all rows with a single query per relation.
+    """
+    building = serializers.UUIDField()
+    project = serializers.UUIDField()
+
+    class Meta:
+        model = ThermalZone
+        exclude = ('uuid', 'user', 'created_at', 'updated_at')
@@ -8,9 +8,10 @@ from rest_framework import status
 import logging
 
 from .models import ThermalZone
-from .serializer import ThermalZoneSerializer
+from .serializer import ThermalZoneSerializer, ThermalZoneBulkSerializer
 from building.models import Building
 from project.models import Project
+from common.bulk import bulk_create_response
 from common.utils import (
     get_user_from_token, 
     standard_error_response, 
@@ -73,6 +74,17 @@ def create_thermal_zone(request):
         return standard_error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_create_thermal_zones(request):
+    """
+    Create many thermal zones in one request: {"items": [{"building", "project", ...}, ...]}.
+    The building and project of all rows are looked up together and nothing is
+    created if any row is invalid (errors are returned per row).
+    """
+    return bulk_create_response(request, ThermalZoneBulkSerializer, ThermalZoneSerializer, "thermal zones")
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_building_thermal_zones(request, building_uuid):
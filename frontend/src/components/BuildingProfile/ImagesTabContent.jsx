@@ -198,8 +198,9 @@ const ImagesTabContent = ({
                         className="w-full h-32 bg-gray-200 rounded-lg mb-3 overflow-hidden cursor-pointer"
                         onClick={() => handleDownloadImage(image)}>
                         <img
-                          src={image.image_url || image.image}
+                          src={image.thumbnail_url || image.image_url || image.image}
                           alt={image.title}
+                          loading="lazy"
                           className="w-full h-full object-cover"
                           onLoad={(e) => {}}
                           onError={(e) => {
@@ -58,28 +58,39 @@ export default function Sidenav() {
 
     const fetchProjects = async () => {
       try {
-        const response = await axios.get(`${API_BASE_URL}/projects/get/`, {
-          headers: {
-            Authorization: `Token ${token}`,
-            "Content-Type": "application/json",
-          },
-        });
+        // Μόνο τα πεδία της λίστας, σε σελίδες (pagination.next_cursor)
+        const collected = [];
+        let cursor = null;
+        do {
+          const response = await axios.get(`${API_BASE_URL}/projects/get/`, {
+            params: {
+              fields: "uuid,name,is_submitted",
+              page_size: 500,
+              ...(cursor ? { cursor } : {}),
+            },
+            headers: {
+              Authorization: `Token ${token}`,
+              "Content-Type": "application/json",
+            },
+          });
+
+          const data = response.data;
 
-        const data = response.data;
+          if (Array.isArray(data)) {
+            collected.push(...data);
+          } else if (data.projects && Array.isArray(data.projects)) {
+            collected.push(...data.projects);
+          } else if (
+            data.data &&
+            data.data.projects &&
+            Array.isArray(data.data.projects)
+          ) {
+            collected.push(...data.data.projects);
+          }
+          cursor = data.pagination ? data.pagination.next_cursor : null;
+        } while (cursor);
 
-        if (Array.isArray(data)) {
-          setProjects(data);
-        } else if (data.projects && Array.isArray(data.projects)) {
-          setProjects(data.projects);
-        } else if (
-          data.data &&
-          data.data.projects &&
-          Array.isArray(data.data.projects)
-        ) {
-          setProjects(data.data.projects);
-        } else {
-          setProjects([]);
-        }
+        setProjects(collected);
       } catch (error) {}
     };
 
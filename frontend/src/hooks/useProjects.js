@@ -17,30 +17,44 @@ export const useProjects = () => {
 
   const fetchProjects = () => {
     setLoading(true);
+    const collected = [];
 
-    const settings = {
-      url: `${API_BASE_URL}/projects/get/`,
-      method: "GET",
-      timeout: 0,
-      headers: {
-        Authorization: `token ${token}`,
-      },
-    };
+    // Η λίστα έρχεται σε σελίδες: ακολουθούμε το pagination.next_cursor
+    const fetchPage = (cursor) => {
+      const settings = {
+        url: `${API_BASE_URL}/projects/get/?page_size=500${
+          cursor ? `&cursor=${encodeURIComponent(cursor)}` : ""
+        }`,
+        method: "GET",
+        timeout: 0,
+        headers: {
+          Authorization: `token ${token}`,
+        },
+      };
 
-    $.ajax(settings)
-      .done(function (response) {
+      $.ajax(settings)
+        .done(function (response) {
+
+          const projectsArray = Array.isArray(response)
+            ? response
+            : response.projects || response.data.projects || [];
+          collected.push(...projectsArray);
+          const nextCursor = response.pagination && response.pagination.next_cursor;
+          if (nextCursor) {
+            fetchPage(nextCursor);
+            return;
+          }
+          setProjects(collected);
+          setLoading(false);
+        })
+        .fail(function (error) {
 
-        const projectsArray = Array.isArray(response)
-          ? response
-          : response.projects || response.data.projects || [];
-        setProjects(projectsArray);
-        setLoading(false);
-      })
-      .fail(function (error) {
+          setError(error);
+          setLoading(false);
+        });
+    };
 
-        setError(error);
-        setLoading(false);
-      });
+    fetchPage(null);
   };
 
   const handleProjectCreated = (newProject) => {
@@ -68,18 +68,8 @@ function AddImageModalForm({
         return;
       }
 
-      const reader = new FileReader();
-      reader.onload = function (e) {
-        const base64String = e.target.result;
-        setSelectedFile({
-          name: file.name,
-          type: file.type,
-          size: file.size,
-          base64: base64String,
-        });
-        setErrors({ ...errors, image: "" });
-      };
-      reader.readAsDataURL(file);
+      setSelectedFile(file);
+      setErrors({ ...errors, image: "" });
     }
   };
 
@@ -114,18 +104,14 @@ function AddImageModalForm({
 
     if (!validateForm()) return;
 
-    const submitData = {
-      title: formData.title,
-      description: formData.description,
-      category: formData.category,
-      tags: formData.tags,
-      building: buildingUuid,
-      project: projectUuid,
-      image: selectedFile.base64,
-      image_name: selectedFile.name,
-      image_type: selectedFile.type,
-      image_size: selectedFile.size,
-    };
+    const submitData = new FormData();
+    submitData.append("title", formData.title);
+    submitData.append("description", formData.description);
+    submitData.append("category", formData.category);
+    submitData.append("tags", formData.tags);
+    submitData.append("building", buildingUuid);
+    submitData.append("project", projectUuid);
+    submitData.append("image", selectedFile, selectedFile.name);
 
     const submitUrl = `${API_BASE_URL}/building-images/upload/`;
 
@@ -135,9 +121,10 @@ function AddImageModalForm({
       method: "POST",
       headers: {
         Authorization: `Token ${token}`,
-        "Content-Type": "application/json",
       },
-      data: JSON.stringify(submitData),
+      data: submitData,
+      processData: false,
+      contentType: false,
       success: function (response) {
 
         onImageAdded(response);